@@ -3,30 +3,71 @@ Sign Language Translator - Flask Application
 
 This module provides a Flask-based web application for translating
 American Sign Language (ASL) fingerspelling to text and vice versa.
+Slow operations (speech recognition, sentence correction, speech
+synthesis) can run as background jobs: with ?async=1 their endpoints
+answer 202 with a job ID, and /jobs/<id> reports status and result.
+The application is built by create_app(); the classifier, MediaPipe
+and the API clients are initialized on first use, so importing this
+module (tests, tools, health checks) stays fast and works without them.
+A background warm-up then makes their first, slow calls before real
+traffic arrives; /ready reports when it is done.
 """
 
-from flask import Flask, render_template, jsonify, request, Response
-import cv2
-import mediapipe as mp
-import numpy as np
-import pickle
 import time
+_IMPORT_START = time.perf_counter()
+
+import pickle
+import json
+import itertools
+import functools
 import os
 import sys
 import signal
 import atexit
 import logging
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Optional, Generator, Any
-from dotenv import load_dotenv
+
+from functions.startup import (
+    LazyResource, Warmup, timed, record_timing, record_remainder, timing_report, log_timing_report
+)
+
+with timed('import:flask'):
+    from flask import (
+        Flask, Blueprint, render_template, jsonify, request, Response, send_file, abort, stream_with_context,
+        url_for
+    )
+    from werkzeug.wsgi import ClosingIterator
+    from dotenv import load_dotenv
+with timed('import:opencv'):
+    import cv2
+    import numpy as np
 
 # Load environment variables
 load_dotenv()
 
 # Import custom modules
-from functions.text_fix import generate_sentences
-from functions.voice import text_to_speech_and_play
-from functions.text_to_sign import text_to_sign_language
-from functions.speech_to_text import speech_to_text
+with timed('import:functions'):
+    from functions.text_fix import generate_sentences, generate_sentences_stream, correction_cache
+    from functions.voice import (
+        text_to_speech_and_play, stream_speech, release_speech, synthesize_to_file, audio_cache
+    )
+    from functions.text_to_sign import text_to_sign_language, iter_sign_segments, split_text_segments
+    from functions.letter_variants import select_variant
+    from functions.speech_to_text import (
+        SpeechRecognizerService, SpeechBusyError, AudioDecodeError, create_backend
+    )
+    from functions.speculative import SpeculativeCorrector, SPECULATIVE_PAUSE
+    from functions.resilience import breaker_stats
+    from functions.speech_prefetch import SpeechPrefetcher, TTS_PREFETCH
+    from functions.jobs import JobQueue, JobQueueFull, PRIORITY_HIGH, PRIORITY_NORMAL
+    from functions.frame_source import FrameSource, create_frame_source, CAMERA_SOURCE
+    from functions.frame_ring import CaptureProcess
+    from functions.hand_detection import (
+        DetectionError, HandTracker, InferenceRegion, create_detector, pool_size, MAX_NUM_HANDS
+    )
+    from functions.presence import PresenceGate
+    from functions.cameras import CameraPipeline, FairScheduler, parse_camera_sources, CAMERA_SOURCES
 
 # =============================================================================
 # CONFIGURATION CONSTANTS
@@ -36,6 +77,11 @@ from functions.speech_to_text import speech_to_text
 MIN_DETECTION_CONFIDENCE: float = float(os.getenv('MIN_DETECTION_CONFIDENCE', '0.3'))
 NUM_HAND_LANDMARKS: int = 21
 FEATURE_VECTOR_SIZE: int = 42  # 21 landmarks * 2 coordinates (x, y)
+# Stability buffer of callers that don't track hands
+DEFAULT_HAND: str = 'hand'
+
+# Number of letter candidates kept per committed position for decoding
+LATTICE_TOP_K: int = int(os.getenv('LATTICE_TOP_K', '5'))
 
 # Stabilization settings (can be configured via environment variables)
 STABILITY_THRESHOLD: int = int(os.getenv('STABILITY_THRESHOLD', '5'))
@@ -44,6 +90,41 @@ STABILIZATION_DELAY: float = float(os.getenv('STABILIZATION_DELAY', '2.0'))
 
 # Input validation
 MAX_TEXT_LENGTH: int = 500
+MAX_IMAGE_SIZE: int = 1024
+
+# Bulk text-to-sign settings
+BULK_MAX_SEGMENTS: int = int(os.getenv('BULK_MAX_SEGMENTS', '10000'))
+BULK_RATE_LIMIT: str = os.getenv('BULK_RATE_LIMIT', '30 per minute;300 per hour')
+
+# Uploaded speech recordings
+SPEECH_MAX_UPLOAD_BYTES: int = int(os.getenv('SPEECH_MAX_UPLOAD_BYTES', str(5 * 1024 * 1024)))
+SPEECH_UPLOAD_TIMEOUT: float = float(os.getenv('SPEECH_UPLOAD_TIMEOUT', '20.0'))
+
+# Seconds between keep-alive comments on a job event stream
+JOB_EVENT_KEEPALIVE: float = float(os.getenv('JOB_EVENT_KEEPALIVE', '15.0'))
+
+# Browser cache lifetime for letter images (seconds)
+IMAGE_CACHE_MAX_AGE: int = int(os.getenv('IMAGE_CACHE_MAX_AGE', '86400'))
+
+# Warm-up: synthetic frames and feature vectors pushed through MediaPipe
+# and the classifier at startup; the video feed waits up to WARMUP_WAIT
+# seconds for a warm-up still in progress
+WARMUP_ENABLED: bool = os.getenv('WARMUP', 'true').lower() in ('1', 'true', 'yes')
+WARMUP_ITERATIONS: int = int(os.getenv('WARMUP_ITERATIONS', '3'))
+WARMUP_WAIT: float = float(os.getenv('WARMUP_WAIT', '30.0'))
+WARMUP_FRAME_SHAPE: tuple[int, int, int] = (480, 640, 3)
+
+# Capture CAMERA_SOURCE in a separate process that publishes frames to a
+# shared-memory ring; every video feed then reads the same camera
+CAPTURE_PROCESS: bool = os.getenv('CAPTURE_PROCESS', 'false').lower() in ('1', 'true', 'yes')
+
+# Cameras (CAMERA_SOURCES, or one "default" camera on CAMERA_SOURCE), each
+# with its own stabilization settings; the first serves requests that
+# don't name a camera
+CAMERAS = parse_camera_sources(
+    CAMERA_SOURCES, CAMERA_SOURCE, STABILITY_THRESHOLD, STABILITY_TIME_WINDOW, STABILIZATION_DELAY
+)
+DEFAULT_CAMERA: str = CAMERAS[0].name
 
 # Paths - resolved relative to this file's directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -68,31 +149,40 @@ logger = logging.getLogger(__name__)
 # FLASK APPLICATION SETUP
 # =============================================================================
 
-app = Flask(__name__)
-
-# Try to import and configure rate limiting
-try:
-    from flask_limiter import Limiter
-    from flask_limiter.util import get_remote_address
+# Routes are registered on this blueprint and attached by create_app()
+bp = Blueprint('main', __name__)
 
-    limiter = Limiter(
-        get_remote_address,
-        app=app,
-        default_limits=["200 per day", "50 per hour"],
-        storage_uri="memory://"
-    )
-    RATE_LIMITING_ENABLED = True
-    logger.info("Rate limiting enabled")
-except ImportError:
-    logger.warning("flask-limiter not installed. Rate limiting disabled. Install with: pip install flask-limiter")
-    RATE_LIMITING_ENABLED = False
-    limiter = None
+# Try to import and configure rate limiting (RATE_LIMITING=false turns it
+# off, e.g. for load tests)
+RATE_LIMITING_ENABLED = False
+limiter = None
+if os.getenv('RATE_LIMITING', 'true').lower() in ('1', 'true', 'yes'):
+    try:
+        with timed('import:flask_limiter'):
+            from flask_limiter import Limiter
+            from flask_limiter.util import get_remote_address
+
+        limiter = Limiter(
+            get_remote_address,
+            default_limits=["200 per day", "50 per hour"],
+            storage_uri="memory://"
+        )
+        RATE_LIMITING_ENABLED = True
+        logger.info("Rate limiting enabled")
+    except ImportError:
+        logger.warning("flask-limiter not installed. Rate limiting disabled. Install with: pip install flask-limiter")
+else:
+    logger.info("Rate limiting disabled by RATE_LIMITING")
 
 
 # =============================================================================
 # MODEL AND MEDIAPIPE INITIALIZATION
 # =============================================================================
 
+class ModelLoadError(RuntimeError):
+    """The trained classifier could not be loaded."""
+
+
 def load_model() -> Any:
     """Load the trained ML model from pickle file.
 
@@ -100,7 +190,7 @@ def load_model() -> Any:
         The loaded model object.
 
     Raises:
-        SystemExit: If model cannot be loaded.
+        ModelLoadError: If model cannot be loaded.
     """
     try:
         logger.info(f"Loading model from: {MODEL_PATH}")
@@ -111,39 +201,103 @@ def load_model() -> Any:
     except FileNotFoundError:
         logger.error(f"Model file not found at: {MODEL_PATH}")
         logger.error("Please ensure the model file exists. Run train_classifier.py to generate it.")
-        sys.exit(1)
+        raise ModelLoadError(f"Model file not found at: {MODEL_PATH}")
     except (pickle.UnpicklingError, KeyError) as e:
         logger.error(f"Error loading model - file may be corrupted: {e}")
-        sys.exit(1)
+        raise ModelLoadError(f"Model file is corrupted: {e}") from e
     except Exception as e:
         logger.error(f"Unexpected error loading model: {e}")
-        sys.exit(1)
+        raise ModelLoadError(str(e)) from e
 
 
-def initialize_mediapipe() -> mp.solutions.hands.Hands:
+def initialize_hand_detector() -> Any:
     """Initialize MediaPipe hands detection.
 
+    Starts the pool of detection worker processes (DETECTION_WORKERS, one
+    per core by default), or MediaPipe in this process for 0 workers.
+
     Returns:
-        Configured MediaPipe Hands object.
+        Hand detector with a detect(frame) method.
     """
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(
-        static_image_mode=True,
-        min_detection_confidence=MIN_DETECTION_CONFIDENCE
+    hand_detection = create_detector(min_detection_confidence=MIN_DETECTION_CONFIDENCE)
+    logger.info(
+        f"MediaPipe initialized with confidence threshold: {MIN_DETECTION_CONFIDENCE} "
+        f"({pool_size()} detection workers)"
     )
-    logger.info(f"MediaPipe initialized with confidence threshold: {MIN_DETECTION_CONFIDENCE}")
-    return hands
+    return hand_detection
+
+
+# Model and MediaPipe are created on first use (unpickling the model
+# imports scikit-learn, which dominates startup time)
+classifier = LazyResource('model', load_model)
+hand_detector = LazyResource('mediapipe', initialize_hand_detector)
 
+# Started on a camera's first video feed when CAPTURE_PROCESS is on
+capture_processes = {
+    camera.name: LazyResource(f'capture:{camera.name}', lambda source=camera.source: CaptureProcess(source))
+    for camera in CAMERAS
+}
 
-# Initialize model and MediaPipe
-model = load_model()
-mp_hands = mp.solutions.hands
-hands = initialize_mediapipe()
+# Cameras take turns on the detection pool and the classifier
+inference_scheduler = FairScheduler(max(pool_size(), 1))
+
+# Part of each camera's frames, and its size, that hand detection sees
+# (INFERENCE_WIDTH, DETECTION_ROI)
+inference_regions = {camera.name: InferenceRegion() for camera in CAMERAS}
+
+# Skips hand detection on each camera's empty or static frames (PRESENCE_GATE)
+presence_gates = {camera.name: PresenceGate() for camera in CAMERAS}
+
+# Each camera's feature vectors, rewritten in place every frame
+feature_buffers = {
+    camera.name: np.empty((MAX_NUM_HANDS, FEATURE_VECTOR_SIZE), dtype=np.float64) for camera in CAMERAS
+}
 
 # Label mapping: 0-25 -> a-z
 labels_dict = {i: chr(97 + i) for i in range(26)}
 
 
+def warm_up_mediapipe() -> None:
+    """Push synthetic camera frames through MediaPipe and the JPEG encoder.
+
+    A blank frame and noise frames exercise the palm detector and its
+    first-inference allocations; the landmark model only runs once a
+    real hand is seen.
+    """
+    hand_detection = hand_detector.get()
+    rng = np.random.default_rng(0)
+    frames = [np.zeros(WARMUP_FRAME_SHAPE, dtype=np.uint8)]
+    frames += [
+        rng.integers(0, 256, WARMUP_FRAME_SHAPE, dtype=np.uint8)
+        for _ in range(max(WARMUP_ITERATIONS - 1, 0))
+    ]
+    for frame in frames:
+        hand_detection.detect(frame)
+        cv2.imencode('.jpg', frame)
+
+
+def warm_up_classifier() -> None:
+    """Run synthetic feature vectors through the classifier."""
+    classifier.get()
+    rng = np.random.default_rng(0)
+    for _ in range(max(WARMUP_ITERATIONS, 1)):
+        predict_with_candidates(rng.random(FEATURE_VECTOR_SIZE).tolist())
+
+
+warmup = Warmup(
+    [('mediapipe', warm_up_mediapipe), ('classifier', warm_up_classifier)],
+    enabled=WARMUP_ENABLED
+)
+
+
+# Recognizes recordings uploaded by the browser
+speech_recognizer = SpeechRecognizerService(create_backend())
+
+
+# Runs slow operations for ?async=1 requests
+job_queue = JobQueue()
+
+
 # =============================================================================
 # SIGN LANGUAGE DETECTOR CLASS
 # =============================================================================
@@ -155,8 +309,25 @@ class SignLanguageDetector:
     sentence building for the sign-to-text conversion process.
     """
 
-    def __init__(self) -> None:
-        """Initialize the detector with default state."""
+    def __init__(self, stability_threshold: int = STABILITY_THRESHOLD,
+                 stability_time_window: float = STABILITY_TIME_WINDOW,
+                 stabilization_delay: float = STABILIZATION_DELAY) -> None:
+        """Initialize the detector with default state.
+
+        Args:
+            stability_threshold: Identical predictions needed for a letter.
+            stability_time_window: Seconds a prediction counts towards it.
+            stabilization_delay: Seconds before the next letter is accepted.
+        """
+        self.stability_threshold = stability_threshold
+        self.stability_time_window = stability_time_window
+        self.stabilization_delay = stabilization_delay
+        self.tracker = HandTracker(max_age=stability_time_window)
+        self.speculator = SpeculativeCorrector(generate_sentences, stream=generate_sentences_stream)
+        # Synthesizes each new sentence before the user asks to hear it;
+        # one per camera, so one booth's new sentence or recording does
+        # not cancel another booth's queued clip
+        self.prefetcher = SpeechPrefetcher(synthesize_to_file, enabled=TTS_PREFETCH and audio_cache.enabled)
         self.reset()
 
     def reset(self) -> None:
@@ -167,15 +338,24 @@ class SignLanguageDetector:
         self.last_detection_time: float = time.time()
         self.stable_char: str = ""
         self.current_meaningful_sentence: str = ""
-        self.stability_buffer: list[tuple[str, float]] = []
+        # Recent predictions and candidates of each tracked hand
+        self.stability_buffers: dict[str, list[tuple[str, float]]] = {}
+        self.candidate_buffers: dict[str, list[tuple[dict[str, float], float]]] = {}
+        self.letter_lattice: list[list[tuple[str, float]]] = []
+        self.tracker.reset()
+        self.speculator.reset()
 
     def start_recording(self) -> None:
         """Start recording mode and reset sentence."""
         self.is_recording = True
         self.detected_sentence = []
-        self.stability_buffer = []
+        self.stability_buffers = {}
+        self.candidate_buffers = {}
+        self.letter_lattice = []
         self.last_confirmed_char = ""
         self.stable_char = ""
+        self.speculator.reset()
+        self.prefetcher.cancel()
         logger.info("Recording started")
 
     def stop_recording(self) -> tuple[str, str]:
@@ -184,12 +364,34 @@ class SignLanguageDetector:
         Returns:
             Tuple of (raw_text, meaningful_sentence)
         """
+        return self.correct_recording(*self.end_recording())
+
+    def end_recording(self) -> tuple[list[str], list[list[tuple[str, float]]]]:
+        """Stop recording and snapshot what was detected.
+
+        Returns:
+            Tuple of (letters, letter_lattice) as of the stop.
+        """
         self.is_recording = False
-        raw_text = ' '.join(self.detected_sentence)
+        return list(self.detected_sentence), list(self.letter_lattice)
+
+    def correct_recording(self, letters: list[str], lattice: list[list[tuple[str, float]]]) -> tuple[str, str]:
+        """Generate the meaningful sentence for a stopped recording.
+
+        Args:
+            letters: Letters returned by end_recording().
+            lattice: Letter lattice returned by end_recording().
+
+        Returns:
+            Tuple of (raw_text, meaningful_sentence)
+        """
+        raw_text = ' '.join(letters)
 
         if raw_text:
             try:
-                self.current_meaningful_sentence = generate_sentences(raw_text)
+                # Chunks corrected while recording are reused; only the
+                # tail still needs a round trip
+                self.current_meaningful_sentence = self.speculator.finish(letters, lattice)
                 logger.info(f"Generated sentence: {self.current_meaningful_sentence}")
             except Exception as e:
                 logger.error(f"Error generating sentence: {e}")
@@ -197,14 +399,59 @@ class SignLanguageDetector:
         else:
             self.current_meaningful_sentence = ""
 
+        self.prefetcher.prefetch(self.current_meaningful_sentence)
         logger.info(f"Recording stopped. Raw: '{raw_text}', Processed: '{self.current_meaningful_sentence}'")
         return raw_text, self.current_meaningful_sentence
 
-    def check_sign_stability(self, prediction: str) -> tuple[bool, Optional[str]]:
+    def stop_recording_stream(self) -> Generator[dict[str, str], None, None]:
+        """Stop recording and stream the sentence correction as it arrives.
+
+        Yields:
+            A {"raw_text": ...} event, {"delta": ...} events, and a final
+            {"final": ...} event with the corrected sentence.
+        """
+        letters, lattice = self.end_recording()
+        raw_text = ' '.join(letters)
+        yield {'raw_text': raw_text}
+
+        sentence = ""
+        if raw_text:
+            try:
+                for event in self.speculator.finish_stream(letters, lattice):
+                    if 'final' in event:
+                        sentence = event['final']
+                    else:
+                        yield event
+            except Exception as e:
+                logger.error(f"Error generating sentence: {e}")
+                sentence = sentence or raw_text
+
+        self.current_meaningful_sentence = sentence
+        self.prefetcher.prefetch(sentence)
+        logger.info(f"Recording stopped. Raw: '{raw_text}', Processed: '{sentence}'")
+        yield {'final': sentence}
+
+    def expire_buffers(self, current_time: float) -> None:
+        """Drop predictions outside the time window, and hands with none left."""
+        for buffers in (self.stability_buffers, self.candidate_buffers):
+            for hand in list(buffers):
+                buffers[hand] = [
+                    (value, t) for value, t in buffers[hand]
+                    if current_time - t < self.stability_time_window
+                ]
+                if not buffers[hand]:
+                    del buffers[hand]
+
+    def check_sign_stability(self, prediction: str,
+                             candidates: Optional[list[tuple[str, float]]] = None,
+                             hand: str = DEFAULT_HAND) -> tuple[bool, Optional[str]]:
         """Check if a sign prediction is stable over time.
 
         Args:
             prediction: The predicted character.
+            candidates: Optional top-k (character, probability) pairs for
+                this frame, kept for the letter lattice.
+            hand: Track id of the hand the prediction is for.
 
         Returns:
             Tuple of (is_stable, stable_prediction or None)
@@ -212,27 +459,50 @@ class SignLanguageDetector:
         current_time = time.time()
 
         # Remove old predictions outside the time window
-        self.stability_buffer = [
-            (pred, t) for pred, t in self.stability_buffer
-            if current_time - t < STABILITY_TIME_WINDOW
-        ]
+        self.expire_buffers(current_time)
 
         # Add new prediction
-        self.stability_buffer.append((prediction, current_time))
+        stability_buffer = self.stability_buffers.setdefault(hand, [])
+        stability_buffer.append((prediction, current_time))
+        if candidates:
+            self.candidate_buffers.setdefault(hand, []).append((dict(candidates), current_time))
 
         # Check if we have enough predictions and they're all the same
-        if len(self.stability_buffer) >= STABILITY_THRESHOLD:
-            recent_predictions = [pred for pred, _ in self.stability_buffer[-STABILITY_THRESHOLD:]]
+        if len(stability_buffer) >= self.stability_threshold:
+            recent_predictions = [pred for pred, _ in stability_buffer[-self.stability_threshold:]]
             if all(pred == recent_predictions[0] for pred in recent_predictions):
                 return True, recent_predictions[0]
 
         return False, None
 
-    def process_stable_prediction(self, prediction: str) -> None:
+    def is_hand_stable(self, hand: str = DEFAULT_HAND) -> bool:
+        """Whether a hand has a full window of predictions."""
+        return len(self.stability_buffers.get(hand, [])) >= self.stability_threshold
+
+    def update_hands(self, predictions: list[tuple[str, str, list[tuple[str, float]]]]) -> bool:
+        """Feed one frame's predictions, one per tracked hand.
+
+        Each hand fills its own stability buffer, so two hands signing
+        different letters don't keep resetting each other.
+
+        Args:
+            predictions: (track id, character, candidates) per hand.
+
+        Returns:
+            True if any of the hands has a full window of predictions.
+        """
+        for hand, prediction, candidates in predictions:
+            is_stable, stable_pred = self.check_sign_stability(prediction, candidates, hand)
+            if is_stable and stable_pred:
+                self.process_stable_prediction(stable_pred, hand)
+        return any(self.is_hand_stable(hand) for hand, _, _ in predictions)
+
+    def process_stable_prediction(self, prediction: str, hand: str = DEFAULT_HAND) -> None:
         """Process a stable prediction and add to sentence if appropriate.
 
         Args:
             prediction: The stable predicted character.
+            hand: Track id of the hand that made the sign.
         """
         current_time = time.time()
         self.stable_char = prediction
@@ -240,16 +510,54 @@ class SignLanguageDetector:
         # Add to sentence if recording and enough time has passed
         if (self.is_recording and
             prediction != self.last_confirmed_char and
-            current_time - self.last_detection_time >= STABILIZATION_DELAY):
+            current_time - self.last_detection_time >= self.stabilization_delay):
 
             self.detected_sentence.append(prediction)
+            self.letter_lattice.append(self.window_candidates(prediction, hand))
             self.last_confirmed_char = prediction
             self.last_detection_time = current_time
+            self.speculator.update(self.detected_sentence, self.letter_lattice)
             logger.debug(f"Added character: {prediction}, Sentence: {self.detected_sentence}")
 
+    def check_pause(self) -> None:
+        """Correct the pending letters in the background if the signer paused."""
+        if (self.is_recording and self.detected_sentence and
+                time.time() - self.last_detection_time >= SPECULATIVE_PAUSE):
+            self.speculator.on_pause()
 
-# Create global detector instance
-detector = SignLanguageDetector()
+    def window_candidates(self, prediction: str, hand: str = DEFAULT_HAND) -> list[tuple[str, float]]:
+        """Average the candidate probabilities seen in the stability window.
+
+        Args:
+            prediction: The committed character, which is always ranked first.
+            hand: Track id of the hand whose candidates are averaged.
+
+        Returns:
+            Up to LATTICE_TOP_K (character, probability) pairs, best first.
+        """
+        candidate_buffer = self.candidate_buffers.get(hand)
+        if not candidate_buffer:
+            return [(prediction, 1.0)]
+
+        totals: dict[str, float] = {}
+        for probs, _ in candidate_buffer:
+            for char, prob in probs.items():
+                totals[char] = totals.get(char, 0.0) + prob
+
+        count = len(candidate_buffer)
+        ranked = sorted(((c, p / count) for c, p in totals.items() if c != prediction),
+                        key=lambda item: item[1], reverse=True)
+        return [(prediction, totals.get(prediction, 0.0) / count)] + ranked[:LATTICE_TOP_K - 1]
+
+
+# One detector per camera; `detector` is the default camera's
+detectors = {
+    camera.name: SignLanguageDetector(
+        camera.stability_threshold, camera.stability_time_window, camera.stabilization_delay
+    )
+    for camera in CAMERAS
+}
+detector = detectors[DEFAULT_CAMERA]
 
 
 # =============================================================================
@@ -260,11 +568,15 @@ def process_hand_landmarks(hand_landmarks) -> list[float]:
     """Extract normalized feature vector from hand landmarks.
 
     Args:
-        hand_landmarks: MediaPipe hand landmarks object.
+        hand_landmarks: MediaPipe hand landmarks object, or a (21, 3)
+            array of landmark coordinates from the hand detector.
 
     Returns:
         List of normalized x, y coordinates (42 values).
     """
+    if isinstance(hand_landmarks, np.ndarray):
+        return hand_features([hand_landmarks])[0].tolist()
+
     x_coords = [lm.x for lm in hand_landmarks.landmark]
     y_coords = [lm.y for lm in hand_landmarks.landmark]
 
@@ -278,6 +590,28 @@ def process_hand_landmarks(hand_landmarks) -> list[float]:
     return features
 
 
+def hand_features(landmarks: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Extract the feature vectors of several hands at once.
+
+    Args:
+        landmarks: (hands, 21, 2 or 3) array, or a list of (21, 2 or 3)
+            arrays, of landmark coordinates.
+        out: Reusable (rows, 42) float64 buffer; rows must cover the hands.
+
+    Returns:
+        (hands, 42) array of x, y relative to each hand's minimum (a view
+        of out when given).
+    """
+    count = len(landmarks)
+    if out is None or len(out) < count:
+        out = np.empty((count, FEATURE_VECTOR_SIZE), dtype=np.float64)
+    features = out[:count]
+    for row, hand in zip(features.reshape(count, NUM_HAND_LANDMARKS, 2), landmarks):
+        xy = hand[:, :2]
+        np.subtract(xy, xy.min(axis=0), out=row)
+    return features
+
+
 def predict_character(features: list[float]) -> tuple[str, float]:
     """Predict character from feature vector.
 
@@ -287,19 +621,70 @@ def predict_character(features: list[float]) -> tuple[str, float]:
     Returns:
         Tuple of (predicted_character, confidence)
     """
+    predicted_char, confidence, _ = predict_with_candidates(features)
+    return predicted_char, confidence
+
+
+def predict_with_candidates(features: list[float],
+                            top_k: int = LATTICE_TOP_K) -> tuple[str, float, list[tuple[str, float]]]:
+    """Predict a character and its most likely alternatives.
+
+    Uses a single predict_proba call when the model supports it.
+
+    Args:
+        features: Normalized feature vector (42 values).
+        top_k: Number of candidates to return.
+
+    Returns:
+        Tuple of (predicted_character, confidence, candidates) where
+        candidates is a list of (character, probability) pairs, best first.
+    """
     if len(features) != FEATURE_VECTOR_SIZE:
-        return "", 0.0
+        return "", 0.0, []
+    return predict_batch(np.asarray([features], dtype=np.float64), top_k)[0]
 
-    prediction = model.predict([np.asarray(features)])
-    predicted_char = labels_dict[int(prediction[0])]
 
-    # Get confidence if available
-    if hasattr(model, "predict_proba"):
-        confidence = model.predict_proba([np.asarray(features)])[0][int(prediction[0])] * 100
-    else:
-        confidence = 100.0
+@functools.lru_cache(maxsize=4)
+def class_labels(model: Any) -> tuple[str, ...]:
+    """Letter of each predict_proba column of a model."""
+    return tuple(labels_dict[int(label)].upper() for label in model.classes_)
 
-    return predicted_char.upper(), confidence
+
+def predict_batch(features: np.ndarray,
+                  top_k: int = LATTICE_TOP_K) -> list[tuple[str, float, list[tuple[str, float]]]]:
+    """Predict the characters of several hands with one classifier call.
+
+    Args:
+        features: (hands, 42) array of feature vectors.
+        top_k: Number of candidates to return per hand.
+
+    Returns:
+        One (predicted_character, confidence, candidates) tuple per row,
+        as returned by predict_with_candidates.
+    """
+    if not len(features):
+        return []
+
+    model = classifier.get()
+
+    if not hasattr(model, "predict_proba"):
+        results = []
+        for prediction in model.predict(features):
+            predicted_char = labels_dict[int(prediction)].upper()
+            results.append((predicted_char, 100.0, [(predicted_char, 1.0)]))
+        return results
+
+    # Column order follows model.classes_, not the numeric label value
+    probabilities = model.predict_proba(features)
+    orders = np.argsort(probabilities, axis=1)[:, ::-1][:, :max(top_k, 1)]
+    classes = class_labels(model)
+
+    results = []
+    for row, order in zip(probabilities, orders):
+        candidates = [(classes[i], float(row[i])) for i in order]
+        predicted_char, best = candidates[0]
+        results.append((predicted_char, best * 100, candidates))
+    return results
 
 
 def draw_overlays(frame: np.ndarray, stable_char: str,
@@ -356,198 +741,531 @@ def create_error_frame(message: str) -> bytes:
     return buffer.tobytes() if ret else b''
 
 
-def generate_frames() -> Generator[bytes, None, None]:
+def open_frame_source(camera: str = DEFAULT_CAMERA) -> FrameSource:
+    """Open a camera's frame source.
+
+    Args:
+        camera: Camera name.
+
+    Returns:
+        A reader of the camera's capture process ring if CAPTURE_PROCESS
+        is on, otherwise the camera's source opened in this process.
+    """
+    if CAPTURE_PROCESS:
+        capture_process = capture_processes[camera]
+        capture = capture_process.get()
+        if not capture.alive():
+            logger.error(f"Capture process of camera {camera} exited, restarting it")
+            capture.stop()
+            capture_process.reset()
+            capture = capture_process.get()
+        return capture.open_reader()
+    return create_frame_source(pipelines[camera].config.source)
+
+
+def process_frame(camera: str, frame: np.ndarray) -> np.ndarray:
+    """Detect and recognize the signs of every hand in a frame and annotate it.
+
+    Args:
+        camera: Camera name (selects the detector state).
+        frame: BGR frame; drawn on in place.
+
+    Returns:
+        The annotated frame.
+    """
+    import mediapipe as mp
+
+    sign_detector = detectors[camera]
+    gate = presence_gates[camera]
+    hands_found, predictions = [], []
+    # Nothing moved and no hands lately: MediaPipe would find none either
+    if gate.should_detect(frame):
+        with inference_scheduler.turn(camera):
+            # Find hands (on a detection worker unless DETECTION_WORKERS=0),
+            # in full-frame coordinates whatever region was searched
+            try:
+                hands_found = inference_regions[camera].detect(hand_detector.get(), frame)
+            except DetectionError:
+                hands_found = []  # The worker is restarted; keep streaming
+
+            # Every hand in the frame, classified in one call
+            if hands_found:
+                features = hand_features([hand.landmarks for hand in hands_found], out=feature_buffers[camera])
+                predictions = predict_batch(features)
+        gate.update(bool(hands_found))
+
+    tracks = sign_detector.tracker.update(hands_found)
+    height, width = frame.shape[:2]
+    for hand, track, (predicted_char, _, _) in zip(hands_found, tracks, predictions):
+        # Draw hand landmarks, and label the hand below its wrist
+        mp.solutions.drawing_utils.draw_landmarks(
+            frame, hand.to_landmark_list(), mp.solutions.hands.HAND_CONNECTIONS
+        )
+        wrist_x, wrist_y = hand.landmarks[0, :2]
+        cv2.putText(frame, f"{track}: {predicted_char}", (int(wrist_x * width), int(wrist_y * height) + 25),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+
+    if predictions:
+        # Each tracked hand has its own stability buffer
+        is_buffer_stable = sign_detector.update_hands([
+            (track, predicted_char, candidates)
+            for track, (predicted_char, _, candidates) in zip(tracks, predictions)
+        ])
+
+        # Draw overlays
+        frame = draw_overlays(
+            frame,
+            sign_detector.stable_char,
+            sign_detector.detected_sentence,
+            is_buffer_stable
+        )
+
+    sign_detector.check_pause()
+    return frame
+
+
+def encode_frame(frame: np.ndarray) -> Optional[np.ndarray]:
+    """Encode a frame as JPEG (None on failure).
+
+    The encoded buffer is returned as is; the pipeline copies it straight
+    into the multipart part instead of making a bytes copy first.
+    """
+    ret, buffer = cv2.imencode('.jpg', frame)
+    return buffer if ret else None
+
+
+# One processing pipeline per camera, shared by all of its viewers
+pipelines = {
+    camera.name: CameraPipeline(
+        camera,
+        open_source=lambda name=camera.name: open_frame_source(name),
+        process=lambda frame, name=camera.name: process_frame(name, frame),
+        encode=encode_frame,
+        error_frame=create_error_frame
+    )
+    for camera in CAMERAS
+}
+
+
+def generate_frames(camera: str = DEFAULT_CAMERA) -> Generator[bytes, None, None]:
     """Generate video frames with sign language detection.
 
+    Frames come from the camera's pipeline, which runs once however many
+    viewers the camera has.
+
+    Args:
+        camera: Camera name.
+
     Yields:
         JPEG encoded frames for streaming.
     """
-    cap = None
-    consecutive_failures = 0
-    max_failures = 30  # Allow up to 30 consecutive failures before reconnecting
-    reconnect_attempts = 0
-    max_reconnect_attempts = 5
+    # A viewer arriving mid-warm-up waits for it instead of racing it
+    # for the MediaPipe graph
+    warmup.wait(WARMUP_WAIT)
 
-    while reconnect_attempts < max_reconnect_attempts:
-        try:
-            # Try to open camera
-            if cap is None or not cap.isOpened():
-                cap = cv2.VideoCapture(0)
-                if not cap.isOpened():
-                    logger.error("Failed to open camera")
-                    reconnect_attempts += 1
-                    error_frame = create_error_frame(f"Camera not available. Retrying... ({reconnect_attempts}/{max_reconnect_attempts})")
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + error_frame + b'\r\n')
-                    time.sleep(2)
-                    continue
-
-                logger.info("Camera opened successfully")
-                consecutive_failures = 0
-                reconnect_attempts = 0
-
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    consecutive_failures += 1
-                    logger.warning(f"Failed to read frame ({consecutive_failures}/{max_failures})")
-
-                    if consecutive_failures >= max_failures:
-                        logger.error("Too many consecutive frame failures, reconnecting camera...")
-                        if cap is not None:
-                            cap.release()
-                            cap = None
-                        reconnect_attempts += 1
-                        break  # Break inner loop to reconnect
-
-                    # Yield a placeholder frame while waiting
-                    time.sleep(0.1)
-                    continue
-
-                # Reset failure counter on successful read
-                consecutive_failures = 0
-
-                # Convert to RGB for MediaPipe
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = hands.process(frame_rgb)
-
-                # Process detected hands
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        # Draw hand landmarks
-                        mp.solutions.drawing_utils.draw_landmarks(
-                            frame, hand_landmarks, mp_hands.HAND_CONNECTIONS
-                        )
-
-                        # Extract features and predict
-                        features = process_hand_landmarks(hand_landmarks)
-
-                        if len(features) == FEATURE_VECTOR_SIZE:
-                            predicted_char, confidence = predict_character(features)
-
-                            # Check stability
-                            is_stable, stable_pred = detector.check_sign_stability(predicted_char)
-
-                            if is_stable and stable_pred:
-                                detector.process_stable_prediction(stable_pred)
-
-                            # Draw overlays
-                            is_buffer_stable = len(detector.stability_buffer) >= STABILITY_THRESHOLD
-                            frame = draw_overlays(
-                                frame,
-                                detector.stable_char,
-                                detector.detected_sentence,
-                                is_buffer_stable
-                            )
-                            break  # Only process first detected hand
-
-                # Encode and yield frame
-                ret, buffer = cv2.imencode('.jpg', frame)
-                if ret:
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-
-        except GeneratorExit:
-            # Client disconnected, clean up
-            logger.info("Client disconnected from video feed")
-            break
-        except Exception as e:
-            logger.error(f"Error in video processing: {e}")
-            reconnect_attempts += 1
-            if cap is not None:
-                cap.release()
-                cap = None
-            time.sleep(1)
-
-    # Final cleanup
-    if cap is not None:
-        cap.release()
-        logger.info("Camera released")
+    try:
+        hand_detector.get()
+        classifier.get()
+    except Exception as e:
+        error_frame = create_error_frame(f"Detector unavailable: {e}")
+        yield (b'--frame\r\n'
+               b'Content-Type: image/jpeg\r\n\r\n' + error_frame + b'\r\n')
+        return
+
+    # Complete multipart parts, built once per frame for all viewers
+    frames = pipelines[camera].frames_for_viewer()
+    try:
+        yield from frames
+    finally:
+        # Client disconnected
+        frames.close()
+        logger.info(f"Client disconnected from camera {camera}")
 
 
 # =============================================================================
 # FLASK ROUTES
 # =============================================================================
 
-@app.route('/')
+def wants_async() -> bool:
+    """True if the request asked to run as a background job (?async=1)."""
+    return request.args.get('async', '').lower() in ('1', 'true', 'yes')
+
+
+def submit_job(kind: str, fn: Any, *args: Any, priority: int = PRIORITY_NORMAL) -> tuple[Response, int]:
+    """Queue fn as a background job and answer with its ID.
+
+    Args:
+        kind: Operation name used in job metrics.
+        fn: Function returning the JSON result of the job.
+        *args: Arguments for fn.
+        priority: Job priority (PRIORITY_HIGH runs first).
+
+    Returns:
+        202 response with the job ID and status URLs, or 503 if the
+        job queue is full.
+    """
+    try:
+        job = job_queue.submit(kind, fn, *args, priority=priority)
+    except JobQueueFull:
+        return jsonify({
+            'status': 'error',
+            'message': 'Server is busy. Please try again in a moment.'
+        }), 503
+    return jsonify({
+        'status': 'accepted',
+        'job_id': job.id,
+        'status_url': url_for('main.job_status', job_id=job.id),
+        'events_url': url_for('main.job_events', job_id=job.id)
+    }), 202
+
+
+def requested_camera() -> Optional[str]:
+    """The camera named by ?source= (the default camera if absent).
+
+    Returns:
+        The camera name, or None if no such camera is configured.
+    """
+    camera = request.args.get('source') or DEFAULT_CAMERA
+    return camera if camera in detectors else None
+
+
+def unknown_camera() -> tuple[Response, int]:
+    """404 response for a ?source= that names no camera."""
+    return jsonify({'status': 'error', 'message': 'Unknown camera'}), 404
+
+
+@bp.route('/')
 def index():
-    """Serve the main page."""
-    return render_template('index.html')
+    """Serve the main page (?camera= picks the camera of this booth)."""
+    camera = request.args.get('camera') or DEFAULT_CAMERA
+    if camera not in detectors:
+        abort(404)
+    return render_template('index.html', camera=camera)
 
 
-@app.route('/health')
+@bp.route('/health')
 def health():
     """Health check endpoint for Docker/Kubernetes."""
     return jsonify({
         'status': 'healthy',
-        'model_loaded': model is not None,
+        'model_loaded': classifier.loaded,
         'rate_limiting': RATE_LIMITING_ENABLED
     })
 
 
-@app.route('/video_feed')
-def video_feed():
-    """Video streaming endpoint."""
+@bp.route('/ready')
+def ready():
+    """Readiness check: 503 until the warm-up has finished.
+
+    Unlike /health (liveness), this tells the orchestrator when the
+    instance can take traffic without a cold first frame.
+    """
+    status = warmup.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+
+@bp.before_app_request
+def start_warmup() -> None:
+    """Start the warm-up on the first request if no entry point did.
+
+    A failed warm-up is started again once its retry backoff has passed,
+    so polling /ready is enough for the instance to recover.
+    """
+    warmup.start()
+
+
+# Probes are polled by Docker/Kubernetes and must never be rate limited
+if RATE_LIMITING_ENABLED and limiter:
+    health = limiter.exempt(health)
+    ready = limiter.exempt(ready)
+
+
+@bp.route('/metrics')
+def metrics():
+    """Runtime metrics (cache effectiveness) as JSON."""
+    return jsonify({
+        'correction_cache': correction_cache.stats(),
+        'audio_cache': audio_cache.stats(),
+        'speech_prefetch': {name: sign_detector.prefetcher.stats() for name, sign_detector in detectors.items()},
+        'speech_recognition': speech_recognizer.stats(),
+        'jobs': job_queue.stats(),
+        'speculative_correction': {name: sign_detector.speculator.stats() for name, sign_detector in detectors.items()},
+        'circuit_breakers': breaker_stats(),
+        'startup': timing_report(),
+        'warmup': warmup.status(),
+        'hand_detection': hand_detector.peek().stats() if hand_detector.loaded else None,
+        'cameras': {name: pipeline.stats() for name, pipeline in pipelines.items()},
+        'inference_regions': {name: region.stats() for name, region in inference_regions.items()},
+        'presence_gates': {name: gate.stats() for name, gate in presence_gates.items()},
+        'inference_scheduler': inference_scheduler.stats()
+    })
+
+
+@bp.route('/jobs/<job_id>')
+def job_status(job_id: str):
+    """Status, result and timing of a background job."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Unknown or expired job'}), 404
+    return jsonify(job.to_dict())
+
+
+@bp.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id: str):
+    """Cancel a background job that has not started yet."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Unknown or expired job'}), 404
+    return jsonify({'cancelled': job_queue.cancel(job_id), 'state': job.state})
+
+
+@bp.route('/jobs/<job_id>/events')
+def job_events(job_id: str):
+    """Follow a background job as Server-Sent Events.
+
+    Events: "state" whenever the job changes state, then "done" with the
+    finished job (state, result and timing).
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Unknown or expired job'}), 404
+
+    def generate() -> Generator[str, None, None]:
+        state = None
+        while True:
+            if job.state != state:
+                state = job.state
+                name = 'done' if job.finished else 'state'
+                yield f"event: {name}\ndata: {json.dumps(job.to_dict())}\n\n"
+                if job.finished:
+                    return
+            elif job.wait(timeout=JOB_EVENT_KEEPALIVE, since=state) == state:
+                yield ": keep-alive\n\n"
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# Polling is cheap; the endpoints that create jobs are limited instead
+if RATE_LIMITING_ENABLED and limiter:
+    job_status = limiter.exempt(job_status)
+    job_events = limiter.exempt(job_events)
+
+
+@bp.route('/video_feed')
+@bp.route('/video_feed/<source>')
+def video_feed(source: str = DEFAULT_CAMERA):
+    """Video streaming endpoint (the default camera, or the one named)."""
+    if source not in pipelines:
+        return unknown_camera()
     return Response(
-        generate_frames(),
+        generate_frames(source),
         mimetype='multipart/x-mixed-replace; boundary=frame'
     )
 
 
-@app.route('/start_recording', methods=['POST'])
+@bp.route('/cameras')
+def cameras():
+    """Configured cameras with their pipeline statistics."""
+    return jsonify({
+        'default': DEFAULT_CAMERA,
+        'cameras': [
+            {**camera.to_dict(), **pipelines[camera.name].stats()} for camera in CAMERAS
+        ]
+    })
+
+
+@bp.route('/start_recording', methods=['POST'])
 def start_recording():
     """Start recording sign language gestures."""
-    detector.start_recording()
+    camera = requested_camera()
+    if camera is None:
+        return unknown_camera()
+    detectors[camera].start_recording()
     return jsonify({'status': 'success', 'message': 'Recording started'})
 
 
-@app.route('/stop_recording', methods=['POST'])
-def stop_recording_route():
-    """Stop recording and process the detected sentence."""
-    raw_text, meaningful_sentence = detector.stop_recording()
-    return jsonify({
+def stop_recording_result(sign_detector: Optional[SignLanguageDetector] = None) -> dict[str, Any]:
+    """Stop recording and correct the detected sentence.
+
+    Args:
+        sign_detector: Detector of the camera (the default camera's if None).
+    """
+    sign_detector = sign_detector or detector
+    return correction_result(sign_detector, *sign_detector.end_recording())
+
+
+def correction_result(sign_detector: SignLanguageDetector, letters: list[str],
+                      lattice: list[list[tuple[str, float]]]) -> dict[str, Any]:
+    """Correct the sentence of a recording stopped with end_recording().
+
+    Args:
+        sign_detector: Detector the recording was made on.
+        letters: Letters snapshotted when the recording stopped.
+        lattice: Letter lattice snapshotted when the recording stopped.
+    """
+    raw_text, meaningful_sentence = sign_detector.correct_recording(letters, lattice)
+    return {
         'status': 'success',
         'raw_text': raw_text,
         'meaningful_sentence': meaningful_sentence
-    })
+    }
+
+
+@bp.route('/stop_recording', methods=['POST'])
+def stop_recording_route():
+    """Stop recording and process the detected sentence."""
+    camera = requested_camera()
+    if camera is None:
+        return unknown_camera()
+    if wants_async():
+        # Stop now, so frames arriving while the job waits are not
+        # recorded; only the correction is deferred
+        letters, lattice = detectors[camera].end_recording()
+        return submit_job('stop_recording', correction_result, detectors[camera], letters, lattice,
+                          priority=PRIORITY_HIGH)
+    return jsonify(stop_recording_result(detectors[camera]))
+
+
+@bp.route('/stop_recording/stream', methods=['POST'])
+def stop_recording_stream_route():
+    """Stop recording and stream the corrected sentence as Server-Sent Events.
+
+    Events: "raw" with the raw letters, "delta" for each piece of text as
+    the correction is generated, and "done" with the final sentence
+    (which replaces the deltas).
+    """
+    camera = requested_camera()
+    if camera is None:
+        return unknown_camera()
+    sign_detector = detectors[camera]
+
+    def generate() -> Generator[str, None, None]:
+        for event in sign_detector.stop_recording_stream():
+            if 'raw_text' in event:
+                name, data = 'raw', {'raw_text': event['raw_text']}
+            elif 'final' in event:
+                name, data = 'done', {'status': 'success', 'meaningful_sentence': event['final']}
+            else:
+                name, data = 'delta', {'text': event['delta']}
+            yield f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 
 # Apply rate limiting only if available
 if RATE_LIMITING_ENABLED and limiter:
     stop_recording_route = limiter.limit("10 per minute")(stop_recording_route)
+    stop_recording_stream_route = limiter.limit("10 per minute")(stop_recording_stream_route)
 
 
-@app.route('/get_current_prediction')
+@bp.route('/get_current_prediction')
 def get_current_prediction():
     """Get the currently stable character prediction."""
-    return jsonify({'prediction': detector.stable_char})
+    camera = requested_camera()
+    if camera is None:
+        return unknown_camera()
+    return jsonify({'prediction': detectors[camera].stable_char})
 
 
-@app.route('/speak_text', methods=['POST'])
-def speak_text():
-    """Convert the current meaningful sentence to speech."""
+def speak_text_result(text: str, prefetcher: SpeechPrefetcher) -> dict[str, Any]:
+    """Speak text on the server, reporting a browser fallback on failure."""
     try:
-        if detector.current_meaningful_sentence:
-            text_to_speech_and_play(detector.current_meaningful_sentence)
-            logger.info(f"Spoke text: {detector.current_meaningful_sentence}")
-            return jsonify({
-                'status': 'success',
-                'message': 'Audio played successfully'
-            })
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'No text available to speak. Please record some signs first.'
-            })
+        prefetcher.wait_for(text)
+        if not text_to_speech_and_play(text):
+            # ElevenLabs failed, was too slow or is switched off by its
+            # breaker; the browser's own speech synthesis takes over
+            return {
+                'status': 'fallback',
+                'message': 'Speech service unavailable, using browser speech',
+                'text': text
+            }
+        logger.info(f"Spoke text: {text}")
+        return {
+            'status': 'success',
+            'message': 'Audio played successfully'
+        }
     except Exception as e:
         logger.error(f"Error in speak_text: {e}")
-        return jsonify({
+        return {
             'status': 'error',
             'message': f'Failed to play audio: {str(e)}'
+        }
+
+
+@bp.route('/speak_text', methods=['POST'])
+def speak_text():
+    """Convert the current meaningful sentence to speech."""
+    camera = requested_camera()
+    if camera is None:
+        return unknown_camera()
+    sign_detector = detectors[camera]
+    text = sign_detector.current_meaningful_sentence
+    if not text:
+        return jsonify({
+            'status': 'error',
+            'message': 'No text available to speak. Please record some signs first.'
         })
+    if wants_async():
+        return submit_job('speak_text', speak_text_result, text, sign_detector.prefetcher)
+    return jsonify(speak_text_result(text, sign_detector.prefetcher))
 
 
-@app.route('/convert_text', methods=['POST'])
+@bp.route('/speak_text/audio')
+def speak_text_audio():
+    """Send the current meaningful sentence as MP3 for playback in the browser.
+
+    Cached clips are served from disk with Range support; otherwise the
+    audio is forwarded chunk by chunk as ElevenLabs synthesizes it, so
+    playback starts before synthesis finishes.
+    """
+    camera = requested_camera()
+    if camera is None:
+        return unknown_camera()
+    sign_detector = detectors[camera]
+    text = sign_detector.current_meaningful_sentence
+    if not text:
+        return jsonify({
+            'status': 'error',
+            'message': 'No text available to speak. Please record some signs first.'
+        }), 404
+
+    # A prefetch started when the sentence was generated is usually
+    # already done or close to it; reuse it rather than synthesizing twice
+    sign_detector.prefetcher.wait_for(text)
+    path, chunks = stream_speech(text)
+    if path:
+        # The clip stays held in the cache until the response is closed,
+        # so eviction cannot delete it mid-transfer (send_file responses
+        # pass their body through directly, skipping call_on_close)
+        try:
+            response = send_file(path, mimetype='audio/mpeg', conditional=True)
+        except Exception:
+            release_speech(path)
+            raise
+        response.response = ClosingIterator(response.response, lambda: release_speech(path))
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    if chunks is None:
+        return jsonify({
+            'status': 'fallback',
+            'message': 'Speech service unavailable, using browser speech',
+            'text': text
+        }), 503
+
+    return Response(chunks, mimetype='audio/mpeg', headers={
+        'Cache-Control': 'no-store',
+        'Accept-Ranges': 'none'
+    })
+
+
+@bp.route('/convert_text', methods=['POST'])
 def convert_text():
     """Convert input text to sign language images."""
     # Validate request
@@ -581,8 +1299,12 @@ def convert_text():
             'message': 'Please enter English letters only (A-Z).'
         })
 
+    size = parse_image_size(request.json.get('size'))
+
     try:
-        images_data = text_to_sign_language(filtered_text)
+        images_data = text_to_sign_language(
+            filtered_text, size=size, accept=request.headers.get('Accept')
+        )
         logger.info(f"Converted text to sign: {filtered_text}")
         return jsonify({
             'status': 'success',
@@ -602,37 +1324,228 @@ if RATE_LIMITING_ENABLED and limiter:
     convert_text = limiter.limit("10 per minute")(convert_text)
 
 
-@app.route('/convert_speech_to_sign', methods=['POST'])
-def convert_speech_to_sign():
-    """Convert speech input to sign language images."""
-    try:
-        # Convert speech to text
-        logger.info("Starting speech recognition...")
-        text = speech_to_text()
+def iter_bulk_texts() -> Any:
+    """Yield the input texts of a bulk request without buffering the body.
 
-        if text is None:
-            return jsonify({
-                'status': 'error',
-                'message': 'Could not understand speech. Please try again and speak clearly.'
-            })
+    Accepts either an NDJSON body (one JSON string or {"text": ...} object
+    per line, read incrementally from the request stream) or a JSON body
+    with a "texts" list or a "document" string. Documents are split into
+    segments of at most MAX_TEXT_LENGTH characters.
+
+    Yields:
+        Text segments (malformed NDJSON lines and items that are not
+        strings yield an empty string, which is reported as an error
+        segment).
+    """
+    if request.mimetype == 'application/x-ndjson':
+        for line in request.stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError:
+                yield ''
+                continue
+            if isinstance(item, dict):
+                item = item.get('text')
+            yield item if isinstance(item, str) else ''
+        return
+
+    payload = request.get_json(silent=True)
+    if isinstance(payload.get('document'), str):
+        yield from split_text_segments(payload['document'], MAX_TEXT_LENGTH)
+    else:
+        for text in payload['texts']:
+            yield text if isinstance(text, str) else ''
 
-        logger.info(f"Recognized speech: {text}")
 
-        # Convert text to sign language
-        images_data = text_to_sign_language(text)
+def bulk_payload_error() -> Optional[str]:
+    """Check the shape of a JSON bulk request body.
 
+    Returns:
+        An error message, or None if the body has a "document" string or
+        a "texts" list (NDJSON bodies are checked line by line instead).
+    """
+    if request.mimetype == 'application/x-ndjson':
+        return None
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return 'Request body must be a JSON object'
+    if not isinstance(payload.get('document'), str) and not isinstance(payload.get('texts'), list):
+        return 'Request must contain a "texts" list or a "document" string'
+    return None
+
+
+@bp.route('/convert_text/bulk', methods=['POST'])
+def convert_text_bulk():
+    """Convert many texts (or one long document) and stream NDJSON results.
+
+    Query parameters:
+        size: Requested image width in device pixels.
+        images: 'inline' (base64, default) or 'url' (/sign_image links).
+    """
+    if request.mimetype not in ('application/json', 'application/x-ndjson'):
         return jsonify({
-            'status': 'success',
-            'text': text,
-            'images': images_data
-        })
+            'status': 'error',
+            'message': 'Request must be JSON or NDJSON'
+        }), 400
+
+    error = bulk_payload_error()
+    if error:
+        return jsonify({'status': 'error', 'message': error}), 400
+
+    size = parse_image_size(request.args.get('size'))
+    inline = request.args.get('images', 'inline') != 'url'
+    accept = request.headers.get('Accept')
+
+    def generate() -> Generator[str, None, None]:
+        texts = iter_bulk_texts()
+        segments = iter_sign_segments(
+            itertools.islice(texts, BULK_MAX_SEGMENTS),
+            size=size, accept=accept, inline=inline, max_length=MAX_TEXT_LENGTH
+        )
+        count = 0
+        for result in segments:
+            count += 1
+            yield json.dumps(result) + '\n'
+
+        if next(texts, None) is not None:
+            yield json.dumps({
+                'status': 'error',
+                'message': f'Segment limit reached. Maximum {BULK_MAX_SEGMENTS} segments per request.'
+            }) + '\n'
+        logger.info(f"Bulk conversion streamed {count} segments")
 
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+# Bulk requests get their own throughput-oriented limits instead of the defaults
+if RATE_LIMITING_ENABLED and limiter:
+    convert_text_bulk = limiter.limit(BULK_RATE_LIMIT)(convert_text_bulk)
+
+
+def parse_image_size(value: Any) -> Optional[int]:
+    """Parse a requested image width, clamped to a sane range.
+
+    Args:
+        value: Raw size value from the request.
+
+    Returns:
+        Width in pixels, or None if missing or invalid.
+    """
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return None
+    return min(max(size, 1), MAX_IMAGE_SIZE)
+
+
+@bp.route('/sign_image/<letter>')
+def sign_image(letter: str):
+    """Serve a letter image variant sized and encoded for the client."""
+    if len(letter) != 1 or not letter.isalpha() or not letter.isascii():
+        abort(404)
+
+    variant = select_variant(
+        letter,
+        size=parse_image_size(request.args.get('size')),
+        accept=request.headers.get('Accept')
+    )
+    if variant is None:
+        abort(404)
+
+    path, mimetype = variant
+    response = send_file(path, mimetype=mimetype, max_age=IMAGE_CACHE_MAX_AGE, conditional=True)
+    response.vary.add('Accept')
+    return response
+
+
+def speech_to_sign_result(data: bytes) -> tuple[dict[str, Any], int]:
+    """Recognize an uploaded recording and look up the signs for its text.
+
+    Args:
+        data: Recording file contents.
+
+    Returns:
+        Tuple of (JSON result, HTTP status).
+    """
+    try:
+        logger.info(f"Recognizing uploaded audio ({len(data)} bytes)...")
+        text = speech_recognizer.recognize_upload(data, timeout=SPEECH_UPLOAD_TIMEOUT)
+    except AudioDecodeError as e:
+        logger.warning(f"Rejected uploaded audio: {e}")
+        return {
+            'status': 'error',
+            'message': 'Unsupported audio format. Please upload a WAV, AIFF or FLAC recording.'
+        }, 400
+    except SpeechBusyError:
+        return {
+            'status': 'error',
+            'message': 'Speech recognition is busy. Please try again in a moment.'
+        }, 503
+    except FutureTimeoutError:
+        logger.error("Speech recognition timed out")
+        return {
+            'status': 'error',
+            'message': 'Speech recognition timed out. Please try again.'
+        }, 504
     except Exception as e:
         logger.error(f"Error in convert_speech_to_sign: {e}")
-        return jsonify({
+        return {
             'status': 'error',
             'message': f'Speech conversion failed: {str(e)}'
-        })
+        }, 200
+
+    if not text:
+        return {
+            'status': 'error',
+            'message': 'Could not understand speech. Please try again and speak clearly.'
+        }, 200
+
+    logger.info(f"Recognized speech: {text}")
+
+    # Convert text to sign language
+    images_data = text_to_sign_language(text)
+
+    return {
+        'status': 'success',
+        'text': text,
+        'images': images_data
+    }, 200
+
+
+@bp.route('/convert_speech_to_sign', methods=['POST'])
+def convert_speech_to_sign():
+    """Convert a recording uploaded by the browser to sign language images.
+
+    Expects a WAV, AIFF or FLAC file in the "audio" form field.
+    """
+    upload = request.files.get('audio')
+    if upload is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'No audio uploaded. Record your speech in the browser and try again.'
+        }), 400
+
+    data = upload.read(SPEECH_MAX_UPLOAD_BYTES + 1)
+    if len(data) > SPEECH_MAX_UPLOAD_BYTES:
+        return jsonify({
+            'status': 'error',
+            'message': f'Recording too large. Maximum size is {SPEECH_MAX_UPLOAD_BYTES // (1024 * 1024)} MB.'
+        }), 413
+
+    if wants_async():
+        # The job result carries the same JSON; its HTTP status is dropped
+        return submit_job('speech_to_sign', lambda: speech_to_sign_result(data)[0])
+
+    result, status = speech_to_sign_result(data)
+    return jsonify(result), status
+
+
+# Apply rate limiting if available
+if RATE_LIMITING_ENABLED and limiter:
+    convert_speech_to_sign = limiter.limit("10 per minute")(convert_speech_to_sign)
 
 
 # =============================================================================
@@ -641,10 +1554,21 @@ def convert_speech_to_sign():
 
 def cleanup() -> None:
     """Clean up resources on shutdown."""
-    global hands
+    for pipeline in pipelines.values():
+        pipeline.stop()
+    for sign_detector in detectors.values():
+        sign_detector.speculator.shutdown()
+        sign_detector.prefetcher.shutdown()
+    speech_recognizer.shutdown()
+    job_queue.shutdown()
     try:
-        if hands:
-            hands.close()
+        for capture_process in capture_processes.values():
+            capture = capture_process.peek()
+            if capture:
+                capture.stop()
+        hand_detection = hand_detector.peek()
+        if hand_detection:
+            hand_detection.shutdown()
             logger.info("MediaPipe hands closed")
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
@@ -663,6 +1587,56 @@ signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
 
+# =============================================================================
+# APPLICATION FACTORY
+# =============================================================================
+
+def create_app(config: Optional[dict[str, Any]] = None, eager: bool = False) -> Flask:
+    """Create the Flask application.
+
+    The warm-up is not started here, so importing app.py (benchmarks,
+    tools) loads nothing: the server entry points start it (__main__
+    below, post_worker_init in gunicorn.conf.py), and otherwise the first
+    request does.
+
+    Args:
+        config: Optional Flask configuration overrides.
+        eager: Initialize the API clients and run the warm-up now
+            (fails fast if a component is broken).
+
+    Returns:
+        Configured Flask application.
+    """
+    start = time.perf_counter()
+    flask_app = Flask(__name__)
+    if config:
+        flask_app.config.update(config)
+
+    flask_app.register_blueprint(bp)
+    if RATE_LIMITING_ENABLED and limiter:
+        limiter.init_app(flask_app)
+
+    if eager:
+        from functions.text_fix import get_client
+        from functions.voice import get_session
+
+        get_client()
+        get_session()
+        if not warmup.run():
+            raise RuntimeError(f"Warm-up failed: {warmup.error}")
+
+    record_timing('init:create_app', time.perf_counter() - start)
+    log_timing_report()
+    return flask_app
+
+
+# Imports not covered by a timed block above
+record_remainder('import:app', _IMPORT_START)
+
+# Module-level application for gunicorn (app:app) and the test suite
+app = create_app()
+
+
 # =============================================================================
 # MAIN ENTRY POINT
 # =============================================================================
@@ -673,7 +1647,9 @@ if __name__ == '__main__':
     logger.info(f"Stability threshold: {STABILITY_THRESHOLD}")
     logger.info(f"Stabilization delay: {STABILIZATION_DELAY}s")
 
+    warmup.start()
+
     # Run the Flask app
     # Note: debug=True is for development only
     # For production, use a WSGI server like gunicorn
-    app.run(debug=False, threaded=True)
+    app.run(debug=False, threaded=True, port=int(os.getenv('PORT', '5000')))
@@ -0,0 +1,239 @@
+"""
+Audio Cache Module
+
+This module stores synthesized speech on disk, addressed by a hash of
+everything that determines the audio (text, voice and voice settings).
+Repeated phrases are served from disk without an API call. Files are
+written under a temporary name and renamed into place, so concurrent
+requests never see a partial clip, and the total size is bounded with
+least-recently-used eviction. Clips still being sent to a client are
+held and skipped by eviction until they are released.
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSION = '.mp3'
+
+
+class AudioCache:
+    """Size-bounded, content-addressed LRU cache of audio files."""
+
+    def __init__(self, directory: str, max_bytes: int = 200 * 1024 * 1024) -> None:
+        """Initialize the cache.
+
+        The directory is created and any clips already on disk are
+        indexed on first use, not here.
+
+        Args:
+            directory: Directory holding the cached clips.
+            max_bytes: Total size kept on disk (0 disables caching).
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._held: dict[str, int] = {}
+        self._total_bytes = 0
+        self._loaded = False
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(text: str, voice_id: str, stability: float, similarity_boost: float) -> str:
+        """Build the content address of a clip.
+
+        Args:
+            text: Text that was synthesized (whitespace-normalized).
+            voice_id: Provider voice ID.
+            stability: Voice stability setting.
+            similarity_boost: Voice similarity boost setting.
+
+        Returns:
+            Hex digest identifying the clip.
+        """
+        raw = f"{voice_id}\x00{stability:.3f}\x00{similarity_boost:.3f}\x00{' '.join(text.split())}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        """File path where the clip for key is (or would be) stored."""
+        return os.path.join(self.directory, key + AUDIO_EXTENSION)
+
+    def _load(self) -> None:
+        """Index the clips on disk on first use (called with the lock held)."""
+        if not self._loaded:
+            self._loaded = True
+            if self.enabled:
+                self._scan()
+
+    def _scan(self) -> None:
+        """Index existing clips, oldest access first."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            files = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(AUDIO_EXTENSION):
+                    continue
+                stat = os.stat(os.path.join(self.directory, name))
+                files.append((stat.st_mtime, name[:-len(AUDIO_EXTENSION)], stat.st_size))
+        except OSError as e:
+            logger.error(f"Failed to read audio cache at {self.directory}: {e}")
+            return
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+        logger.info(f"Audio cache at {self.directory}: {len(self._entries)} clips, {self._total_bytes} bytes")
+
+    def _evict(self) -> None:
+        """Remove least recently used clips until under max_bytes (lock held).
+
+        Held clips are skipped, so the cache can exceed max_bytes until
+        they are released.
+        """
+        for key in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if key in self._held:
+                continue
+            self._total_bytes -= self._entries.pop(key)
+            self.evictions += 1
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+
+    def get(self, key: str, hold: bool = False) -> Optional[str]:
+        """Return the path of a cached clip, or None on a miss.
+
+        Args:
+            key: Key returned by make_key.
+            hold: Keep the clip from being evicted until release(path),
+                e.g. while it is sent to a client.
+
+        Returns:
+            Path to the clip.
+        """
+        with self._lock:
+            self._load()
+            if key in self._entries:
+                path = self.path_for(key)
+                if os.path.exists(path):
+                    self._entries.move_to_end(key)
+                    try:
+                        os.utime(path)  # Keeps LRU order across restarts
+                    except OSError:
+                        pass
+                    if hold:
+                        self._held[key] = self._held.get(key, 0) + 1
+                    self.hits += 1
+                    return path
+                self._total_bytes -= self._entries.pop(key)
+            self.misses += 1
+            return None
+
+    def release(self, path: str) -> None:
+        """Let a clip returned by get(key, hold=True) be evicted again.
+
+        Args:
+            path: Path returned by get().
+        """
+        key = os.path.basename(path)[:-len(AUDIO_EXTENSION)]
+        with self._lock:
+            count = self._held.get(key, 0) - 1
+            if count > 0:
+                self._held[key] = count
+            else:
+                self._held.pop(key, None)
+                self._evict()
+
+    def put(self, key: str, data: bytes, hold: bool = False) -> Optional[str]:
+        """Store a clip atomically.
+
+        Args:
+            key: Key returned by make_key.
+            data: Audio bytes.
+            hold: Keep the stored clip from being evicted until
+                release(path), as with get().
+
+        Returns:
+            Path to the stored clip, or None if caching is disabled or the
+            clip is larger than the whole cache.
+        """
+        if not self.enabled or len(data) > self.max_bytes:
+            return None
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            path = self.path_for(key)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Failed to write audio cache entry: {e}")
+            return None
+
+        with self._lock:
+            self._load()
+            if key in self._entries:
+                self._total_bytes -= self._entries[key]
+            self._entries[key] = len(data)
+            self._entries.move_to_end(key)
+            self._total_bytes += len(data)
+            self.stores += 1
+            self._evict()
+            if key not in self._entries:
+                return None
+            if hold:
+                self._held[key] = self._held.get(key, 0) + 1
+            return path
+
+    def clear(self) -> None:
+        """Delete every cached clip."""
+        with self._lock:
+            self._load()
+            for key in list(self._entries):
+                try:
+                    os.remove(self.path_for(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters and the cache size (0 before first use).
+
+        Returns:
+            Dictionary of cache metrics.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'held': len(self._held),
+            }
@@ -0,0 +1,453 @@
+"""
+Cameras Module
+
+This module runs one processing pipeline per configured camera. Each
+pipeline is a thread that reads its camera, runs detection and
+recognition on every frame, and publishes the annotated JPEG to
+everyone watching that camera. A camera costs one inference stream no
+matter how many viewers it has, and cameras share the hand detection
+pool and the classifier through a fair scheduler. Each frame is
+published as a complete multipart part, built once in a reusable buffer
+and shared by every viewer.
+
+CAMERA_SOURCES lists the cameras as comma-separated name=source pairs,
+e.g. "front=0,side=v4l2:/dev/video2,demo=synthetic" (sources as in
+frame_source.py). Without it there is one camera, "default", reading
+CAMERA_SOURCE. Stabilization settings can be overridden per camera with
+CAMERA_<NAME>_STABILITY_THRESHOLD, CAMERA_<NAME>_STABILITY_TIME_WINDOW
+and CAMERA_<NAME>_STABILIZATION_DELAY.
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+try:
+    from functions.frame_source import FrameSource, CAMERA_SOURCE
+except ImportError:
+    from frame_source import FrameSource, CAMERA_SOURCE
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CAMERA_SOURCES = os.getenv('CAMERA_SOURCES', '')
+# Seconds a pipeline keeps running after its last viewer left
+PIPELINE_IDLE_TIMEOUT = float(os.getenv('PIPELINE_IDLE_TIMEOUT', '10.0'))
+# Frames kept for the FPS and latency figures
+METRICS_WINDOW = 300
+
+CAMERA_NAME = re.compile(r'^[a-z0-9_-]+$')
+
+# multipart/x-mixed-replace framing of each JPEG (boundary "frame")
+PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+PART_TRAILER = b'\r\n'
+
+
+class CameraConfig:
+    """Source and stabilization settings of one camera."""
+
+    def __init__(self, name: str, source: str, stability_threshold: int,
+                 stability_time_window: float, stabilization_delay: float) -> None:
+        """Initialize the configuration.
+
+        Args:
+            name: Camera name used in URLs (/video_feed/<name>).
+            source: Frame source specification.
+            stability_threshold: Identical predictions needed for a letter.
+            stability_time_window: Seconds predictions count towards it.
+            stabilization_delay: Seconds before the next letter is accepted.
+        """
+        self.name = name
+        self.source = source
+        self.stability_threshold = stability_threshold
+        self.stability_time_window = stability_time_window
+        self.stabilization_delay = stabilization_delay
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'name': self.name,
+            'source': self.source,
+            'stability_threshold': self.stability_threshold,
+            'stability_time_window': self.stability_time_window,
+            'stabilization_delay': self.stabilization_delay,
+        }
+
+
+def parse_camera_sources(value: str, default_source: str = CAMERA_SOURCE,
+                         stability_threshold: int = 5, stability_time_window: float = 1.0,
+                         stabilization_delay: float = 2.0,
+                         environ: Optional[dict[str, str]] = None) -> list[CameraConfig]:
+    """Parse CAMERA_SOURCES into camera configurations.
+
+    Args:
+        value: Comma-separated name=source pairs; a bare source is named
+            camN. Empty means one "default" camera on default_source.
+        default_source: Source of the default camera.
+        stability_threshold: Default for cameras without an override.
+        stability_time_window: Default for cameras without an override.
+        stabilization_delay: Default for cameras without an override.
+        environ: Environment holding per-camera overrides (os.environ).
+
+    Returns:
+        The cameras, in configuration order.
+
+    Raises:
+        ValueError: On a bad or duplicate camera name, or a bad override.
+    """
+    environ = os.environ if environ is None else environ
+    entries = [entry.strip() for entry in value.split(',') if entry.strip()]
+    if not entries:
+        entries = [f'default={default_source}']
+
+    cameras = []
+    for i, entry in enumerate(entries):
+        name, sep, source = entry.partition('=')
+        if not sep:
+            name, source = f'cam{i}', entry
+        name = name.strip().lower()
+        if not CAMERA_NAME.match(name):
+            raise ValueError(f"Bad camera name '{name}' (use letters, digits, _ and -)")
+        if any(camera.name == name for camera in cameras):
+            raise ValueError(f"Camera '{name}' is configured twice")
+
+        prefix = f"CAMERA_{name.upper().replace('-', '_')}_"
+        try:
+            cameras.append(CameraConfig(
+                name, source.strip(),
+                int(environ.get(prefix + 'STABILITY_THRESHOLD', stability_threshold)),
+                float(environ.get(prefix + 'STABILITY_TIME_WINDOW', stability_time_window)),
+                float(environ.get(prefix + 'STABILIZATION_DELAY', stabilization_delay)),
+            ))
+        except ValueError as e:
+            raise ValueError(f"Bad stabilization setting for camera '{name}': {e}") from e
+    return cameras
+
+
+class FairScheduler:
+    """Hands out inference turns to cameras in round-robin order.
+
+    At most `slots` turns run at once (the detection pool size). When
+    cameras are waiting, the one served least recently goes next, so a
+    faster camera cannot crowd out a slower one.
+    """
+
+    def __init__(self, slots: int = 1) -> None:
+        self.slots = max(slots, 1)
+        self._cond = threading.Condition()
+        self._busy = 0
+        self._waiting: list[tuple[str, int]] = []
+        self._tickets = 0
+        self._last_served: dict[str, float] = {}
+        self.turns: dict[str, int] = {}
+        self.wait_seconds: dict[str, float] = {}
+
+    def _next(self) -> tuple[str, int]:
+        """The waiting ticket to serve next (lock held)."""
+        return min(self._waiting, key=lambda ticket: (self._last_served.get(ticket[0], 0.0), ticket[1]))
+
+    @contextmanager
+    def turn(self, camera: str) -> Iterator[None]:
+        """Wait for this camera's turn, and hold it for the with block."""
+        start = time.perf_counter()
+        with self._cond:
+            self._tickets += 1
+            ticket = (camera, self._tickets)
+            self._waiting.append(ticket)
+            self._cond.wait_for(lambda: self._busy < self.slots and self._next() == ticket)
+            self._waiting.remove(ticket)
+            self._busy += 1
+            self._last_served[camera] = time.monotonic()
+            self.turns[camera] = self.turns.get(camera, 0) + 1
+            self.wait_seconds[camera] = self.wait_seconds.get(camera, 0.0) + time.perf_counter() - start
+            # Another slot may be free for the next waiter
+            self._cond.notify_all()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._busy -= 1
+                self._cond.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                'slots': self.slots,
+                'busy': self._busy,
+                'waiting': len(self._waiting),
+                'turns': dict(self.turns),
+                'mean_wait_ms': {
+                    camera: round(self.wait_seconds[camera] / count * 1000, 2)
+                    for camera, count in self.turns.items() if count
+                },
+            }
+
+
+class FramePartWriter:
+    """Wraps JPEGs into multipart parts in one reusable buffer.
+
+    The header is written once; each frame only copies its JPEG in after
+    it and the trailer behind it, then takes one bytes copy of the part
+    (which viewers may still be sending when the next frame is built).
+    """
+
+    def __init__(self, capacity: int = 256 * 1024) -> None:
+        self._buffer = bytearray()
+        self._view = memoryview(self._buffer)
+        self._grow(capacity)
+
+    def _grow(self, capacity: int) -> None:
+        self._view.release()
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._view[:len(PART_HEADER)] = PART_HEADER
+
+    def part(self, jpeg: ArrayLike) -> bytes:
+        """Return the multipart part of a JPEG (bytes or a uint8 array)."""
+        data = memoryview(jpeg).cast('B')
+        start = len(PART_HEADER)
+        end = start + data.nbytes
+        size = end + len(PART_TRAILER)
+        if size > len(self._buffer):
+            self._grow(max(size, len(self._buffer) * 2))
+        self._view[start:end] = data
+        self._view[end:size] = PART_TRAILER
+        return self._view[:size].tobytes()
+
+
+class CameraPipeline:
+    """Reads one camera, processes every frame and serves it to viewers."""
+
+    def __init__(self, config: CameraConfig, open_source: Callable[[], FrameSource],
+                 process: Callable[[np.ndarray], np.ndarray],
+                 encode: Callable[[np.ndarray], Optional[ArrayLike]],
+                 error_frame: Callable[[str], bytes],
+                 idle_timeout: float = PIPELINE_IDLE_TIMEOUT) -> None:
+        """Initialize the pipeline (it starts with its first viewer).
+
+        Args:
+            config: The camera's configuration.
+            open_source: Opens the camera's frame source.
+            process: Runs detection and recognition on a frame and returns
+                the annotated frame.
+            encode: Encodes a frame as JPEG (bytes or a uint8 array, None
+                on failure).
+            error_frame: Renders a message as a JPEG frame.
+            idle_timeout: Seconds to keep running without viewers.
+        """
+        self.config = config
+        self.name = config.name
+        self.open_source = open_source
+        self.process = process
+        self.encode = encode
+        self.error_frame = error_frame
+        self.idle_timeout = idle_timeout
+
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.viewers = 0
+        self._idle_since: Optional[float] = None
+        self.sequence = 0
+        self.part: Optional[bytes] = None
+        self._parts = FramePartWriter()
+
+        self.frames = 0
+        self.read_failures = 0
+        self.reconnects = 0
+        self._frame_times: deque = deque(maxlen=METRICS_WINDOW)
+        self._latencies: deque = deque(maxlen=METRICS_WINDOW)
+        self._processing: deque = deque(maxlen=METRICS_WINDOW)
+
+    # --- viewers ---
+
+    def subscribe(self) -> None:
+        """Register a viewer, starting the pipeline if it is not running."""
+        with self._cond:
+            self.viewers += 1
+            self._idle_since = None
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(
+                    target=self._run, name=f'camera-{self.name}', daemon=True
+                )
+                self._thread.start()
+
+    def unsubscribe(self) -> None:
+        with self._cond:
+            self.viewers = max(self.viewers - 1, 0)
+            if not self.viewers:
+                self._idle_since = time.monotonic()
+
+    def wait_frame(self, after: int, timeout: float = 5.0) -> tuple[int, Optional[bytes]]:
+        """Wait for a frame newer than `after`.
+
+        Returns:
+            (sequence, multipart part); the part is None if none came in time.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.sequence > after, timeout)
+            if self.sequence > after:
+                return self.sequence, self.part
+            return after, None
+
+    def frames_for_viewer(self) -> Iterator[bytes]:
+        """Yield each new frame of this camera, as a multipart part, until the viewer leaves."""
+        self.subscribe()
+        try:
+            sequence = 0
+            while not self._stopping:
+                sequence, part = self.wait_frame(sequence)
+                if part is not None:
+                    yield part
+        finally:
+            self.unsubscribe()
+
+    def _publish(self, jpeg: ArrayLike) -> None:
+        part = self._parts.part(jpeg)
+        with self._cond:
+            self.sequence += 1
+            self.part = part
+            self._cond.notify_all()
+
+    def render(self, frame: np.ndarray) -> bool:
+        """Process, encode and publish one frame.
+
+        Returns:
+            False if the frame could not be encoded.
+        """
+        jpeg = self.encode(self.process(frame))
+        if jpeg is None:
+            return False
+        self._publish(jpeg)
+        return True
+
+    def _should_exit(self) -> bool:
+        """True if stopped or without viewers for idle_timeout.
+
+        The thread is forgotten under the same lock, so a viewer arriving
+        now starts a new one instead of waiting on this one.
+        """
+        with self._cond:
+            idle = (not self.viewers and self._idle_since is not None
+                    and time.monotonic() - self._idle_since >= self.idle_timeout)
+            if self._stopping or idle:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                return True
+            return False
+
+    # --- processing ---
+
+    def _run(self) -> None:
+        cap = None
+        consecutive_failures = 0
+        max_failures = 30  # Allow up to 30 consecutive failures before reconnecting
+        reconnect_attempts = 0
+        logger.info(f"Camera {self.name} pipeline started")
+
+        try:
+            while not self._should_exit():
+                try:
+                    if cap is None or not cap.isOpened():
+                        if cap is not None:
+                            cap.release()
+                        cap = self.open_source()
+                        if not cap.isOpened():
+                            reconnect_attempts += 1
+                            logger.error(f"Failed to open camera {self.name} ({self.config.source})")
+                            self._publish(self.error_frame(
+                                f"Camera not available. Retrying... ({reconnect_attempts})"
+                            ))
+                            time.sleep(2)
+                            continue
+                        logger.info(f"Camera {self.name}: source {cap.name} opened successfully")
+                        consecutive_failures = 0
+                        reconnect_attempts = 0
+
+                    ok, frame = cap.read()
+                    captured_at = time.time()
+                    if not ok:
+                        consecutive_failures += 1
+                        self.read_failures += 1
+                        if consecutive_failures >= max_failures:
+                            logger.error(f"Camera {self.name}: too many consecutive frame failures, reconnecting...")
+                            cap.release()
+                            cap = None
+                            self.reconnects += 1
+                        time.sleep(0.1)
+                        continue
+                    consecutive_failures = 0
+
+                    # Ring sources know when the frame was actually captured
+                    latency = getattr(cap, 'last_latency', None)
+                    if latency is not None:
+                        captured_at = time.time() - latency
+
+                    start = time.perf_counter()
+                    if self.render(frame):
+                        self._record(captured_at, time.perf_counter() - start)
+                except Exception as e:
+                    logger.error(f"Error in camera {self.name} pipeline: {e}")
+                    if cap is not None:
+                        cap.release()
+                        cap = None
+                    time.sleep(1)
+        finally:
+            if cap is not None:
+                cap.release()
+            logger.info(f"Camera {self.name} pipeline stopped")
+
+    def _record(self, captured_at: float, processed: float) -> None:
+        now = time.time()
+        with self._cond:
+            self.frames += 1
+            self._frame_times.append(now)
+            self._latencies.append(now - captured_at)
+            self._processing.append(processed)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the pipeline thread and release the camera."""
+        with self._cond:
+            self._stopping = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        """Return frame rate, latency and viewer figures over recent frames."""
+        with self._cond:
+            times = list(self._frame_times)
+            latencies = sorted(self._latencies)
+            processing = list(self._processing)
+            running = self._thread is not None and self._thread.is_alive()
+            viewers = self.viewers
+
+        def percentile(values: list[float], p: float) -> Optional[float]:
+            if not values:
+                return None
+            return round(values[min(int(p / 100 * len(values)), len(values) - 1)] * 1000, 1)
+
+        fps = 0.0
+        if len(times) > 1 and times[-1] > times[0]:
+            fps = (len(times) - 1) / (times[-1] - times[0])
+        return {
+            'source': self.config.source,
+            'running': running,
+            'viewers': viewers,
+            'frames': self.frames,
+            'fps': round(fps, 1),
+            'latency_p50_ms': percentile(latencies, 50),
+            'latency_p95_ms': percentile(latencies, 95),
+            'mean_processing_ms': round(sum(processing) / len(processing) * 1000, 1) if processing else None,
+            'read_failures': self.read_failures,
+            'reconnects': self.reconnects,
+        }
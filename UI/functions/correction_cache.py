@@ -0,0 +1,248 @@
+"""
+Correction Cache Module
+
+This module provides a two-tier cache for text corrections: an
+in-memory LRU in front of an on-disk SQLite store. Entries are keyed
+by the normalized input, the model name and a hash of the prompt, so
+changing either invalidates old results automatically.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def normalize_input(text: str) -> str:
+    """Normalize raw fingerspelled text for use in a cache key.
+
+    Args:
+        text: Raw text such as "h e l l o ".
+
+    Returns:
+        Uppercased text with whitespace collapsed ("H E L L O").
+    """
+    return ' '.join(text.upper().split())
+
+
+def prompt_hash(prompt: str) -> str:
+    """Return a short stable hash identifying a prompt variant."""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
+
+
+class CorrectionCache:
+    """Two-tier (memory + SQLite) LRU cache with TTL expiry.
+
+    All methods are thread-safe. The SQLite file is opened on first use,
+    so creating a cache is cheap.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_memory_entries: int = 1024,
+        max_disk_entries: int = 50000,
+        ttl: float = 30 * 24 * 3600
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file. None keeps the cache in memory only.
+            max_memory_entries: Size of the in-memory LRU tier.
+            max_disk_entries: Maximum rows kept in the SQLite tier.
+            ttl: Time-to-live of an entry in seconds (0 = never expire).
+        """
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_count = 0
+        self._disk_failed = False
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(text: str, model: str, prompt: str) -> str:
+        """Build a cache key from the input, model and prompt.
+
+        Args:
+            text: Raw input text.
+            model: Model name used for the correction.
+            prompt: Full system prompt (or a variant identifier).
+
+        Returns:
+            Hex digest identifying the request.
+        """
+        raw = f"{model}\x00{prompt_hash(prompt)}\x00{normalize_input(text)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite store on first use (called with the lock held)."""
+        if self._conn is not None or self.path is None or self._disk_failed:
+            return self._conn
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS corrections ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON corrections(accessed)")
+            conn.commit()
+            self._disk_count = conn.execute("SELECT COUNT(*) FROM corrections").fetchone()[0]
+            self._conn = conn
+            logger.info(f"Correction cache opened at {self.path} ({self._disk_count} entries)")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open correction cache at {self.path}: {e}")
+            self._disk_failed = True
+
+        return self._conn
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl > 0 and now - created > self.ttl
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        """Insert into the memory tier, evicting the least recently used entry."""
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached correction.
+
+        Args:
+            key: Key returned by make_key.
+
+        Returns:
+            The cached correction, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+                self.expirations += 1
+
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    row = conn.execute(
+                        "SELECT value, created FROM corrections WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        value, created = row
+                        if not self._expired(created, now):
+                            conn.execute("UPDATE corrections SET accessed = ? WHERE key = ?", (now, key))
+                            conn.commit()
+                            self._remember(key, value, created)
+                            self.disk_hits += 1
+                            return value
+                        conn.execute("DELETE FROM corrections WHERE key = ?", (key,))
+                        conn.commit()
+                        self._disk_count -= 1
+                        self.expirations += 1
+                except sqlite3.Error as e:
+                    logger.error(f"Correction cache read failed: {e}")
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a correction in both tiers.
+
+        Args:
+            key: Key returned by make_key.
+            value: Corrected text.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self.sets += 1
+
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                exists = conn.execute("SELECT 1 FROM corrections WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO corrections (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now)
+                )
+                if not exists:
+                    self._disk_count += 1
+                if self._disk_count > self.max_disk_entries:
+                    excess = self._disk_count - self.max_disk_entries
+                    conn.execute(
+                        "DELETE FROM corrections WHERE key IN "
+                        "(SELECT key FROM corrections ORDER BY accessed LIMIT ?)", (excess,)
+                    )
+                    self._disk_count -= excess
+                    self.evictions += excess
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Correction cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM corrections")
+                conn.commit()
+                self._disk_count = 0
+
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters and tier sizes.
+
+        Returns:
+            Dictionary of cache metrics.
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_entries': len(self._memory),
+                'disk_entries': self._disk_count,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'sets': self.sets,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,440 @@
+"""
+Frame Ring Module
+
+This module moves camera frames between processes through a ring buffer
+in shared memory, so capture and inference can run in different
+processes without pickling every frame. A capture process writes each
+frame into the next slot of the ring; readers in any process map the
+same memory and get the newest frame as a NumPy view, without a copy.
+
+Each slot carries the sequence number of the frame it holds. The writer
+clears it while overwriting the slot, so a reader can tell afterwards
+whether the frame it used was overwritten underneath it (a seqlock).
+Readers never block the writer: a reader that falls behind skips to the
+newest frame, which is what a live video feed wants.
+
+Run a capture process by hand and point the app at it with
+CAMERA_SOURCE=shm:<name>:
+
+    python UI/functions/frame_ring.py --source 0 --name signcam
+
+or set CAPTURE_PROCESS=true to have the app start one itself.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import subprocess
+from multiprocessing import shared_memory
+from typing import Optional
+
+import cv2
+import numpy as np
+
+try:
+    from functions.frame_source import FrameSource, create_frame_source
+except ImportError:
+    from frame_source import FrameSource, create_frame_source
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Ring settings
+FRAME_RING_SLOTS = int(os.getenv('FRAME_RING_SLOTS', '4'))
+CAPTURE_WIDTH = int(os.getenv('CAPTURE_WIDTH', '640'))
+CAPTURE_HEIGHT = int(os.getenv('CAPTURE_HEIGHT', '480'))
+FRAME_WAIT_TIMEOUT = 1.0    # Seconds read() waits for a new frame
+POLL_INTERVAL = 0.002       # Seconds between checks for a new frame
+
+_MAGIC = 0x5349474E52494E47  # "SIGNRING"
+# Header fields (int64): magic, height, width, channels, slots, latest
+# sequence number, closed flag, writer pid
+_HEIGHT, _WIDTH, _CHANNELS, _SLOTS, _LATEST, _CLOSED, _PID = range(1, 8)
+_FIELDS = 8
+
+
+def _header_bytes(slots: int) -> int:
+    """Size of the header: fields, slot sequence numbers and timestamps."""
+    size = (_FIELDS + 2 * slots) * 8
+    return (size + 63) // 64 * 64
+
+
+class FrameRing:
+    """A fixed-size ring of frames in shared memory."""
+
+    def __init__(self, name: Optional[str] = None, shape: Optional[tuple[int, int, int]] = None,
+                 slots: int = FRAME_RING_SLOTS, create: bool = False) -> None:
+        """Create a ring or attach to an existing one.
+
+        Args:
+            name: Shared memory name; a random one is chosen when creating
+                without a name.
+            shape: (height, width, channels) of every frame; required when
+                creating, read from the ring when attaching.
+            slots: Frames held when creating; a reader lagging more than
+                slots - 1 frames behind skips ahead.
+            create: Create the ring (the creator unlinks it on close).
+
+        Raises:
+            FileNotFoundError: If attaching and no ring has this name.
+            ValueError: If creating without a shape, or attaching to
+                memory that is not a frame ring.
+        """
+        self.owner = create
+        if create:
+            if shape is None:
+                raise ValueError("A frame shape is needed to create a ring")
+            if slots < 2:
+                raise ValueError("A ring needs at least 2 slots")
+            frame_bytes = int(np.prod(shape))
+            self.shm = shared_memory.SharedMemory(
+                name=name, create=True, size=_header_bytes(slots) + slots * frame_bytes
+            )
+        else:
+            self.shm = _attach(name)
+
+        header = np.ndarray((_FIELDS,), dtype=np.int64, buffer=self.shm.buf)
+        if create:
+            header[:] = 0
+            header[_HEIGHT], header[_WIDTH], header[_CHANNELS] = shape
+            header[_SLOTS] = slots
+            header[_PID] = os.getpid()
+            header[0] = _MAGIC
+        elif header[0] != _MAGIC:
+            del header
+            self.shm.close()
+            raise ValueError(f"Shared memory '{name}' is not a frame ring")
+
+        self.name = self.shm.name
+        self.shape = (int(header[_HEIGHT]), int(header[_WIDTH]), int(header[_CHANNELS]))
+        self.slots = int(header[_SLOTS])
+        self._header = header
+        self._sequences = np.ndarray((self.slots,), dtype=np.int64, buffer=self.shm.buf,
+                                     offset=_FIELDS * 8)
+        self._timestamps = np.ndarray((self.slots,), dtype=np.float64, buffer=self.shm.buf,
+                                      offset=(_FIELDS + self.slots) * 8)
+        self._frames = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf,
+                                  offset=_header_bytes(self.slots))
+
+    # --- writer ---
+
+    def begin_write(self) -> np.ndarray:
+        """Return the slot the next frame goes into, marked as being written.
+
+        Fill it in place (e.g. cv2.resize(..., dst=slot)) and call
+        end_write(); readers skip the slot until then.
+        """
+        sequence = int(self._header[_LATEST]) + 1
+        index = (sequence - 1) % self.slots
+        self._sequences[index] = 0
+        return self._frames[index]
+
+    def end_write(self, timestamp: Optional[float] = None) -> int:
+        """Publish the slot returned by begin_write().
+
+        Args:
+            timestamp: Capture time (time.time()); defaults to now.
+
+        Returns:
+            The frame's sequence number.
+        """
+        sequence = int(self._header[_LATEST]) + 1
+        index = (sequence - 1) % self.slots
+        self._timestamps[index] = time.time() if timestamp is None else timestamp
+        # Slot first, then the ring's newest frame: a reader that sees the
+        # new sequence number finds the slot complete
+        self._sequences[index] = sequence
+        self._header[_LATEST] = sequence
+        return sequence
+
+    def publish(self, frame: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """Copy a frame into the ring, resizing it to the ring's shape.
+
+        Args:
+            frame: BGR frame of any size.
+            timestamp: Capture time (time.time()); defaults to now.
+
+        Returns:
+            The frame's sequence number.
+        """
+        slot = self.begin_write()
+        if frame.shape == self.shape:
+            np.copyto(slot, frame)
+        else:
+            cv2.resize(frame, (self.shape[1], self.shape[0]), dst=slot)
+        return self.end_write(timestamp)
+
+    def close_writer(self) -> None:
+        """Tell readers (and a capture process) that no more frames will come."""
+        self._header[_CLOSED] = 1
+
+    # --- readers ---
+
+    @property
+    def latest(self) -> int:
+        """Sequence number of the newest frame (0 before the first)."""
+        return int(self._header[_LATEST])
+
+    @property
+    def closed(self) -> bool:
+        return bool(self._header[_CLOSED])
+
+    def view(self, sequence: int) -> Optional[tuple[np.ndarray, float]]:
+        """Return a frame and its capture time without copying.
+
+        The view stays valid until the writer comes round to its slot
+        again; check valid(sequence) after using it.
+
+        Args:
+            sequence: Sequence number, e.g. latest.
+
+        Returns:
+            (frame view, capture time), or None if the slot no longer (or
+            not yet) holds that frame.
+        """
+        if sequence <= 0:
+            return None
+        index = (sequence - 1) % self.slots
+        if self._sequences[index] != sequence:
+            return None
+        return self._frames[index], float(self._timestamps[index])
+
+    def valid(self, sequence: int) -> bool:
+        """True if the frame has not been overwritten since view()."""
+        return sequence > 0 and self._sequences[(sequence - 1) % self.slots] == sequence
+
+    def wait(self, after: int, timeout: float = FRAME_WAIT_TIMEOUT) -> int:
+        """Wait for a frame newer than `after`.
+
+        Args:
+            after: Sequence number the caller already has.
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            The newest sequence number, or `after` if none arrived in time
+            or the ring was closed.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            latest = self.latest
+            if latest > after or self.closed:
+                return latest
+            if time.monotonic() >= deadline:
+                return after
+            time.sleep(POLL_INTERVAL)
+
+    def close(self) -> None:
+        """Unmap the ring; the creator also removes it."""
+        # The arrays hold exported buffers that block closing the mapping
+        self._header = self._sequences = self._timestamps = self._frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # A caller still holds a frame view; the mapping goes with it
+            logger.warning(f"Frame ring {self.name} still in use at close")
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to existing shared memory without adopting it.
+
+    Before Python 3.13 an attaching process registers the memory with its
+    resource tracker, which would remove it when that process exits,
+    under the feet of its creator.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    creator = np.ndarray((_FIELDS,), dtype=np.int64, buffer=shm.buf)[_PID]
+    if creator == os.getpid():
+        # The registration is the creator's own
+        return shm
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    except Exception:
+        pass
+    return shm
+
+
+class FrameRingSource(FrameSource):
+    """Reads the newest frames of a ring published by another process."""
+
+    def __init__(self, name: str, copy: bool = True, timeout: float = FRAME_WAIT_TIMEOUT) -> None:
+        """Attach to the ring.
+
+        Args:
+            name: Shared memory name of the ring.
+            copy: Return a private copy of each frame. Callers that draw on
+                the frame need one; read-only callers can use the view.
+            timeout: Seconds read() waits for a new frame.
+        """
+        self.name = f'shm:{name}'
+        self.copy = copy
+        self.timeout = timeout
+        self.sequence = 0
+        self.frames = 0
+        self.skipped = 0
+        self.last_latency: Optional[float] = None
+        try:
+            self.ring: Optional[FrameRing] = FrameRing(name)
+        except (FileNotFoundError, ValueError) as e:
+            logger.error(f"Cannot attach to frame ring '{name}': {e}")
+            self.ring = None
+
+    def isOpened(self) -> bool:
+        return self.ring is not None and not self.ring.closed
+
+    def read(self) -> tuple[bool, Optional[np.ndarray]]:
+        """Return the newest frame not returned before.
+
+        Waits up to `timeout` for one; (False, None) if none came.
+        """
+        if self.ring is None:
+            return False, None
+        while True:
+            sequence = self.ring.wait(self.sequence, self.timeout)
+            if sequence <= self.sequence:
+                return False, None
+            entry = self.ring.view(sequence)
+            if entry is None:
+                # Overwritten already; try the newer frame
+                continue
+            frame, captured_at = entry
+            if self.copy:
+                frame = frame.copy()
+                if not self.ring.valid(sequence):
+                    continue
+            if self.sequence:
+                self.skipped += sequence - self.sequence - 1
+            self.sequence = sequence
+            self.frames += 1
+            self.last_latency = time.time() - captured_at
+            return True, frame
+
+    def valid(self) -> bool:
+        """True if the last frame returned without a copy is still intact."""
+        return self.ring is not None and self.ring.valid(self.sequence)
+
+    def release(self) -> None:
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+
+def run_capture(spec: str, ring: FrameRing, parent_pid: Optional[int] = None) -> None:
+    """Publish frames from a frame source into a ring until it is closed.
+
+    Args:
+        spec: Frame source specification (see frame_source.py).
+        ring: Ring to write to.
+        parent_pid: Also stop once this process has exited.
+    """
+    source = create_frame_source(spec)
+    failures = 0
+    try:
+        while not ring.closed:
+            if parent_pid is not None and os.getppid() != parent_pid:
+                logger.info("Parent process exited, stopping capture")
+                break
+            if not source.isOpened():
+                logger.error(f"Capture source {spec} not available, retrying")
+                source.release()
+                time.sleep(2)
+                source = create_frame_source(spec)
+                continue
+            ok, frame = source.read()
+            captured_at = time.time()
+            if not ok:
+                failures += 1
+                if failures >= 30:
+                    source.release()
+                    failures = 0
+                time.sleep(0.1)
+                continue
+            failures = 0
+            ring.publish(frame, captured_at)
+    finally:
+        source.release()
+
+
+class CaptureProcess:
+    """A child process capturing frames into a ring this process owns."""
+
+    def __init__(self, spec: str, width: int = CAPTURE_WIDTH, height: int = CAPTURE_HEIGHT,
+                 slots: int = FRAME_RING_SLOTS) -> None:
+        """Create the ring and start capturing.
+
+        Args:
+            spec: Frame source specification for the capture process.
+            width: Width frames are published at.
+            height: Height frames are published at.
+            slots: Frames held by the ring.
+        """
+        self.spec = spec
+        self.ring: Optional[FrameRing] = FrameRing(shape=(height, width, 3), slots=slots, create=True)
+        # A fresh interpreter running this file: multiprocessing would
+        # re-import the app's main module in the child
+        self.process = subprocess.Popen([
+            sys.executable, os.path.abspath(__file__), '--attach',
+            '--source', spec, '--name', self.ring.name, '--parent', str(os.getpid()),
+        ])
+        logger.info(f"Capturing {spec} in process {self.process.pid} into ring {self.ring.name}")
+
+    @property
+    def name(self) -> str:
+        return self.ring.name
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def open_reader(self, copy: bool = True) -> FrameRingSource:
+        """Return a frame source reading this capture's frames."""
+        return FrameRingSource(self.ring.name, copy=copy)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the capture process and remove the ring."""
+        if self.ring is None:
+            return
+        self.ring.close_writer()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.ring.close()
+        self.ring = None
+        logger.info("Capture process stopped")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Capture frames into a shared-memory ring.')
+    parser.add_argument('--source', default=os.getenv('CAMERA_SOURCE', '0'), help='frame source (see frame_source.py)')
+    parser.add_argument('--name', default='signcam', help='shared memory name of the ring')
+    parser.add_argument('--width', type=int, default=CAPTURE_WIDTH)
+    parser.add_argument('--height', type=int, default=CAPTURE_HEIGHT)
+    parser.add_argument('--slots', type=int, default=FRAME_RING_SLOTS)
+    parser.add_argument('--attach', action='store_true', help='write to an existing ring (started by the app)')
+    parser.add_argument('--parent', type=int, help='stop when this process exits')
+    args = parser.parse_args()
+
+    if args.attach:
+        ring = FrameRing(args.name)
+    else:
+        ring = FrameRing(args.name, (args.height, args.width, 3), args.slots, create=True)
+        print(f'Publishing {args.source} as CAMERA_SOURCE=shm:{ring.name}')
+    try:
+        run_capture(args.source, ring, args.parent)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if not args.attach:
+            ring.close_writer()
+        ring.close()
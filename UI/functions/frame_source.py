@@ -0,0 +1,288 @@
+"""
+Frame Source Module
+
+This module provides the frames the video feed runs detection on. Besides
+a camera, frames can come from a looping video file or be generated, so
+the app can be load tested and benchmarked on machines without a camera.
+
+CAMERA_SOURCE selects the source:
+    0, 1, ...                a camera device index (default 0)
+    v4l2:<device>[:WxH[@FPS]]
+                             a Video4Linux device opened with the V4L2
+                             backend, e.g. v4l2:/dev/video0:1280x720@30
+    file:<path>              a video file, looped, paced at its frame rate
+    dir:<path>[@FPS]         the images in a directory, looped
+    synthetic[:WxH[@FPS]]    generated frames, e.g. synthetic:640x480@30
+    shm:<name>               frames published to a shared-memory ring by a
+                             capture process (see frame_ring.py)
+"""
+
+import os
+import re
+import time
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CAMERA_SOURCE = os.getenv('CAMERA_SOURCE', '0')
+
+DEFAULT_WIDTH = 640
+DEFAULT_HEIGHT = 480
+DEFAULT_FPS = 30.0
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class FrameSource(ABC):
+    """A stream of BGR frames with the cv2.VideoCapture calling convention."""
+
+    name = 'source'
+
+    @abstractmethod
+    def isOpened(self) -> bool:
+        """Whether the source can deliver frames."""
+
+    @abstractmethod
+    def read(self) -> tuple[bool, Optional[np.ndarray]]:
+        """Return (ok, frame) for the next frame."""
+
+    def release(self) -> None:
+        pass
+
+
+class DeviceSource(FrameSource):
+    """A camera device."""
+
+    def __init__(self, device: int | str = 0, backend: Optional[int] = None,
+                 width: Optional[int] = None, height: Optional[int] = None,
+                 fps: Optional[float] = None) -> None:
+        """Open the device.
+
+        Args:
+            device: Device index, or a device path such as /dev/video0.
+            backend: OpenCV capture backend (e.g. cv2.CAP_V4L2); None lets
+                OpenCV choose.
+            width: Requested frame width; the driver may pick another.
+            height: Requested frame height.
+            fps: Requested frame rate.
+        """
+        self.name = f'device:{device}' if backend is None else f'v4l2:{device}'
+        if backend is None:
+            self.capture = cv2.VideoCapture(device)
+        else:
+            self.capture = cv2.VideoCapture(device, backend)
+        requested = (
+            (cv2.CAP_PROP_FRAME_WIDTH, width),
+            (cv2.CAP_PROP_FRAME_HEIGHT, height),
+            (cv2.CAP_PROP_FPS, fps),
+        )
+        for prop, value in requested:
+            if value:
+                self.capture.set(prop, value)
+
+    def isOpened(self) -> bool:
+        return self.capture.isOpened()
+
+    def read(self) -> tuple[bool, Optional[np.ndarray]]:
+        return self.capture.read()
+
+    def release(self) -> None:
+        self.capture.release()
+
+
+class _PacedSource(FrameSource):
+    """Delivers frames no faster than a camera would."""
+
+    def __init__(self, fps: float) -> None:
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self._next_time = time.monotonic()
+
+    def _wait(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self._next_time > now:
+            time.sleep(self._next_time - now)
+            self._next_time += self.interval
+        else:
+            # Running behind: don't try to catch up with a burst
+            self._next_time = now + self.interval
+
+
+class VideoFileSource(_PacedSource):
+    """A video file played in a loop at its own frame rate."""
+
+    def __init__(self, path: str, fps: Optional[float] = None) -> None:
+        """Open the file.
+
+        Args:
+            path: Video file readable by OpenCV.
+            fps: Playback rate; defaults to the file's frame rate.
+        """
+        self.name = f'file:{path}'
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        file_fps = self.capture.get(cv2.CAP_PROP_FPS) if self.capture.isOpened() else 0
+        super().__init__(fps or file_fps or DEFAULT_FPS)
+
+    def isOpened(self) -> bool:
+        return self.capture.isOpened()
+
+    def read(self) -> tuple[bool, Optional[np.ndarray]]:
+        self._wait()
+        ok, frame = self.capture.read()
+        if not ok:
+            # Loop back to the start
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.capture.read()
+        return ok, frame
+
+    def release(self) -> None:
+        self.capture.release()
+
+
+class ImageDirectorySource(_PacedSource):
+    """The images in a directory, in name order, played in a loop."""
+
+    def __init__(self, path: str, fps: float = DEFAULT_FPS) -> None:
+        """List the images.
+
+        Args:
+            path: Directory of .png, .jpg or .bmp files.
+            fps: Playback rate.
+        """
+        super().__init__(fps)
+        self.name = f'dir:{path}'
+        self.path = path
+        try:
+            names = sorted(os.listdir(path))
+        except OSError:
+            names = []
+        self.files = [
+            os.path.join(path, name) for name in names
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        ]
+        self.index = 0
+
+    def isOpened(self) -> bool:
+        return bool(self.files)
+
+    def read(self) -> tuple[bool, Optional[np.ndarray]]:
+        if not self.files:
+            return False, None
+        self._wait()
+        path = self.files[self.index]
+        self.index = (self.index + 1) % len(self.files)
+        frame = cv2.imread(path)
+        if frame is None:
+            logger.warning(f"Could not read image {path}")
+            return False, None
+        return True, frame
+
+
+class SyntheticSource(_PacedSource):
+    """Generated frames: a moving shape over a noisy gradient.
+
+    The content changes every frame, so JPEG encoding and detection do
+    real work, but no hand is ever found; MediaPipe's landmark model
+    therefore never runs (use a video file of signing for that cost).
+    """
+
+    def __init__(self, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT,
+                 fps: float = DEFAULT_FPS, seed: int = 0) -> None:
+        super().__init__(fps)
+        self.name = f'synthetic:{width}x{height}@{fps:g}'
+        self.width = width
+        self.height = height
+        self.frame_index = 0
+        self._rng = np.random.default_rng(seed)
+        gradient = np.linspace(40, 200, width, dtype=np.uint8)
+        self._background = np.repeat(np.tile(gradient, (height, 1))[:, :, None], 3, axis=2)
+
+    def isOpened(self) -> bool:
+        return True
+
+    def read(self) -> tuple[bool, Optional[np.ndarray]]:
+        self._wait()
+        frame = self._background.copy()
+        noise = self._rng.integers(0, 16, (self.height, self.width, 1), dtype=np.uint8)
+        frame += noise
+        t = self.frame_index
+        center = (
+            int(self.width / 2 + self.width / 3 * np.sin(t / 20)),
+            int(self.height / 2 + self.height / 3 * np.cos(t / 15)),
+        )
+        cv2.circle(frame, center, min(self.width, self.height) // 8, (60, 120, 200), -1)
+        self.frame_index += 1
+        return True, frame
+
+
+def parse_synthetic_spec(spec: str) -> tuple[int, int, float]:
+    """Parse "WxH@FPS" (each part optional) into (width, height, fps)."""
+    width, height, fps = DEFAULT_WIDTH, DEFAULT_HEIGHT, DEFAULT_FPS
+    size, _, rate = spec.partition('@')
+    if size:
+        w, _, h = size.lower().partition('x')
+        width, height = int(w), int(h)
+    if rate:
+        fps = float(rate)
+    return width, height, fps
+
+
+def parse_device_spec(spec: str) -> tuple[int | str, Optional[int], Optional[int], Optional[float]]:
+    """Parse "<device>[:WxH[@FPS]]" into (device, width, height, fps)."""
+    device, width, height, fps = spec, None, None, None
+    head, _, tail = spec.rpartition(':')
+    if head and re.fullmatch(r'\d+x\d+(@[\d.]+)?', tail.lower()):
+        device = head
+        width, height, fps = parse_synthetic_spec(tail)
+        if '@' not in tail:
+            fps = None
+    return (int(device) if device.isdigit() else device), width, height, fps
+
+
+def create_frame_source(spec: str = CAMERA_SOURCE) -> FrameSource:
+    """Create the frame source described by spec (see the module docstring).
+
+    Args:
+        spec: Source specification.
+
+    Returns:
+        A new, opened frame source (check isOpened()).
+
+    Raises:
+        ValueError: If the specification cannot be parsed.
+    """
+    spec = spec.strip()
+    kind, _, rest = spec.partition(':')
+    if kind == 'synthetic':
+        try:
+            return SyntheticSource(*parse_synthetic_spec(rest))
+        except ValueError as e:
+            raise ValueError(f"Bad synthetic source '{spec}', expected synthetic:WxH@FPS") from e
+    if kind == 'v4l2':
+        device, width, height, fps = parse_device_spec(rest)
+        return DeviceSource(device, cv2.CAP_V4L2, width, height, fps)
+    if kind == 'file':
+        return VideoFileSource(rest)
+    if kind == 'dir':
+        path, _, rate = rest.partition('@')
+        try:
+            return ImageDirectorySource(path, float(rate) if rate else DEFAULT_FPS)
+        except ValueError as e:
+            raise ValueError(f"Bad directory source '{spec}', expected dir:<path>@FPS") from e
+    if kind == 'shm':
+        try:
+            from functions.frame_ring import FrameRingSource
+        except ImportError:
+            from frame_ring import FrameRingSource
+        return FrameRingSource(rest)
+    if spec.isdigit():
+        return DeviceSource(int(spec))
+    raise ValueError(f"Unknown camera source '{spec}'")
@@ -0,0 +1,671 @@
+"""
+Hand Detection Module
+
+This module finds hands in video frames with MediaPipe Hands, either in
+this process or on a pool of detection worker processes. A MediaPipe
+solution object must not be called from several threads at once, and
+in one process every video feed also shares one interpreter lock, so
+concurrent streams queue up behind each other. The pool gives every
+worker process its own Hands instance:
+
+- the frame is copied into a shared-memory buffer owned by the worker
+  (nothing is pickled);
+- a 12-byte request on the worker's stdin says the frame is ready;
+- the worker answers on its stdout with the landmarks of each hand as
+  packed float32 values.
+
+Callers block on the pipe without holding the interpreter lock, so
+streams run in parallel up to the number of workers. DETECTION_WORKERS
+sets the pool size: "auto" (one per CPU core, the default) or a number;
+0 runs MediaPipe in this process behind a lock.
+"""
+
+import os
+import sys
+import time
+import queue
+import select
+import struct
+import logging
+import argparse
+import threading
+import subprocess
+from multiprocessing import shared_memory
+from typing import Any, Optional
+
+import cv2
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Detection settings
+MIN_DETECTION_CONFIDENCE = float(os.getenv('MIN_DETECTION_CONFIDENCE', '0.3'))
+DETECTION_WORKERS = os.getenv('DETECTION_WORKERS', 'auto')
+DETECTION_TIMEOUT = float(os.getenv('DETECTION_TIMEOUT', '5.0'))          # Seconds per frame
+DETECTION_START_TIMEOUT = float(os.getenv('DETECTION_START_TIMEOUT', '60.0'))
+DETECTION_MAX_FRAME_BYTES = int(os.getenv('DETECTION_MAX_FRAME_BYTES', str(1920 * 1080 * 3)))
+# Hands looked for per frame (two signers need 4); workers read it too
+MAX_NUM_HANDS = int(os.getenv('MAX_NUM_HANDS', '2'))
+# Hand tracking: largest move of a hand's centre between frames (in
+# normalized image coordinates), and seconds an unseen hand is kept
+HAND_TRACK_DISTANCE = float(os.getenv('HAND_TRACK_DISTANCE', '0.25'))
+# Inference region: frames wider than INFERENCE_WIDTH are downscaled
+# before detection (0 keeps full resolution); with DETECTION_ROI only a
+# box around the previous frame's hands (grown by ROI_MARGIN of its size
+# on each side) is searched, with the full frame every ROI_REFRESH frames
+# so new hands are found
+INFERENCE_WIDTH = int(os.getenv('INFERENCE_WIDTH', '0'))
+DETECTION_ROI = os.getenv('DETECTION_ROI', 'false').lower() in ('1', 'true', 'yes')
+ROI_MARGIN = float(os.getenv('ROI_MARGIN', '0.5'))
+ROI_REFRESH = int(os.getenv('ROI_REFRESH', '30'))
+
+NUM_LANDMARKS = 21
+HANDEDNESS = ('Left', 'Right')
+
+# Worker protocol: request = frame height, width, channels; response =
+# hand count, then per hand 21 x (x, y, z), handedness score and label
+_REQUEST = struct.Struct('<III')
+_COUNT = struct.Struct('<I')
+_HAND_VALUES = NUM_LANDMARKS * 3 + 2
+_HAND_BYTES = _HAND_VALUES * 4
+_READY = b'R'
+
+
+class DetectionError(Exception):
+    """A frame could not be run through hand detection."""
+
+
+class DetectedHand:
+    """Landmarks of one hand found in a frame."""
+
+    __slots__ = ('landmarks', 'handedness', 'score')
+
+    def __init__(self, landmarks: np.ndarray, handedness: str, score: float) -> None:
+        """Initialize the hand.
+
+        Args:
+            landmarks: (21, 3) float32 array of normalized x, y, z.
+            handedness: "Left" or "Right" as reported by MediaPipe.
+            score: Handedness confidence.
+        """
+        self.landmarks = landmarks
+        self.handedness = handedness
+        self.score = score
+
+    def to_landmark_list(self) -> Any:
+        """Return the landmarks as a MediaPipe NormalizedLandmarkList (for drawing)."""
+        from mediapipe.framework.formats import landmark_pb2
+
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z in self.landmarks.tolist():
+            landmark_list.landmark.add(x=x, y=y, z=z)
+        return landmark_list
+
+
+def hands_from_results(results: Any) -> list[DetectedHand]:
+    """Convert a MediaPipe Hands result into DetectedHand objects."""
+    if not results.multi_hand_landmarks:
+        return []
+    classifications = results.multi_handedness or []
+    hands = []
+    for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+        landmarks = np.array(
+            [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32
+        )
+        handedness, score = 'Right', 0.0
+        if i < len(classifications) and classifications[i].classification:
+            best = classifications[i].classification[0]
+            handedness, score = best.label, best.score
+        hands.append(DetectedHand(landmarks, handedness, score))
+    return hands
+
+
+def pack_hands(hands: list[DetectedHand]) -> bytes:
+    """Encode hands for the worker protocol: a count, then one record per hand."""
+    records = np.empty((len(hands), _HAND_VALUES), dtype=np.float32)
+    for record, hand in zip(records, hands):
+        record[:NUM_LANDMARKS * 3] = hand.landmarks.ravel()
+        record[-2] = hand.score
+        record[-1] = HANDEDNESS.index(hand.handedness) if hand.handedness in HANDEDNESS else 1
+    return _COUNT.pack(len(hands)) + records.tobytes()
+
+
+def unpack_hands(count: int, data: bytes) -> list[DetectedHand]:
+    """Decode count hand records written by pack_hands()."""
+    values = np.frombuffer(data, dtype=np.float32).reshape(count, _HAND_VALUES)
+    return [
+        DetectedHand(record[:NUM_LANDMARKS * 3].reshape(NUM_LANDMARKS, 3),
+                     HANDEDNESS[int(record[-1])], float(record[-2]))
+        for record in values
+    ]
+
+
+class HandTracker:
+    """Gives each hand a track id that persists from frame to frame.
+
+    MediaPipe runs in static-image mode and returns hands in no particular
+    order, so a hand is matched to the nearest track of the same
+    handedness seen recently. Track ids are the handedness plus a number,
+    e.g. "right1"; a second signer's right hand becomes "right2".
+    """
+
+    def __init__(self, max_distance: float = HAND_TRACK_DISTANCE, max_age: float = 1.0) -> None:
+        """Initialize the tracker.
+
+        Args:
+            max_distance: Largest move of a hand's centre between frames.
+            max_age: Seconds a track survives without its hand.
+        """
+        self.max_distance = max_distance
+        self.max_age = max_age
+        self._tracks: dict[str, tuple[np.ndarray, float]] = {}  # id -> (centre, last seen)
+
+    def update(self, hands: list[DetectedHand], now: Optional[float] = None) -> list[str]:
+        """Assign track ids to the hands of a new frame.
+
+        Args:
+            hands: Hands found in the frame.
+            now: Frame time (time.monotonic() if None).
+
+        Returns:
+            One track id per hand, in the order of hands.
+        """
+        now = time.monotonic() if now is None else now
+        self._tracks = {
+            track: state for track, state in self._tracks.items() if now - state[1] <= self.max_age
+        }
+        centres = [hand.landmarks[:, :2].mean(axis=0) for hand in hands]
+
+        # Closest pairs first, each hand and track used once
+        pairs = sorted(
+            (float(np.linalg.norm(centre - state[0])), i, track)
+            for i, (hand, centre) in enumerate(zip(hands, centres))
+            for track, state in self._tracks.items()
+            if track.startswith(hand.handedness.lower())
+        )
+        ids: list[Optional[str]] = [None] * len(hands)
+        used = set()
+        for distance, i, track in pairs:
+            if distance <= self.max_distance and ids[i] is None and track not in used:
+                ids[i] = track
+                used.add(track)
+
+        for i, hand in enumerate(hands):
+            if ids[i] is None:
+                # A new hand takes the lowest free number
+                prefix, number = hand.handedness.lower(), 1
+                while f'{prefix}{number}' in self._tracks or f'{prefix}{number}' in ids:
+                    number += 1
+                ids[i] = f'{prefix}{number}'
+            self._tracks[ids[i]] = (centres[i], now)
+        return ids
+
+    def reset(self) -> None:
+        self._tracks = {}
+
+
+class InferenceRegion:
+    """Decides which part of a frame, at what size, hand detection sees.
+
+    Landmarks found in a crop are mapped back to full-frame coordinates,
+    so features and overlays don't depend on the region. One instance
+    per camera, used by one thread.
+    """
+
+    def __init__(self, width: int = INFERENCE_WIDTH, roi: bool = DETECTION_ROI,
+                 margin: float = ROI_MARGIN, refresh: int = ROI_REFRESH) -> None:
+        """Initialize the region.
+
+        Args:
+            width: Widest image handed to detection (0 for full size).
+            roi: Search only around the previous frame's hands.
+            margin: Growth of the hands' box on each side, as a fraction
+                of its larger side.
+            refresh: Frames between full-frame searches in ROI mode.
+        """
+        self.width = width
+        self.roi = roi
+        self.margin = margin
+        self.refresh = max(refresh, 1)
+        self.box: Optional[tuple[int, int, int, int]] = None  # x0, y0, x1, y1 in pixels
+        self._roi_run = 0
+        self.frames = 0
+        self.roi_frames = 0
+        self.roi_misses = 0
+        self._pixels = 0
+        self._resized: Optional[np.ndarray] = None  # Reused while the size stays the same
+
+    def prepare(self, frame: np.ndarray,
+                box: Optional[tuple[int, int, int, int]] = None) -> np.ndarray:
+        """Crop a frame to a box and downscale it to the inference width."""
+        image = frame if box is None else frame[box[1]:box[3], box[0]:box[2]]
+        if self.width and image.shape[1] > self.width:
+            height = max(int(round(image.shape[0] * self.width / image.shape[1])), 1)
+            shape = (height, self.width) + image.shape[2:]
+            if self._resized is None or self._resized.shape != shape:
+                self._resized = np.empty(shape, dtype=image.dtype)
+            image = cv2.resize(image, (self.width, height), dst=self._resized, interpolation=cv2.INTER_AREA)
+        self._pixels += image.shape[0] * image.shape[1]
+        return image
+
+    @staticmethod
+    def remap(hands: list[DetectedHand], box: tuple[int, int, int, int],
+              frame_shape: tuple[int, ...]) -> list[DetectedHand]:
+        """Map landmarks found in a crop to full-frame coordinates."""
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = box
+        # z is on the same scale as x
+        scale = np.array([(x1 - x0) / width, (y1 - y0) / height, (x1 - x0) / width], dtype=np.float32)
+        offset = np.array([x0 / width, y0 / height, 0.0], dtype=np.float32)
+        return [DetectedHand(hand.landmarks * scale + offset, hand.handedness, hand.score) for hand in hands]
+
+    def hands_box(self, hands: list[DetectedHand],
+                  frame_shape: tuple[int, ...]) -> Optional[tuple[int, int, int, int]]:
+        """Square box around the hands plus the margin, clipped to the frame."""
+        if not hands:
+            return None
+        height, width = frame_shape[:2]
+        points = np.concatenate([hand.landmarks[:, :2] for hand in hands]) * (width, height)
+        low, high = points.min(axis=0), points.max(axis=0)
+        centre = (low + high) / 2
+        half = (high - low).max() * (0.5 + self.margin)
+        x0, y0 = np.round(np.maximum(centre - half, 0)).astype(int)
+        x1, y1 = np.round(np.minimum(centre + half, (width, height))).astype(int)
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        return int(x0), int(y0), int(x1), int(y1)
+
+    def detect(self, detector: Any, frame: np.ndarray) -> list[DetectedHand]:
+        """Find hands in a BGR frame through this region.
+
+        Args:
+            detector: A LocalDetector or DetectionPool.
+            frame: Full-resolution BGR frame.
+
+        Returns:
+            The hands found, in full-frame coordinates.
+        """
+        self.frames += 1
+        box = None
+        if self.roi and self.box is not None and self._roi_run < self.refresh:
+            box = self.box
+            self._roi_run += 1
+            self.roi_frames += 1
+            hands = detector.detect(self.prepare(frame, box))
+            if hands:
+                hands = self.remap(hands, box, frame.shape)
+            else:
+                # Lost the hands: look at the whole frame now, not next frame
+                self.roi_misses += 1
+                box = None
+
+        if box is None:
+            self._roi_run = 0
+            hands = detector.detect(self.prepare(frame))
+
+        self.box = self.hands_box(hands, frame.shape) if self.roi else None
+        return hands
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'width': self.width or None,
+            'roi': self.roi,
+            'frames': self.frames,
+            'roi_frames': self.roi_frames,
+            'roi_misses': self.roi_misses,
+            'mean_pixels': round(self._pixels / self.frames) if self.frames else None,
+        }
+
+
+def create_hands(min_detection_confidence: float = MIN_DETECTION_CONFIDENCE,
+                 max_num_hands: int = MAX_NUM_HANDS) -> Any:
+    """Create a MediaPipe Hands solution configured like the app's detector."""
+    import mediapipe as mp
+
+    return mp.solutions.hands.Hands(
+        static_image_mode=True,
+        max_num_hands=max_num_hands,
+        min_detection_confidence=min_detection_confidence
+    )
+
+
+def pool_size(setting: str = DETECTION_WORKERS) -> int:
+    """Number of detection workers for a DETECTION_WORKERS setting."""
+    if setting.strip().lower() == 'auto':
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:
+            return os.cpu_count() or 1
+    return max(int(setting), 0)
+
+
+class _Stats:
+    """Frame counters shared by both detectors."""
+
+    def __init__(self) -> None:
+        self._stats_lock = threading.Lock()
+        self.frames = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def _record(self, seconds: float, waited: float, ok: bool) -> None:
+        with self._stats_lock:
+            if ok:
+                self.frames += 1
+                self.total_seconds += seconds
+                self.wait_seconds += waited
+            else:
+                self.errors += 1
+
+    def _frame_stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            return {
+                'frames': self.frames,
+                'errors': self.errors,
+                'mean_detect_ms': round(self.total_seconds / self.frames * 1000, 2) if self.frames else 0.0,
+                'mean_wait_ms': round(self.wait_seconds / self.frames * 1000, 2) if self.frames else 0.0,
+            }
+
+
+class LocalDetector(_Stats):
+    """MediaPipe Hands in this process, one frame at a time."""
+
+    def __init__(self, hands: Any) -> None:
+        """Initialize the detector.
+
+        Args:
+            hands: MediaPipe Hands object, e.g. from create_hands().
+        """
+        super().__init__()
+        self.hands = hands
+        self._lock = threading.Lock()
+        self._rgb: Optional[np.ndarray] = None  # Reused for every frame of the same size
+
+    def detect(self, frame: np.ndarray) -> list[DetectedHand]:
+        """Find hands in a BGR frame.
+
+        Args:
+            frame: BGR frame.
+
+        Returns:
+            The hands found (possibly none).
+        """
+        start = time.perf_counter()
+        with self._lock:
+            waited = time.perf_counter() - start
+            if self._rgb is None or self._rgb.shape != frame.shape:
+                self._rgb = np.empty_like(frame)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+            results = self.hands.process(self._rgb)
+        hands = hands_from_results(results)
+        self._record(time.perf_counter() - start, waited, True)
+        return hands
+
+    def stats(self) -> dict[str, Any]:
+        return {'mode': 'local', 'workers': 0, **self._frame_stats()}
+
+    def shutdown(self) -> None:
+        self.hands.close()
+
+
+class _Worker:
+    """One detection process and its frame buffer."""
+
+    def __init__(self, index: int, min_detection_confidence: float, max_frame_bytes: int) -> None:
+        self.index = index
+        self.min_detection_confidence = min_detection_confidence
+        self.shm = shared_memory.SharedMemory(create=True, size=max_frame_bytes)
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        self.process = subprocess.Popen(
+            [
+                sys.executable, os.path.abspath(__file__), '--worker',
+                '--shm', self.shm.name,
+                '--confidence', str(self.min_detection_confidence),
+                '--parent', str(os.getpid()),
+            ],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0
+        )
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def read_exactly(self, size: int, timeout: float) -> bytes:
+        """Read size bytes from the worker, or raise DetectionError."""
+        stream = self.process.stdout
+        data = b''
+        deadline = time.monotonic() + timeout
+        while len(data) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([stream], [], [], remaining)[0]:
+                raise DetectionError(f"Detection worker {self.index} timed out")
+            chunk = os.read(stream.fileno(), size - len(data))
+            if not chunk:
+                raise DetectionError(f"Detection worker {self.index} exited")
+            data += chunk
+        return data
+
+    def detect(self, frame: np.ndarray, timeout: float) -> list[DetectedHand]:
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        target = np.ndarray(frame.shape, dtype=np.uint8, buffer=self.shm.buf)
+        np.copyto(target, frame)
+        del target
+
+        try:
+            self.process.stdin.write(_REQUEST.pack(height, width, channels))
+        except (BrokenPipeError, OSError) as e:
+            raise DetectionError(f"Detection worker {self.index} exited") from e
+
+        (count,) = _COUNT.unpack(self.read_exactly(_COUNT.size, timeout))
+        if not count:
+            return []
+        return unpack_hands(count, self.read_exactly(count * _HAND_BYTES, timeout))
+
+    def stop(self) -> None:
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+                self.process.wait(2)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+            self.process.stdout.close()
+            self.process = None
+
+    def close(self) -> None:
+        self.stop()
+        self.shm.close()
+        self.shm.unlink()
+
+
+class DetectionPool(_Stats):
+    """Hand detection spread over worker processes, one frame per worker."""
+
+    def __init__(self, workers: Optional[int] = None,
+                 min_detection_confidence: float = MIN_DETECTION_CONFIDENCE,
+                 timeout: float = DETECTION_TIMEOUT,
+                 max_frame_bytes: int = DETECTION_MAX_FRAME_BYTES) -> None:
+        """Initialize the pool (start() launches the workers).
+
+        Args:
+            workers: Worker processes; None sizes the pool to the CPU cores.
+            min_detection_confidence: Passed to every worker's Hands.
+            timeout: Seconds a frame may take before its worker is restarted.
+            max_frame_bytes: Largest frame accepted.
+        """
+        super().__init__()
+        self.size = workers if workers is not None else pool_size('auto')
+        if self.size < 1:
+            raise ValueError("A detection pool needs at least one worker")
+        self.min_detection_confidence = min_detection_confidence
+        self.timeout = timeout
+        self.max_frame_bytes = max_frame_bytes
+
+        self._workers: list[_Worker] = []
+        self._idle: queue.Queue = queue.Queue()
+        self._start_lock = threading.Lock()
+        self.restarts = 0
+
+    @staticmethod
+    def _wait_ready(worker: _Worker, timeout: float) -> None:
+        """Wait until a started worker has loaded and warmed up its Hands."""
+        if worker.read_exactly(1, timeout) != _READY:
+            raise DetectionError(f"Detection worker {worker.index} failed to start")
+
+    def start(self, timeout: float = DETECTION_START_TIMEOUT) -> None:
+        """Launch the workers and wait until all are ready.
+
+        Raises:
+            DetectionError: If a worker does not come up in time.
+        """
+        with self._start_lock:
+            if self._workers:
+                return
+            workers = [
+                _Worker(i, self.min_detection_confidence, self.max_frame_bytes)
+                for i in range(self.size)
+            ]
+            try:
+                # Start all, then wait: the workers load MediaPipe in parallel
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    self._wait_ready(worker, timeout)
+            except DetectionError:
+                for worker in workers:
+                    worker.close()
+                raise
+            self._workers = workers
+            for worker in workers:
+                self._idle.put(worker)
+        logger.info(f"Started {self.size} hand detection workers")
+
+    def detect(self, frame: np.ndarray) -> list[DetectedHand]:
+        """Find hands in a BGR frame on the next free worker.
+
+        Args:
+            frame: BGR frame (uint8).
+
+        Returns:
+            The hands found (possibly none).
+
+        Raises:
+            DetectionError: If the worker failed or timed out; it is
+                restarted for the next frame.
+        """
+        if frame.nbytes > self.max_frame_bytes:
+            raise DetectionError(f"Frame of {frame.nbytes} bytes exceeds DETECTION_MAX_FRAME_BYTES")
+        if not self._workers:
+            self.start()
+        start = time.perf_counter()
+        worker = self._idle.get()
+        waited = time.perf_counter() - start
+        try:
+            if not worker.alive():
+                self.restarts += 1
+                logger.warning(f"Restarting detection worker {worker.index}")
+                worker.stop()
+                worker.start()
+                self._wait_ready(worker, DETECTION_START_TIMEOUT)
+            hands = worker.detect(np.ascontiguousarray(frame, dtype=np.uint8), self.timeout)
+        except DetectionError as e:
+            logger.error(str(e))
+            worker.stop()  # Restarted when next taken
+            self._record(0.0, waited, False)
+            raise
+        finally:
+            self._idle.put(worker)
+        self._record(time.perf_counter() - start, waited, True)
+        return hands
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'mode': 'pool',
+            'workers': self.size,
+            'alive': sum(1 for worker in self._workers if worker.alive()),
+            'idle': self._idle.qsize(),
+            'restarts': self.restarts,
+            **self._frame_stats(),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the workers and free their buffers."""
+        with self._start_lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+
+
+def create_detector(workers: Optional[int] = None,
+                    min_detection_confidence: float = MIN_DETECTION_CONFIDENCE) -> LocalDetector | DetectionPool:
+    """Create the detector DETECTION_WORKERS asks for.
+
+    Args:
+        workers: Pool size; None reads DETECTION_WORKERS.
+        min_detection_confidence: Hand detection threshold.
+
+    Returns:
+        A started DetectionPool, or a LocalDetector for 0 workers.
+    """
+    if workers is None:
+        workers = pool_size()
+    if workers == 0:
+        return LocalDetector(create_hands(min_detection_confidence))
+    pool = DetectionPool(workers, min_detection_confidence)
+    pool.start()
+    return pool
+
+
+def _serve(shm_name: str, min_detection_confidence: float, parent_pid: Optional[int]) -> None:
+    """Worker process: answer detection requests on stdin/stdout."""
+    # Keep the protocol stream to ourselves: anything else printing to
+    # stdout (including native libraries) goes to stderr instead
+    out = os.fdopen(os.dup(1), 'wb', buffering=0)
+    os.dup2(2, 1)
+    requests = os.fdopen(0, 'rb', buffering=0)
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')  # The parent owns it
+    except Exception:
+        pass
+
+    hands = create_hands(min_detection_confidence)
+    hands.process(np.zeros((480, 640, 3), dtype=np.uint8))  # Warm up
+    out.write(_READY)
+    frame_rgb = np.empty(0, dtype=np.uint8)  # Reused while the frame size stays the same
+
+    while True:
+        header = requests.read(_REQUEST.size)
+        if len(header) < _REQUEST.size:
+            break  # Parent closed the pipe
+        if parent_pid is not None and os.getppid() != parent_pid:
+            break
+        height, width, channels = _REQUEST.unpack(header)
+        frame = np.ndarray((height, width, channels), dtype=np.uint8, buffer=shm.buf)
+        if frame_rgb.shape != frame.shape:
+            frame_rgb = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame_rgb)
+        del frame
+        out.write(pack_hands(hands_from_results(hands.process(frame_rgb))))
+
+    hands.close()
+    shm.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Hand detection worker process.')
+    parser.add_argument('--worker', action='store_true', required=True)
+    parser.add_argument('--shm', required=True, help='shared memory name of the frame buffer')
+    parser.add_argument('--confidence', type=float, default=MIN_DETECTION_CONFIDENCE)
+    parser.add_argument('--parent', type=int, help='stop when this process exits')
+    args = parser.parse_args()
+    try:
+        _serve(args.shm, args.confidence, args.parent)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,326 @@
+"""
+Jobs Module
+
+This module runs slow operations (speech recognition, sentence
+correction, speech synthesis) on an in-process worker pool, so the
+request that starts one returns a job ID straight away instead of
+holding a server thread while an external provider answers. Jobs are
+taken in priority order, their status and result can be polled or
+followed as events, and their queue and run times are recorded.
+
+Jobs live in this process only: with several server processes, status
+requests must reach the process that accepted the job.
+"""
+
+import os
+import uuid
+import time
+import queue
+import logging
+import itertools
+import threading
+from typing import Any, Callable, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Job pool settings
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+JOB_MAX_QUEUED = int(os.getenv('JOB_MAX_QUEUED', '64'))
+JOB_RESULT_TTL = float(os.getenv('JOB_RESULT_TTL', '300.0'))   # Seconds a finished job is kept
+
+# Priorities: lower runs first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Too many jobs are waiting; the job was not accepted."""
+
+
+class Job:
+    """One submitted operation and its outcome."""
+
+    def __init__(self, kind: str, fn: Callable[..., Any], args: tuple, kwargs: dict,
+                 priority: int) -> None:
+        """Initialize the job.
+
+        Args:
+            kind: Operation name used in metrics, e.g. "speech_to_sign".
+            fn: Function doing the work; its return value is the result.
+            args: Positional arguments for fn.
+            kwargs: Keyword arguments for fn.
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW.
+        """
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+        self.state = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def _set_state(self, state: str) -> None:
+        with self._changed:
+            self.state = state
+            now = time.time()
+            if state == RUNNING:
+                self.started_at = now
+            elif state in FINISHED_STATES:
+                self.finished_at = now
+                # The arguments may hold large uploads
+                self.fn, self.args, self.kwargs = None, (), {}
+            self._changed.notify_all()
+
+    def wait(self, timeout: Optional[float] = None, since: Optional[str] = None) -> str:
+        """Wait until the job finishes, or leaves the state `since`.
+
+        Args:
+            timeout: Maximum seconds to wait.
+            since: State the caller last saw; None waits for completion.
+
+        Returns:
+            The job's state after waiting.
+        """
+        with self._changed:
+            if since is None:
+                self._changed.wait_for(lambda: self.finished, timeout)
+            else:
+                self._changed.wait_for(lambda: self.state != since, timeout)
+            return self.state
+
+    def timing(self) -> dict[str, Optional[float]]:
+        """Return queue, run and total time in milliseconds (None if not reached)."""
+        def ms(start: Optional[float], end: Optional[float]) -> Optional[float]:
+            if start is None or end is None:
+                return None
+            return round((end - start) * 1000, 1)
+
+        return {
+            'queued_ms': ms(self.submitted_at, self.started_at or self.finished_at),
+            'run_ms': ms(self.started_at, self.finished_at),
+            'total_ms': ms(self.submitted_at, self.finished_at),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the job's status, result and timing for the status API."""
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'state': self.state,
+            'priority': self.priority,
+            'result': self.result,
+            'error': self.error,
+            'timing': self.timing(),
+        }
+
+
+class JobQueue:
+    """Bounded priority queue of jobs served by a fixed set of worker threads."""
+
+    def __init__(self, max_workers: int = JOB_WORKERS, max_queued: int = JOB_MAX_QUEUED,
+                 result_ttl: float = JOB_RESULT_TTL) -> None:
+        """Initialize the queue.
+
+        Args:
+            max_workers: Jobs run at once.
+            max_queued: Jobs waiting to start before submit() refuses more.
+            result_ttl: Seconds a finished job stays available.
+        """
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+
+        self._lock = threading.Lock()
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._sequence = itertools.count()  # FIFO within a priority
+        self._jobs: dict[str, Job] = {}
+        self._workers: list[threading.Thread] = []
+        self._queued = 0
+        self._running = 0
+
+        self.submitted = 0
+        self.rejected = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.cancelled = 0
+        self._timing_totals: dict[str, dict[str, float]] = {}
+
+    def _start_workers(self) -> None:
+        """Start the worker threads on first use (called with the lock held)."""
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._work, name=f'job-worker-{len(self._workers)}', daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _expire(self) -> None:
+        """Forget finished jobs older than result_ttl (lock held)."""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args: Any,
+               priority: int = PRIORITY_NORMAL, **kwargs: Any) -> Job:
+        """Queue fn(*args, **kwargs) and return its job immediately.
+
+        Args:
+            kind: Operation name used in metrics.
+            fn: Function doing the work.
+            *args: Positional arguments for fn.
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW.
+            **kwargs: Keyword arguments for fn.
+
+        Returns:
+            The queued job.
+
+        Raises:
+            JobQueueFull: If max_queued jobs are already waiting.
+        """
+        with self._lock:
+            if self._workers is None:
+                raise RuntimeError("Job queue has been shut down")
+            if self._queued >= self.max_queued:
+                self.rejected += 1
+                raise JobQueueFull(f"{self._queued} jobs already waiting")
+
+            self._expire()
+            job = Job(kind, fn, args, kwargs, priority)
+            self._jobs[job.id] = job
+            self._queued += 1
+            self.submitted += 1
+            self._start_workers()
+            self._queue.put((priority, next(self._sequence), job))
+
+        logger.debug(f"Queued {kind} job {job.id} (priority {priority})")
+        return job
+
+    def _work(self) -> None:
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+
+            with self._lock:
+                self._queued -= 1
+                if job.state == CANCELLED:
+                    continue
+                self._running += 1
+                # Under the lock, so cancel() cannot slip in between
+                job._set_state(RUNNING)
+
+            try:
+                job.result = job.fn(*job.args, **job.kwargs)
+                outcome = SUCCEEDED
+            except Exception as e:
+                logger.error(f"{job.kind} job {job.id} failed: {e}")
+                job.error = str(e)
+                outcome = FAILED
+            job._set_state(outcome)
+
+            with self._lock:
+                self._running -= 1
+                if outcome == SUCCEEDED:
+                    self.succeeded += 1
+                else:
+                    self.failed += 1
+                self._record_timing(job)
+
+    def _record_timing(self, job: Job) -> None:
+        """Add a finished job's times to the per-kind totals (lock held)."""
+        timing = job.timing()
+        totals = self._timing_totals.setdefault(
+            job.kind, {'count': 0, 'queued_ms': 0.0, 'run_ms': 0.0, 'max_total_ms': 0.0}
+        )
+        totals['count'] += 1
+        totals['queued_ms'] += timing['queued_ms'] or 0.0
+        totals['run_ms'] += timing['run_ms'] or 0.0
+        totals['max_total_ms'] = max(totals['max_total_ms'], timing['total_ms'] or 0.0)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by ID, or None if it is unknown or expired."""
+        with self._lock:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet.
+
+        Args:
+            job_id: ID returned by submit().
+
+        Returns:
+            True if the job was cancelled.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state != QUEUED:
+                return False
+            self.cancelled += 1
+            # The worker that dequeues it skips it
+            job._set_state(CANCELLED)
+            return True
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue counters and mean timings per kind of job.
+
+        Returns:
+            Dictionary of job metrics.
+        """
+        with self._lock:
+            kinds = {
+                kind: {
+                    'count': int(totals['count']),
+                    'mean_queued_ms': round(totals['queued_ms'] / totals['count'], 1),
+                    'mean_run_ms': round(totals['run_ms'] / totals['count'], 1),
+                    'max_total_ms': round(totals['max_total_ms'], 1),
+                }
+                for kind, totals in self._timing_totals.items()
+            }
+            return {
+                'workers': self.max_workers,
+                'queued': self._queued,
+                'running': self._running,
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'succeeded': self.succeeded,
+                'failed': self.failed,
+                'cancelled': self.cancelled,
+                'kinds': kinds,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the workers after the jobs already running; queued jobs are cancelled."""
+        with self._lock:
+            workers, self._workers = self._workers, None
+            for job in self._jobs.values():
+                if job.state == QUEUED:
+                    job._set_state(CANCELLED)
+                    self.cancelled += 1
+        for _ in workers or []:
+            # Sorts after every real job
+            self._queue.put((float('inf'), next(self._sequence), None))
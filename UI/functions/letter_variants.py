@@ -0,0 +1,272 @@
+"""
+Letter Variants Module
+
+This module builds pre-scaled, recompressed copies of the ASL letter
+images and picks the best variant for a requested display size and
+the formats a client accepts. Run it as a script to (re)build the
+variants:
+
+    python UI/functions/letter_variants.py
+"""
+
+import os
+import logging
+from functools import lru_cache
+from typing import Iterable, Optional
+from PIL import Image
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Get base directory for image paths
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LETTER_IMAGES_DIR = os.path.join(BASE_DIR, '..', 'datasets', 'letter_images')
+VARIANTS_DIR = os.path.join(LETTER_IMAGES_DIR, 'variants')
+
+# Target widths (pixels) for the generated variants
+VARIANT_WIDTHS: tuple[int, ...] = (64, 128, 256)
+
+# Output formats: file extension -> MIME type
+VARIANT_FORMATS: dict[str, str] = {
+    'webp': 'image/webp',
+    'png': 'image/png',
+}
+
+# Encoder settings
+WEBP_QUALITY = 80
+PNG_COLORS = 256
+
+
+def variant_path(letter: str, width: int, ext: str,
+                 variants_dir: str = VARIANTS_DIR) -> str:
+    """Return the path of a letter variant.
+
+    Args:
+        letter: Uppercase letter A-Z.
+        width: Variant width in pixels.
+        ext: File extension ('webp' or 'png').
+        variants_dir: Root directory of the generated variants.
+
+    Returns:
+        Path to the variant file (which may not exist yet).
+    """
+    return os.path.join(variants_dir, str(width), f"{letter}.{ext}")
+
+
+def _save_variant(img: Image.Image, path: str, ext: str) -> None:
+    """Encode a resized image in the given format."""
+    if ext == 'webp':
+        img.save(path, format='WEBP', quality=WEBP_QUALITY, method=6)
+    else:
+        # Palette quantization keeps the alpha channel and shrinks the
+        # file far more than zlib tuning alone
+        quantized = img.quantize(colors=PNG_COLORS, method=Image.Quantize.FASTOCTREE)
+        quantized.save(path, format='PNG', optimize=True)
+
+
+def build_variants(
+    source_dir: str = LETTER_IMAGES_DIR,
+    variants_dir: str = VARIANTS_DIR,
+    widths: Iterable[int] = VARIANT_WIDTHS,
+    formats: Iterable[str] = tuple(VARIANT_FORMATS),
+) -> list[str]:
+    """Generate resized WebP/PNG variants for every letter image.
+
+    Args:
+        source_dir: Directory containing the full-size A.png ... Z.png.
+        variants_dir: Output directory (one subdirectory per width).
+        widths: Target widths in pixels. Images are never upscaled.
+        formats: File extensions to generate.
+
+    Returns:
+        List of written file paths.
+    """
+    written: list[str] = []
+
+    for name in sorted(os.listdir(source_dir)):
+        letter, ext = os.path.splitext(name)
+        if ext.lower() != '.png' or len(letter) != 1 or not letter.isalpha():
+            continue
+
+        with Image.open(os.path.join(source_dir, name)) as src:
+            src = src.convert('RGBA')
+            for width in widths:
+                # Variants are filed under the target width even when the
+                # original is narrower, so every letter has every width
+                target = min(width, src.width)
+                height = max(1, round(src.height * target / src.width))
+                resized = src.resize((target, height), Image.Resampling.LANCZOS)
+
+                os.makedirs(os.path.join(variants_dir, str(width)), exist_ok=True)
+                for fmt in formats:
+                    path = variant_path(letter.upper(), width, fmt, variants_dir)
+                    _save_variant(resized, path, fmt)
+                    written.append(path)
+
+    if os.path.isdir(variants_dir):
+        # Overwriting files leaves the directory's mtime alone; touching
+        # it lets a running app see the rebuild (see variants_version)
+        os.utime(variants_dir)
+    logger.info(f"Built {len(written)} letter image variants in {variants_dir}")
+    return written
+
+
+def parse_accept(accept: Optional[str]) -> dict[str, float]:
+    """Parse an HTTP Accept header into a MIME type -> quality mapping.
+
+    Args:
+        accept: Raw Accept header value.
+
+    Returns:
+        Dictionary of media ranges to their q-values.
+    """
+    accepted: dict[str, float] = {}
+    if not accept:
+        return accepted
+
+    for part in accept.split(','):
+        fields = [f.strip() for f in part.split(';')]
+        if not fields[0]:
+            continue
+        quality = 1.0
+        for param in fields[1:]:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        accepted[fields[0].lower()] = quality
+
+    return accepted
+
+
+def preferred_formats(accept: Optional[str]) -> list[str]:
+    """Order the variant formats by client preference.
+
+    WebP is only used when the client names it explicitly, since a
+    wildcard Accept header says nothing about decoder support.
+
+    Args:
+        accept: Raw Accept header value.
+
+    Returns:
+        List of file extensions, best first. PNG is always included.
+    """
+    accepted = parse_accept(accept)
+    formats = []
+    if accepted.get('image/webp', 0.0) > 0:
+        formats.append('webp')
+    formats.append('png')
+    return formats
+
+
+def variants_version(variants_dir: str = VARIANTS_DIR) -> int:
+    """Modification time of the variants directory (0 if it does not exist).
+
+    It changes when a width is added or removed and whenever
+    build_variants() finishes, so caches keyed on it pick up variants
+    built while the app is running.
+    """
+    try:
+        return os.stat(variants_dir).st_mtime_ns
+    except OSError:
+        return 0
+
+
+# One entry per (directory, rebuild); older versions age out
+@lru_cache(maxsize=8)
+def _list_widths(variants_dir: str, version: int) -> tuple[int, ...]:
+    try:
+        return tuple(sorted(int(d) for d in os.listdir(variants_dir) if d.isdigit()))
+    except OSError:
+        return ()
+
+
+def _available_widths(variants_dir: str) -> tuple[int, ...]:
+    """List the variant widths present on disk, smallest first."""
+    return _list_widths(variants_dir, variants_version(variants_dir))
+
+
+def select_variant(
+    letter: str,
+    size: Optional[int] = None,
+    accept: Optional[str] = None,
+    variants_dir: str = VARIANTS_DIR,
+    original_dir: str = LETTER_IMAGES_DIR,
+) -> Optional[tuple[str, str]]:
+    """Pick the letter image that best fits a display size and Accept header.
+
+    The smallest variant at least ``size`` pixels wide is chosen (or the
+    largest available when none is big enough). Without a size the
+    largest variant is used. Falls back to the original PNG when no
+    variants have been built.
+
+    Args:
+        letter: Letter to look up (case-insensitive).
+        size: Requested display width in device pixels.
+        accept: Client Accept header.
+        variants_dir: Root directory of the generated variants.
+        original_dir: Directory of the full-size originals.
+
+    Returns:
+        Tuple of (path, mimetype), or None if the letter has no image.
+    """
+    letter = letter.upper()
+    widths = _available_widths(variants_dir)
+
+    if widths:
+        if size:
+            candidates = [w for w in widths if w >= size] or [widths[-1]]
+            width = candidates[0]
+        else:
+            width = widths[-1]
+
+        for ext in preferred_formats(accept):
+            path = variant_path(letter, width, ext, variants_dir)
+            if os.path.exists(path):
+                return path, VARIANT_FORMATS[ext]
+
+    original = os.path.join(original_dir, f"{letter}.png")
+    if os.path.exists(original):
+        return original, 'image/png'
+    return None
+
+
+@lru_cache(maxsize=512)
+def read_variant(path: str, version: int = 0) -> bytes:
+    """Read (and cache) the encoded bytes of an image file.
+
+    Args:
+        path: Path returned by select_variant.
+        version: variants_version() at the time of the call, so a
+            rebuilt file is read again.
+
+    Returns:
+        Raw file contents.
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def clear_caches() -> None:
+    """Forget cached directory listings and file contents."""
+    _list_widths.cache_clear()
+    read_variant.cache_clear()
+
+
+# Build variants when run as a script
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    paths = build_variants()
+
+    original_size = sum(
+        os.path.getsize(os.path.join(LETTER_IMAGES_DIR, f))
+        for f in os.listdir(LETTER_IMAGES_DIR) if f.endswith('.png')
+    )
+    print(f"Originals: {original_size / 1024:.0f} KB")
+    for width in VARIANT_WIDTHS:
+        for ext in VARIANT_FORMATS:
+            total = sum(os.path.getsize(p) for p in paths
+                        if p.endswith(f".{ext}") and os.sep + str(width) + os.sep in p)
+            if total:
+                print(f"  {width}px {ext}: {total / 1024:.0f} KB")
@@ -0,0 +1,245 @@
+"""
+Noisy Channel Module
+
+This module decodes a lattice of letter candidates (the classifier's
+top-k probabilities for every committed position) into words. A beam
+search scores letter paths with the classifier probabilities, a
+confusion matrix measured on the training set, and the word-level
+language model from the word segmenter, so an "M" that was almost an
+"N" can still become the word the user meant.
+"""
+
+import os
+import json
+import math
+import logging
+import threading
+from typing import Optional, Sequence
+
+try:
+    from functions.word_segmenter import (
+        LanguageModel, SQUEEZE_PENALTY, get_segmenter, format_sentence
+    )
+except ImportError:
+    from word_segmenter import (
+        LanguageModel, SQUEEZE_PENALTY, get_segmenter, format_sentence
+    )
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Get base directory for the confusion matrix
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFUSION_PATH = os.path.join(BASE_DIR, '..', 'model', 'confusion.json')
+
+LETTERS = [chr(65 + i) for i in range(26)]
+
+# Decoder settings
+BEAM_WIDTH = int(os.getenv('DECODER_BEAM_WIDTH', '32'))
+CONFUSION_CANDIDATES = 3       # Extra letters taken from the confusion matrix
+CLASSIFIER_WEIGHT = 0.7        # Classifier probability vs. confusion likelihood
+CHANNEL_WEIGHT = 1.0           # Channel score vs. language model score
+CONFUSION_SMOOTHING = 1.0      # Add-alpha smoothing of confusion counts
+DEFAULT_ACCURACY = 0.9         # Diagonal mass used without a measured matrix
+MIN_PROBABILITY = 1e-6
+
+# A lattice position: candidate letters with probabilities, best first
+LatticeEntry = Sequence[tuple[str, float]]
+
+
+class ConfusionModel:
+    """P(observed letter | intended letter) estimated from the training set."""
+
+    def __init__(self, counts: Optional[dict[str, dict[str, float]]] = None) -> None:
+        """Initialize from confusion counts.
+
+        Args:
+            counts: counts[intended][observed]. Without counts every letter
+                is assumed to be recognized with DEFAULT_ACCURACY and
+                confused uniformly otherwise.
+        """
+        self.likelihood: dict[str, dict[str, float]] = {}
+        for intended in LETTERS:
+            if counts and intended in counts:
+                row = counts[intended]
+                total = sum(row.values()) + CONFUSION_SMOOTHING * len(LETTERS)
+                self.likelihood[intended] = {
+                    observed: (row.get(observed, 0.0) + CONFUSION_SMOOTHING) / total
+                    for observed in LETTERS
+                }
+            else:
+                off_diagonal = (1 - DEFAULT_ACCURACY) / (len(LETTERS) - 1)
+                self.likelihood[intended] = {
+                    observed: DEFAULT_ACCURACY if observed == intended else off_diagonal
+                    for observed in LETTERS
+                }
+
+        # Letters most often mistaken for each observed letter (only known
+        # from a measured matrix; the uniform model suggests none)
+        self.measured = bool(counts)
+        self._confusable: dict[str, list[str]] = {} if not counts else {
+            observed: sorted(
+                (c for c in LETTERS if c != observed),
+                key=lambda c: self.likelihood[c][observed],
+                reverse=True
+            )
+            for observed in LETTERS
+        }
+
+    @classmethod
+    def from_file(cls, path: str = CONFUSION_PATH) -> 'ConfusionModel':
+        """Load a matrix written by model-creation/build_confusion_matrix.py.
+
+        Falls back to the uniform model when the file does not exist.
+        """
+        if not os.path.exists(path):
+            logger.info(f"No confusion matrix at {path}, using uniform confusion model")
+            return cls()
+
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        labels = data['labels']
+        counts = {
+            intended: dict(zip(labels, row))
+            for intended, row in zip(labels, data['matrix'])
+        }
+        return cls(counts)
+
+    def p_observed(self, observed: str, intended: str) -> float:
+        """Probability that the classifier outputs observed when intended was signed."""
+        return self.likelihood.get(intended, {}).get(observed, MIN_PROBABILITY)
+
+    def confusable(self, observed: str, n: int) -> list[str]:
+        """The n letters most likely to have been signed when observed was seen."""
+        return self._confusable.get(observed, [])[:n]
+
+
+class NoisyChannelDecoder:
+    """Beam-search decoder from a letter lattice to words."""
+
+    def __init__(self, language_model: LanguageModel, confusion: ConfusionModel,
+                 beam_width: int = BEAM_WIDTH) -> None:
+        """Initialize the decoder.
+
+        Args:
+            language_model: Word-level language model.
+            confusion: Classifier confusion model.
+            beam_width: Number of partial hypotheses kept per position.
+        """
+        self.lm = language_model
+        self.confusion = confusion
+        self.beam_width = beam_width
+
+        # Every prefix of every vocabulary word, for pruning partial words
+        self._prefixes: set[str] = set()
+        for word in language_model.unigrams:
+            for i in range(1, len(word) + 1):
+                self._prefixes.add(word[:i])
+
+    def _emissions(self, entry: LatticeEntry) -> list[tuple[str, float]]:
+        """Channel log-scores of the letters that may have been signed."""
+        if not entry:
+            return []
+        probs = {c.upper(): p for c, p in entry}
+        observed = entry[0][0].upper()
+        letters = list(probs) + [
+            c for c in self.confusion.confusable(observed, CONFUSION_CANDIDATES) if c not in probs
+        ]
+
+        emissions = []
+        for letter in letters:
+            p = (CLASSIFIER_WEIGHT * probs.get(letter, 0.0)
+                 + (1 - CLASSIFIER_WEIGHT) * self.confusion.p_observed(observed, letter))
+            emissions.append((letter.lower(), CHANNEL_WEIGHT * math.log10(max(p, MIN_PROBABILITY))))
+        return emissions
+
+    def decode(self, lattice: Sequence[LatticeEntry]) -> Optional[list[str]]:
+        """Find the most probable word sequence for a lattice.
+
+        Args:
+            lattice: One candidate list per committed letter position.
+
+        Returns:
+            List of lowercase words, or None if no path spells
+            in-vocabulary words (the caller should fall back to the
+            segmenter).
+        """
+        # Hypothesis: (score, words, partial word)
+        beam: list[tuple[float, tuple[str, ...], str]] = [(0.0, (), '')]
+
+        for entry in lattice:
+            expanded: dict[tuple[tuple[str, ...], str], float] = {}
+            for score, words, partial in beam:
+                for letter, emission in self._emissions(entry):
+                    # The detector never commits the same letter twice in a
+                    # row, so also try a doubled letter ("helo" -> "hello")
+                    for spelled, extra in ((letter, 0.0), (letter * 2, SQUEEZE_PENALTY)):
+                        candidate = partial + spelled
+                        if candidate not in self._prefixes:
+                            continue
+                        base = score + emission + extra
+
+                        key = (words, candidate)
+                        if base > expanded.get(key, -math.inf):
+                            expanded[key] = base
+
+                        if candidate in self.lm:
+                            prev = words[-1] if words else None
+                            closed = base + self.lm.log_prob(candidate, prev)
+                            key = (words + (candidate,), '')
+                            if closed > expanded.get(key, -math.inf):
+                                expanded[key] = closed
+
+            if not expanded:
+                return None
+
+            # Closed hypotheses have already paid their language model cost
+            # and open ones have not, so they are pruned separately
+            ranked = sorted(
+                ((score, words, partial) for (words, partial), score in expanded.items()),
+                key=lambda h: h[0],
+                reverse=True
+            )
+            beam = ([h for h in ranked if not h[2]][:self.beam_width]
+                    + [h for h in ranked if h[2]][:self.beam_width])
+
+        complete = [h for h in beam if not h[2]]
+        if not complete:
+            return None
+        return list(max(complete, key=lambda h: h[0])[1])
+
+
+_decoder: Optional[NoisyChannelDecoder] = None
+_decoder_lock = threading.Lock()
+
+
+def get_decoder() -> NoisyChannelDecoder:
+    """Return the shared decoder, loading its models on first use."""
+    global _decoder
+    if _decoder is None:
+        with _decoder_lock:
+            if _decoder is None:
+                _decoder = NoisyChannelDecoder(get_segmenter().lm, ConfusionModel.from_file())
+    return _decoder
+
+
+def decode_lattice(lattice: Sequence[LatticeEntry]) -> str:
+    """Decode a letter lattice into a formatted sentence.
+
+    Falls back to segmenting the top-1 letters when the beam finds no
+    path made of dictionary words.
+
+    Args:
+        lattice: One candidate list per committed letter position.
+
+    Returns:
+        Corrected sentence, or "" for an empty lattice.
+    """
+    if not lattice:
+        return ""
+
+    words = get_decoder().decode(lattice)
+    if words is None:
+        top_letters = ''.join(entry[0][0] for entry in lattice if entry)
+        words = get_segmenter().segment(top_letters)
+    return format_sentence(words)
@@ -0,0 +1,156 @@
+"""
+Presence Module
+
+This module decides, for each video frame, whether hand detection needs
+to run at all. An empty or static scene looks the same frame after
+frame, so a downsampled grayscale copy of each frame is compared with
+the previous one; MediaPipe only runs when:
+
+- enough of the picture changed (something moved into view), optionally
+  counting only skin-coloured pixels;
+- hands or motion were seen within the last PRESENCE_HOLD seconds, so a
+  hand held still while forming a letter keeps being recognized;
+- PRESENCE_HEARTBEAT seconds passed since the last detection, in case
+  something arrived that the motion check missed.
+
+A hand moving into view is detected in the frame it appears in, and the
+check itself costs a fraction of a millisecond.
+"""
+
+import os
+import time
+import logging
+from typing import Any, Optional
+
+import cv2
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PRESENCE_GATE = os.getenv('PRESENCE_GATE', 'true').lower() in ('1', 'true', 'yes')
+PRESENCE_WIDTH = int(os.getenv('PRESENCE_WIDTH', '80'))                      # Pixels
+PRESENCE_MOTION_THRESHOLD = int(os.getenv('PRESENCE_MOTION_THRESHOLD', '16'))  # Grey levels
+PRESENCE_MOTION_AREA = float(os.getenv('PRESENCE_MOTION_AREA', '0.005'))     # Share of the frame
+PRESENCE_SKIN = os.getenv('PRESENCE_SKIN', 'false').lower() in ('1', 'true', 'yes')
+PRESENCE_HEARTBEAT = float(os.getenv('PRESENCE_HEARTBEAT', '1.0'))           # Seconds
+PRESENCE_HOLD = float(os.getenv('PRESENCE_HOLD', '1.0'))                     # Seconds
+
+# Skin colour range in YCrCb (Cr, Cb), wide enough for most skin tones
+SKIN_LOWER = np.array([0, 133, 77], dtype=np.uint8)
+SKIN_UPPER = np.array([255, 173, 127], dtype=np.uint8)
+
+
+class PresenceGate:
+    """Skips hand detection on frames where nothing can have changed.
+
+    One instance per camera, used by one thread: should_detect() before
+    each frame, then update() with whether the detection found hands.
+    """
+
+    def __init__(self, enabled: bool = PRESENCE_GATE, width: int = PRESENCE_WIDTH,
+                 motion_threshold: int = PRESENCE_MOTION_THRESHOLD,
+                 motion_area: float = PRESENCE_MOTION_AREA, skin: bool = PRESENCE_SKIN,
+                 heartbeat: float = PRESENCE_HEARTBEAT, hold: float = PRESENCE_HOLD) -> None:
+        """Initialize the gate.
+
+        Args:
+            enabled: False lets every frame through.
+            width: Width of the copy frames are compared at.
+            motion_threshold: Grey-level change that counts as motion.
+            motion_area: Share of the picture that must move.
+            skin: Count only skin-coloured moving pixels.
+            heartbeat: Longest time between detections.
+            hold: Seconds to keep detecting after hands or motion.
+        """
+        self.enabled = enabled
+        self.width = width
+        self.motion_threshold = motion_threshold
+        self.motion_area = motion_area
+        self.skin = skin
+        self.heartbeat = heartbeat
+        self.hold = hold
+
+        # Downsampled copies, allocated for the first frame and reused;
+        # the current and previous grey frames swap roles every frame
+        self._small: Optional[np.ndarray] = None
+        self._gray: Optional[np.ndarray] = None
+        self._previous: Optional[np.ndarray] = None
+        self._moving: Optional[np.ndarray] = None
+        self._ycrcb: Optional[np.ndarray] = None
+        self._skin: Optional[np.ndarray] = None
+        self._last_active = float('-inf')
+        self._last_detection = float('-inf')
+        self.frames = 0
+        self.skipped = 0
+        self.reasons = {'motion': 0, 'hold': 0, 'heartbeat': 0}
+        self._check_seconds = 0.0
+
+    def motion(self, frame: np.ndarray) -> float:
+        """Share of the (downsampled) picture that changed since the last call."""
+        height, width = frame.shape[:2]
+        size = (self.width, max(int(round(height * self.width / width)), 1))
+        first = self._small is None or self._small.shape[:2] != size[::-1]
+        if first:
+            self._small = np.empty(size[::-1] + (3,), dtype=np.uint8)
+            self._gray = np.empty(size[::-1], dtype=np.uint8)
+            self._previous = np.empty_like(self._gray)
+            self._moving = np.empty_like(self._gray)
+            self._ycrcb = np.empty_like(self._small)
+            self._skin = np.empty_like(self._gray)
+
+        small = cv2.resize(frame, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        self._gray, self._previous = self._previous, self._gray
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        cv2.GaussianBlur(gray, (5, 5), 0, dst=gray)
+        if first:
+            return 1.0
+
+        moving = cv2.absdiff(gray, self._previous, dst=self._moving)
+        cv2.threshold(moving, self.motion_threshold, 255, cv2.THRESH_BINARY, dst=moving)
+        if self.skin:
+            cv2.cvtColor(small, cv2.COLOR_BGR2YCrCb, dst=self._ycrcb)
+            cv2.inRange(self._ycrcb, SKIN_LOWER, SKIN_UPPER, dst=self._skin)
+            cv2.bitwise_and(moving, self._skin, dst=moving)
+        return cv2.countNonZero(moving) / moving.size
+
+    def should_detect(self, frame: np.ndarray, now: Optional[float] = None) -> bool:
+        """Whether hand detection should run on this BGR frame."""
+        if not self.enabled:
+            return True
+        now = time.monotonic() if now is None else now
+        self.frames += 1
+
+        start = time.perf_counter()
+        moved = self.motion(frame) >= self.motion_area
+        self._check_seconds += time.perf_counter() - start
+
+        if moved:
+            self._last_active = now
+            reason = 'motion'
+        elif now - self._last_active < self.hold:
+            reason = 'hold'
+        elif now - self._last_detection >= self.heartbeat:
+            reason = 'heartbeat'
+        else:
+            self.skipped += 1
+            return False
+
+        self.reasons[reason] += 1
+        self._last_detection = now
+        return True
+
+    def update(self, hands_found: bool, now: Optional[float] = None) -> None:
+        """Record the result of a detection the gate let through."""
+        if hands_found:
+            self._last_active = time.monotonic() if now is None else now
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'skip_rate': round(self.skipped / self.frames, 3) if self.frames else 0.0,
+            'detections': dict(self.reasons),
+            'mean_check_ms': round(self._check_seconds / self.frames * 1000, 3) if self.frames else None,
+        }
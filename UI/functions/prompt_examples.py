@@ -0,0 +1,132 @@
+"""
+Prompt Examples Module
+
+This module stores the few-shot examples used by the text correction
+prompt and retrieves the ones most similar to an input. Inputs are
+compared as character n-gram vectors (spaces removed, so "H E L L O"
+and "HELLO" look alike) through an inverted index, which keeps lookups
+proportional to the n-grams of the query rather than the store size.
+"""
+
+import os
+import json
+import math
+import logging
+from collections import Counter
+from typing import Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Get base directory for the example file
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLES_PATH = os.path.join(BASE_DIR, '..', 'datasets', 'text_fix_examples.json')
+
+NGRAM_SIZE = 3
+
+
+def load_examples(path: str = EXAMPLES_PATH) -> list[dict[str, str]]:
+    """Load few-shot examples from a JSON file.
+
+    Args:
+        path: JSON list of {"category", "input", "output"} objects.
+
+    Returns:
+        List of example dictionaries in file order.
+    """
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def char_ngrams(text: str, n: int = NGRAM_SIZE) -> Counter:
+    """Count the character n-grams of the letters in text.
+
+    The letters are padded with boundary markers so short inputs such
+    as acronyms still produce n-grams.
+    """
+    letters = ''.join(c for c in text.lower() if c.isalpha())
+    padded = f"^{letters}$"
+    return Counter(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+
+
+def _normalize(counts: Counter) -> dict[str, float]:
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {gram: v / norm for gram, v in counts.items()}
+
+
+class ExampleStore:
+    """Nearest-neighbor index over few-shot examples."""
+
+    def __init__(self, examples: list[dict[str, str]], n: int = NGRAM_SIZE) -> None:
+        """Index the examples.
+
+        Args:
+            examples: Example dictionaries with 'input' and 'output' keys.
+            n: Character n-gram size.
+        """
+        self.examples = examples
+        self.n = n
+        self._index: dict[str, list[tuple[int, float]]] = {}
+
+        for i, example in enumerate(examples):
+            for gram, weight in _normalize(char_ngrams(example['input'], n)).items():
+                self._index.setdefault(gram, []).append((i, weight))
+
+    def __len__(self) -> int:
+        return len(self.examples)
+
+    def nearest(self, text: str, k: int, exclude: Optional[set[int]] = None) -> list[dict[str, str]]:
+        """Return the k examples whose inputs are most similar to text.
+
+        Args:
+            text: Query input.
+            k: Number of examples to return.
+            exclude: Example indices to skip (used for leave-one-out evaluation).
+
+        Returns:
+            Up to k examples, most similar first. Ties keep file order.
+        """
+        scores: dict[int, float] = {}
+        for gram, weight in _normalize(char_ngrams(text, self.n)).items():
+            for i, example_weight in self._index.get(gram, ()):
+                scores[i] = scores.get(i, 0.0) + weight * example_weight
+
+        exclude = exclude or set()
+        ranked = sorted((i for i in scores if i not in exclude), key=lambda i: (-scores[i], i))
+        return [self.examples[i] for i in ranked[:k]]
+
+
+def format_examples(examples: list[dict[str, str]], grouped: bool = False) -> str:
+    """Render examples in the prompt's "Input:/Output:" format.
+
+    Args:
+        examples: Examples to render.
+        grouped: Emit a category heading whenever the category changes
+            (the layout of the full prompt).
+
+    Returns:
+        Prompt text for the examples.
+    """
+    lines: list[str] = []
+    category = None
+    for example in examples:
+        heading = example.get('category', 'Examples') if grouped else 'Examples'
+        if heading != category:
+            lines.append(f"\n{heading}:")
+            category = heading
+        lines.append(f"Input: {example['input']}\nOutput: {example['output']}\n")
+    return '\n'.join(lines)
+
+
+def build_prompt(rules: str, examples: list[dict[str, str]], grouped: bool = False) -> str:
+    """Combine the rules and examples into a system prompt.
+
+    Args:
+        rules: Instruction text placed before the examples.
+        examples: Few-shot examples.
+        grouped: Keep category headings (full prompt layout).
+
+    Returns:
+        System prompt text.
+    """
+    return f"{rules}\n{format_examples(examples, grouped)}"
@@ -0,0 +1,237 @@
+"""
+Resilience Module
+
+This module bounds how long a request thread can wait on an external
+provider (OpenAI, ElevenLabs, Google Speech). Each call runs against a
+latency budget, and each provider has a circuit breaker: after repeated
+failures or missed budgets the breaker opens and calls are skipped
+outright, so callers go straight to their local fallback until the
+provider has had time to recover.
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Breaker defaults
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', '5'))
+BREAKER_RESET_TIMEOUT = float(os.getenv('BREAKER_RESET_TIMEOUT', '30.0'))
+
+# Threads that run external calls; a call that misses its budget keeps its
+# thread until the provider answers or its own timeout fires
+EXTERNAL_CALL_WORKERS = int(os.getenv('EXTERNAL_CALL_WORKERS', '16'))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class DeadlineExceeded(Exception):
+    """The provider did not answer within the latency budget."""
+
+
+class CircuitOpenError(Exception):
+    """The provider's circuit breaker is open; the call was not made."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one provider.
+
+    Closed: calls go through. After failure_threshold consecutive
+    failures it opens and rejects calls for reset_timeout seconds, then
+    lets a single trial call through (half-open); its outcome closes or
+    re-opens the breaker.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT) -> None:
+        """Initialize the breaker.
+
+        Args:
+            name: Provider name used in logs and metrics.
+            failure_threshold: Consecutive failures that open the breaker.
+            reset_timeout: Seconds to stay open before a trial call.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.budget_misses = 0
+        self.short_circuits = 0
+        self.opens = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout passed."""
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may be made now (and count it)."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == OPEN or (state == HALF_OPEN and self._trial_in_flight):
+                self.short_circuits += 1
+                return False
+            if state == HALF_OPEN:
+                self._trial_in_flight = True
+            self.calls += 1
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the breaker."""
+        with self._lock:
+            self.successes += 1
+            self._consecutive_failures = 0
+            if self._state != CLOSED:
+                logger.info(f"Circuit breaker '{self.name}' closed")
+            self._state = CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self, budget_miss: bool = False) -> None:
+        """Record a failed call, opening the breaker past the threshold.
+
+        Args:
+            budget_miss: The failure was a missed latency budget.
+        """
+        with self._lock:
+            self.failures += 1
+            if budget_miss:
+                self.budget_misses += 1
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.opens += 1
+                    logger.warning(
+                        f"Circuit breaker '{self.name}' opened after "
+                        f"{self._consecutive_failures} consecutive failures"
+                    )
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def reset(self) -> None:
+        """Close the breaker and clear the failure streak."""
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def stats(self) -> dict[str, Any]:
+        """Return breaker state and counters.
+
+        Returns:
+            Dictionary of breaker metrics.
+        """
+        with self._lock:
+            return {
+                'state': self._current_state(time.monotonic()),
+                'consecutive_failures': self._consecutive_failures,
+                'calls': self.calls,
+                'successes': self.successes,
+                'failures': self.failures,
+                'budget_misses': self.budget_misses,
+                'short_circuits': self.short_circuits,
+                'opens': self.opens,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the shared breaker for a provider, creating it on first use."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def breaker_stats() -> dict[str, dict[str, Any]]:
+    """Return the metrics of every provider breaker."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _breakers_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=EXTERNAL_CALL_WORKERS, thread_name_prefix='external'
+            )
+        return _executor
+
+
+def call_with_deadline(breaker: CircuitBreaker, deadline: float,
+                       fn: Callable[..., Any], *args: Any,
+                       discard: Optional[Callable[[Any], None]] = None, **kwargs: Any) -> Any:
+    """Call fn through a provider's breaker within a latency budget.
+
+    The call runs on a worker thread; if it has not returned after
+    deadline seconds the caller stops waiting (the call itself finishes
+    in the background and its result is discarded).
+
+    Args:
+        breaker: Breaker of the provider being called.
+        deadline: Latency budget in seconds (0 or less waits indefinitely).
+        fn: Function making the external call.
+        *args: Positional arguments for fn.
+        discard: Called with the result of a call that returns after the
+            budget ran out, to release what it holds (e.g. close an open
+            response).
+        **kwargs: Keyword arguments for fn.
+
+    Returns:
+        The return value of fn.
+
+    Raises:
+        CircuitOpenError: The breaker is open; fn was not called.
+        DeadlineExceeded: fn did not return within the budget.
+        Exception: Whatever fn raised.
+    """
+    if not breaker.allow():
+        raise CircuitOpenError(f"{breaker.name} circuit is open")
+
+    future = _pool().submit(fn, *args, **kwargs)
+    try:
+        result = future.result(timeout=deadline if deadline > 0 else None)
+    except FutureTimeoutError:
+        if discard is not None:
+            def discard_late(late: Future) -> None:
+                if not late.cancelled() and late.exception() is None:
+                    discard(late.result())
+            future.add_done_callback(discard_late)
+        breaker.record_failure(budget_miss=True)
+        logger.warning(f"{breaker.name} call exceeded its {deadline:.1f}s budget")
+        raise DeadlineExceeded(f"{breaker.name} did not answer within {deadline:.1f}s")
+    except Exception:
+        breaker.record_failure()
+        raise
+
+    breaker.record_success()
+    return result
@@ -0,0 +1,374 @@
+"""
+Speculative Correction Module
+
+This module corrects a fingerspelled sentence while it is still being
+recorded. Whenever the committed letters contain a finished chunk of
+words (the user paused, or the word segmenter places a word boundary
+far enough back that later letters are unlikely to move it), that
+chunk is sent for correction on a background thread. When recording
+stops only the uncorrected tail is corrected and joined to the chunk
+results, so the user does not wait for a full round trip on long
+sentences.
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+
+try:
+    from functions.word_segmenter import word_boundaries
+except ImportError:
+    from word_segmenter import word_boundaries
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Speculation settings
+SPECULATIVE_CORRECTION = os.getenv('SPECULATIVE_CORRECTION', 'true').lower() in ('1', 'true', 'yes')
+SPECULATIVE_PAUSE = float(os.getenv('SPECULATIVE_PAUSE', '4.0'))        # Seconds without a new letter
+SPECULATIVE_HOLDBACK_WORDS = int(os.getenv('SPECULATIVE_HOLDBACK_WORDS', '2'))
+SPECULATIVE_MIN_LETTERS = int(os.getenv('SPECULATIVE_MIN_LETTERS', '6'))
+SPECULATIVE_WORKERS = int(os.getenv('SPECULATIVE_WORKERS', '2'))
+SPECULATIVE_WAIT = float(os.getenv('SPECULATIVE_WAIT', '15.0'))        # Max wait for a chunk on stop
+
+# Corrector signature: (spaced letters, letter lattice) -> sentence
+Corrector = Callable[[str, Optional[list]], str]
+# Streaming corrector: yields {"delta": ...} events and one {"final": ...}
+StreamingCorrector = Callable[[str, Optional[list]], Iterator[dict[str, str]]]
+
+
+def _is_title_case(text: str) -> bool:
+    words = text.split()
+    return bool(words) and all(w[0].isupper() for w in words if w[0].isalpha())
+
+
+def join_corrections(parts: list[str]) -> str:
+    """Join independently corrected chunks into one sentence.
+
+    Terminal punctuation is removed from every chunk but the last, and a
+    chunk's first word is lowercased to continue the sentence unless it
+    is "I", an acronym, or the text so far is title-cased (the offline
+    corrector's style).
+
+    Args:
+        parts: Corrected chunks in order.
+
+    Returns:
+        The combined sentence.
+    """
+    parts = [p.strip() for p in parts if p and p.strip()]
+    if not parts:
+        return ""
+
+    pieces: list[str] = []
+    for i, part in enumerate(parts):
+        if i < len(parts) - 1:
+            part = part.rstrip('.!?')
+        if pieces and not _is_title_case(' '.join(pieces)):
+            first, _, rest = part.partition(' ')
+            keep = first == 'I' or first.startswith("I'") or (len(first) > 1 and first.isupper())
+            if not keep:
+                part = first[:1].lower() + first[1:] + (' ' + rest if rest else '')
+        pieces.append(part)
+
+    sentence = ' '.join(pieces)
+    # A question is recognized from its opening words, which only the
+    # first chunk saw
+    if parts[0].endswith('?') and sentence.endswith('.'):
+        sentence = sentence[:-1] + '?'
+    return sentence
+
+
+class _Chunk:
+    """A span of committed letters with its background correction."""
+
+    def __init__(self, start: int, end: int, text: str, lattice: Optional[list], future: Future) -> None:
+        self.start = start
+        self.end = end
+        self.text = text
+        self.lattice = lattice
+        self.future = future
+
+
+class SpeculativeCorrector:
+    """Corrects finished chunks of a sentence in the background."""
+
+    def __init__(
+        self,
+        correct: Corrector,
+        stream: Optional[StreamingCorrector] = None,
+        boundaries: Callable[[str], list[int]] = word_boundaries,
+        enabled: bool = SPECULATIVE_CORRECTION,
+        holdback_words: int = SPECULATIVE_HOLDBACK_WORDS,
+        min_letters: int = SPECULATIVE_MIN_LETTERS,
+        max_workers: int = SPECULATIVE_WORKERS,
+        wait_timeout: float = SPECULATIVE_WAIT
+    ) -> None:
+        """Initialize the corrector.
+
+        Args:
+            correct: Function correcting spaced letters (and an optional
+                lattice) into a sentence, e.g. text_fix.generate_sentences.
+            stream: Streaming counterpart of correct used by finish_stream(),
+                e.g. text_fix.generate_sentences_stream.
+            boundaries: Function returning word end offsets for letters.
+            enabled: When False, finish() simply corrects everything.
+            holdback_words: Words at the end of the pending letters that are
+                never dispatched, since new letters may still change them.
+            min_letters: Smallest chunk dispatched on a word boundary.
+            max_workers: Background threads for chunk corrections (word
+                boundaries are planned on a thread of their own, so they
+                never wait behind a slow correction).
+            wait_timeout: Seconds finish() waits for an in-flight chunk
+                before correcting it again itself.
+        """
+        self.correct = correct
+        self.stream = stream
+        self.boundaries = boundaries
+        self.enabled = enabled
+        self.holdback_words = holdback_words
+        self.min_letters = min_letters
+        self.max_workers = max_workers
+        self.wait_timeout = wait_timeout
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._planner: Optional[ThreadPoolExecutor] = None
+        self._session = 0
+        self._letters: list[str] = []
+        self._lattice: list = []
+        self._chunks: list[_Chunk] = []
+        self._planning = False
+
+        self.chunks_dispatched = 0
+        self.chunks_reused = 0
+        self.chunks_discarded = 0
+        self.chunks_recomputed = 0
+        self.finishes = 0
+        self.letters_speculated = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """Create the worker pool on first use (called with the lock held)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='speculative'
+            )
+        return self._executor
+
+    def _planner_pool(self) -> ThreadPoolExecutor:
+        """Create the planning thread on first use (called with the lock held)."""
+        if self._planner is None:
+            self._planner = ThreadPoolExecutor(max_workers=1, thread_name_prefix='speculative-plan')
+        return self._planner
+
+    def _pending_start(self) -> int:
+        return self._chunks[-1].end if self._chunks else 0
+
+    def _dispatch(self, end: int) -> None:
+        """Send letters from the pending start to end for correction (lock held)."""
+        start = self._pending_start()
+        text = ' '.join(self._letters[start:end])
+        lattice = self._lattice[start:end] or None
+        future = self._pool().submit(self.correct, text, lattice)
+        self._chunks.append(_Chunk(start, end, text, lattice, future))
+        self.chunks_dispatched += 1
+        self.letters_speculated += end - start
+        logger.debug(f"Speculative correction of letters {start}-{end}: {text}")
+
+    def reset(self) -> None:
+        """Discard the current sentence and any in-flight chunks."""
+        with self._lock:
+            self._session += 1
+            self._planning = False
+            for chunk in self._chunks:
+                chunk.future.cancel()
+            self.chunks_discarded += len(self._chunks)
+            self._chunks = []
+            self._letters = []
+            self._lattice = []
+
+    def update(self, letters: list[str], lattice: Optional[list] = None) -> None:
+        """Record the committed letters and look for a finished chunk.
+
+        The word boundary search runs on the planning thread, so this is
+        cheap enough to call from the frame loop on every committed letter.
+
+        Args:
+            letters: All letters committed so far.
+            lattice: Letter candidates per committed position.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._letters = list(letters)
+            self._lattice = list(lattice or [])
+            if not self._planning:
+                self._planning = True
+                self._planner_pool().submit(self._plan, self._session)
+
+    def _plan(self, session: int) -> None:
+        """Dispatch a chunk ending at a settled word boundary, if any."""
+        try:
+            while True:
+                with self._lock:
+                    if session != self._session:
+                        return
+                    start = self._pending_start()
+                    pending = self._letters[start:]
+                    seen = len(self._letters)
+
+                ends = self.boundaries(''.join(pending)) if len(pending) >= self.min_letters else []
+
+                with self._lock:
+                    if session != self._session:
+                        return
+                    if len(ends) > self.holdback_words:
+                        cut = ends[-self.holdback_words - 1]
+                        if cut >= self.min_letters and start == self._pending_start():
+                            self._dispatch(start + cut)
+                    if len(self._letters) == seen:
+                        return
+        except Exception as e:
+            logger.error(f"Speculative planning failed: {e}")
+        finally:
+            with self._lock:
+                if session == self._session:
+                    self._planning = False
+
+    def on_pause(self) -> None:
+        """Dispatch every pending letter; call when the signer has paused."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if len(self._letters) > self._pending_start():
+                self._dispatch(len(self._letters))
+
+    def _take_chunks(self, letters: list[str]) -> list[_Chunk]:
+        """End the session and return the chunks still matching letters."""
+        with self._lock:
+            self._session += 1
+            self._planning = False
+            chunks = self._chunks
+            self._chunks = []
+            self._letters = []
+            self._lattice = []
+            self.finishes += 1
+
+        # Chunks only describe the letters they were built from
+        valid = []
+        for chunk in chunks:
+            if chunk.end > len(letters) or ' '.join(letters[chunk.start:chunk.end]) != chunk.text:
+                break
+            valid.append(chunk)
+        for chunk in chunks[len(valid):]:
+            chunk.future.cancel()
+        with self._lock:
+            self.chunks_discarded += len(chunks) - len(valid)
+        return valid
+
+    def _chunk_results(self, chunks: list[_Chunk]) -> list[str]:
+        """Wait for chunk corrections, redoing any that failed or timed out."""
+        parts = []
+        for chunk in chunks:
+            try:
+                parts.append(chunk.future.result(timeout=self.wait_timeout))
+                with self._lock:
+                    self.chunks_reused += 1
+            except Exception as e:
+                logger.warning(f"Speculative chunk unavailable ({e!r}), correcting it now")
+                parts.append(self.correct(chunk.text, chunk.lattice))
+                with self._lock:
+                    self.chunks_recomputed += 1
+        return parts
+
+    def finish(self, letters: list[str], lattice: Optional[list] = None) -> str:
+        """Correct the whole sentence, reusing finished chunk corrections.
+
+        Args:
+            letters: All committed letters.
+            lattice: Letter candidates per committed position.
+
+        Returns:
+            The corrected sentence.
+        """
+        lattice = list(lattice or [])
+        valid = self._take_chunks(letters)
+        if not valid:
+            return self.correct(' '.join(letters), lattice or None)
+
+        # The tail is corrected here while the chunks finish in the background
+        tail_start = valid[-1].end
+        tail = ''
+        if tail_start < len(letters):
+            tail = self.correct(' '.join(letters[tail_start:]), lattice[tail_start:] or None)
+
+        return join_corrections(self._chunk_results(valid) + [tail])
+
+    def finish_stream(self, letters: list[str], lattice: Optional[list] = None) -> Iterator[dict[str, str]]:
+        """Streaming finish(): reused chunks first, then the tail as it arrives.
+
+        Args:
+            letters: All committed letters.
+            lattice: Letter candidates per committed position.
+
+        Yields:
+            {"delta": text} events, then one {"final": sentence} event
+            (see text_fix.generate_sentences_stream).
+        """
+        if self.stream is None:
+            sentence = self.finish(letters, lattice)
+            yield {"delta": sentence}
+            yield {"final": sentence}
+            return
+
+        lattice = list(lattice or [])
+        valid = self._take_chunks(letters)
+        if not valid:
+            yield from self.stream(' '.join(letters), lattice or None)
+            return
+
+        parts = self._chunk_results(valid)
+        tail_start = valid[-1].end
+        if tail_start >= len(letters):
+            sentence = join_corrections(parts)
+            yield {"delta": sentence}
+            yield {"final": sentence}
+            return
+
+        yield {"delta": join_corrections(parts).rstrip('.!?') + ' '}
+        tail = ''
+        for event in self.stream(' '.join(letters[tail_start:]), lattice[tail_start:] or None):
+            if 'final' in event:
+                tail = event['final']
+            else:
+                yield event
+        yield {"final": join_corrections(parts + [tail])}
+
+    def stats(self) -> dict[str, int]:
+        """Return speculation counters.
+
+        Returns:
+            Dictionary of speculation metrics.
+        """
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'chunks_dispatched': self.chunks_dispatched,
+                'chunks_reused': self.chunks_reused,
+                'chunks_recomputed': self.chunks_recomputed,
+                'chunks_discarded': self.chunks_discarded,
+                'letters_speculated': self.letters_speculated,
+                'finishes': self.finishes,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool and the planning thread."""
+        with self._lock:
+            self._session += 1
+            for executor in (self._executor, self._planner):
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._planner = None
@@ -0,0 +1,158 @@
+"""
+Speech Prefetch Module
+
+This module starts text-to-speech synthesis as soon as a sentence is
+known, before the user asks to hear it, so the clip is already in the
+audio cache when /speak_text runs. Only the latest sentence matters:
+queued work for an older sentence is cancelled when a new one arrives
+or a new recording starts.
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Prefetch settings
+TTS_PREFETCH = os.getenv('TTS_PREFETCH', 'true').lower() in ('1', 'true', 'yes')
+TTS_PREFETCH_WORKERS = int(os.getenv('TTS_PREFETCH_WORKERS', '2'))
+TTS_PREFETCH_WAIT = float(os.getenv('TTS_PREFETCH_WAIT', '5.0'))   # Max wait for an in-flight clip
+
+# Synthesizer signature: text -> (path, temporary), see voice.synthesize_to_file
+Synthesizer = Callable[[str], tuple[Optional[str], bool]]
+
+
+class SpeechPrefetcher:
+    """Synthesizes the latest sentence in the background."""
+
+    def __init__(self, synthesize: Synthesizer, enabled: bool = TTS_PREFETCH,
+                 max_workers: int = TTS_PREFETCH_WORKERS) -> None:
+        """Initialize the prefetcher.
+
+        Args:
+            synthesize: Function synthesizing text into the audio cache.
+            enabled: When False, prefetch() does nothing.
+            max_workers: Synthesis requests allowed in flight at once.
+        """
+        self.synthesize = synthesize
+        self.enabled = enabled
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: dict[str, Future] = {}
+
+        self.submitted = 0
+        self.cancelled = 0
+        self.completed = 0
+        self.failed = 0
+        self.waits = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """Create the worker pool on first use (called with the lock held)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='tts-prefetch'
+            )
+        return self._executor
+
+    def _run(self, text: str) -> None:
+        try:
+            path, temporary = self.synthesize(text)
+            if temporary and path and os.path.exists(path):
+                # Nothing to reuse when the clip could not be cached
+                os.remove(path)
+            with self._lock:
+                if path:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+        except Exception as e:
+            logger.error(f"Speech prefetch failed: {e}")
+            with self._lock:
+                self.failed += 1
+        finally:
+            with self._lock:
+                self._pending.pop(text, None)
+
+    def prefetch(self, text: str) -> None:
+        """Start synthesizing text, cancelling queued work for older sentences.
+
+        Args:
+            text: Sentence that is likely to be spoken next.
+        """
+        if not self.enabled or not text or not text.strip():
+            return
+        with self._lock:
+            self._cancel_queued(keep=text)
+            if text in self._pending:
+                return
+            self._pending[text] = self._pool().submit(self._run, text)
+            self.submitted += 1
+            logger.debug(f"Prefetching speech for: {text[:50]}")
+
+    def _cancel_queued(self, keep: Optional[str] = None) -> None:
+        """Cancel queued (not yet running) requests (lock held)."""
+        for text, future in list(self._pending.items()):
+            if text != keep and future.cancel():
+                del self._pending[text]
+                self.cancelled += 1
+
+    def cancel(self) -> None:
+        """Cancel queued requests, e.g. when a new recording starts.
+
+        Requests already talking to the provider finish and fill the
+        cache; they cannot be interrupted mid-response.
+        """
+        with self._lock:
+            self._cancel_queued()
+
+    def wait_for(self, text: str, timeout: float = TTS_PREFETCH_WAIT) -> bool:
+        """Wait briefly for an in-flight prefetch of text.
+
+        Args:
+            text: Sentence about to be spoken.
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            True if a prefetch of text finished while waiting.
+        """
+        with self._lock:
+            future = self._pending.get(text)
+            if future is None:
+                return False
+            self.waits += 1
+        try:
+            future.result(timeout=timeout)
+            return True
+        except (FutureTimeoutError, CancelledError):
+            return False
+
+    def stats(self) -> dict[str, int]:
+        """Return prefetch counters.
+
+        Returns:
+            Dictionary of prefetch metrics.
+        """
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'in_flight': len(self._pending),
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'cancelled': self.cancelled,
+                'waits': self.waits,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, dropping queued requests."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._pending.clear()
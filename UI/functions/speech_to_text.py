@@ -3,12 +3,35 @@ Speech to Text Module
 
 This module provides speech recognition functionality using the
 SpeechRecognition library with Google's Speech Recognition API.
+Recordings uploaded by the browser are decoded, trimmed to the speech
+they contain and recognized on a bounded worker pool by a pluggable
+backend whose recognizer instances are reused across requests.
 """
 
+import io
+import os
 import logging
-from typing import Optional
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import numpy as np
 import speech_recognition as sr
 
+try:
+    from functions.resilience import get_breaker, call_with_deadline, DeadlineExceeded, CircuitOpenError
+    from functions.voice_activity import NoiseCalibration, find_speech
+except ImportError:
+    from resilience import get_breaker, call_with_deadline, DeadlineExceeded, CircuitOpenError
+    from voice_activity import NoiseCalibration, find_speech
+
+# Offline recognition is used when Google is slow or down, if installed
+try:
+    import pocketsphinx  # noqa: F401
+    SPHINX_AVAILABLE = True
+except ImportError:
+    SPHINX_AVAILABLE = False
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -16,12 +39,370 @@ logger = logging.getLogger(__name__)
 AMBIENT_NOISE_DURATION = 0.5  # seconds
 PHRASE_TIME_LIMIT = 10  # seconds
 
+# Latency budget for Google recognition (seconds), after the audio is captured
+SPEECH_RECOGNITION_DEADLINE = float(os.getenv("SPEECH_RECOGNITION_DEADLINE", "8.0"))
+google_speech_breaker = get_breaker("google_speech")
+
+# Uploaded recordings
+SPEECH_BACKEND = os.getenv("SPEECH_BACKEND", "google")          # google, sphinx or fixed
+SPEECH_FIXED_TRANSCRIPT = os.getenv("SPEECH_FIXED_TRANSCRIPT", "hello")
+SPEECH_WORKERS = int(os.getenv("SPEECH_WORKERS", "2"))
+SPEECH_MAX_PENDING = int(os.getenv("SPEECH_MAX_PENDING", "8"))  # Queued + running uploads
+SPEECH_SAMPLE_RATE = 16000                                      # Rate sent to the recognizer
+SPEECH_MAX_SECONDS = float(os.getenv("SPEECH_MAX_SECONDS", "15.0"))
+
+
+def _recognize_google(recognizer: sr.Recognizer, audio: sr.AudioData) -> Optional[str]:
+    """Google recognition where unintelligible speech is not a provider failure."""
+    if SPEECH_RECOGNITION_DEADLINE > 0:
+        # Bound the request itself, not just the wait for it, so an
+        # abandoned call frees its worker on the shared provider pool
+        recognizer.operation_timeout = SPEECH_RECOGNITION_DEADLINE
+    try:
+        return recognizer.recognize_google(audio)
+    except sr.UnknownValueError:
+        logger.warning("Could not understand audio - speech unclear")
+        return None
+
+
+def recognize_audio(recognizer: sr.Recognizer, audio: sr.AudioData) -> Optional[str]:
+    """Recognize captured audio with Google, within the latency budget.
+
+    Falls back to offline recognition (CMU Sphinx, if installed) when
+    Google misses its budget or its circuit breaker is open.
+
+    Args:
+        recognizer: Recognizer instance.
+        audio: Captured audio.
+
+    Returns:
+        Recognized text, or None if nothing could be recognized.
+
+    Raises:
+        sr.RequestError: Google failed and no offline recognizer is available.
+    """
+    try:
+        return call_with_deadline(
+            google_speech_breaker, SPEECH_RECOGNITION_DEADLINE, _recognize_google, recognizer, audio
+        )
+    except (DeadlineExceeded, CircuitOpenError) as e:
+        if not SPHINX_AVAILABLE:
+            logger.warning(f"Google Speech Recognition skipped and no offline recognizer installed: {e}")
+            return None
+        logger.warning(f"Google Speech Recognition skipped, using offline recognizer: {e}")
+        return recognizer.recognize_sphinx(audio)
+
+
+class AudioDecodeError(ValueError):
+    """The uploaded recording is not a readable WAV, AIFF or FLAC file."""
+
+
+class SpeechBusyError(Exception):
+    """Too many recordings are already waiting for recognition."""
+
+
+class RecognizerBackend(ABC):
+    """Turns captured audio into text.
+
+    Backends are created once and reused for every request, so they can
+    keep recognizers, connections or loaded models between calls.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def recognize(self, audio: sr.AudioData) -> Optional[str]:
+        """Recognize speech.
+
+        Args:
+            audio: Mono 16-bit audio containing speech.
+
+        Returns:
+            Recognized text, or None if nothing could be recognized.
+        """
+
+
+class GoogleBackend(RecognizerBackend):
+    """Google Speech Recognition, falling back to Sphinx if installed."""
+
+    name = 'google'
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def recognizer(self) -> sr.Recognizer:
+        """Return this worker thread's long-lived recognizer."""
+        recognizer = getattr(self._local, 'recognizer', None)
+        if recognizer is None:
+            recognizer = self._local.recognizer = sr.Recognizer()
+        return recognizer
+
+    def recognize(self, audio: sr.AudioData) -> Optional[str]:
+        return recognize_audio(self.recognizer(), audio)
+
+
+class SphinxBackend(GoogleBackend):
+    """Offline CMU Sphinx recognition (requires pocketsphinx)."""
+
+    name = 'sphinx'
+
+    def recognize(self, audio: sr.AudioData) -> Optional[str]:
+        try:
+            return self.recognizer().recognize_sphinx(audio)
+        except sr.UnknownValueError:
+            return None
+
+
+class FixedTranscriptBackend(RecognizerBackend):
+    """Local stand-in returning the same transcript for every clip.
+
+    Used by the tests and for load testing without a speech provider;
+    clips without speech are still rejected before it is called.
+    """
+
+    name = 'fixed'
+
+    def __init__(self, text: str = SPEECH_FIXED_TRANSCRIPT) -> None:
+        self.text = text
+        self.calls = 0
+
+    def recognize(self, audio: sr.AudioData) -> Optional[str]:
+        self.calls += 1
+        return self.text
+
+
+_backends: dict[str, Callable[[], RecognizerBackend]] = {
+    GoogleBackend.name: GoogleBackend,
+    SphinxBackend.name: SphinxBackend,
+    FixedTranscriptBackend.name: FixedTranscriptBackend,
+}
+
+
+def register_backend(name: str, factory: Callable[[], RecognizerBackend]) -> None:
+    """Make a recognizer backend available to create_backend().
+
+    Args:
+        name: Name used in SPEECH_BACKEND.
+        factory: Function creating the backend.
+    """
+    _backends[name] = factory
+
+
+def create_backend(name: str = SPEECH_BACKEND) -> RecognizerBackend:
+    """Create a recognizer backend by name.
+
+    Args:
+        name: Registered backend name; unknown names fall back to Google.
+
+    Returns:
+        The backend.
+    """
+    factory = _backends.get(name)
+    if factory is None:
+        logger.error(f"Unknown speech backend '{name}', using google")
+        factory = GoogleBackend
+    if factory is SphinxBackend and not SPHINX_AVAILABLE:
+        logger.error("SPEECH_BACKEND=sphinx but pocketsphinx is not installed, using google")
+        factory = GoogleBackend
+    return factory()
+
+
+def decode_audio(data: bytes) -> tuple[np.ndarray, int]:
+    """Decode a recording into mono 16-bit samples at SPEECH_SAMPLE_RATE.
+
+    Args:
+        data: WAV, AIFF or FLAC file contents.
+
+    Returns:
+        Tuple of (samples, sample_rate).
+
+    Raises:
+        AudioDecodeError: If the data cannot be decoded.
+    """
+    try:
+        with sr.AudioFile(io.BytesIO(data)) as source:
+            audio = sr.Recognizer().record(source)
+        raw = audio.get_raw_data(convert_rate=SPEECH_SAMPLE_RATE, convert_width=2)
+    except (ValueError, EOFError, AssertionError) as e:
+        raise AudioDecodeError(f"Unsupported or corrupt audio: {e}") from e
+    return np.frombuffer(raw, dtype='<i2'), SPEECH_SAMPLE_RATE
+
+
+class SpeechRecognizerService:
+    """Recognizes uploaded recordings on a bounded worker pool."""
+
+    def __init__(self, backend: RecognizerBackend, max_workers: int = SPEECH_WORKERS,
+                 max_pending: int = SPEECH_MAX_PENDING,
+                 max_seconds: float = SPEECH_MAX_SECONDS) -> None:
+        """Initialize the service.
+
+        Args:
+            backend: Backend used for every recording.
+            max_workers: Recordings recognized at once.
+            max_pending: Recordings queued or running before new ones are
+                rejected with SpeechBusyError.
+            max_seconds: Longest speech passed to the backend.
+        """
+        self.backend = backend
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_seconds = max_seconds
+        self.calibration = NoiseCalibration()
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+
+        self.uploads = 0
+        self.rejected = 0
+        self.invalid = 0
+        self.no_speech = 0
+        self.recognized = 0
+        self.unrecognized = 0
+        self.failed = 0
+        self.audio_seconds = 0.0
+        self.speech_seconds = 0.0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """Create the worker pool on first use (called with the lock held)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='speech'
+            )
+        return self._executor
+
+    def transcribe(self, data: bytes) -> Optional[str]:
+        """Decode, trim and recognize a recording on the calling thread.
+
+        Args:
+            data: WAV, AIFF or FLAC file contents.
+
+        Returns:
+            Recognized text, or None if the recording holds no
+            recognizable speech.
+
+        Raises:
+            AudioDecodeError: If the data cannot be decoded.
+        """
+        samples, sample_rate = decode_audio(data)
+        bounds = find_speech(samples, sample_rate, self.calibration)
+        with self._lock:
+            self.audio_seconds += len(samples) / sample_rate
+        if bounds is None:
+            with self._lock:
+                self.no_speech += 1
+            logger.info("No speech detected in uploaded audio")
+            return None
+
+        start, end = bounds
+        end = min(end, start + int(self.max_seconds * sample_rate))
+        speech = samples[start:end]
+        with self._lock:
+            self.speech_seconds += len(speech) / sample_rate
+
+        text = self.backend.recognize(sr.AudioData(speech.tobytes(), sample_rate, 2))
+        with self._lock:
+            if text:
+                self.recognized += 1
+            else:
+                self.unrecognized += 1
+        return text
+
+    def _run(self, data: bytes) -> Optional[str]:
+        try:
+            return self.transcribe(data)
+        except AudioDecodeError:
+            with self._lock:
+                self.invalid += 1
+            raise
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def submit(self, data: bytes) -> Future:
+        """Queue a recording for recognition.
+
+        Args:
+            data: WAV, AIFF or FLAC file contents.
+
+        Returns:
+            Future resolving to the text (see transcribe()).
+
+        Raises:
+            SpeechBusyError: If max_pending recordings are already queued.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise SpeechBusyError("Speech recognition is busy")
+            self._pending += 1
+            self.uploads += 1
+            return self._pool().submit(self._run, data)
+
+    def recognize_upload(self, data: bytes, timeout: Optional[float] = None) -> Optional[str]:
+        """Recognize a recording on the worker pool and wait for the text.
+
+        Args:
+            data: WAV, AIFF or FLAC file contents.
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            Recognized text, or None if nothing could be recognized.
+
+        Raises:
+            SpeechBusyError: If too many recordings are queued.
+            AudioDecodeError: If the data cannot be decoded.
+            concurrent.futures.TimeoutError: If recognition did not finish in time.
+        """
+        return self.submit(data).result(timeout=timeout)
+
+    def stats(self) -> dict[str, Any]:
+        """Return recognition counters.
+
+        Returns:
+            Dictionary of speech recognition metrics.
+        """
+        with self._lock:
+            return {
+                'backend': self.backend.name,
+                'pending': self._pending,
+                'uploads': self.uploads,
+                'rejected': self.rejected,
+                'invalid': self.invalid,
+                'no_speech': self.no_speech,
+                'recognized': self.recognized,
+                'unrecognized': self.unrecognized,
+                'failed': self.failed,
+                'audio_seconds': round(self.audio_seconds, 1),
+                'speech_seconds': round(self.speech_seconds, 1),
+                'noise_level': self.calibration.level,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, dropping queued recordings."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Server microphone recognizer; calibrated once and reused
+_microphone_recognizer = sr.Recognizer()
+_microphone_calibrated = False
+
 
 def speech_to_text(
     timeout: Optional[int] = None,
     phrase_time_limit: int = PHRASE_TIME_LIMIT
 ) -> Optional[str]:
-    """Convert speech input from microphone to text.
+    """Convert speech input from the server's microphone to text.
+
+    Only useful when the browser runs on the server itself; remote users
+    upload recordings instead (see SpeechRecognizerService).
 
     Args:
         timeout: Maximum time to wait for speech to start (None = no timeout).
@@ -30,12 +411,16 @@ def speech_to_text(
     Returns:
         Recognized text string, or None if recognition failed.
     """
-    recognizer = sr.Recognizer()
+    global _microphone_calibrated
+    recognizer = _microphone_recognizer
 
     try:
         with sr.Microphone() as source:
-            logger.info("Adjusting for ambient noise...")
-            recognizer.adjust_for_ambient_noise(source, duration=AMBIENT_NOISE_DURATION)
+            if not _microphone_calibrated:
+                # Later calls rely on the recognizer's dynamic threshold
+                logger.info("Adjusting for ambient noise...")
+                recognizer.adjust_for_ambient_noise(source, duration=AMBIENT_NOISE_DURATION)
+                _microphone_calibrated = True
 
             logger.info("Listening for speech...")
             audio = recognizer.listen(
@@ -45,8 +430,9 @@ def speech_to_text(
             )
 
             logger.info("Processing audio...")
-            text = recognizer.recognize_google(audio)
-            logger.info(f"Recognized text: {text}")
+            text = recognize_audio(recognizer, audio)
+            if text:
+                logger.info(f"Recognized text: {text}")
             return text
 
     except sr.WaitTimeoutError:
@@ -0,0 +1,318 @@
+"""
+Startup Module
+
+This module defers expensive initialization (the classifier, MediaPipe,
+API clients) until first use and records how long startup took, split
+into import time and per-resource initialization time, so a slow start
+can be traced to the component responsible. A warm-up can then run the
+expensive first calls in the background and report readiness once they
+are done.
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Generic, Iterator, Optional, TypeVar
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Seconds before a failed initialization is tried again, doubling after
+# each further failure up to the maximum
+INIT_RETRY_INTERVAL = float(os.getenv('INIT_RETRY_INTERVAL', '5.0'))
+INIT_RETRY_MAX_INTERVAL = float(os.getenv('INIT_RETRY_MAX_INTERVAL', '60.0'))
+
+_timings: dict[str, float] = {}
+_timings_lock = threading.Lock()
+
+
+def record_timing(phase: str, seconds: float) -> None:
+    """Record the duration of a startup phase.
+
+    Args:
+        phase: Name such as "import:cv2" or "init:model".
+        seconds: Duration in seconds.
+    """
+    with _timings_lock:
+        _timings[phase] = seconds
+
+
+def record_remainder(phase: str, start: float) -> None:
+    """Record time since start not already attributed to a phase of the same kind.
+
+    Used for the catch-all phase of a group, e.g. everything imported by
+    app.py outside the individually timed "import:" blocks.
+
+    Args:
+        phase: Name such as "import:app"; its prefix selects the group.
+        start: time.perf_counter() value when the group started.
+    """
+    prefix = phase.split(':', 1)[0] + ':'
+    with _timings_lock:
+        attributed = sum(v for k, v in _timings.items() if k.startswith(prefix) and k != phase)
+    record_timing(phase, max(time.perf_counter() - start - attributed, 0.0))
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Context manager recording how long its body takes."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(phase, time.perf_counter() - start)
+
+
+def timing_report() -> dict[str, Any]:
+    """Return recorded startup timings.
+
+    Returns:
+        Dictionary with every phase in milliseconds plus import, init and
+        warm-up totals (a warm-up step includes any initialization it
+        triggered, so warm-up and init overlap).
+    """
+    with _timings_lock:
+        timings = dict(_timings)
+    phases = {phase: round(seconds * 1000, 1) for phase, seconds in timings.items()}
+    return {
+        'import_ms': round(sum(v for k, v in phases.items() if k.startswith('import:')), 1),
+        'init_ms': round(sum(v for k, v in phases.items() if k.startswith('init:')), 1),
+        'warmup_ms': round(sum(v for k, v in phases.items() if k.startswith('warmup:')), 1),
+        'phases_ms': phases,
+    }
+
+
+def log_timing_report() -> None:
+    """Log the startup timings, slowest phase first."""
+    report = timing_report()
+    phases = sorted(report['phases_ms'].items(), key=lambda item: item[1], reverse=True)
+    details = ', '.join(f"{phase}={ms:.0f}ms" for phase, ms in phases)
+    logger.info(f"Startup timing: import {report['import_ms']:.0f}ms, init {report['init_ms']:.0f}ms ({details})")
+
+
+class LazyResource(Generic[T]):
+    """A value created by a factory on first use, at most once.
+
+    A failed initialization is remembered so callers can report degraded
+    mode, and is retried by the first get() after a backoff (a model file
+    briefly missing or a worker slow to start should not last until the
+    process restarts); reset() allows a retry at once.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T],
+                 retry_interval: float = INIT_RETRY_INTERVAL,
+                 max_retry_interval: float = INIT_RETRY_MAX_INTERVAL) -> None:
+        """Initialize the resource.
+
+        Args:
+            name: Name used in logs and the timing report ("init:<name>").
+            factory: Function creating the value; may raise.
+            retry_interval: Seconds before a failed initialization is
+                retried, doubled after each further failure.
+            max_retry_interval: Longest wait between retries.
+        """
+        self.name = name
+        self.factory = factory
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self._lock = threading.Lock()
+        self._value: Optional[T] = None
+        self._loaded = False
+        self._failures = 0
+        self._retry_at = 0.0
+        self.error: Optional[Exception] = None
+
+    @property
+    def loaded(self) -> bool:
+        """True once the value has been created successfully."""
+        return self._loaded
+
+    def get(self) -> T:
+        """Return the value, creating it on first use.
+
+        Returns:
+            The resource.
+
+        Raises:
+            Exception: Whatever the factory raised (also on later calls,
+                until the retry backoff has passed or reset()).
+        """
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if self._loaded:
+                return self._value
+            if self.error is not None and time.monotonic() < self._retry_at:
+                raise self.error
+
+            start = time.perf_counter()
+            try:
+                self._value = self.factory()
+            except Exception as e:
+                self.error = e
+                delay = min(self.retry_interval * 2 ** self._failures, self.max_retry_interval)
+                self._failures += 1
+                self._retry_at = time.monotonic() + delay
+                logger.error(f"Failed to initialize {self.name} (retrying in {delay:.0f}s): {e}")
+                raise
+            finally:
+                record_timing(f"init:{self.name}", time.perf_counter() - start)
+            self._loaded = True
+            self._failures = 0
+            self.error = None
+            logger.info(f"Initialized {self.name} in {(time.perf_counter() - start) * 1000:.0f}ms")
+            return self._value
+
+    def peek(self) -> Optional[T]:
+        """Return the value if it has been created, without creating it."""
+        return self._value if self._loaded else None
+
+    def reset(self) -> None:
+        """Forget the value (or failure) so the next get() initializes again."""
+        with self._lock:
+            self._value = None
+            self._loaded = False
+            self._failures = 0
+            self.error = None
+
+
+PENDING = 'pending'
+RUNNING = 'running'
+READY = 'ready'
+FAILED = 'failed'
+DISABLED = 'disabled'
+
+
+class Warmup:
+    """Runs warm-up steps once and reports whether the instance is ready.
+
+    Each step is a function making the first (slow) calls into a
+    component, e.g. pushing a synthetic frame through MediaPipe, so that
+    the one-off allocations happen before real traffic arrives. A failed
+    warm-up is run again by the first start() or run() after a backoff,
+    as LazyResource retries a failed initialization.
+    """
+
+    def __init__(self, steps: list[tuple[str, Callable[[], None]]], enabled: bool = True,
+                 retry_interval: float = INIT_RETRY_INTERVAL,
+                 max_retry_interval: float = INIT_RETRY_MAX_INTERVAL) -> None:
+        """Initialize the warm-up.
+
+        Args:
+            steps: (name, function) pairs run in order; names appear in
+                the timing report as "warmup:<name>".
+            enabled: When False, the instance is ready immediately.
+            retry_interval: Seconds before a failed warm-up may run
+                again, doubled after each further failure.
+            max_retry_interval: Longest wait between retries.
+        """
+        self.steps = steps
+        self.enabled = enabled
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._retry_at = 0.0
+        self._done = threading.Event()
+        self.state = PENDING if enabled else DISABLED
+        self.error: Optional[str] = None
+        self.duration: Optional[float] = None
+        self.step_durations: dict[str, float] = {}
+
+        if not enabled:
+            self._done.set()
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up succeeded (or is disabled)."""
+        return self.state in (READY, DISABLED)
+
+    def _claim(self) -> bool:
+        """Move to RUNNING if the warm-up is due to run; call under _lock."""
+        due = self.state == PENDING or (self.state == FAILED and time.monotonic() >= self._retry_at)
+        if due:
+            self.state = RUNNING
+            self._done.clear()
+        return due
+
+    def start(self) -> None:
+        """Run the warm-up on a background thread (once, or again after a failure)."""
+        with self._lock:
+            if not self._claim():
+                return
+        threading.Thread(target=self._run_steps, name='warmup', daemon=True).start()
+
+    def run(self) -> bool:
+        """Run the warm-up on the calling thread, or wait for a running one.
+
+        Returns:
+            True if every step succeeded (or warm-up is disabled).
+        """
+        with self._lock:
+            owner = self._claim()
+        if not owner:
+            self._done.wait()
+            return self.ready
+        return self._run_steps()
+
+    def _run_steps(self) -> bool:
+        logger.info("Warm-up started")
+        start = time.perf_counter()
+        name = ''
+        try:
+            for name, step in self.steps:
+                step_start = time.perf_counter()
+                step()
+                elapsed = time.perf_counter() - step_start
+                self.step_durations[name] = elapsed
+                record_timing(f"warmup:{name}", elapsed)
+        except Exception as e:
+            self.error = f"{name}: {e}"
+            delay = min(self.retry_interval * 2 ** self._failures, self.max_retry_interval)
+            self._failures += 1
+            self._retry_at = time.monotonic() + delay
+            self.state = FAILED
+            logger.error(f"Warm-up failed in {self.error} (retrying in {delay:.0f}s)")
+        else:
+            self._failures = 0
+            self.error = None
+            self.state = READY
+        finally:
+            self.duration = time.perf_counter() - start
+            self._done.set()
+
+        if self.state == READY:
+            logger.info(f"Warm-up finished in {self.duration * 1000:.0f}ms")
+        return self.ready
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the warm-up has finished or timeout passed.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if the instance is ready.
+        """
+        if self.state != PENDING:
+            self._done.wait(timeout)
+        return self.ready
+
+    def status(self) -> dict[str, Any]:
+        """Return the readiness state and warm-up durations.
+
+        Returns:
+            Dictionary with state, ready, duration_ms, steps_ms and error.
+        """
+        return {
+            'state': self.state,
+            'ready': self.ready,
+            'duration_ms': round(self.duration * 1000, 1) if self.duration is not None else None,
+            'steps_ms': {name: round(seconds * 1000, 1) for name, seconds in self.step_durations.items()},
+            'error': self.error,
+        }
@@ -7,38 +7,111 @@ typos, and converts spaced letters into proper words.
 """
 
 import os
+import time
 import logging
-from typing import Optional
+from typing import Any, Iterator, Optional
 from dotenv import load_dotenv
 
+try:
+    from functions.correction_cache import CorrectionCache
+    from functions.word_segmenter import correct_text, segment_letters
+    from functions.noisy_channel import decode_lattice
+    from functions.prompt_examples import ExampleStore, load_examples, build_prompt
+    from functions.startup import LazyResource
+    from functions.resilience import (
+        get_breaker, call_with_deadline, DeadlineExceeded, CircuitOpenError
+    )
+except ImportError:
+    from correction_cache import CorrectionCache
+    from word_segmenter import correct_text, segment_letters
+    from noisy_channel import decode_lattice
+    from prompt_examples import ExampleStore, load_examples, build_prompt
+    from startup import LazyResource
+    from resilience import get_breaker, call_with_deadline, DeadlineExceeded, CircuitOpenError
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 API_KEY = os.getenv("OPENAI_API_KEY")
-
-# Track if API is available
-API_AVAILABLE = False
-client = None
-
-if not API_KEY or API_KEY == "your_openai_api_key_here":
+# Alternative endpoint speaking the same API, e.g. a local stand-in
+# (benchmarks/fake_providers.py); unset uses api.openai.com
+OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL") or None
+
+# Model used for corrections
+MODEL_NAME = "gpt-4o"
+
+# Latency budget for an OpenAI response (seconds); past it the offline
+# correction is returned and the call counts against the breaker. The
+# client times out its own requests after the same budget, so abandoned
+# calls do not keep holding a worker thread, and does not retry within it
+OPENAI_DEADLINE = float(os.getenv("OPENAI_DEADLINE", "6.0"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "0"))
+openai_breaker = get_breaker("openai")
+
+# Offline corrector usage:
+#   fallback - only when OpenAI is unavailable or fails (default)
+#   primary  - always use the offline corrector, never call OpenAI
+#   prepass  - segment locally, then send the words to OpenAI for polishing
+#   off      - never use it (raw text is only capitalized)
+LOCAL_CORRECTION_MODE = os.getenv("LOCAL_CORRECTION_MODE", "fallback").lower()
+
+# Correction cache settings (empty CORRECTION_CACHE_PATH = memory only)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORRECTION_CACHE_PATH: Optional[str] = os.getenv(
+    "CORRECTION_CACHE_PATH", os.path.join(BASE_DIR, "cache", "corrections.sqlite3")
+) or None
+CORRECTION_CACHE_SIZE = int(os.getenv("CORRECTION_CACHE_SIZE", "1024"))
+CORRECTION_CACHE_DISK_SIZE = int(os.getenv("CORRECTION_CACHE_DISK_SIZE", "50000"))
+CORRECTION_CACHE_TTL = float(os.getenv("CORRECTION_CACHE_TTL", str(30 * 24 * 3600)))
+
+correction_cache = CorrectionCache(
+    path=CORRECTION_CACHE_PATH,
+    max_memory_entries=CORRECTION_CACHE_SIZE,
+    max_disk_entries=CORRECTION_CACHE_DISK_SIZE,
+    ttl=CORRECTION_CACHE_TTL
+)
+
+API_CONFIGURED = bool(API_KEY) and API_KEY != "your_openai_api_key_here"
+if not API_CONFIGURED:
     logger.warning("OPENAI_API_KEY not configured. Text correction will be disabled.")
     logger.warning("To enable, add a valid OPENAI_API_KEY to your .env file.")
-else:
-    # Initialize OpenAI client with new API
+
+
+def _create_client() -> Any:
+    """Create the OpenAI client (the openai import alone takes ~0.7s)."""
     try:
         from openai import OpenAI
-        client = OpenAI(api_key=API_KEY)
-        API_AVAILABLE = True
-        logger.info("OpenAI client initialized successfully")
     except ImportError:
         logger.error("openai package not installed. Install with: pip install openai")
-    except Exception as e:
-        logger.error(f"Failed to initialize OpenAI client: {e}")
+        raise
+    options: dict[str, Any] = {"max_retries": OPENAI_MAX_RETRIES}
+    if OPENAI_DEADLINE > 0:
+        options["timeout"] = OPENAI_DEADLINE
+    return OpenAI(api_key=API_KEY, base_url=OPENAI_BASE_URL, **options)
+
+
+openai_client = LazyResource("openai", _create_client)
+
 
-# System prompt for text correction
-SYSTEM_PROMPT = """CRITICAL RULE: Return ONLY the corrected sentence. No explanations, no input/output labels.
+def get_client() -> Optional[Any]:
+    """Return the OpenAI client, creating it on first use.
+
+    Returns:
+        The client, or None when no API key is configured or the client
+        could not be created (the offline corrector is used instead).
+    """
+    if not API_CONFIGURED:
+        return None
+    try:
+        return openai_client.get()
+    except Exception:
+        return None
+
+
+# Correction rules; the few-shot examples live in datasets/text_fix_examples.json
+PROMPT_RULES = """CRITICAL RULE: Return ONLY the corrected sentence. No explanations, no input/output labels.
 1. Return ONLY the corrected sentence - no explanations, labels, or quotes
 2. NEVER change original words or grammar structures
 3. NEVER add, remove, or modify words
@@ -56,413 +129,278 @@ SYSTEM_PROMPT = """CRITICAL RULE: Return ONLY the corrected sentence. No explana
 15. Add appropriate punctuation
 16. Convert repeated letters only if they're typos (like 'helllo' to 'hello')
 19. Maintain proper sentence case
-20. Handle contractions properly (dont -> don't, cant -> can't)
-
-Examples:
-Input: D O N O T C R Y N O W
-Output: Do Not Cry Now.
-
-Input: I A M G O I N G H O M E
-Output: I Am Going Home.
-
-Input: W H E R E A R E Y O U G O I N G
-Output: Where Are You Going?
-
-Input: H E L L O W O R L D
-Output: Hello World.
-
-Input: T H I S I S A T E S T
-Output: This Is A Test.
-
-Input: G O O D M O R N I N G
-Output: Good Morning.
-
-Input: S E E Y O U T O M O R R O W
-Output: See You Tomorrow.
-
-Input: H A V E A N I C E D A Y
-Output: Have A Nice Day.
-
-Input: T H A N K Y O U V E R Y M U C H
-Output: Thank You Very Much.
-
-Input: P L E A S E H E L P M E
-Output: Please Help Me.
-
-Input: I L O V E P R O G R A M M I N G
-Output: I Love Programming.
-
-Input: W E A R E W O R K I N G
-Output: We Are Working.
-
-Input: S H E I S D A N C I N G
-Output: She Is Dancing.
-
-Input: T H E Y A R E P L A Y I N G
-Output: They Are Playing.
-
-Input: H E W A S H E R E
-Output: He Was Here.
-
-Input: W E W E R E T H E R E
-Output: We Were There.
-
-Input: I T I S R A I N I N G
-Output: It Is Raining.
-
-Input: T H E S U N I S S H I N I N G
-Output: The Sun Is Shining.
-
-Input: B I R D S A R E F L Y I N G
-Output: Birds Are Flying.
-
-Input: W H A T I S Y O U R N A M E
-Output: What Is Your Name?
-
-Input: H O W A R E Y O U
-Output: How Are You?
-
-Input: N I C E T O M E E T Y O U
-Output: Nice To Meet You.
-
-Input: S E E Y O U L A T E R
-Output: See You Later.
-
-Input: H A V E F U N
-Output: Have Fun.
-
-Input: T A K E C A R E
-Output: Take Care.
-
-Input: B E S A F E
-Output: Be Safe.
-
-Input: G O O D L U C K
-Output: Good Luck.
-
-Input: W E L C O M E B A C K
-Output: Welcome Back.
-
-Input: S T A Y H O M E
-Output: Stay Home.
-
-Input: B E H A P P Y
-Output: Be Happy.
-
-Examples:
-Input: M A C H I N E L E A U N I N G
-Output: Machine Learning.
-
-Input: C A N Y O U F Y I X T H O E O L D U V A N
-Output: Can you fix the old van?
-
-Input: A R T I F I C A L I N T E L I G E N S
-Output: Artificial Intelligence.
-
-Input: W H E R E I S S T H E N E W C A R R
-Output: Where is the new car?
-
-Input: S O F T W E R E N G I N E R
-Output: Software Engineer.
-
-Input: H E L P M E E W I T H T H I S S C O D E
-Output: Help me with this code.
-
-Input: D A T A S C I E N S E
-Output: Data Science.
-
-Input: T H E Y Y A R E W O R K I N G G H A R D
-Output: They are working hard.
-
-Input: C L O U D C O M P U T I G
-Output: Cloud Computing.
-
-Input: W H A T T I S S Y O U R N A M E E
-Output: What is your name?
-
-Input: F U L L S T A K D E V E L O P E R
-Output: Full Stack Developer.
-
-Input: P L E A S E E O P E N T H E D O O R R
-Output: Please open the door.
-
-Input: W E B D E V E L O P M E N T T
-Output: Web Development.
-
-Input: I L O V E E P R O G R A M M I N G G
-Output: I love programming.
-
-Input: D A T A B A S E Q U E R Y Y
-Output: Database Query.
-
-Input: D O Y O U U L I K E C O F F E E E
-Output: Do you like coffee?
-
-Input: S Y S T E M D E S I G N N
-Output: System Design.
-
-Input: L E T S S G O T O T H E P A R K K
-Output: Lets go to the park.
-
-Single Word Examples:
-Input: D O N E
-Output: Done.
-
-Input: H E L L O
-Output: Hello.
+20. Handle contractions properly (dont -> don't, cant -> can't)"""
 
-Input: W O R K
-Output: Work.
+# Prompt variant:
+#   retrieval - send only the PROMPT_EXAMPLES_K examples most similar to the input (default)
+#   full      - send every example
+PROMPT_MODE = os.getenv("PROMPT_MODE", "retrieval").lower()
+PROMPT_EXAMPLES_K = int(os.getenv("PROMPT_EXAMPLES_K", "8"))
 
-Input: S L E E P
-Output: Sleep.
+example_store = ExampleStore(load_examples())
 
-Input: C O D E
-Output: Code.
+# Full system prompt with every example, grouped by category
+SYSTEM_PROMPT = build_prompt(PROMPT_RULES, example_store.examples, grouped=True)
 
-Acronym Examples:
-Input: B M W
-Output: BMW.
 
-Input: I B M
-Output: IBM.
+def select_prompt(user_content: str) -> str:
+    """Build the system prompt for one correction request.
 
-Input: N A S A
-Output: NASA.
-
-Input: F B I
-Output: FBI.
-
-Input: C I A
-Output: CIA.
-
-Input: N B A
-Output: NBA.
-
-Input: U S A
-Output: USA.
-
-Input: U K
-Output: UK.
-
-Input: U N
-Output: UN.
-
-Input: M I T
-Output: MIT.
-
-Input: N F L
-Output: NFL.
-
-Input: W H O
-Output: WHO.
-
-Input: N O S
-Output: NOS.
-
-Input: R A M
-Output: RAM.
-
-Input: C P U
-Output: CPU.
-
-Input: G P U
-Output: GPU.
-
-Mixed Examples:
-Input: I W O R K A T I B M
-Output: I Work At IBM.
-
-Input: M Y B M W I S N E W
-Output: My BMW Is New.
-
-Input: T H E C I A A N D F B I
-Output: The CIA And FBI.
-
-Input: N A S A A N D I S R O
-Output: NASA And ISRO.
-
-Typing Error Examples:
-Input: HELLOZ
-Output: Hello.
-
-Input: GOODZ
-Output: Good.
-
-Input: THANKZ
-Output: Thanks.
-
-Input: NICEE
-Output: Nice.
-
-Input: GREATT
-Output: Great.
-
-Misspelling Examples:
-Input: Quewn
-Output: Queen.
-
-Input: Programing
-Output: Programming.
-
-Input: Enginear
-Output: Engineer.
-
-Input: Computar
-Output: Computer.
-
-Input: Softwar
-Output: Software.
+    Args:
+        user_content: Text that will be sent as the user message.
 
-Mixed Error Examples:
-Input: TESZT
-Output: Test.
+    Returns:
+        The full prompt, or the rules plus the examples nearest to the
+        input when PROMPT_MODE is "retrieval".
+    """
+    if PROMPT_MODE != "retrieval":
+        return SYSTEM_PROMPT
+    return build_prompt(PROMPT_RULES, example_store.nearest(user_content, PROMPT_EXAMPLES_K))
 
-Input: CODINGG
-Output: Coding.
 
-Input: SLEAPING
-Output: Sleeping.
+def basic_format(input_text: str) -> str:
+    """Capitalize the text and add a period, without correcting it.
 
-Input: STUDYYING
-Output: Studying.
+    Args:
+        input_text: Raw text.
 
-Input: WORKKING
-Output: Working.
+    Returns:
+        Minimally formatted text.
+    """
+    formatted = input_text.strip()
+    if formatted:
+        formatted = formatted[0].upper() + formatted[1:] if len(formatted) > 1 else formatted.upper()
+        if not formatted.endswith(('.', '!', '?')):
+            formatted += '.'
+    return formatted
 
-Sign Language Specific Examples:
-Input: S I N G G A G E
-Output: Sign Language.
 
-Input: D E F A
-Output: Deaf.
+def local_correction(input_text: str, lattice: Optional[list] = None) -> str:
+    """Correct text with the offline word segmenter.
 
-Input: H N A D
-Output: Hand.
+    When the classifier's letter lattice is available, the noisy-channel
+    decoder is used so near-miss letters can still be corrected. Falls
+    back to basic formatting if the offline corrector is disabled or its
+    frequency tables cannot be loaded.
 
-Input: F I N G R E
-Output: Finger.
+    Args:
+        input_text: Raw text with spaced letters from ASL recognition.
+        lattice: Optional top-k letter candidates per committed position.
 
-Input: G E S T R U E
-Output: Gesture.
+    Returns:
+        Corrected sentence.
+    """
+    if LOCAL_CORRECTION_MODE == "off":
+        return basic_format(input_text)
+    try:
+        if lattice:
+            return decode_lattice(lattice) or basic_format(input_text)
+        return correct_text(input_text) or basic_format(input_text)
+    except Exception as e:
+        logger.error(f"Offline correction failed: {e}")
+        return basic_format(input_text)
 
-Input: S P E L L I G N
-Output: Spelling.
 
-Input: C O M M U N I C T E
-Output: Communicate.
+def _prepare_request(input_text: str, lattice: Optional[list]) -> tuple[str, str, str]:
+    """Build the user message, system prompt and cache key for a correction.
 
-Input: E X P R E S S N I O
-Output: Expression.
+    Args:
+        input_text: Raw text with spaced letters from ASL recognition.
+        lattice: Optional top-k letter candidates per committed position.
 
-Input: V I S U L A
-Output: Visual.
+    Returns:
+        Tuple of (user_content, system_prompt, cache_key).
+    """
+    # The pre-pass sends words instead of spaced letters, which is a
+    # different request, so it gets its own cache namespace
+    model_key = MODEL_NAME
+    user_content = input_text
+    if LOCAL_CORRECTION_MODE == "prepass":
+        try:
+            if lattice:
+                user_content = decode_lattice(lattice).rstrip('.?') or input_text
+            else:
+                user_content = ' '.join(segment_letters(input_text)) or input_text
+            model_key = f"{MODEL_NAME}:prepass"
+        except Exception as e:
+            logger.error(f"Offline pre-pass failed: {e}")
+
+    # The cache key hashes the prompt actually sent, so each retrieved
+    # example set (and the full prompt) is its own variant
+    system_prompt = select_prompt(user_content)
+    cache_key = CorrectionCache.make_key(user_content, model_key, system_prompt)
+    return user_content, system_prompt, cache_key
+
+
+def _request_kwargs(input_text: str, user_content: str, system_prompt: str) -> dict[str, Any]:
+    """Arguments for client.chat.completions.create."""
+    return {
+        "model": MODEL_NAME,
+        "messages": [
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user",
+                "content": user_content
+            }
+        ],
+        "temperature": 0.0,
+        "max_tokens": len(input_text.split()) + 50,
+        "top_p": 1.0,
+        "frequency_penalty": 0.0,
+        "presence_penalty": 0.0
+    }
+
+
+def _log_api_error(e: Exception) -> None:
+    """Log an OpenAI error with a user-friendly hint."""
+    if isinstance(e, (DeadlineExceeded, CircuitOpenError)):
+        logger.warning(f"OpenAI skipped, using offline correction: {e}")
+        return
+
+    error_msg = str(e)
+    logger.error(f"OpenAI API error: {error_msg}")
+
+    # Handle specific error types with user-friendly messages
+    if "401" in error_msg or "invalid_api_key" in error_msg.lower():
+        logger.error("Invalid OpenAI API key. Please check your .env file.")
+    elif "429" in error_msg or "rate_limit" in error_msg.lower():
+        logger.error("OpenAI rate limit exceeded. Please try again later.")
+    elif "insufficient_quota" in error_msg.lower():
+        logger.error("OpenAI quota exceeded. Please check your billing.")
+
+
+def generate_sentences(input_text: str, lattice: Optional[list] = None) -> str:
+    """Generate corrected sentences from spaced letter input.
 
-Input: M O V E M N E T
-Output: Movement.
+    Args:
+        input_text: Raw text with spaced letters from ASL recognition.
+        lattice: Optional top-k letter candidates per committed position,
+            used by the offline corrector.
 
-Input: F E E L I G N
-Output: Feeling.
+    Returns:
+        Corrected and formatted sentence. When OpenAI is unavailable or
+        fails, the offline corrector's result is returned instead.
+    """
+    if not input_text or not input_text.strip():
+        return ""
 
-Input: M O R N I M G
-Output: Morning.
+    if LOCAL_CORRECTION_MODE == "primary":
+        return local_correction(input_text, lattice)
 
-Input: T H A M K
-Output: Thank.
+    # If API is not available, correct offline
+    client = get_client()
+    if client is None:
+        logger.warning("OpenAI API not available, using offline correction")
+        return local_correction(input_text, lattice)
 
-Input: W A T E R N
-Output: Water.
+    user_content, system_prompt, cache_key = _prepare_request(input_text, lattice)
+    cached = correction_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Correction cache hit: {cached}")
+        return cached
 
-Input: P L E A S N E
-Output: Please.
+    try:
+        logger.info(f"Processing text: {user_content[:50]}...")
 
-Input: H E L L M O
-Output: Hello.
+        response = call_with_deadline(
+            openai_breaker, OPENAI_DEADLINE, client.chat.completions.create,
+            **_request_kwargs(input_text, user_content, system_prompt)
+        )
 
-Input: G O O D M B Y E
-Output: Goodbye.
+        result = response.choices[0].message.content
+        logger.info(f"Generated result: {result}")
+        if not result:
+            return local_correction(input_text, lattice)
 
-Input: S I G M N
-Output: Sign.
+        # Only successful corrections are cached; fallbacks are retried
+        result = result.strip()
+        correction_cache.set(cache_key, result)
+        return result
 
-Input: F R I E M N D
-Output: Friend.
+    except Exception as e:
+        _log_api_error(e)
+        # Fall back to the offline corrector instead of raw text
+        return local_correction(input_text, lattice)
 
-Input: T E A C H M E R
-Output: Teacher.
-"""
 
+def generate_sentences_stream(input_text: str, lattice: Optional[list] = None) -> Iterator[dict[str, str]]:
+    """Stream a correction as it is generated.
 
-def generate_sentences(input_text: str) -> str:
-    """Generate corrected sentences from spaced letter input.
+    Yields {"delta": text} events as tokens arrive, then exactly one
+    {"final": sentence} event with the cleaned result, which replaces
+    the deltas (it differs from them when a fallback was used after a
+    failure mid-stream). Cache hits and offline corrections arrive as a
+    single delta.
 
     Args:
         input_text: Raw text with spaced letters from ASL recognition.
+        lattice: Optional top-k letter candidates per committed position.
 
-    Returns:
-        Corrected and formatted sentence.
-
-    Raises:
-        Exception: If OpenAI API call fails.
+    Yields:
+        Delta events followed by the final event.
     """
     if not input_text or not input_text.strip():
-        return ""
-
-    # If API is not available, return the raw text with basic formatting
-    if not API_AVAILABLE or client is None:
-        logger.warning("OpenAI API not available, returning raw text")
-        # Basic formatting: capitalize and add period
-        formatted = input_text.strip()
-        if formatted:
-            formatted = formatted[0].upper() + formatted[1:] if len(formatted) > 1 else formatted.upper()
-            if not formatted.endswith(('.', '!', '?')):
-                formatted += '.'
-        return formatted
-
+        yield {"final": ""}
+        return
+
+    client = get_client() if LOCAL_CORRECTION_MODE != "primary" else None
+    if client is None:
+        result = local_correction(input_text, lattice)
+        yield {"delta": result}
+        yield {"final": result}
+        return
+
+    user_content, system_prompt, cache_key = _prepare_request(input_text, lattice)
+    cached = correction_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Correction cache hit: {cached}")
+        yield {"delta": cached}
+        yield {"final": cached}
+        return
+
+    parts: list[str] = []
     try:
-        logger.info(f"Processing text: {input_text[:50]}...")
-
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": SYSTEM_PROMPT
-                },
-                {
-                    "role": "user",
-                    "content": input_text
-                }
-            ],
-            temperature=0.0,
-            max_tokens=len(input_text.split()) + 50,
-            top_p=1.0,
-            frequency_penalty=0.0,
-            presence_penalty=0.0
+        logger.info(f"Streaming text: {user_content[:50]}...")
+        # The budget covers the whole generation: the wait for the first
+        # response bytes here, then every chunk below (a stalled stream
+        # is cut off by the client's read timeout)
+        deadline_at = time.monotonic() + OPENAI_DEADLINE
+        stream = call_with_deadline(
+            openai_breaker, OPENAI_DEADLINE, client.chat.completions.create,
+            **_request_kwargs(input_text, user_content, system_prompt), stream=True,
+            discard=lambda late: late.close()
         )
-
-        result = response.choices[0].message.content
-        logger.info(f"Generated result: {result}")
-        return result.strip() if result else input_text
+        try:
+            for chunk in stream:
+                if OPENAI_DEADLINE > 0 and time.monotonic() > deadline_at:
+                    openai_breaker.record_failure(budget_miss=True)
+                    raise DeadlineExceeded(f"openai stream did not finish within {OPENAI_DEADLINE:.1f}s")
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield {"delta": delta}
+        finally:
+            # Also when the client disconnects (GeneratorExit) mid-stream
+            stream.close()
 
     except Exception as e:
-        error_msg = str(e)
-        logger.error(f"OpenAI API error: {error_msg}")
-
-        # Handle specific error types with user-friendly messages
-        if "401" in error_msg or "invalid_api_key" in error_msg.lower():
-            logger.error("Invalid OpenAI API key. Please check your .env file.")
-            # Return raw text instead of error
-            return input_text.strip()
-        elif "429" in error_msg or "rate_limit" in error_msg.lower():
-            logger.error("OpenAI rate limit exceeded. Please try again later.")
-            return input_text.strip()
-        elif "insufficient_quota" in error_msg.lower():
-            logger.error("OpenAI quota exceeded. Please check your billing.")
-            return input_text.strip()
-
-        # For other errors, return raw text
-        return input_text.strip()
+        _log_api_error(e)
+        yield {"final": local_correction(input_text, lattice)}
+        return
+
+    result = ''.join(parts).strip()
+    logger.info(f"Generated result: {result}")
+    if not result:
+        result = local_correction(input_text, lattice)
+        yield {"delta": result}
+    else:
+        correction_cache.set(cache_key, result)
+    yield {"final": result}
 
 
 # Example usage
@@ -9,9 +9,15 @@ import os
 import base64
 import logging
 from io import BytesIO
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
 from PIL import Image
 
+try:
+    from functions.letter_variants import select_variant, read_variant, preferred_formats, variants_version
+except ImportError:
+    from letter_variants import select_variant, read_variant, preferred_formats, variants_version
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -77,21 +83,64 @@ def get_image_base64(image_path: str) -> Optional[str]:
         return None
 
 
-def text_to_sign_language(text: str) -> list[dict[str, Optional[str]]]:
+def get_letter_image(letter: str, size: Optional[int] = None,
+                     accept_webp: bool = False) -> Optional[tuple[str, str]]:
+    """Return a cached base64 image for a letter at the requested size.
+
+    The cache is keyed on the variants directory's version, so variants
+    built while the app runs are served without a restart.
+
+    Args:
+        letter: Uppercase letter A-Z.
+        size: Requested display width in device pixels.
+        accept_webp: Whether the client can decode WebP.
+
+    Returns:
+        Tuple of (base64_string, mimetype), or None if no image exists.
+    """
+    return _letter_image(letter, size, accept_webp, variants_version())
+
+
+@lru_cache(maxsize=256)
+def _letter_image(letter: str, size: Optional[int], accept_webp: bool,
+                  version: int) -> Optional[tuple[str, str]]:
+    accept = 'image/webp' if accept_webp else None
+    variant = select_variant(letter, size=size, accept=accept)
+    if variant is None:
+        logger.error(f"Image file not found for letter: {letter}")
+        return None
+
+    path, mimetype = variant
+    try:
+        return base64.b64encode(read_variant(path, version)).decode(), mimetype
+    except OSError as e:
+        logger.error(f"Error reading image {path}: {e}")
+        return None
+
+
+def text_to_sign_language(
+    text: str,
+    size: Optional[int] = None,
+    accept: Optional[str] = None
+) -> list[dict[str, Optional[str]]]:
     """Convert text to a list of sign language image representations.
 
     Args:
         text: The text to convert (will be converted to uppercase).
+        size: Requested display width in device pixels (None = largest).
+        accept: Client Accept header, used to choose WebP over PNG.
 
     Returns:
-        List of dictionaries containing character and base64 encoded image.
-        Each dictionary has 'character' and 'image' keys.
+        List of dictionaries containing character, base64 encoded image
+        and its MIME type. Each dictionary has 'character', 'image' and
+        'mime' keys.
     """
     if not text:
         logger.warning("Empty text provided to text_to_sign_language")
         return []
 
     text = text.upper()
+    accept_webp = preferred_formats(accept)[0] == 'webp'
     images_data: list[dict[str, Optional[str]]] = []
 
     logger.info(f"Converting text to sign language: {text[:50]}...")
@@ -100,16 +149,18 @@ def text_to_sign_language(text: str) -> list[dict[str, Optional[str]]]:
         if char in SIGN_LANGUAGE_IMAGES:
             img_path = SIGN_LANGUAGE_IMAGES[char]
             if img_path:
-                img_base64 = get_image_base64(img_path)
+                image = get_letter_image(char, size, accept_webp)
                 images_data.append({
                     'character': char,
-                    'image': img_base64
+                    'image': image[0] if image else None,
+                    'mime': image[1] if image else None
                 })
             else:
                 # Space character
                 images_data.append({
                     'character': 'space',
-                    'image': None
+                    'image': None,
+                    'mime': None
                 })
         else:
             logger.warning(f"Character '{char}' not found in sign language dictionary")
@@ -118,6 +169,123 @@ def text_to_sign_language(text: str) -> list[dict[str, Optional[str]]]:
     return images_data
 
 
+def filter_sign_text(text: str) -> str:
+    """Keep only the characters that can be fingerspelled (letters and spaces).
+
+    Args:
+        text: Raw user input.
+
+    Returns:
+        Filtered text.
+    """
+    return ''.join(c for c in text if c.isalpha() or c.isspace())
+
+
+def split_text_segments(text: str, max_length: int) -> Iterator[str]:
+    """Split a long document into segments of at most max_length characters.
+
+    Segments are cut at whitespace where possible, so words are not split
+    across segments unless a single word is longer than max_length.
+
+    Args:
+        text: Document to split.
+        max_length: Maximum segment length.
+
+    Yields:
+        Non-empty text segments.
+    """
+    start = 0
+    length = len(text)
+
+    while start < length:
+        # Skip leading whitespace between segments
+        while start < length and text[start].isspace():
+            start += 1
+        if start >= length:
+            break
+
+        end = min(start + max_length, length)
+        if end < length and not text[end].isspace():
+            cut = text.rfind(' ', start, end)
+            if cut > start:
+                end = cut
+
+        segment = text[start:end].strip()
+        if segment:
+            yield segment
+        start = end
+
+
+def sign_image_url(letter: str, size: Optional[int] = None) -> str:
+    """Return the /sign_image URL for a letter."""
+    url = f"/sign_image/{letter}"
+    return f"{url}?size={size}" if size else url
+
+
+def iter_sign_segments(
+    texts: Iterable[str],
+    size: Optional[int] = None,
+    accept: Optional[str] = None,
+    inline: bool = True,
+    max_length: Optional[int] = None
+) -> Iterator[dict]:
+    """Convert a stream of texts to sign images, one segment at a time.
+
+    Only one segment is held in memory at once, and letter images come
+    from the cached variant path, so long inputs cost no more memory
+    than short ones.
+
+    Args:
+        texts: Iterable of text segments (anything that is not a string
+            is reported as an error segment).
+        size: Requested display width in device pixels.
+        accept: Client Accept header, used to choose WebP over PNG.
+        inline: Embed base64 images; otherwise return /sign_image URLs.
+        max_length: Reject segments longer than this (None = no limit).
+
+    Yields:
+        One result dictionary per input segment with 'index', 'status',
+        'text' and either 'images' or 'message'.
+    """
+    for index, text in enumerate(texts):
+        if not isinstance(text, str):
+            text = ''
+        if max_length is not None and len(text) > max_length:
+            yield {
+                'index': index,
+                'status': 'error',
+                'text': text[:50],
+                'message': f'Segment too long. Maximum {max_length} characters allowed.'
+            }
+            continue
+
+        filtered = ' '.join(filter_sign_text(text).split())
+        if not filtered:
+            yield {
+                'index': index,
+                'status': 'error',
+                'text': text,
+                'message': 'No English letters (A-Z) in segment.'
+            }
+            continue
+
+        if inline:
+            images = text_to_sign_language(filtered, size=size, accept=accept)
+        else:
+            images = [
+                {'character': 'space', 'url': None} if c == ' '
+                else {'character': c, 'url': sign_image_url(c, size)}
+                for c in filtered.upper() if c in SIGN_LANGUAGE_IMAGES
+            ]
+
+        yield {
+            'index': index,
+            'status': 'success',
+            'text': filtered,
+            'images': images
+        }
+
+
 def validate_images() -> dict[str, bool]:
     """Validate that all sign language images exist.
 
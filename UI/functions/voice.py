@@ -2,116 +2,318 @@
 Voice Module
 
 This module provides text-to-speech functionality using the ElevenLabs API.
-It converts text into natural-sounding speech and plays it back.
+It converts text into natural-sounding speech and plays it back. Requests
+share a keep-alive connection pool, and synthesized clips are kept in a
+content-addressed disk cache so repeated phrases need no API call.
 """
 
 import os
 import logging
-from typing import Optional
+import tempfile
+from typing import Iterator, Optional
 import requests
+from requests.adapters import HTTPAdapter
 from playsound import playsound
 from dotenv import load_dotenv
 
+try:
+    from functions.resilience import get_breaker, call_with_deadline, DeadlineExceeded, CircuitOpenError
+    from functions.audio_cache import AudioCache
+    from functions.startup import LazyResource
+except ImportError:
+    from resilience import get_breaker, call_with_deadline, DeadlineExceeded, CircuitOpenError
+    from audio_cache import AudioCache
+    from startup import LazyResource
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+# Missing settings are reported on first use, so the rest of the app
+# (and browser speech fallback) keeps working without them
 API_KEY: Optional[str] = os.getenv("ELEVENLABS_API_KEY")
-if not API_KEY:
-    logger.error("ELEVENLABS_API_KEY not found in .env file")
-    raise ValueError("API key not found in .env file. Please add ELEVENLABS_API_KEY to your .env file.")
-
 VOICE_ID: Optional[str] = os.getenv("ELEVENLABS_VOICE_ID")
-if not VOICE_ID:
-    logger.error("ELEVENLABS_VOICE_ID not found in .env file")
-    raise ValueError("Voice ID not found in .env file. Please add ELEVENLABS_VOICE_ID to your .env file.")
 
-# ElevenLabs API configuration
-ELEVENLABS_API_URL = "https://api.elevenlabs.io/v1/text-to-speech"
+# ElevenLabs API configuration (the URL can point at a local stand-in,
+# see benchmarks/fake_providers.py)
+ELEVENLABS_API_URL = os.getenv("ELEVENLABS_API_URL", "https://api.elevenlabs.io/v1/text-to-speech")
 DEFAULT_STABILITY = 0.7
 DEFAULT_SIMILARITY_BOOST = 0.8
 
+# Latency budget for the synthesis request (seconds); past it the call
+# is abandoned and counts against the breaker
+ELEVENLABS_DEADLINE = float(os.getenv("ELEVENLABS_DEADLINE", "10.0"))
+# A request never outlives its budget, so abandoned calls free their
+# worker on the shared provider pool instead of holding it
+REQUEST_TIMEOUT = ELEVENLABS_DEADLINE if ELEVENLABS_DEADLINE > 0 else 30
+STREAM_CHUNK_SIZE = 16 * 1024
+elevenlabs_breaker = get_breaker("elevenlabs")
 
-def text_to_speech_and_play(
-    text: str,
-    output_file: str = "output.mp3",
-    stability: float = DEFAULT_STABILITY,
-    similarity_boost: float = DEFAULT_SIMILARITY_BOOST
-) -> bool:
-    """Convert text to speech using ElevenLabs API and play it.
+# Keep-alive connections kept open to ElevenLabs
+TTS_POOL_SIZE = int(os.getenv("TTS_POOL_SIZE", "4"))
 
-    Args:
-        text: The text to convert to speech.
-        output_file: Path for the temporary audio file.
-        stability: Voice stability setting (0.0-1.0).
-        similarity_boost: Voice similarity boost setting (0.0-1.0).
 
-    Returns:
-        True if successful, False otherwise.
+# Synthesized clip cache (AUDIO_CACHE_MAX_BYTES=0 disables it)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", os.path.join(BASE_DIR, "cache", "audio"))
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+audio_cache = AudioCache(AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES)
+
+
+class ElevenLabsError(Exception):
+    """The ElevenLabs API answered with an error status."""
+
+
+def _create_session() -> requests.Session:
+    """Check the configuration and open the keep-alive connection pool.
 
     Raises:
-        ValueError: If text is empty.
-        requests.RequestException: If API call fails.
+        ValueError: If the API key or voice ID is not configured.
     """
-    if not text or not text.strip():
-        logger.warning("Empty text provided to text_to_speech_and_play")
-        return False
-
-    # Clean up text - remove extra whitespace
-    cleaned_text = ' '.join(text.split())
-    logger.info(f"Converting text to speech: {cleaned_text[:50]}...")
+    if not API_KEY:
+        logger.error("ELEVENLABS_API_KEY not found in .env file")
+        raise ValueError("API key not found in .env file. Please add ELEVENLABS_API_KEY to your .env file.")
+    if not VOICE_ID:
+        logger.error("ELEVENLABS_VOICE_ID not found in .env file")
+        raise ValueError("Voice ID not found in .env file. Please add ELEVENLABS_VOICE_ID to your .env file.")
 
-    url = f"{ELEVENLABS_API_URL}/{VOICE_ID}"
-    headers = {
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=TTS_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
         "xi-api-key": API_KEY,
         "Content-Type": "application/json"
-    }
-    data = {
-        "text": cleaned_text,
+    })
+    return session
+
+
+elevenlabs_session = LazyResource("elevenlabs", _create_session)
+
+
+def get_session() -> Optional[requests.Session]:
+    """Return the ElevenLabs session, or None if ElevenLabs is not configured."""
+    try:
+        return elevenlabs_session.get()
+    except ValueError:
+        return None
+
+
+def _payload(text: str, stability: float, similarity_boost: float) -> dict:
+    return {
+        "text": text,
         "voice_settings": {
             "stability": stability,
             "similarity_boost": similarity_boost
         }
     }
 
+
+def _synthesize(text: str, stability: float, similarity_boost: float) -> bytes:
+    """POST a synthesis request, raising on error statuses."""
+    response = elevenlabs_session.get().post(
+        f"{ELEVENLABS_API_URL}/{VOICE_ID}",
+        json=_payload(text, stability, similarity_boost),
+        timeout=REQUEST_TIMEOUT
+    )
+    if response.status_code != 200:
+        raise ElevenLabsError(f"{response.status_code}, {response.text}")
+    return response.content
+
+
+def _open_stream(text: str, stability: float, similarity_boost: float) -> requests.Response:
+    """Start a streaming synthesis request, raising on error statuses."""
+    response = elevenlabs_session.get().post(
+        f"{ELEVENLABS_API_URL}/{VOICE_ID}/stream",
+        json=_payload(text, stability, similarity_boost),
+        timeout=REQUEST_TIMEOUT,
+        stream=True
+    )
+    if response.status_code != 200:
+        message = f"{response.status_code}, {response.text}"
+        response.close()
+        raise ElevenLabsError(message)
+    return response
+
+
+def stream_speech(
+    text: str,
+    stability: float = DEFAULT_STABILITY,
+    similarity_boost: float = DEFAULT_SIMILARITY_BOOST
+) -> tuple[Optional[str], Optional[Iterator[bytes]]]:
+    """Get the speech for text as a cached file or a live audio stream.
+
+    A streamed clip is added to the audio cache once it has been received
+    completely, so later requests (and Range requests) are served from disk.
+
+    Args:
+        text: The text to convert to speech.
+        stability: Voice stability setting (0.0-1.0).
+        similarity_boost: Voice similarity boost setting (0.0-1.0).
+
+    Returns:
+        Tuple of (cached_path, chunks): the path of a cached clip, or an
+        iterator of MP3 bytes as they arrive from ElevenLabs. Both are
+        None if synthesis could not be started. A cached clip is held
+        (not evicted) until the caller passes it to release_speech().
+    """
+    cleaned_text = ' '.join(text.split())
+    key = AudioCache.make_key(cleaned_text, VOICE_ID, stability, similarity_boost)
+
+    cached = audio_cache.get(key, hold=True)
+    if cached:
+        logger.info(f"Audio cache hit for: {cleaned_text[:50]}")
+        return cached, None
+
+    if get_session() is None:
+        return None, None
+
+    logger.info(f"Streaming speech for: {cleaned_text[:50]}...")
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-
-        if response.status_code == 200:
-            # Save audio to file
-            with open(output_file, "wb") as file:
-                file.write(response.content)
-
-            logger.info(f"Audio saved to {output_file}. Playing now...")
-
-            # Play the audio
-            try:
-                playsound(output_file)
-            except Exception as e:
-                logger.error(f"Error playing audio: {e}")
-                return False
-            finally:
-                # Clean up the temporary file
-                if os.path.exists(output_file):
-                    os.remove(output_file)
-                    logger.debug(f"Cleaned up temporary file: {output_file}")
-
-            return True
-        else:
-            logger.error(f"ElevenLabs API error: {response.status_code}, {response.text}")
-            return False
+        # The budget covers the wait for the first response bytes
+        response = call_with_deadline(
+            elevenlabs_breaker, ELEVENLABS_DEADLINE, _open_stream, cleaned_text, stability, similarity_boost,
+            discard=requests.Response.close
+        )
+    except (DeadlineExceeded, CircuitOpenError) as e:
+        logger.warning(f"ElevenLabs skipped: {e}")
+        return None, None
+    except (ElevenLabsError, requests.RequestException) as e:
+        logger.error(f"ElevenLabs streaming request failed: {e}")
+        return None, None
+
+    def chunks() -> Iterator[bytes]:
+        parts = []
+        complete = False
+        try:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                if chunk:
+                    parts.append(chunk)
+                    yield chunk
+            complete = True
+        except requests.RequestException as e:
+            logger.error(f"ElevenLabs stream interrupted: {e}")
+        finally:
+            # Abandoned or broken streams are not cached
+            response.close()
+            if complete and parts:
+                audio_cache.put(key, b''.join(parts))
+
+    return None, chunks()
+
+
+def release_speech(path: str) -> None:
+    """Let a cached clip held by stream_speech() or synthesize_to_file() be evicted again."""
+    audio_cache.release(path)
+
+
+def synthesize_to_file(
+    text: str,
+    stability: float = DEFAULT_STABILITY,
+    similarity_boost: float = DEFAULT_SIMILARITY_BOOST,
+    hold: bool = False
+) -> tuple[Optional[str], bool]:
+    """Return a file with the speech for text, synthesizing it if needed.
+
+    Args:
+        text: The text to convert to speech.
+        stability: Voice stability setting (0.0-1.0).
+        similarity_boost: Voice similarity boost setting (0.0-1.0).
+        hold: Keep a cached clip from being evicted until the caller
+            passes it to release_speech(), e.g. while it plays.
+
+    Returns:
+        Tuple of (path, temporary). The path is None if synthesis failed.
+        A temporary file (only when the cache is disabled or the clip
+        could not be cached) must be deleted by the caller.
+    """
+    cleaned_text = ' '.join(text.split())
+    key = AudioCache.make_key(cleaned_text, VOICE_ID, stability, similarity_boost)
 
+    cached = audio_cache.get(key, hold=hold)
+    if cached:
+        logger.info(f"Audio cache hit for: {cleaned_text[:50]}")
+        return cached, False
+
+    if get_session() is None:
+        return None, False
+
+    logger.info(f"Converting text to speech: {cleaned_text[:50]}...")
+    try:
+        audio = call_with_deadline(
+            elevenlabs_breaker, ELEVENLABS_DEADLINE, _synthesize, cleaned_text, stability, similarity_boost
+        )
+    except (DeadlineExceeded, CircuitOpenError) as e:
+        logger.warning(f"ElevenLabs skipped: {e}")
+        return None, False
+    except ElevenLabsError as e:
+        logger.error(f"ElevenLabs API error: {e}")
+        return None, False
     except requests.Timeout:
         logger.error("ElevenLabs API request timed out")
-        return False
+        return None, False
     except requests.RequestException as e:
         logger.error(f"ElevenLabs API request failed: {e}")
+        return None, False
+
+    path = audio_cache.put(key, audio, hold=hold)
+    if path:
+        return path, False
+
+    # Not cacheable: use a private file so concurrent requests never collide
+    fd, path = tempfile.mkstemp(suffix=".mp3")
+    with os.fdopen(fd, "wb") as file:
+        file.write(audio)
+    return path, True
+
+
+def text_to_speech_and_play(
+    text: str,
+    stability: float = DEFAULT_STABILITY,
+    similarity_boost: float = DEFAULT_SIMILARITY_BOOST
+) -> bool:
+    """Convert text to speech using ElevenLabs API and play it.
+
+    Args:
+        text: The text to convert to speech.
+        stability: Voice stability setting (0.0-1.0).
+        similarity_boost: Voice similarity boost setting (0.0-1.0).
+
+    Returns:
+        True if successful, False otherwise (including when ElevenLabs
+        missed its latency budget or its circuit breaker is open).
+    """
+    if not text or not text.strip():
+        logger.warning("Empty text provided to text_to_speech_and_play")
         return False
+
+    path = None
+    temporary = False
+    try:
+        path, temporary = synthesize_to_file(text, stability, similarity_boost, hold=True)
+        if path is None:
+            return False
+
+        logger.info(f"Playing {path}")
+        try:
+            playsound(path)
+        except Exception as e:
+            logger.error(f"Error playing audio: {e}")
+            return False
+        return True
+
     except Exception as e:
         logger.error(f"Unexpected error in text_to_speech_and_play: {e}")
         return False
+    finally:
+        if temporary and path and os.path.exists(path):
+            os.remove(path)
+            logger.debug(f"Cleaned up temporary file: {path}")
+        elif path:
+            release_speech(path)
 
 
 # Example usage
@@ -0,0 +1,139 @@
+"""
+Voice Activity Module
+
+This module finds the speech in a recorded clip from its short-time
+energy, so leading and trailing silence can be trimmed before the clip
+is sent to a recognizer. Less audio is uploaded, and clips without any
+speech are rejected without a recognizer call. The background noise
+level is calibrated across clips, so a clip that starts with speech
+straight away still gets a sensible threshold.
+"""
+
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+
+# Endpointing settings
+VAD_FRAME_MS = 30
+VAD_ENERGY_RATIO = float(os.getenv('VAD_ENERGY_RATIO', '3.0'))     # Speech vs. noise floor
+VAD_MIN_RMS = float(os.getenv('VAD_MIN_RMS', '150.0'))             # 16-bit sample units
+VAD_MIN_SPEECH_MS = int(os.getenv('VAD_MIN_SPEECH_MS', '90'))      # Ignores clicks and pops
+VAD_PADDING_MS = int(os.getenv('VAD_PADDING_MS', '250'))           # Kept around the speech
+
+# Percentile of frame energies taken as the background noise level
+NOISE_PERCENTILE = 10
+
+
+class NoiseCalibration:
+    """Running estimate of the background noise level across clips."""
+
+    def __init__(self, smoothing: float = 0.2) -> None:
+        """Initialize the calibration.
+
+        Args:
+            smoothing: Weight of each new clip in the running estimate.
+        """
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._level: Optional[float] = None
+        self.samples = 0
+
+    @property
+    def level(self) -> Optional[float]:
+        """Calibrated noise RMS, or None before the first clip."""
+        return self._level
+
+    def update(self, level: float) -> float:
+        """Fold the noise level of a clip into the estimate.
+
+        Args:
+            level: Noise RMS measured in the clip.
+
+        Returns:
+            The updated estimate.
+        """
+        with self._lock:
+            if self._level is None:
+                self._level = level
+            else:
+                self._level += self.smoothing * (level - self._level)
+            self.samples += 1
+            return self._level
+
+
+def frame_rms(samples: np.ndarray, frame_length: int) -> np.ndarray:
+    """Return the RMS energy of consecutive frames.
+
+    Args:
+        samples: Mono 16-bit samples.
+        frame_length: Samples per frame (a trailing partial frame is dropped).
+
+    Returns:
+        One RMS value per frame.
+    """
+    frames = len(samples) // frame_length
+    if frames == 0:
+        return np.zeros(0)
+    blocks = samples[:frames * frame_length].astype(np.float64).reshape(frames, frame_length)
+    return np.sqrt(np.mean(blocks * blocks, axis=1))
+
+
+def find_speech(
+    samples: np.ndarray,
+    sample_rate: int,
+    calibration: Optional[NoiseCalibration] = None,
+    energy_ratio: float = VAD_ENERGY_RATIO,
+    min_rms: float = VAD_MIN_RMS,
+    min_speech_ms: int = VAD_MIN_SPEECH_MS,
+    padding_ms: int = VAD_PADDING_MS
+) -> Optional[tuple[int, int]]:
+    """Locate the speech in a clip.
+
+    A frame is voiced when its energy exceeds energy_ratio times the
+    noise floor (and min_rms). Speech runs from the first to the last run
+    of voiced frames lasting at least min_speech_ms, plus padding.
+
+    Args:
+        samples: Mono 16-bit samples.
+        sample_rate: Samples per second.
+        calibration: Running noise estimate to use and update.
+        energy_ratio: Voiced threshold relative to the noise floor.
+        min_rms: Absolute minimum voiced energy.
+        min_speech_ms: Shortest run of voiced frames counted as speech.
+        padding_ms: Audio kept before and after the speech.
+
+    Returns:
+        (start, end) sample indices of the speech, or None if the clip
+        holds no speech.
+    """
+    frame_length = max(int(sample_rate * VAD_FRAME_MS / 1000), 1)
+    energies = frame_rms(samples, frame_length)
+    if len(energies) == 0:
+        return None
+
+    noise = float(np.percentile(energies, NOISE_PERCENTILE))
+    if calibration is not None:
+        calibrated = calibration.level
+        calibration.update(noise)
+        # A clip with no pause before the speech overestimates its own
+        # floor; the lower estimate only ever keeps more audio
+        if calibrated is not None:
+            noise = min(noise, calibrated)
+
+    voiced = energies > max(noise * energy_ratio, min_rms)
+    min_frames = max(int(np.ceil(min_speech_ms / VAD_FRAME_MS)), 1)
+
+    # Start and end frames of each run of voiced frames
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    runs = [(s, e) for s, e in zip(starts, ends) if e - s >= min_frames]
+    if not runs:
+        return None
+
+    padding = int(sample_rate * padding_ms / 1000)
+    start = max(runs[0][0] * frame_length - padding, 0)
+    end = min(runs[-1][1] * frame_length + padding, len(samples))
+    return start, end
@@ -0,0 +1,412 @@
+"""
+Word Segmenter Module
+
+This module turns fingerspelled letter sequences such as
+"I L O V E P R O G R A M M I N G" into words without any network
+access. It combines dynamic-programming word segmentation over a
+unigram/bigram frequency table with a symmetric-delete spelling index
+that recovers dropped, doubled, inserted or substituted letters.
+"""
+
+import os
+import math
+import logging
+import threading
+from functools import lru_cache
+from typing import Iterable, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Get base directory for the frequency tables
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LANGUAGE_MODEL_DIR = os.path.join(BASE_DIR, '..', 'datasets', 'language_model')
+UNIGRAMS_PATH = os.path.join(LANGUAGE_MODEL_DIR, 'unigrams.txt')
+BIGRAMS_PATH = os.path.join(LANGUAGE_MODEL_DIR, 'bigrams.txt')
+
+# Segmentation settings
+MAX_WORD_LENGTH = 20
+MAX_EDIT_DISTANCE = 1
+MIN_CORRECTION_LENGTH = 4  # Shorter substrings are only matched exactly
+
+# Log10 penalties applied to corrected words
+EDIT_PENALTY = -3.0       # Per insertion, deletion or substitution
+SQUEEZE_PENALTY = -0.5    # Per doubled letter (repeats are never committed twice)
+
+# Weight of the bigram estimate against the unigram estimate
+BIGRAM_WEIGHT = 0.5
+
+# Acronyms are kept uppercase and get a fixed frequency so short letter
+# runs like "I B M" are not forced into unrelated dictionary words
+ACRONYMS = {
+    'asl', 'atm', 'bmw', 'ceo', 'cia', 'cpu', 'diy', 'eu', 'faq', 'fbi', 'gps',
+    'gpu', 'ibm', 'isro', 'mit', 'nasa', 'nba', 'nfl', 'pdf', 'tv', 'ufo',
+    'uk', 'usa', 'usb',
+}
+ACRONYM_COUNT = 10 ** 7
+
+# Words that turn the sentence into a question when they lead it
+QUESTION_WORDS = {'what', 'where', 'when', 'why', 'who', 'whom', 'whose', 'which', 'how'}
+
+# Auxiliary + pronoun openings ("Do you ...", "Can we ...") are questions too
+AUXILIARY_VERBS = {
+    'am', 'are', 'can', 'could', 'did', 'do', 'does', 'has', 'have', 'is',
+    'may', 'shall', 'should', 'was', 'were', 'will', 'would',
+}
+PRONOUNS = {'i', 'you', 'he', 'she', 'it', 'we', 'they', 'this', 'that', 'there'}
+
+
+def squeeze(word: str) -> str:
+    """Collapse runs of the same letter ("hello" -> "helo").
+
+    The detector only commits a letter when it differs from the previous
+    one, so fingerspelled doubles always arrive squeezed.
+    """
+    out = []
+    for c in word:
+        if not out or out[-1] != c:
+            out.append(c)
+    return ''.join(out)
+
+
+def damerau_levenshtein(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, or max_distance + 1 if larger.
+
+    Args:
+        a: First string.
+        b: Second string.
+        max_distance: Distances above this are not computed exactly.
+
+    Returns:
+        Edit distance between the strings.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    prev_prev: list[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(prev[j] + 1, current[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], prev_prev[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        prev_prev, prev = prev, current
+    return prev[-1]
+
+
+class LanguageModel:
+    """Unigram/bigram word model with interpolated probabilities."""
+
+    def __init__(self, unigrams: dict[str, int], bigrams: Optional[dict[tuple[str, str], int]] = None) -> None:
+        """Initialize the model from raw counts.
+
+        Args:
+            unigrams: Word -> count.
+            bigrams: (previous word, word) -> count.
+        """
+        self.unigrams = unigrams
+        self.bigrams = bigrams or {}
+        self.total = sum(unigrams.values()) or 1
+
+        # Row totals turn bigram counts into conditional probabilities
+        self._row_totals: dict[str, int] = {}
+        for (prev, _), count in self.bigrams.items():
+            self._row_totals[prev] = self._row_totals.get(prev, 0) + count
+
+    @classmethod
+    def from_files(cls, unigrams_path: str = UNIGRAMS_PATH,
+                   bigrams_path: Optional[str] = BIGRAMS_PATH) -> 'LanguageModel':
+        """Load "word count" / "word word count" frequency files."""
+        unigrams: dict[str, int] = {}
+        with open(unigrams_path, encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    unigrams[parts[0]] = int(parts[1])
+
+        bigrams: dict[tuple[str, str], int] = {}
+        if bigrams_path and os.path.exists(bigrams_path):
+            with open(bigrams_path, encoding='utf-8') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 3:
+                        bigrams[(parts[0], parts[1])] = int(parts[2])
+
+        for acronym in ACRONYMS:
+            unigrams[acronym] = max(unigrams.get(acronym, 0), ACRONYM_COUNT)
+
+        return cls(unigrams, bigrams)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.unigrams
+
+    def unknown_log_prob(self, length: int) -> float:
+        """Log10 probability of an out-of-vocabulary word of a given length."""
+        return math.log10(10.0 / (self.total * 10 ** length))
+
+    def log_prob(self, word: str, prev: Optional[str] = None) -> float:
+        """Log10 probability of a word given the previous word.
+
+        Args:
+            word: Candidate word (lowercase).
+            prev: Previous word, or None at the start of a sentence.
+
+        Returns:
+            Interpolated bigram/unigram log probability.
+        """
+        count = self.unigrams.get(word)
+        if count is None:
+            return self.unknown_log_prob(len(word))
+
+        p_unigram = count / self.total
+        row_total = self._row_totals.get(prev) if prev else None
+        if not row_total:
+            return math.log10(p_unigram)
+
+        p_bigram = self.bigrams.get((prev, word), 0) / row_total
+        return math.log10(BIGRAM_WEIGHT * p_bigram + (1 - BIGRAM_WEIGHT) * p_unigram)
+
+
+class SpellingIndex:
+    """Symmetric-delete spelling index (SymSpell style).
+
+    Every dictionary word is stored under all strings reachable by up to
+    ``max_distance`` deletions; a lookup generates the deletes of the
+    query and intersects, so no insert/substitute candidates are ever
+    enumerated.
+    """
+
+    def __init__(self, words: Iterable[str], max_distance: int = MAX_EDIT_DISTANCE) -> None:
+        """Build the index.
+
+        Args:
+            words: Dictionary words (lowercase).
+            max_distance: Maximum edit distance supported by lookups.
+        """
+        self.max_distance = max_distance
+        self._deletes: dict[str, list[str]] = {}
+        self._squeezed: dict[str, list[str]] = {}
+        self._words: set[str] = set()
+
+        for word in words:
+            self._words.add(word)
+            for variant in self._delete_variants(word, max_distance):
+                self._deletes.setdefault(variant, []).append(word)
+            squeezed = squeeze(word)
+            if squeezed != word:
+                self._squeezed.setdefault(squeezed, []).append(word)
+
+    @staticmethod
+    def _delete_variants(word: str, distance: int) -> set[str]:
+        """All strings reachable from word by up to distance deletions."""
+        variants = {word}
+        frontier = {word}
+        for _ in range(distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            variants |= frontier
+        return variants
+
+    def lookup(self, term: str, max_distance: Optional[int] = None) -> list[tuple[str, float]]:
+        """Find dictionary words close to a term.
+
+        Args:
+            term: Observed letters (lowercase).
+            max_distance: Maximum edit distance (defaults to the index maximum).
+
+        Returns:
+            List of (word, log10 penalty) pairs; exact matches have penalty 0.
+        """
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        results: dict[str, float] = {}
+
+        if term in self._words:
+            results[term] = 0.0
+
+        # Words whose doubled letters were squeezed out by the detector
+        for word in self._squeezed.get(term, ()):
+            doubles = len(word) - len(term)
+            results.setdefault(word, SQUEEZE_PENALTY * doubles)
+
+        if max_distance > 0:
+            for variant in self._delete_variants(term, max_distance):
+                for word in self._deletes.get(variant, ()):
+                    if word in results:
+                        continue
+                    distance = damerau_levenshtein(term, word, max_distance)
+                    if distance <= max_distance:
+                        results[word] = EDIT_PENALTY * distance
+
+        return list(results.items())
+
+
+class WordSegmenter:
+    """Dynamic-programming segmenter with spelling correction."""
+
+    def __init__(self, language_model: LanguageModel,
+                 spelling_index: Optional[SpellingIndex] = None,
+                 max_word_length: int = MAX_WORD_LENGTH) -> None:
+        """Initialize the segmenter.
+
+        Args:
+            language_model: Word probabilities.
+            spelling_index: Index for correcting misspelled words (built
+                from the language model vocabulary when omitted).
+            max_word_length: Longest substring considered as one word.
+        """
+        self.lm = language_model
+        self.index = spelling_index or SpellingIndex(language_model.unigrams)
+        self.max_word_length = max_word_length
+        self._candidates = lru_cache(maxsize=4096)(self._lookup_candidates)
+
+    def _lookup_candidates(self, piece: str) -> tuple[tuple[str, float], ...]:
+        """Dictionary words (with penalties) that the piece may stand for."""
+        if len(piece) < MIN_CORRECTION_LENGTH:
+            max_distance = 0
+        else:
+            max_distance = self.index.max_distance
+        candidates = self.index.lookup(piece, max_distance)
+
+        # Out-of-vocabulary fallback keeps every input segmentable
+        if not any(penalty == 0.0 for _, penalty in candidates):
+            candidates.append((piece, 0.0))
+        return tuple(candidates)
+
+    def _segment(self, letters: str) -> tuple[list[str], list[int]]:
+        """Best segmentation of letters as (words, end offset of each word)."""
+        text = ''.join(c for c in letters.lower() if c.isalpha())
+        n = len(text)
+        if n == 0:
+            return [], []
+
+        # best[i] = (score, words, ends) for the best segmentation of text[:i]
+        best: list[tuple[float, list[str], list[int]]] = [(0.0, [], [])] + [(-math.inf, [], [])] * n
+
+        for end in range(1, n + 1):
+            for start in range(max(0, end - self.max_word_length), end):
+                prev_score, prev_words, prev_ends = best[start]
+                if prev_score == -math.inf:
+                    continue
+                prev = prev_words[-1] if prev_words else None
+                for word, penalty in self._candidates(text[start:end]):
+                    score = prev_score + self.lm.log_prob(word, prev) + penalty
+                    if score > best[end][0]:
+                        best[end] = (score, prev_words + [word], prev_ends + [end])
+
+        return best[n][1], best[n][2]
+
+    def segment(self, letters: str) -> list[str]:
+        """Split a run of letters into the most probable word sequence.
+
+        Args:
+            letters: Letters without spaces (case-insensitive).
+
+        Returns:
+            List of corrected lowercase words.
+        """
+        return self._segment(letters)[0]
+
+    def word_ends(self, letters: str) -> list[int]:
+        """Letter offsets at which each word of the best segmentation ends.
+
+        Args:
+            letters: Letters without spaces (case-insensitive).
+
+        Returns:
+            Exclusive end offset of every word, in order.
+        """
+        return self._segment(letters)[1]
+
+
+def format_sentence(words: list[str]) -> str:
+    """Format words the way the LLM corrector does ("I Love Programming.").
+
+    Args:
+        words: Lowercase words.
+
+    Returns:
+        Title-cased sentence ending in '.' or '?'.
+    """
+    if not words:
+        return ""
+    sentence = ' '.join(w.upper() if w in ACRONYMS else w.capitalize() for w in words)
+    is_question = (
+        words[0] in QUESTION_WORDS
+        or (len(words) > 1 and words[0] in AUXILIARY_VERBS and words[1] in PRONOUNS)
+    )
+    return sentence + ('?' if is_question else '.')
+
+
+_segmenter: Optional[WordSegmenter] = None
+_segmenter_lock = threading.Lock()
+
+
+def get_segmenter() -> WordSegmenter:
+    """Return the shared segmenter, loading the frequency tables on first use."""
+    global _segmenter
+    if _segmenter is None:
+        with _segmenter_lock:
+            if _segmenter is None:
+                lm = LanguageModel.from_files()
+                _segmenter = WordSegmenter(lm)
+                logger.info(f"Word segmenter loaded ({len(lm.unigrams)} words, {len(lm.bigrams)} bigrams)")
+    return _segmenter
+
+
+def segment_letters(input_text: str) -> list[str]:
+    """Segment fingerspelled input ("H E L O") into words (["hello"]).
+
+    Args:
+        input_text: Letters, optionally separated by spaces.
+
+    Returns:
+        List of lowercase words.
+    """
+    return get_segmenter().segment(input_text)
+
+
+def word_boundaries(input_text: str) -> list[int]:
+    """Letter offsets where the words of fingerspelled input end.
+
+    Args:
+        input_text: Letters, optionally separated by spaces.
+
+    Returns:
+        Exclusive end offset (counted in letters) of every word.
+    """
+    return get_segmenter().word_ends(input_text)
+
+
+def correct_text(input_text: str) -> str:
+    """Correct fingerspelled input into a formatted sentence, offline.
+
+    Args:
+        input_text: Raw text with spaced letters from ASL recognition.
+
+    Returns:
+        Corrected sentence, or "" for empty input.
+    """
+    return format_sentence(segment_letters(input_text))
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    test_inputs = [
+        "I L O V E P R O G R A M M I N G",
+        "H E L O W O R L D",
+        "T H A N K Y O U V E R Y M U C H",
+        "W H E R E A R E Y O U G O I N G",
+        "G O O D M B Y E",
+    ]
+
+    get_segmenter()
+    for input_text in test_inputs:
+        start = time.perf_counter()
+        output = correct_text(input_text)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{input_text!r} -> {output!r} ({elapsed:.1f} ms)")
@@ -0,0 +1,14 @@
+"""
+Gunicorn Configuration
+
+Read by gunicorn from the working directory (see the Dockerfile). Each
+worker starts the warm-up as soon as it has loaded the app, so it is
+ready before the first request instead of warming up on it.
+"""
+
+
+def post_worker_init(worker):
+    """Start the warm-up in a worker that has just loaded app.py."""
+    from app import warmup
+
+    warmup.start()
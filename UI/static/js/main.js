@@ -18,6 +18,19 @@ let currentImageIndex = 0;
 let imagesData = [];
 let imageInterval = null;
 let speechRecording = false;
+let speechRecorder = null;
+
+// Speech recordings: longest recording, and the rate uploaded to the server
+const SPEECH_MAX_MS = 10000;
+const SPEECH_SAMPLE_RATE = 16000;
+
+// Background jobs: first and longest interval between status polls
+const JOB_POLL_MS = 300;
+const JOB_POLL_MAX_MS = 2000;
+
+// Camera this page shows (set by the server from ?camera=); recording
+// and speech calls act on that camera's detector
+const CAMERA = document.getElementById('camera-feed')?.dataset.camera || '';
 
 // =============================================================================
 // DOM ELEMENTS (cached for performance)
@@ -46,6 +59,17 @@ const elements = {
 // UTILITY FUNCTIONS
 // =============================================================================
 
+/**
+ * Add this page's camera to an endpoint URL
+ * @param {string} url - Endpoint URL, possibly with a query string
+ * @returns {string} - URL with ?source= for the camera
+ */
+function withCamera(url) {
+    if (!CAMERA) return url;
+    const separator = url.includes('?') ? '&' : '?';
+    return `${url}${separator}source=${encodeURIComponent(CAMERA)}`;
+}
+
 /**
  * Show the loading overlay with animation
  */
@@ -147,6 +171,55 @@ async function fetchWithErrorHandling(url, options = {}) {
     }
 }
 
+/**
+ * Poll a background job until it finishes
+ * @param {object} accepted - The 202 response of an ?async=1 request
+ * @returns {Promise<object>} - The job's result
+ */
+async function waitForJob(accepted) {
+    let delay = JOB_POLL_MS;
+    while (true) {
+        const job = await fetchWithErrorHandling(accepted.status_url);
+        if (job.state === 'succeeded') return job.result;
+        if (job.state === 'failed' || job.state === 'cancelled') {
+            throw new Error(job.error || 'Request could not be completed');
+        }
+        await new Promise((resolve) => setTimeout(resolve, delay));
+        delay = Math.min(delay * 1.5, JOB_POLL_MAX_MS);
+    }
+}
+
+/**
+ * Read a Server-Sent Events response body, calling onEvent for each event
+ * @param {Response} response - Fetch response with a text/event-stream body
+ * @param {function(string, object)} onEvent - Called with the event name and parsed data
+ */
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let name = 'message';
+            let data = '';
+            for (const line of block.split('\n')) {
+                if (line.startsWith('event: ')) name = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            if (data) onEvent(name, JSON.parse(data));
+        }
+    }
+}
+
 /**
  * Update the progress bar
  * @param {number} current - Current position
@@ -205,7 +278,7 @@ async function startRecording() {
     try {
         setButtonLoading('record-btn');
 
-        const data = await fetchWithErrorHandling('/start_recording', {
+        const data = await fetchWithErrorHandling(withCamera('/start_recording'), {
             method: 'POST'
         });
 
@@ -247,9 +320,7 @@ async function stopRecording() {
         setButtonLoading('stop-btn');
         showLoading();
 
-        const data = await fetchWithErrorHandling('/stop_recording', {
-            method: 'POST'
-        });
+        const data = await stopRecordingStreamed();
 
         recording = false;
         elements.recordBtn?.classList.remove('recording');
@@ -282,13 +353,54 @@ async function stopRecording() {
     }
 }
 
+/**
+ * Stop recording and show the correction word by word as it is generated.
+ * Falls back to the JSON endpoint when streaming is not supported.
+ * @returns {Promise<object>} - Same shape as the /stop_recording response
+ */
+async function stopRecordingStreamed() {
+    if (!window.ReadableStream || !window.TextDecoder) {
+        return fetchWithErrorHandling(withCamera('/stop_recording'), { method: 'POST' });
+    }
+
+    let response;
+    try {
+        response = await fetch(withCamera('/stop_recording/stream'), { method: 'POST' });
+    } catch (error) {
+        throw new Error('Network error. Please check your connection.');
+    }
+    if (!response.ok || !response.body) {
+        const errorData = await response.json().catch(() => ({}));
+        throw new Error(errorData.message || `Server error: ${response.status}`);
+    }
+
+    const outputBox = elements.outputBox;
+    const result = { status: 'success', raw_text: '', meaningful_sentence: '' };
+    let streamed = '';
+
+    await readEventStream(response, (name, data) => {
+        if (name === 'raw') {
+            result.raw_text = data.raw_text;
+        } else if (name === 'delta') {
+            // The first words are worth more than the spinner
+            if (!streamed) hideLoading();
+            streamed += data.text;
+            if (outputBox) outputBox.textContent = streamed;
+        } else if (name === 'done') {
+            Object.assign(result, data);
+        }
+    });
+
+    return result;
+}
+
 /**
  * Update the prediction display periodically while recording
  */
 function updatePrediction() {
     if (!recording) return;
 
-    fetch('/get_current_prediction')
+    fetch(withCamera('/get_current_prediction'))
         .then(response => response.json())
         .then(data => {
             const predictionBox = elements.predictionBox;
@@ -318,23 +430,38 @@ async function speakText() {
         return;
     }
 
-    try {
-        setButtonLoading('speak-btn');
+    setButtonLoading('speak-btn');
 
-        const data = await fetchWithErrorHandling('/speak_text', {
-            method: 'POST'
-        });
+    // The server streams the MP3 as it is synthesized, so playback
+    // starts before the whole clip exists
+    const audio = new Audio(withCamera(`/speak_text/audio?t=${Date.now()}`));
+    let settled = false;
 
-        if (data.status === 'success') {
-            showToast('Audio played successfully', 'success', 2000);
+    const finish = (message, type) => {
+        if (settled) return;
+        settled = true;
+        resetButton('speak-btn');
+        if (message) showToast(message, type, 2000);
+    };
+
+    const fallback = (error) => {
+        if (settled) return;
+        console.error('Error speaking text:', error);
+        if (window.speechSynthesis) {
+            window.speechSynthesis.speak(new SpeechSynthesisUtterance(text));
+            finish('Speech service unavailable, using browser speech', 'info');
         } else {
-            showToast(data.message || 'Failed to play audio', 'error');
+            finish('Failed to play audio', 'error');
         }
+    };
+
+    audio.addEventListener('playing', () => finish('Playing audio', 'success'), { once: true });
+    audio.addEventListener('error', () => fallback(audio.error), { once: true });
+
+    try {
+        await audio.play();
     } catch (error) {
-        console.error('Error speaking text:', error);
-        showToast(error.message || 'Failed to play audio', 'error');
-    } finally {
-        resetButton('speak-btn');
+        fallback(error);
     }
 }
 
@@ -361,6 +488,25 @@ function resetSignDisplay() {
     updateProgressBar(0, 0);
 }
 
+/**
+ * Accept header advertising the image formats this browser can decode
+ */
+const SIGN_IMAGE_ACCEPT = (() => {
+    const canvas = document.createElement('canvas');
+    const webp = canvas.toDataURL && canvas.toDataURL('image/webp').startsWith('data:image/webp');
+    return webp ? 'application/json, image/webp, image/png;q=0.8' : 'application/json, image/png';
+})();
+
+/**
+ * Width in device pixels the sign images are displayed at
+ * @returns {number} - Requested image width
+ */
+function getSignImageSize() {
+    const signDisplay = elements.signDisplay;
+    const width = signDisplay ? signDisplay.clientWidth : 256;
+    return Math.round(width * (window.devicePixelRatio || 1));
+}
+
 /**
  * Convert text input to sign language images
  */
@@ -386,8 +532,9 @@ async function convertText() {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'Accept': SIGN_IMAGE_ACCEPT,
             },
-            body: JSON.stringify({ text: text })
+            body: JSON.stringify({ text: text, size: getSignImageSize() })
         });
 
         if (data.status === 'success') {
@@ -420,28 +567,143 @@ async function convertText() {
 }
 
 /**
- * Convert speech to sign language
+ * Encode mono samples as a 16-bit PCM WAV file
+ * @param {Float32Array} samples - Samples in the range [-1, 1]
+ * @param {number} sampleRate - Samples per second
+ * @returns {Blob} - The WAV file
+ */
+function encodeWav(samples, sampleRate) {
+    const buffer = new ArrayBuffer(44 + samples.length * 2);
+    const view = new DataView(buffer);
+    const writeString = (offset, text) => {
+        for (let i = 0; i < text.length; i++) view.setUint8(offset + i, text.charCodeAt(i));
+    };
+
+    writeString(0, 'RIFF');
+    view.setUint32(4, 36 + samples.length * 2, true);
+    writeString(8, 'WAVE');
+    writeString(12, 'fmt ');
+    view.setUint32(16, 16, true);            // fmt chunk size
+    view.setUint16(20, 1, true);             // PCM
+    view.setUint16(22, 1, true);             // mono
+    view.setUint32(24, sampleRate, true);
+    view.setUint32(28, sampleRate * 2, true); // byte rate
+    view.setUint16(32, 2, true);             // block align
+    view.setUint16(34, 16, true);            // bits per sample
+    writeString(36, 'data');
+    view.setUint32(40, samples.length * 2, true);
+
+    for (let i = 0; i < samples.length; i++) {
+        const sample = Math.max(-1, Math.min(1, samples[i]));
+        view.setInt16(44 + i * 2, sample < 0 ? sample * 0x8000 : sample * 0x7FFF, true);
+    }
+    return new Blob([view], { type: 'audio/wav' });
+}
+
+/**
+ * Convert a MediaRecorder recording to a mono WAV at SPEECH_SAMPLE_RATE
+ * @param {Blob} recording - Recording in the browser's native format
+ * @returns {Promise<Blob>} - The WAV file
+ */
+async function recordingToWav(recording) {
+    const AudioContextClass = window.AudioContext || window.webkitAudioContext;
+    const context = new AudioContextClass();
+    try {
+        const decoded = await context.decodeAudioData(await recording.arrayBuffer());
+        const length = Math.max(1, Math.ceil(decoded.duration * SPEECH_SAMPLE_RATE));
+
+        // Rendering into a one-channel context downmixes and resamples
+        const offline = new OfflineAudioContext(1, length, SPEECH_SAMPLE_RATE);
+        const source = offline.createBufferSource();
+        source.buffer = decoded;
+        source.connect(offline.destination);
+        source.start();
+        const rendered = await offline.startRendering();
+
+        return encodeWav(rendered.getChannelData(0), SPEECH_SAMPLE_RATE);
+    } finally {
+        context.close();
+    }
+}
+
+/**
+ * Convert speech to sign language.
+ *
+ * The first click records from the browser's microphone; a second click
+ * (or SPEECH_MAX_MS) stops the recording and uploads it.
  */
 async function convertSpeech() {
+    if (speechRecorder) {
+        speechRecorder.stop();
+        return;
+    }
     if (speechRecording) {
-        showToast('Already recording speech', 'info');
+        showToast('Already processing speech', 'info');
+        return;
+    }
+    if (!navigator.mediaDevices || !window.MediaRecorder) {
+        showToast('Voice input is not supported in this browser', 'error');
+        return;
+    }
+
+    let stream;
+    try {
+        stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+    } catch (error) {
+        console.error('Microphone access failed:', error);
+        showToast('Microphone access was denied', 'error');
         return;
     }
 
+    const chunks = [];
+    const recorder = new MediaRecorder(stream);
+    speechRecorder = recorder;
+
+    const stopTimer = setTimeout(() => {
+        if (recorder.state !== 'inactive') recorder.stop();
+    }, SPEECH_MAX_MS);
+
+    recorder.ondataavailable = (event) => {
+        if (event.data.size > 0) chunks.push(event.data);
+    };
+    recorder.onstop = () => {
+        clearTimeout(stopTimer);
+        stream.getTracks().forEach((track) => track.stop());
+        speechRecorder = null;
+        elements.convertSpeechBtn?.classList.remove('recording');
+        uploadSpeech(new Blob(chunks, { type: recorder.mimeType }));
+    };
+
+    // Clear the text input to show we're listening
+    if (elements.textInput) {
+        elements.textInput.value = '';
+        updateCharCount();
+    }
+
+    recorder.start();
+    elements.convertSpeechBtn?.classList.add('recording');
+    showToast('Listening... click Voice Input again to finish', 'info', 3000);
+}
+
+/**
+ * Upload a speech recording and show the recognized text as signs
+ * @param {Blob} recording - Recording in the browser's native format
+ */
+async function uploadSpeech(recording) {
     try {
         speechRecording = true;
         setButtonLoading('convert-speech-btn');
         showLoading();
 
-        // Clear the text input to show we're listening
-        if (elements.textInput) {
-            elements.textInput.value = '';
-            updateCharCount();
-        }
+        const form = new FormData();
+        form.append('audio', await recordingToWav(recording), 'speech.wav');
 
-        const data = await fetchWithErrorHandling('/convert_speech_to_sign', {
-            method: 'POST'
+        // Recognition runs as a background job so it never ties up a server thread
+        const accepted = await fetchWithErrorHandling('/convert_speech_to_sign?async=1', {
+            method: 'POST',
+            body: form
         });
+        const data = await waitForJob(accepted);
 
         if (data.status === 'success') {
             // Show recognized text in the input
@@ -491,7 +753,7 @@ function displayNextImage() {
         if (imageData.image) {
             signDisplay.innerHTML = `
                 <div class="sign-content">
-                    <img src="data:image/png;base64,${imageData.image}"
+                    <img src="data:${imageData.mime || 'image/png'};base64,${imageData.image}"
                          alt="Sign language gesture for letter ${imageData.character}"
                          class="sign-image">
                     <span class="sign-letter">${imageData.character}</span>
@@ -653,7 +915,7 @@ function refreshVideoFeed() {
 
     // Add timestamp to force reload
     const timestamp = new Date().getTime();
-    const baseUrl = '/video_feed';
+    const baseUrl = CAMERA ? `/video_feed/${encodeURIComponent(CAMERA)}` : '/video_feed';
     cameraFeed.src = `${baseUrl}?t=${timestamp}`;
     console.log('Video feed refreshed');
 }
@@ -0,0 +1,323 @@
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-ins for the OpenAI chat-completions API and the ElevenLabs
+# text-to-speech API, with configurable latency, error rates and
+# streaming, so the app can be benchmarked end to end without paid calls.
+#
+# Point the app at them with:
+#
+#   OPENAI_BASE_URL=http://127.0.0.1:8900/v1
+#   ELEVENLABS_API_URL=http://127.0.0.1:8900/v1/text-to-speech
+#
+# and run:
+#
+#   python benchmarks/fake_providers.py --port 8900 \
+#       --openai-latency lognormal:0.8:0.5 --openai-error-rate 0.05 \
+#       --tts-latency uniform:0.2:0.6
+#
+# Latency specs: "0.5" or "fixed:0.5", "uniform:LOW:HIGH",
+# "lognormal:MEDIAN:SIGMA" (seconds). For chat requests the latency is
+# the time to the first token; for speech it is the time to the first
+# audio byte.
+#
+# Corrections: inputs found in datasets/text_fix_examples.json get the
+# example's answer; anything else has its letters joined and capitalized.
+
+EXAMPLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datasets', 'text_fix_examples.json')
+
+
+class Latency:
+    """Samples response delays from a distribution spec."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        parts = str(spec).split(':')
+        if len(parts) == 1:
+            parts = ['fixed', parts[0]]
+        self.kind = parts[0]
+        self.params = [float(p) for p in parts[1:]]
+        expected = {'fixed': 1, 'uniform': 2, 'lognormal': 2}
+        if expected.get(self.kind) != len(self.params):
+            raise ValueError(f"Bad latency spec '{spec}'")
+
+    def sample(self, rng):
+        if self.kind == 'fixed':
+            return self.params[0]
+        if self.kind == 'uniform':
+            return rng.uniform(*self.params)
+        median, sigma = self.params
+        return median * rng.lognormvariate(0.0, sigma)
+
+
+class ProviderProfile:
+    """Latency, error rate and streaming pace of one fake provider."""
+
+    def __init__(self, latency='0.3', error_rate=0.0, error_status=500, chunk_delay=0.02):
+        self.latency = Latency(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.chunk_delay = chunk_delay
+
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.served = 0
+
+    def count(self, field):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def stats(self):
+        with self.lock:
+            return {'requests': self.requests, 'errors': self.errors, 'served': self.served}
+
+
+def load_answers():
+    try:
+        with open(EXAMPLES_PATH, encoding='utf-8') as f:
+            return {' '.join(e['input'].split()): e['output'] for e in json.load(f)}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+ANSWERS = load_answers()
+
+
+def fake_correction(user_content):
+    """The sentence the fake chat API returns for a user message."""
+    key = ' '.join(user_content.split())
+    if key in ANSWERS:
+        return ANSWERS[key]
+    letters = ''.join(user_content.split())
+    return letters.capitalize() + '.' if letters else ''
+
+
+def fake_audio(text):
+    """Deterministic stand-in MP3 bytes, roughly as long as real speech."""
+    size = max(len(text), 1) * 400
+    seed = hashlib.sha256(text.encode('utf-8')).digest()
+    body = (seed * (size // len(seed) + 1))[:size]
+    return b'ID3\x04\x00\x00\x00\x00\x00\x00' + body
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # Keep-alive, like the real APIs
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return {}
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def start_chunked(self, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+    def write_chunk(self, data):
+        self.wfile.write(f'{len(data):x}\r\n'.encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+    def end_chunked(self):
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+    def maybe_fail(self, profile):
+        """Wait the sampled latency; answer with an error at the configured rate."""
+        profile.count('requests')
+        with self.server.rng_lock:
+            delay = profile.latency.sample(self.server.rng)
+            failed = self.server.rng.random() < profile.error_rate
+        time.sleep(max(delay, 0.0))
+        if failed:
+            profile.count('errors')
+            self.send_json(profile.error_status, {
+                'error': {'message': 'Injected failure', 'type': 'server_error', 'code': profile.error_status}
+            })
+        return failed
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self.send_json(200, {
+                'openai': self.server.openai.stats(),
+                'elevenlabs': self.server.elevenlabs.stats()
+            })
+        else:
+            self.send_json(404, {'error': {'message': 'Not found'}})
+
+    def do_POST(self):
+        request = self.read_json()
+        if self.path.rstrip('/') == '/v1/chat/completions':
+            self.chat_completion(request)
+        elif self.path.startswith('/v1/text-to-speech/'):
+            self.text_to_speech(request, stream=self.path.rstrip('/').endswith('/stream'))
+        else:
+            self.send_json(404, {'error': {'message': 'Not found'}})
+
+    def chat_completion(self, request):
+        profile = self.server.openai
+        if self.maybe_fail(profile):
+            return
+
+        messages = request.get('messages') or [{}]
+        text = fake_correction(messages[-1].get('content', ''))
+        model = request.get('model', 'fake')
+        created = int(time.time())
+
+        if not request.get('stream'):
+            profile.count('served')
+            self.send_json(200, {
+                'id': 'chatcmpl-fake',
+                'object': 'chat.completion',
+                'created': created,
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': text},
+                    'finish_reason': 'stop'
+                }],
+                'usage': {'prompt_tokens': 0, 'completion_tokens': len(text.split()), 'total_tokens': 0}
+            })
+            return
+
+        def event(delta, finish_reason=None):
+            chunk = {
+                'id': 'chatcmpl-fake',
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+            }
+            return f'data: {json.dumps(chunk)}\n\n'.encode('utf-8')
+
+        self.start_chunked('text/event-stream')
+        self.write_chunk(event({'role': 'assistant', 'content': ''}))
+        for i, word in enumerate(text.split(' ')):
+            if i:
+                time.sleep(profile.chunk_delay)
+            self.write_chunk(event({'content': word if i == 0 else ' ' + word}))
+        self.write_chunk(event({}, 'stop'))
+        self.write_chunk(b'data: [DONE]\n\n')
+        self.end_chunked()
+        profile.count('served')
+
+    def text_to_speech(self, request, stream):
+        profile = self.server.elevenlabs
+        if self.maybe_fail(profile):
+            return
+
+        audio = fake_audio(request.get('text', ''))
+        if not stream:
+            profile.count('served')
+            self.send_response(200)
+            self.send_header('Content-Type', 'audio/mpeg')
+            self.send_header('Content-Length', str(len(audio)))
+            self.end_headers()
+            self.wfile.write(audio)
+            return
+
+        self.start_chunked('audio/mpeg')
+        chunk_size = 4096
+        for offset in range(0, len(audio), chunk_size):
+            if offset:
+                time.sleep(profile.chunk_delay)
+            self.write_chunk(audio[offset:offset + chunk_size])
+        self.end_chunked()
+        profile.count('served')
+
+
+class FakeProviderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, openai, elevenlabs, seed=0, verbose=False):
+        super().__init__(address, FakeProviderHandler)
+        self.openai = openai
+        self.elevenlabs = elevenlabs
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.verbose = verbose
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def app_environment(self):
+        """Environment variables pointing the app at this server."""
+        return {
+            'OPENAI_BASE_URL': f'{self.base_url}/v1',
+            'ELEVENLABS_API_URL': f'{self.base_url}/v1/text-to-speech',
+        }
+
+
+def start_fake_providers(openai, elevenlabs, host='127.0.0.1', port=0, seed=0, verbose=False):
+    """Start the fake providers on a background thread and return the server."""
+    server = FakeProviderServer((host, port), openai, elevenlabs, seed=seed, verbose=verbose)
+    threading.Thread(target=server.serve_forever, name='fake-providers', daemon=True).start()
+    return server
+
+
+def add_profile_arguments(parser):
+    parser.add_argument('--openai-latency', default='lognormal:0.8:0.4', help='time to first token')
+    parser.add_argument('--openai-error-rate', type=float, default=0.0, help='fraction of chat requests failing')
+    parser.add_argument('--openai-error-status', type=int, default=500, help='HTTP status of injected chat failures')
+    parser.add_argument('--openai-token-delay', type=float, default=0.03, help='seconds between streamed words')
+    parser.add_argument('--tts-latency', default='lognormal:0.4:0.4', help='time to first audio byte')
+    parser.add_argument('--tts-error-rate', type=float, default=0.0, help='fraction of speech requests failing')
+    parser.add_argument('--tts-error-status', type=int, default=500, help='HTTP status of injected speech failures')
+    parser.add_argument('--tts-chunk-delay', type=float, default=0.02, help='seconds between streamed audio chunks')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for latency and failures')
+
+
+def profiles_from_args(args):
+    openai = ProviderProfile(args.openai_latency, args.openai_error_rate,
+                             args.openai_error_status, args.openai_token_delay)
+    elevenlabs = ProviderProfile(args.tts_latency, args.tts_error_rate,
+                                 args.tts_error_status, args.tts_chunk_delay)
+    return openai, elevenlabs
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve fake OpenAI and ElevenLabs APIs.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        openai, elevenlabs = profiles_from_args(args)
+    except ValueError as e:
+        sys.exit(str(e))
+
+    server = FakeProviderServer((args.host, args.port), openai, elevenlabs, seed=args.seed, verbose=args.verbose)
+    print(f'Fake providers listening on {server.base_url}')
+    for name, value in server.app_environment().items():
+        print(f'  {name}={value}')
+    print(f'  request counts: {server.base_url}/stats')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
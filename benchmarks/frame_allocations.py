@@ -0,0 +1,117 @@
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+# Memory churn and timing jitter of the per-frame hot loop: read a frame,
+# gate it, find and classify hands, draw, encode the JPEG and build the
+# multipart part viewers are sent, exactly as a camera pipeline does
+# (CameraPipeline.render). Frames are read before each measurement so
+# only the processing is counted.
+#
+#   python benchmarks/frame_allocations.py --frames 500 --source synthetic:1280x720@0
+#
+# Reported per frame, after --warmup frames:
+#
+#   peak_kb     highest traced memory above the frame's starting point
+#               (tracemalloc), i.e. the temporary buffers the frame needed
+#   blocks      Python memory blocks allocated and not freed within the
+#               frame (sys.getallocatedblocks), which should stay near 0
+#   gc          garbage collections during the run and their total pause
+#   p50/p99     frame time, and its standard deviation (jitter)
+#
+# Hand detection runs in this process by default (--workers 0) so its
+# buffers are traced too.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+parser = argparse.ArgumentParser(description='Measure allocations and jitter of the frame hot loop.')
+parser.add_argument('--source', default='synthetic:640x480@0', help='frame source (as CAMERA_SOURCE)')
+parser.add_argument('--frames', type=int, default=300, help='measured frames')
+parser.add_argument('--warmup', type=int, default=30, help='unmeasured frames first')
+parser.add_argument('--workers', type=int, default=0, help='DETECTION_WORKERS for the run')
+parser.add_argument('--json', action='store_true', help='print the results as JSON')
+args = parser.parse_args()
+
+os.environ['DETECTION_WORKERS'] = str(args.workers)
+os.environ.setdefault('WARMUP', 'false')
+sys.path.insert(0, os.path.join(ROOT_DIR, 'UI'))
+
+import numpy as np
+import app
+from functions.frame_source import create_frame_source
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+source = create_frame_source(args.source)
+pipeline = app.pipelines[app.DEFAULT_CAMERA]
+app.hand_detector.get()
+app.classifier.get()
+
+pauses = []
+pause_start = [0.0]
+
+
+def on_gc(phase, info):
+    if phase == 'start':
+        pause_start[0] = time.perf_counter()
+    else:
+        pauses.append(time.perf_counter() - pause_start[0])
+
+
+try:
+    for _ in range(args.warmup):
+        pipeline.render(source.read()[1])
+
+    peaks, blocks, seconds = [], [], []
+    gc.collect()
+    gc.callbacks.append(on_gc)
+    tracemalloc.start()
+    for _ in range(args.frames):
+        ok, frame = source.read()
+        if not ok:
+            break
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        start_blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        pipeline.render(frame)
+        seconds.append(time.perf_counter() - start)
+        blocks.append(sys.getallocatedblocks() - start_blocks)
+        peaks.append(tracemalloc.get_traced_memory()[1] - start_memory)
+        del frame
+    tracemalloc.stop()
+    gc.callbacks.remove(on_gc)
+finally:
+    source.release()
+    app.cleanup()
+
+ms = [s * 1000 for s in seconds]
+result = {
+    'source': args.source,
+    'frames': len(seconds),
+    'peak_kb': round(float(np.mean(peaks)) / 1024, 1),
+    'blocks': round(float(np.mean(blocks)), 2),
+    'gc_collections': len(pauses),
+    'gc_pause_ms': round(sum(pauses) * 1000, 2),
+    'p50_ms': round(percentile(ms, 50), 2),
+    'p99_ms': round(percentile(ms, 99), 2),
+    'stdev_ms': round(float(np.std(ms)), 2),
+    'presence_gate': app.presence_gates[app.DEFAULT_CAMERA].stats()['skip_rate'],
+}
+
+if args.json:
+    print(json.dumps(result, indent=2))
+else:
+    print(f"{result['source']}: {result['frames']} frames (presence gate skipped {result['presence_gate']:.0%})")
+    print(f"  temporary memory  {result['peak_kb']} KB peak per frame, {result['blocks']} blocks kept per frame")
+    print(f"  garbage collector {result['gc_collections']} collections, {result['gc_pause_ms']} ms paused")
+    print(f"  frame time        p50 {result['p50_ms']} ms, p99 {result['p99_ms']} ms, stdev {result['stdev_ms']} ms")
@@ -0,0 +1,210 @@
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+
+import numpy as np
+
+# Latency and accuracy of hand detection at each inference setting:
+# INFERENCE_WIDTH (downscaling before detection) and DETECTION_ROI
+# (searching only around the previous frame's hands).
+#
+# The frames of --source are read once and run through every setting in
+# order, so the ROI mode sees real frame-to-frame motion. Accuracy is
+# measured against the full-resolution, full-frame run:
+#
+#   recall      share of the reference hands also found (same handedness,
+#               centre within 10% of the frame)
+#   extra       hands found that the reference did not find
+#   error_px    mean landmark distance to the reference, in frame pixels
+#   letters     share of found hands classified as the same letter as
+#               the reference (needs the model, --model)
+#
+# Accuracy needs frames with hands in them, e.g. a recording:
+#
+#   python benchmarks/inference_resolution.py --source file:signing.mp4 \
+#       --frames 300 --widths 0,960,640,480,320
+#
+# Synthetic frames (the default) have no hands and only show latency.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'UI', 'functions'))
+
+from frame_source import create_frame_source
+from hand_detection import InferenceRegion, LocalDetector, DetectionPool, create_hands
+
+MATCH_DISTANCE = 0.1
+
+
+def percentile(values, p):
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    index = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def read_frames(spec, count):
+    source = create_frame_source(spec)
+    if hasattr(source, 'interval'):
+        source.interval = 0.0  # As fast as they can be read
+    frames = []
+    try:
+        for _ in range(count * 3):
+            if len(frames) == count:
+                break
+            ok, frame = source.read()
+            if ok:
+                frames.append(frame)
+    finally:
+        source.release()
+    return frames
+
+
+def load_model(path):
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)['model']
+    except Exception as e:
+        print(f"No letter accuracy: cannot load {path} ({e})", file=sys.stderr)
+        return None
+
+
+def classify(model, hands):
+    """Class of each hand (features as in app.hand_features)."""
+    if model is None or not hands:
+        return []
+    xy = np.stack([hand.landmarks[:, :2] for hand in hands]).astype(np.float64)
+    features = (xy - xy.min(axis=1, keepdims=True)).reshape(len(xy), -1)
+    return list(model.predict(features))
+
+
+def match(reference, found):
+    """Pairs (i, j) of reference and found hands that are the same hand."""
+    pairs = sorted(
+        (float(np.linalg.norm(a.landmarks[:, :2].mean(axis=0) - b.landmarks[:, :2].mean(axis=0))), i, j)
+        for i, a in enumerate(reference) for j, b in enumerate(found)
+        if a.handedness == b.handedness
+    )
+    used_i, used_j, matched = set(), set(), []
+    for distance, i, j in pairs:
+        if distance <= MATCH_DISTANCE and i not in used_i and j not in used_j:
+            matched.append((i, j))
+            used_i.add(i)
+            used_j.add(j)
+    return matched
+
+
+def run_setting(detector, frames, width, roi, args):
+    region = InferenceRegion(width=width, roi=roi, margin=args.margin, refresh=args.refresh)
+    for frame in frames[:args.warmup]:
+        region.detect(detector, frame)
+    region = InferenceRegion(width=width, roi=roi, margin=args.margin, refresh=args.refresh)
+
+    results, seconds = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        results.append(region.detect(detector, frame))
+        seconds.append(time.perf_counter() - start)
+    return results, seconds, region.stats()
+
+
+def compare(reference, results, frames, model):
+    total = found = extra = same_letter = classified = 0
+    errors = []
+    for ref_hands, hands, frame in zip(reference, results, frames):
+        height, width = frame.shape[:2]
+        matched = match(ref_hands, hands)
+        total += len(ref_hands)
+        found += len(matched)
+        extra += len(hands) - len(matched)
+        for i, j in matched:
+            offsets = (ref_hands[i].landmarks[:, :2] - hands[j].landmarks[:, :2]) * (width, height)
+            errors.append(float(np.linalg.norm(offsets, axis=1).mean()))
+        if model is not None and matched:
+            ref_letters = classify(model, [ref_hands[i] for i, _ in matched])
+            letters = classify(model, [hands[j] for _, j in matched])
+            same_letter += sum(a == b for a, b in zip(ref_letters, letters))
+            classified += len(matched)
+    return {
+        'reference_hands': total,
+        'recall': round(found / total, 3) if total else None,
+        'extra': extra,
+        'error_px': round(float(np.mean(errors)), 2) if errors else None,
+        'letters': round(same_letter / classified, 3) if classified else None,
+    }
+
+
+parser = argparse.ArgumentParser(description='Benchmark hand detection at each inference resolution and ROI setting.')
+parser.add_argument('--source', default='synthetic:1280x720@30', help='frame source (as CAMERA_SOURCE)')
+parser.add_argument('--frames', type=int, default=100, help='frames per setting')
+parser.add_argument('--warmup', type=int, default=5, help='untimed frames before each setting')
+parser.add_argument('--widths', default='0,960,640,480,320', help='INFERENCE_WIDTH values (0 = full)')
+parser.add_argument('--roi', choices=('off', 'on', 'both'), default='both', help='DETECTION_ROI values')
+parser.add_argument('--margin', type=float, default=0.5, help='ROI_MARGIN')
+parser.add_argument('--refresh', type=int, default=30, help='ROI_REFRESH')
+parser.add_argument('--workers', type=int, default=0,
+                    help='detection worker processes (0 = in this process, without the frame copy)')
+parser.add_argument('--model', default=os.path.join(ROOT_DIR, 'model', 'model.p'), help='classifier for letter accuracy')
+parser.add_argument('--json', action='store_true', help='print the results as JSON')
+args = parser.parse_args()
+
+frames = read_frames(args.source, args.frames)
+if not frames:
+    sys.exit(f"No frames from {args.source}")
+height, width = frames[0].shape[:2]
+widths = [int(value) for value in args.widths.split(',')]
+rois = {'off': [False], 'on': [True], 'both': [False, True]}[args.roi]
+model = load_model(args.model)
+
+if args.workers:
+    detector = DetectionPool(args.workers)
+    detector.start()
+else:
+    detector = LocalDetector(create_hands())
+
+rows = []
+try:
+    # The reference is the full frame at full resolution
+    reference, reference_seconds, _ = run_setting(detector, frames, 0, False, args)
+    for roi in rois:
+        for inference_width in widths:
+            if inference_width == 0 and not roi:
+                results, seconds = reference, reference_seconds
+                stats = {'roi_frames': 0, 'roi_misses': 0, 'mean_pixels': width * height}
+            else:
+                results, seconds, stats = run_setting(detector, frames, inference_width, roi, args)
+            ms = [s * 1000 for s in seconds]
+            rows.append({
+                'width': inference_width or width,
+                'roi': roi,
+                'p50_ms': round(percentile(ms, 50), 2),
+                'p95_ms': round(percentile(ms, 95), 2),
+                'mean_pixels': stats['mean_pixels'],
+                'roi_frames': stats['roi_frames'],
+                'roi_misses': stats['roi_misses'],
+                **compare(reference, results, frames, model),
+            })
+finally:
+    detector.shutdown()
+
+if args.json:
+    print(json.dumps({'source': args.source, 'frame': [width, height], 'frames': len(frames), 'results': rows}, indent=2))
+else:
+    print(f"{args.source}: {len(frames)} frames of {width}x{height}, "
+          f"{'pool of ' + str(args.workers) if args.workers else 'in-process detector'}")
+    print(f"{'width':>6} {'roi':>4} {'p50 ms':>8} {'p95 ms':>8} {'pixels':>9} {'roi fr':>7} "
+          f"{'recall':>7} {'extra':>6} {'err px':>7} {'letters':>8}")
+
+    def show(value):
+        return '-' if value is None else value
+
+    for row in rows:
+        print(f"{row['width']:>6} {'on' if row['roi'] else 'off':>4} {row['p50_ms']:>8} {row['p95_ms']:>8} "
+              f"{row['mean_pixels']:>9} {row['roi_frames']:>7} {show(row['recall']):>7} {row['extra']:>6} "
+              f"{show(row['error_px']):>7} {show(row['letters']):>8}")
+    if not rows[0]['reference_hands']:
+        print("No hands in the reference run: accuracy needs frames with hands (--source file:... or dir:...)")
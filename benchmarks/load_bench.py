@@ -0,0 +1,350 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+
+import requests
+
+# Load test: how many concurrent users can one app instance serve?
+#
+# For each step of --streams (e.g. 1,2,4,8) the harness opens that many
+# /video_feed streams, polls /get_current_prediction for each of them,
+# and mixes in /convert_text and start/stop recording requests at the
+# given rates. Per step it reports the frame rate each stream achieved,
+# p50/p95/p99 latency per endpoint, errors, and the server's CPU and
+# RSS. The step where the total frame rate stops growing (or streams
+# fall below --min-fps) is reported as the saturation point.
+#
+# With --launch the app is started here with a camera that needs no
+# hardware (CAMERA_SOURCE, default synthetic:640x480@30) and rate
+# limiting off; otherwise point --url at a running server started with
+# the same settings, and pass --pid to sample its CPU and memory.
+#
+#   python benchmarks/load_bench.py --launch --streams 1,2,4 --duration 20
+#   python benchmarks/load_bench.py --launch --camera-source file:signing.mp4
+#
+# Corrections go to OpenAI unless OPENAI_BASE_URL points elsewhere (see
+# fake_providers.py); without a key the offline corrector is used.
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+PHRASES = ['hello', 'thank you', 'how are you', 'good morning', 'see you later', 'nice to meet you']
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def percentile(values, p):
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    index = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+class ProcessSampler(threading.Thread):
+    """Samples CPU use and resident memory of a process (and its children)."""
+
+    def __init__(self, pid, interval=0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.cpu_percent = []
+        self.rss_bytes = []
+
+    def cpu_seconds_and_rss(self):
+        if psutil is not None:
+            processes = [psutil.Process(self.pid)]
+            processes += processes[0].children(recursive=True)
+            cpu, rss = 0.0, 0
+            for process in processes:
+                try:
+                    times = process.cpu_times()
+                    cpu += times.user + times.system
+                    rss += process.memory_info().rss
+                except psutil.NoSuchProcess:
+                    pass
+            return cpu, rss
+
+        # Linux without psutil: read /proc, children (capture and
+        # detection workers) included
+        stats = {}
+        for entry in os.listdir('/proc'):
+            if entry.isdigit():
+                try:
+                    with open(f'/proc/{entry}/stat') as f:
+                        stats[int(entry)] = f.read().rsplit(')', 1)[1].split()
+                except OSError:
+                    pass
+        if self.pid not in stats:
+            raise OSError(f'Process {self.pid} has exited')
+        tree, pending = set(), [self.pid]
+        while pending:
+            pid = pending.pop()
+            tree.add(pid)
+            pending += [child for child, fields in stats.items() if int(fields[1]) == pid and child not in tree]
+        ticks = os.sysconf('SC_CLK_TCK')
+        cpu = sum(int(stats[pid][11]) + int(stats[pid][12]) for pid in tree) / ticks
+        rss = sum(int(stats[pid][21]) for pid in tree) * os.sysconf('SC_PAGE_SIZE')
+        return cpu, rss
+
+    def run(self):
+        last_cpu, _ = self.cpu_seconds_and_rss()
+        last_time = time.monotonic()
+        while not self.stop_event.wait(self.interval):
+            try:
+                cpu, rss = self.cpu_seconds_and_rss()
+            except (OSError, ValueError):
+                return
+            now = time.monotonic()
+            self.cpu_percent.append(100 * (cpu - last_cpu) / (now - last_time))
+            self.rss_bytes.append(rss)
+            last_cpu, last_time = cpu, now
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+class StreamClient(threading.Thread):
+    """Reads one /video_feed stream and counts the frames received."""
+
+    def __init__(self, url, stop_event):
+        super().__init__(daemon=True)
+        self.url = url
+        self.stop_event = stop_event
+        self.frames = 0
+        self.first_frame_at = None
+        self.last_frame_at = None
+        self.error = None
+
+    def run(self):
+        marker = b'--frame\r\n'
+        tail = b''
+        try:
+            with requests.get(f'{self.url}/video_feed', stream=True, timeout=(5, 30)) as response:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    data = tail + chunk
+                    count = data.count(marker)
+                    if count:
+                        now = time.monotonic()
+                        if self.first_frame_at is None:
+                            self.first_frame_at = now
+                            count -= 1  # Rate is measured from the first frame
+                        self.frames += count
+                        self.last_frame_at = now
+                    tail = data[-(len(marker) - 1):]
+                    if self.stop_event.is_set():
+                        break
+        except requests.RequestException as e:
+            self.error = str(e)
+
+    def fps(self):
+        if not self.first_frame_at or self.last_frame_at == self.first_frame_at:
+            return 0.0
+        return self.frames / (self.last_frame_at - self.first_frame_at)
+
+
+class RequestLoop(threading.Thread):
+    """Sends one kind of request at a steady rate, recording latency."""
+
+    def __init__(self, name, send, rate, stop_event, results, seed):
+        super().__init__(daemon=True)
+        self.name = name
+        self.send = send
+        self.interval = 1.0 / rate
+        self.stop_event = stop_event
+        self.results = results
+        self.rng = random.Random(seed)
+
+    def run(self):
+        session = requests.Session()
+        # Random phase so the loops don't fire in lockstep
+        if self.stop_event.wait(self.rng.uniform(0, self.interval)):
+            return
+        while not self.stop_event.is_set():
+            start = time.monotonic()
+            try:
+                ok = self.send(session, self.rng)
+            except requests.RequestException:
+                ok = False
+            latency = time.monotonic() - start
+            self.results.record(self.name, latency, ok)
+            self.stop_event.wait(max(self.interval - latency, 0.0))
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, name, latency, ok):
+        with self.lock:
+            self.latencies.setdefault(name, []).append(latency)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def run_step(args, streams):
+    stop_event = threading.Event()
+    results = Results()
+    url = args.url
+
+    def poll_prediction(session, rng):
+        return session.get(f'{url}/get_current_prediction', timeout=10).ok
+
+    def convert_text(session, rng):
+        return session.post(f'{url}/convert_text', json={'text': rng.choice(PHRASES)}, timeout=30).ok
+
+    def record_sentence(session, rng):
+        session.post(f'{url}/start_recording', timeout=10)
+        return session.post(f'{url}/stop_recording', timeout=60).ok
+
+    clients = [StreamClient(url, stop_event) for _ in range(streams)]
+    loops = [
+        RequestLoop('get_current_prediction', poll_prediction, args.poll_rate, stop_event, results, seed=i)
+        for i in range(streams)
+    ]
+    if args.convert_rate > 0:
+        loops.append(RequestLoop('convert_text', convert_text, args.convert_rate, stop_event, results, seed=100))
+    if args.record_rate > 0:
+        loops.append(RequestLoop('stop_recording', record_sentence, args.record_rate, stop_event, results, seed=200))
+
+    sampler = ProcessSampler(args.pid) if args.pid else None
+    for thread in clients + loops:
+        thread.start()
+    if sampler:
+        sampler.start()
+
+    time.sleep(args.duration)
+    stop_event.set()
+    for thread in clients + loops:
+        thread.join(timeout=35)
+    if sampler:
+        sampler.stop()
+
+    fps = [client.fps() for client in clients]
+    step = {
+        'streams': streams,
+        'fps_per_stream': [round(f, 1) for f in fps],
+        'mean_fps': round(sum(fps) / len(fps), 1) if fps else 0.0,
+        'min_fps': round(min(fps), 1) if fps else 0.0,
+        'total_fps': round(sum(fps), 1),
+        'stream_errors': sum(1 for client in clients if client.error),
+        'endpoints': {
+            name: {
+                'count': len(latencies),
+                'errors': results.errors.get(name, 0),
+                'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+                'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+            }
+            for name, latencies in sorted(results.latencies.items())
+        },
+    }
+    if sampler and sampler.cpu_percent:
+        step['cpu_percent'] = round(sum(sampler.cpu_percent) / len(sampler.cpu_percent), 1)
+        step['max_rss_mb'] = round(max(sampler.rss_bytes) / 2 ** 20, 1)
+    return step
+
+
+def launch_server(args):
+    env = dict(os.environ)
+    env.update({
+        'PORT': str(args.port),
+        'CAMERA_SOURCE': args.camera_source,
+        'RATE_LIMITING': 'false',
+        'PYTHONUNBUFFERED': '1',
+    })
+    log = open(os.path.join(ROOT_DIR, 'benchmarks', 'load_bench_server.log'), 'w')
+    process = subprocess.Popen(
+        [sys.executable, 'app.py'], cwd=os.path.join(ROOT_DIR, 'UI'), env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+    # /ready answers once the warm-up is done
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f'Server exited with code {process.returncode}, see benchmarks/load_bench_server.log')
+        try:
+            if requests.get(f'{args.url}/ready', timeout=2).ok:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    sys.exit('Server did not become ready within 120s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test the app with concurrent video streams and requests.')
+    parser.add_argument('--url', help='running server (default: the launched one)')
+    parser.add_argument('--pid', type=int, help='server process ID to sample CPU and memory of')
+    parser.add_argument('--launch', action='store_true', help='start the app for the test')
+    parser.add_argument('--port', type=int, default=5055, help='port of the launched app')
+    parser.add_argument('--camera-source', default='synthetic:640x480@30', help='CAMERA_SOURCE of the launched app')
+    parser.add_argument('--streams', default='1,2,4,8', help='comma-separated concurrent stream counts')
+    parser.add_argument('--duration', type=float, default=15.0, help='seconds per step')
+    parser.add_argument('--poll-rate', type=float, default=2.0, help='prediction polls per second per stream')
+    parser.add_argument('--convert-rate', type=float, default=0.5, help='/convert_text requests per second')
+    parser.add_argument('--record-rate', type=float, default=0.1, help='start/stop recording pairs per second')
+    parser.add_argument('--min-fps', type=float, default=10.0, help='slowest acceptable stream frame rate')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    if not args.url and not args.launch:
+        parser.error('pass --url of a running server or --launch')
+    args.url = (args.url or f'http://127.0.0.1:{args.port}').rstrip('/')
+
+    server = None
+    if args.launch:
+        server = launch_server(args)
+        args.pid = server.pid
+
+    steps = []
+    saturation = None
+    try:
+        for streams in [int(n) for n in args.streams.split(',')]:
+            step = run_step(args, streams)
+            steps.append(step)
+            if not args.json:
+                cpu = f", cpu {step['cpu_percent']}%, rss {step['max_rss_mb']} MB" if 'cpu_percent' in step else ''
+                print(f"{streams} streams: {step['total_fps']} fps total, "
+                      f"{step['mean_fps']} mean / {step['min_fps']} min per stream{cpu}")
+                for name, stats in step['endpoints'].items():
+                    print(f"    {name:<24}{stats['count']:>6} req {stats['errors']:>4} err "
+                          f"p50 {stats['p50_ms']:>8.1f} ms  p95 {stats['p95_ms']:>8.1f} ms  p99 {stats['p99_ms']:>8.1f} ms")
+
+            # Throughput has fallen off once adding streams no longer adds
+            # frames, or any stream drops below the acceptable rate
+            previous = steps[-2] if len(steps) > 1 else None
+            if saturation is None and (
+                step['min_fps'] < args.min_fps
+                or (previous and step['total_fps'] < previous['total_fps'] * 1.05)
+            ):
+                saturation = streams
+
+            if server and server.poll() is not None:
+                print(f'Server exited with code {server.returncode} during the {streams}-stream step, '
+                      'see benchmarks/load_bench_server.log')
+                if saturation is None:
+                    saturation = streams
+                break
+    finally:
+        if server and server.poll() is None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    if args.json:
+        print(json.dumps({'steps': steps, 'saturation_streams': saturation}, indent=2))
+    elif saturation is None:
+        print(f'No fall-off up to {steps[-1]["streams"]} streams')
+    else:
+        print(f'Throughput falls off at {saturation} streams')
@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+
+# Compares the retrieval-selected few-shot prompt (PROMPT_MODE=retrieval)
+# against the full prompt for UI/functions/text_fix.py.
+#
+# Every example in datasets/text_fix_examples.json is used as a test
+# input. It is left out of the retrieved examples, so the retrieval
+# prompt cannot simply copy its answer. Token counts use tiktoken when
+# installed and a 4-characters-per-token estimate otherwise.
+#
+# With a valid OPENAI_API_KEY both prompts are also sent to the API to
+# compare latency and whether they produce the same output:
+#
+#   python benchmarks/prompt_eval.py --k 8 --limit 30
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'UI', 'functions'))
+
+import text_fix
+from prompt_examples import build_prompt
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding('o200k_base')
+
+    def count_tokens(text):
+        return len(_encoding.encode(text))
+    TOKENIZER = 'tiktoken o200k_base'
+except ImportError:
+    def count_tokens(text):
+        return max(1, round(len(text) / 4))
+    TOKENIZER = 'estimate (chars / 4)'
+
+
+def complete(system_prompt, user_content):
+    start = time.perf_counter()
+    response = text_fix.get_client().chat.completions.create(
+        model=text_fix.MODEL_NAME,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ],
+        temperature=0.0,
+        max_tokens=len(user_content.split()) + 50,
+        top_p=1.0
+    )
+    elapsed = time.perf_counter() - start
+    return (response.choices[0].message.content or '').strip(), elapsed
+
+
+parser = argparse.ArgumentParser(description='Compare the retrieval prompt with the full prompt.')
+parser.add_argument('--k', type=int, default=text_fix.PROMPT_EXAMPLES_K, help='examples per retrieval prompt')
+parser.add_argument('--limit', type=int, default=0, help='evaluate only the first N examples (0 = all)')
+parser.add_argument('--offline', action='store_true', help='skip API calls even if a key is configured')
+args = parser.parse_args()
+
+store = text_fix.example_store
+examples = store.examples[:args.limit] if args.limit else store.examples
+online = not args.offline and text_fix.get_client() is not None
+
+full_tokens = count_tokens(text_fix.SYSTEM_PROMPT)
+retrieval_tokens = []
+same_category = 0
+matches = 0
+full_correct = 0
+retrieval_correct = 0
+full_latency = []
+retrieval_latency = []
+
+for i, example in enumerate(examples):
+    nearest = store.nearest(example['input'], args.k, exclude={i})
+    prompt = build_prompt(text_fix.PROMPT_RULES, nearest)
+    retrieval_tokens.append(count_tokens(prompt))
+    if nearest and nearest[0].get('category') == example.get('category'):
+        same_category += 1
+
+    if online:
+        full_output, full_time = complete(text_fix.SYSTEM_PROMPT, example['input'])
+        retrieval_output, retrieval_time = complete(prompt, example['input'])
+        full_latency.append(full_time)
+        retrieval_latency.append(retrieval_time)
+        matches += full_output == retrieval_output
+        full_correct += full_output == example['output']
+        retrieval_correct += retrieval_output == example['output']
+        if full_output != retrieval_output:
+            print(f"  {example['input']!r}: full={full_output!r} retrieval={retrieval_output!r}")
+
+n = len(examples)
+print(f"\nExamples evaluated: {n} (k={args.k}, tokenizer: {TOKENIZER})")
+print(f"Full prompt tokens:      {full_tokens}")
+print(f"Retrieval prompt tokens: mean {statistics.mean(retrieval_tokens):.0f}, "
+      f"max {max(retrieval_tokens)} ({statistics.mean(retrieval_tokens) / full_tokens:.1%} of full)")
+print(f"Nearest example shares the input's category: {same_category}/{n}")
+
+if online:
+    print(f"Full prompt latency:      median {statistics.median(full_latency) * 1000:.0f} ms")
+    print(f"Retrieval prompt latency: median {statistics.median(retrieval_latency) * 1000:.0f} ms")
+    print(f"Identical outputs: {matches}/{n}")
+    print(f"Matches expected output: full {full_correct}/{n}, retrieval {retrieval_correct}/{n}")
+else:
+    print("OpenAI API not configured (or --offline): latency and output equality were not measured")
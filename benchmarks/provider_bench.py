@@ -0,0 +1,206 @@
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import argparse
+
+# End-to-end benchmark of sentence correction (/stop_recording) and
+# speech (/speak_text/audio) against the local fake providers in
+# fake_providers.py, so tail latency, cache effectiveness and fallback
+# behaviour can be measured offline and without paid API calls.
+#
+# Each iteration simulates one user: start a recording, commit the
+# letters of a phrase from datasets/text_fix_examples.json, stop (the
+# correction), wait --think-time seconds, then fetch the sentence's
+# audio. --repeat is the chance of reusing an earlier phrase, which is
+# what the correction and audio caches can serve. Everything runs in
+# this process through Flask's test client, with fresh caches.
+#
+#   python benchmarks/provider_bench.py --requests 200 --repeat 0.3 \
+#       --openai-latency lognormal:1.5:0.8 --openai-error-rate 0.1 \
+#       --openai-deadline 3
+#
+# Correction outcomes: "api" (answered by the fake OpenAI), "cache" or
+# "fallback" (offline corrector). Speech outcomes: "cached" (served from
+# disk, e.g. prefetched), "streamed" or "fallback" (browser speech).
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from fake_providers import (
+    EXAMPLES_PATH, add_profile_arguments, fake_correction, profiles_from_args, start_fake_providers
+)
+
+
+def percentile(values, p):
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    index = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(name, seconds):
+    ms = [s * 1000 for s in seconds]
+    return {
+        'name': name,
+        'count': len(ms),
+        'p50_ms': round(percentile(ms, 50), 1),
+        'p95_ms': round(percentile(ms, 95), 1),
+        'p99_ms': round(percentile(ms, 99), 1),
+        'max_ms': round(max(ms), 1) if ms else float('nan'),
+    }
+
+
+parser = argparse.ArgumentParser(description='Benchmark correction and speech against fake providers.')
+parser.add_argument('--requests', type=int, default=100, help='simulated users (iterations)')
+parser.add_argument('--repeat', type=float, default=0.3, help='chance of repeating an earlier phrase')
+parser.add_argument('--think-time', type=float, default=0.5, help='seconds between correction and speech')
+parser.add_argument('--stream', action='store_true', help='use /stop_recording/stream for the correction')
+parser.add_argument('--openai-deadline', type=float, help='override OPENAI_DEADLINE')
+parser.add_argument('--tts-deadline', type=float, help='override ELEVENLABS_DEADLINE')
+parser.add_argument('--no-prefetch', action='store_true', help='disable speech prefetching')
+parser.add_argument('--json', action='store_true', help='print the results as JSON')
+add_profile_arguments(parser)
+args = parser.parse_args()
+
+try:
+    openai_profile, tts_profile = profiles_from_args(args)
+except ValueError as e:
+    sys.exit(str(e))
+
+server = start_fake_providers(openai_profile, tts_profile, seed=args.seed)
+workdir = tempfile.mkdtemp(prefix='provider-bench-')
+
+# The app reads its configuration at import time
+os.environ.update(server.app_environment())
+os.environ.update({
+    'OPENAI_API_KEY': 'fake-key',
+    'ELEVENLABS_API_KEY': 'fake-key',
+    'ELEVENLABS_VOICE_ID': 'fake-voice',
+    'CORRECTION_CACHE_PATH': os.path.join(workdir, 'corrections.sqlite3'),
+    'AUDIO_CACHE_DIR': os.path.join(workdir, 'audio'),
+    'WARMUP': 'false',
+})
+if args.openai_deadline is not None:
+    os.environ['OPENAI_DEADLINE'] = str(args.openai_deadline)
+if args.tts_deadline is not None:
+    os.environ['ELEVENLABS_DEADLINE'] = str(args.tts_deadline)
+if args.no_prefetch:
+    os.environ['TTS_PREFETCH'] = 'false'
+
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'UI'))
+import app as app_module
+
+if app_module.limiter:
+    app_module.limiter.enabled = False
+client = app_module.app.test_client()
+
+with open(EXAMPLES_PATH, encoding='utf-8') as f:
+    phrases = [example['input'] for example in json.load(f)]
+
+rng = random.Random(args.seed)
+used = []
+correction_times, speech_first_byte, speech_total = [], [], []
+correction_outcomes = {'api': 0, 'cache': 0, 'fallback': 0}
+speech_outcomes = {'cached': 0, 'streamed': 0, 'fallback': 0}
+
+
+def cache_hits():
+    stats = app_module.correction_cache.stats()
+    return stats['memory_hits'] + stats['disk_hits']
+
+
+start_all = time.perf_counter()
+for i in range(args.requests):
+    if used and rng.random() < args.repeat:
+        phrase = rng.choice(used)
+    else:
+        phrase = rng.choice(phrases)
+        used.append(phrase)
+
+    client.post('/start_recording')
+    app_module.detector.detected_sentence = phrase.split()
+
+    hits_before = cache_hits()
+    served_before = openai_profile.stats()['served']
+    start = time.perf_counter()
+    if args.stream:
+        response = client.post('/stop_recording/stream')
+        response.get_data()
+        sentence = app_module.detector.current_meaningful_sentence
+    else:
+        sentence = client.post('/stop_recording').get_json()['meaningful_sentence']
+    correction_times.append(time.perf_counter() - start)
+
+    if cache_hits() > hits_before:
+        correction_outcomes['cache'] += 1
+    elif openai_profile.stats()['served'] > served_before and sentence == fake_correction(phrase):
+        correction_outcomes['api'] += 1
+    else:
+        correction_outcomes['fallback'] += 1
+
+    time.sleep(args.think_time)
+
+    start = time.perf_counter()
+    response = client.get('/speak_text/audio', buffered=False)
+    first = None
+    for chunk in response.response:
+        if first is None and chunk:
+            first = time.perf_counter() - start
+    response.close()
+    total = time.perf_counter() - start
+
+    if response.status_code != 200:
+        speech_outcomes['fallback'] += 1
+    else:
+        speech_first_byte.append(first if first is not None else total)
+        speech_total.append(total)
+        cached = response.headers.get('Accept-Ranges') == 'bytes'
+        speech_outcomes['cached' if cached else 'streamed'] += 1
+
+elapsed = time.perf_counter() - start_all
+metrics = client.get('/metrics').get_json()
+
+results = {
+    'requests': args.requests,
+    'elapsed_s': round(elapsed, 1),
+    'latency': [
+        summarize('correction', correction_times),
+        summarize('speech first byte', speech_first_byte),
+        summarize('speech complete', speech_total),
+    ],
+    'correction_outcomes': correction_outcomes,
+    'speech_outcomes': speech_outcomes,
+    'correction_cache_hit_rate': round(metrics['correction_cache']['hit_rate'], 3),
+    'audio_cache_hit_rate': round(metrics['audio_cache']['hit_rate'], 3),
+    'circuit_breakers': {
+        name: {key: stats[key] for key in ('state', 'failures', 'budget_misses', 'short_circuits', 'opens')}
+        for name, stats in metrics['circuit_breakers'].items()
+    },
+    'fake_providers': {'openai': openai_profile.stats(), 'elevenlabs': tts_profile.stats()},
+}
+
+if args.json:
+    print(json.dumps(results, indent=2))
+    sys.exit(0)
+
+print(f"{args.requests} users in {elapsed:.1f}s "
+      f"(openai {args.openai_latency}, {args.openai_error_rate:.0%} errors; "
+      f"tts {args.tts_latency}, {args.tts_error_rate:.0%} errors)")
+print()
+print(f"{'':<20}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+for row in results['latency']:
+    print(f"{row['name']:<20}{row['count']:>7}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+          f"{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}")
+print()
+print('Correction:', ', '.join(f'{k} {v}' for k, v in correction_outcomes.items()),
+      f"(cache hit rate {results['correction_cache_hit_rate']:.0%})")
+print('Speech:    ', ', '.join(f'{k} {v}' for k, v in speech_outcomes.items()),
+      f"(audio cache hit rate {results['audio_cache_hit_rate']:.0%})")
+for name, stats in results['circuit_breakers'].items():
+    print(f"Breaker {name}: {stats['state']}, {stats['failures']} failures "
+          f"({stats['budget_misses']} over budget), {stats['short_circuits']} skipped, opened {stats['opens']}x")
+print('Fake providers:', json.dumps(results['fake_providers']))
@@ -0,0 +1,39 @@
+import os
+import json
+import pickle
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import cross_val_predict
+from sklearn.metrics import confusion_matrix
+
+# Measures how often each letter is mistaken for another, for the
+# noisy-channel decoder in UI/functions/noisy_channel.py. Predictions are
+# made with 5-fold cross-validation so every sample is scored by a model
+# that did not see it, mirroring train_classifier.py.
+
+data_dict = pickle.load(open('./datasets/dataset.pickle', 'rb'))
+
+print('Data loaded successfully !')
+print('\n\nComputing cross-validated predictions...')
+
+data = np.asarray(data_dict['data'])
+labels = np.asarray(data_dict['labels'])
+
+y_predict = cross_val_predict(RandomForestClassifier(), data, labels, cv=5)
+
+# Class labels are the folder names 0-25, which map to A-Z
+classes = sorted(set(labels), key=int)
+matrix = confusion_matrix(labels, y_predict, labels=classes)
+
+output = {
+    'labels': [chr(65 + int(c)) for c in classes],
+    'matrix': matrix.tolist()
+}
+
+os.makedirs('./model', exist_ok=True)
+with open('./model/confusion.json', 'w') as f:
+    json.dump(output, f)
+
+accuracy = np.trace(matrix) / matrix.sum()
+print('{}% of samples were classified correctly !'.format(accuracy * 100))
+print('Confusion matrix saved to ./model/confusion.json')
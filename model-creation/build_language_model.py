@@ -0,0 +1,56 @@
+import os
+import argparse
+
+# Builds the word frequency tables used by UI/functions/word_segmenter.py.
+#
+# The shipped tables were built from the MIT-licensed frequency dictionaries
+# distributed with symspellpy (derived from Google Books Ngram data):
+#
+#   pip download symspellpy --no-deps && unzip symspellpy-*.whl
+#   python model-creation/build_language_model.py \
+#       symspellpy/frequency_dictionary_en_82_765.txt \
+#       symspellpy/frequency_bigramdictionary_en_243_342.txt
+
+OUTPUT_DIR = './datasets/language_model'
+
+
+def read_counts(path, ngram):
+    counts = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) != ngram + 1 or not parts[-1].isdigit():
+                continue
+            words = [w.lower() for w in parts[:ngram]]
+            if all(w.isalpha() and w.isascii() for w in words):
+                counts.append((' '.join(words), int(parts[-1])))
+    counts.sort(key=lambda item: item[1], reverse=True)
+    return counts
+
+
+def write_counts(path, counts):
+    with open(path, 'w', encoding='utf-8') as f:
+        for words, count in counts:
+            f.write(f"{words} {count}\n")
+
+
+parser = argparse.ArgumentParser(description='Build unigram/bigram tables for the offline corrector.')
+parser.add_argument('unigrams', help='"word count" frequency file')
+parser.add_argument('bigrams', help='"word word count" frequency file')
+parser.add_argument('--max-unigrams', type=int, default=30000)
+parser.add_argument('--max-bigrams', type=int, default=30000)
+args = parser.parse_args()
+
+unigrams = read_counts(args.unigrams, 1)
+# Keep single letters only for the real one-letter words
+unigrams = [(w, c) for w, c in unigrams if len(w) > 1 or w in ('a', 'i')][:args.max_unigrams]
+vocabulary = {w for w, _ in unigrams}
+
+bigrams = [(w, c) for w, c in read_counts(args.bigrams, 2)
+           if all(part in vocabulary for part in w.split())][:args.max_bigrams]
+
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+write_counts(os.path.join(OUTPUT_DIR, 'unigrams.txt'), unigrams)
+write_counts(os.path.join(OUTPUT_DIR, 'bigrams.txt'), bigrams)
+
+print(f"Wrote {len(unigrams)} unigrams and {len(bigrams)} bigrams to {OUTPUT_DIR}")
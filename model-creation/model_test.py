@@ -30,8 +30,7 @@ while True:
         break
 
     data_aux_list = []
-    x_list = []
-    y_list = []
+    handedness_list = []
 
     H, W, _ = frame.shape
 
@@ -39,7 +38,7 @@ while True:
     results = hands.process(frame_rgb)
 
     if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
+        for hand_index, hand_landmarks in enumerate(results.multi_hand_landmarks):
             data_aux = []
             x_ = []
             y_ = []
@@ -58,6 +57,8 @@ while True:
                 data_aux.append(y - min(y_))
 
             data_aux_list.append(data_aux)
+            handedness = results.multi_handedness[hand_index].classification[0].label if results.multi_handedness else ''
+            handedness_list.append(handedness)
 
             mp_drawing.draw_landmarks(
                 frame,
@@ -69,17 +70,24 @@ while True:
 
         current_char_list = [] 
 
-        for data_aux in data_aux_list:
-            if len(data_aux) == 42: 
-                prediction = model.predict([np.asarray(data_aux)])
-                predicted_character = labels_dict[int(prediction[0])]
-
-                if hasattr(model, "predict_proba"):
-                    confidence = model.predict_proba([np.asarray(data_aux)])[0][int(prediction[0])]
-                else:
-                    confidence = 1.0 
-
-                current_char_list.append(f"{predicted_character} ({confidence * 100:.2f}%)")
+        # All hands in one classifier call
+        hands_batch = [(handedness, data_aux) for handedness, data_aux in zip(handedness_list, data_aux_list)
+                       if len(data_aux) == 42]
+        if hands_batch:
+            batch = np.asarray([data_aux for _, data_aux in hands_batch])
+            if hasattr(model, "predict_proba"):
+                # Columns follow model.classes_
+                probabilities = model.predict_proba(batch)
+                best = probabilities.argmax(axis=1)
+                predictions = model.classes_[best]
+                confidences = probabilities[np.arange(len(batch)), best]
+            else:
+                predictions = model.predict(batch)
+                confidences = np.ones(len(batch))
+
+            for (handedness, _), prediction, confidence in zip(hands_batch, predictions, confidences):
+                predicted_character = labels_dict[int(prediction)]
+                current_char_list.append(f"{predicted_character} ({confidence * 100:.2f}%) {handedness}")
 
         current_char = " | ".join(current_char_list).upper()
 
@@ -19,6 +19,7 @@ def app():
     os.environ.setdefault('OPENAI_API_KEY', 'test-key')
     os.environ.setdefault('ELEVENLABS_API_KEY', 'test-key')
     os.environ.setdefault('ELEVENLABS_VOICE_ID', 'test-voice-id')
+    os.environ.setdefault('WARMUP', 'false')
 
     # Import after setting env vars to avoid validation errors
     from app import app as flask_app
@@ -21,6 +21,18 @@ class TestHealthEndpoint:
         assert 'model_loaded' in data
 
 
+class TestMetricsEndpoint:
+    """Tests for the /metrics endpoint."""
+
+    def test_metrics_reports_cache_stats(self, client):
+        """Test that correction cache counters are exposed."""
+        response = client.get('/metrics')
+        assert response.status_code == 200
+
+        data = json.loads(response.data)
+        assert 'hit_rate' in data['correction_cache']
+
+
 class TestIndexRoute:
     """Tests for the main index page."""
 
@@ -30,6 +42,70 @@ class TestIndexRoute:
         assert response.status_code == 200
         assert b'Sign Language Translator' in response.data
 
+    def test_index_unknown_camera(self, client):
+        """Test that a booth page for an unknown camera is 404."""
+        assert client.get('/?camera=nope').status_code == 404
+
+
+class TestCameraEndpoints:
+    """Tests for per-camera routing."""
+
+    def test_cameras_lists_default(self, client):
+        """Test that the configured cameras are listed with their stats."""
+        response = client.get('/cameras')
+        assert response.status_code == 200
+
+        data = json.loads(response.data)
+        names = [camera['name'] for camera in data['cameras']]
+        assert data['default'] in names
+        assert 'fps' in data['cameras'][0]
+
+    def test_unknown_video_feed(self, client):
+        """Test that a feed for an unknown camera is 404."""
+        assert client.get('/video_feed/nope').status_code == 404
+
+    def test_unknown_source_for_recording(self, client):
+        """Test that recording calls for an unknown camera are 404."""
+        assert client.post('/start_recording?source=nope').status_code == 404
+        assert client.get('/get_current_prediction?source=nope').status_code == 404
+
+    def test_named_source_uses_its_detector(self, client):
+        """Test that ?source= selects the camera's detector."""
+        import app as app_module
+
+        response = client.get(f'/get_current_prediction?source={app_module.DEFAULT_CAMERA}')
+        assert response.status_code == 200
+
+    def test_recording_does_not_cancel_other_cameras_prefetch(self, client):
+        """Test that each camera's detector queues speech on its own prefetcher."""
+        import threading
+        import app as app_module
+        from functions.speech_prefetch import SpeechPrefetcher
+
+        release = threading.Event()
+        front, side = app_module.SignLanguageDetector(), app_module.SignLanguageDetector()
+        front.prefetcher = SpeechPrefetcher(lambda text: release.wait(5) and (None, False),
+                                            enabled=True, max_workers=1)
+        try:
+            front.prefetcher.prefetch('first sentence')
+            front.prefetcher.prefetch('second sentence')  # Queued behind the first
+            side.start_recording()
+            assert front.prefetcher.stats()['cancelled'] == 0
+            assert front.prefetcher.stats()['in_flight'] == 2
+        finally:
+            release.set()
+            front.prefetcher.shutdown()
+            for sign_detector in (front, side):
+                sign_detector.speculator.shutdown()
+
+    def test_metrics_reports_cameras(self, client):
+        """Test that per-camera pipeline stats are exposed."""
+        data = json.loads(client.get('/metrics').data)
+        assert 'cameras' in data
+        assert 'slots' in data['inference_scheduler']
+        assert set(data['speech_prefetch']) == set(data['cameras'])
+        assert set(data['speculative_correction']) == set(data['cameras'])
+
 
 class TestRecordingEndpoints:
     """Tests for the recording start/stop endpoints."""
@@ -55,6 +131,18 @@ class TestRecordingEndpoints:
         assert 'raw_text' in data
         assert 'meaningful_sentence' in data
 
+    def test_stop_recording_stream_sends_events(self, client):
+        """Test that the streaming stop endpoint emits raw and done events."""
+        client.post('/start_recording')
+
+        response = client.post('/stop_recording/stream')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+
+        body = response.get_data(as_text=True)
+        assert body.startswith('event: raw\n')
+        assert 'event: done\ndata: {"status": "success", "meaningful_sentence": ""}' in body
+
     def test_get_current_prediction(self, client):
         """Test that current prediction endpoint works."""
         response = client.get('/get_current_prediction')
@@ -152,6 +240,66 @@ class TestSpeakTextEndpoint:
         assert data['status'] == 'error'
 
 
+class TestSpeakTextAudioEndpoint:
+    """Tests for the /speak_text/audio endpoint."""
+
+    @pytest.fixture
+    def voice_cache(self, client, tmp_path, mocker):
+        """Use an empty audio cache and a current sentence."""
+        import app as app_module
+        from functions import voice
+        from functions.audio_cache import AudioCache
+
+        cache = AudioCache(str(tmp_path))
+        mocker.patch.object(voice, 'audio_cache', cache)
+        mocker.patch.object(app_module.detector, 'current_meaningful_sentence', 'Hello.')
+        return voice, cache
+
+    def test_no_sentence_returns_404(self, client, mocker):
+        """Test that nothing is synthesized without a sentence."""
+        import app as app_module
+        mocker.patch.object(app_module.detector, 'current_meaningful_sentence', '')
+
+        response = client.get('/speak_text/audio')
+        assert response.status_code == 404
+
+    def test_streams_and_caches_new_clip(self, client, voice_cache, mocker):
+        """Test that provider chunks are forwarded and then cached."""
+        voice, cache = voice_cache
+        upstream = mocker.MagicMock(status_code=200)
+        upstream.iter_content.return_value = iter([b'ID3', b'audio'])
+        mocker.patch.object(voice.elevenlabs_session.get(), 'post', return_value=upstream)
+
+        response = client.get('/speak_text/audio')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'audio/mpeg'
+        assert response.get_data() == b'ID3audio'
+        assert cache.stats()['entries'] == 1
+
+    def test_cached_clip_supports_range(self, client, voice_cache):
+        """Test that a cached clip is served with partial content."""
+        voice, cache = voice_cache
+        key = cache.make_key('Hello.', voice.VOICE_ID, voice.DEFAULT_STABILITY, voice.DEFAULT_SIMILARITY_BOOST)
+        cache.put(key, b'0123456789')
+
+        response = client.get('/speak_text/audio', headers={'Range': 'bytes=2-5'})
+
+        assert response.status_code == 206
+        assert response.get_data() == b'2345'
+
+    def test_cached_clip_is_held_while_served(self, client, voice_cache):
+        """Test that a clip cannot be evicted until its response is closed."""
+        voice, cache = voice_cache
+        key = cache.make_key('Hello.', voice.VOICE_ID, voice.DEFAULT_STABILITY, voice.DEFAULT_SIMILARITY_BOOST)
+        cache.put(key, b'0123456789')
+
+        response = client.get('/speak_text/audio', buffered=False)
+        assert cache.stats()['held'] == 1
+        response.close()
+        assert cache.stats()['held'] == 0
+
+
 class TestSignLanguageDetector:
     """Tests for the SignLanguageDetector class."""
 
@@ -200,6 +348,31 @@ class TestSignLanguageDetector:
         assert detector.is_recording is False
         assert raw_text == 'A B C'
 
+    def test_detector_stop_recording_stream(self):
+        """Test that streamed deltas are forwarded and the final text is kept."""
+        import sys
+        import os
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI'))
+
+        from app import SignLanguageDetector
+
+        def fake_stream(text, lattice=None):
+            yield {'delta': 'Hel'}
+            yield {'delta': 'lo.'}
+            yield {'final': 'Hello.'}
+
+        detector = SignLanguageDetector()
+        detector.speculator.stream = fake_stream
+        detector.start_recording()
+        detector.detected_sentence = ['H', 'E', 'L', 'O']
+
+        events = list(detector.stop_recording_stream())
+
+        assert events == [
+            {'raw_text': 'H E L O'}, {'delta': 'Hel'}, {'delta': 'lo.'}, {'final': 'Hello.'}
+        ]
+        assert detector.current_meaningful_sentence == 'Hello.'
+
     def test_detector_check_sign_stability(self):
         """Test sign stability checking."""
         import sys
@@ -221,3 +394,323 @@ class TestSignLanguageDetector:
         # Should be stable after 5 identical predictions
         assert is_stable is True
         assert prediction == 'A'
+
+    def test_detector_builds_letter_lattice(self):
+        """Test that committed letters keep their averaged candidates."""
+        import sys
+        import os
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI'))
+
+        from app import SignLanguageDetector
+
+        detector = SignLanguageDetector()
+        detector.start_recording()
+        detector.last_detection_time = 0
+
+        for _ in range(5):
+            detector.check_sign_stability('M', [('M', 0.6), ('N', 0.4)])
+        detector.process_stable_prediction('M')
+
+        assert detector.detected_sentence == ['M']
+        assert detector.letter_lattice[0][0] == ('M', pytest.approx(0.6))
+        assert detector.letter_lattice[0][1] == ('N', pytest.approx(0.4))
+
+    def test_detector_hands_have_separate_buffers(self):
+        """Test that two hands signing different letters both become stable."""
+        import sys
+        import os
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI'))
+
+        from app import SignLanguageDetector
+
+        detector = SignLanguageDetector()
+        detector.start_recording()
+        detector.last_detection_time = 0
+
+        for _ in range(4):
+            assert detector.update_hands([('left1', 'A', []), ('right1', 'B', [])]) is False
+        assert detector.update_hands([('left1', 'A', []), ('right1', 'B', [])]) is True
+
+        assert detector.is_hand_stable('left1')
+        assert detector.is_hand_stable('right1')
+        assert detector.detected_sentence == ['A']
+
+
+class TestProcessHandLandmarks:
+    """Tests for feature extraction from landmarks."""
+
+    def test_array_matches_landmark_objects(self, app, sample_hand_landmarks):
+        """Landmark arrays from the detection workers give the same features."""
+        import numpy as np
+        from app import process_hand_landmarks
+
+        array = np.array(
+            [(lm.x, lm.y, 0.0) for lm in sample_hand_landmarks.landmark], dtype=np.float32
+        )
+        expected = process_hand_landmarks(sample_hand_landmarks)
+        features = process_hand_landmarks(array)
+
+        assert len(features) == 42
+        assert features == pytest.approx(expected, abs=1e-6)
+
+
+class TestBatchPrediction:
+    """Tests for classifying every hand of a frame in one call."""
+
+    def test_hand_features_per_hand(self, app):
+        """Each hand is normalized to its own minimum."""
+        import numpy as np
+        from app import hand_features
+
+        hands = np.stack([
+            np.full((21, 3), 0.2, dtype=np.float32),
+            np.linspace(0.5, 0.9, 63, dtype=np.float32).reshape(21, 3),
+        ])
+        features = hand_features(hands)
+
+        assert features.shape == (2, 42)
+        assert features[0] == pytest.approx(np.zeros(42))
+        assert features[1][:2] == pytest.approx([0.0, 0.0])
+
+    def test_hand_features_reuses_buffer(self, app):
+        """Features are written into the buffer given."""
+        import numpy as np
+        from app import hand_features
+
+        out = np.full((4, 42), -1.0)
+        landmarks = [np.linspace(0.1, 0.5, 63, dtype=np.float32).reshape(21, 3)] * 2
+        features = hand_features(landmarks, out=out)
+
+        assert features.shape == (2, 42)
+        assert np.shares_memory(features, out)
+        assert out[2, 0] == -1.0
+        assert features[0] == pytest.approx(hand_features(np.stack(landmarks))[0])
+
+    def test_one_classifier_call_for_all_hands(self, app, mocker):
+        """All hands go through a single predict_proba call."""
+        import numpy as np
+        import app as app_module
+
+        model = mocker.MagicMock()
+        model.classes_ = np.arange(26)
+        probabilities = np.full((2, 26), 0.01)
+        probabilities[0, 0] = 0.9
+        probabilities[1, 1] = 0.8
+        model.predict_proba.return_value = probabilities
+        mocker.patch.object(app_module.classifier, 'get', return_value=model)
+
+        results = app_module.predict_batch(np.zeros((2, 42)), top_k=2)
+
+        assert model.predict_proba.call_count == 1
+        assert [result[0] for result in results] == ['A', 'B']
+        assert results[1][1] == pytest.approx(80.0)
+        assert results[0][2][0] == ('A', pytest.approx(0.9))
+        assert len(results[0][2]) == 2
+
+    def test_single_prediction_uses_batch(self, app, mocker):
+        """predict_with_candidates is a batch of one."""
+        import numpy as np
+        import app as app_module
+
+        model = mocker.MagicMock()
+        model.classes_ = np.arange(26)
+        model.predict_proba.return_value = np.eye(26)[[2]]
+        mocker.patch.object(app_module.classifier, 'get', return_value=model)
+
+        assert app_module.predict_with_candidates([0.0] * 42)[0] == 'C'
+        assert app_module.predict_with_candidates([0.0] * 10) == ("", 0.0, [])
+
+
+class TestSignImageEndpoint:
+    """Tests for the /sign_image endpoint."""
+
+    def test_sign_image_returns_image(self, client):
+        """Test that a letter image is served with content negotiation."""
+        response = client.get('/sign_image/a?size=64', headers={'Accept': 'image/png'})
+        assert response.status_code == 200
+        assert response.mimetype == 'image/png'
+        assert 'Accept' in response.headers.get('Vary', '')
+
+    def test_sign_image_rejects_non_letters(self, client):
+        """Test that unknown characters return 404."""
+        response = client.get('/sign_image/1')
+        assert response.status_code == 404
+
+
+class TestConvertTextBulkEndpoint:
+    """Tests for the /convert_text/bulk endpoint."""
+
+    def test_bulk_texts_stream_ndjson(self, client):
+        """Test that each input text produces one NDJSON line."""
+        response = client.post('/convert_text/bulk', json={'texts': ['HI', '123', 'A B']})
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        assert [line['status'] for line in lines] == ['success', 'error', 'success']
+        assert len(lines[0]['images']) == 2
+        assert lines[2]['images'][1]['character'] == 'space'
+
+    def test_bulk_ndjson_input_with_urls(self, client):
+        """Test NDJSON request bodies and URL-only image output."""
+        body = '{"text": "AB"}\n"C"\nnot json\n'
+        response = client.post(
+            '/convert_text/bulk?images=url&size=64',
+            data=body,
+            content_type='application/x-ndjson'
+        )
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+
+        assert lines[0]['images'][0]['url'] == '/sign_image/A?size=64'
+        assert lines[1]['text'] == 'C'
+        assert lines[2]['status'] == 'error'
+
+    def test_bulk_document_is_segmented(self, client):
+        """Test that a long document is split into bounded segments."""
+        document = ' '.join(['HELLO'] * 300)
+        response = client.post('/convert_text/bulk?images=url', json={'document': document})
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+
+        assert len(lines) > 1
+        assert all(line['status'] == 'success' for line in lines)
+        assert all(len(line['text']) <= 500 for line in lines)
+
+    def test_bulk_ndjson_items_that_are_not_strings(self, client):
+        """Test that non-string NDJSON items become error segments."""
+        body = '{"text": 5}\nnull\n7\n{"text": "AB"}\n{}\n'
+        response = client.post('/convert_text/bulk', data=body, content_type='application/x-ndjson')
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+
+        assert [line['status'] for line in lines] == ['error', 'error', 'error', 'success', 'error']
+        assert all(line['text'] == '' for line in lines if line['status'] == 'error')
+
+    def test_bulk_texts_that_are_not_strings(self, client):
+        """Test that non-string items of a texts list become error segments."""
+        response = client.post('/convert_text/bulk', json={'texts': ['HI', None, 5, {'text': 'A'}]})
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+
+        assert [line['status'] for line in lines] == ['success', 'error', 'error', 'error']
+
+    @pytest.mark.parametrize('payload', [['ab', 'cd'], 'abc', None, {'texts': 'abc'}, {'document': 5}, {}])
+    def test_bulk_rejects_malformed_json_bodies(self, client, payload):
+        """Test that a JSON body must be an object with a texts list or a document."""
+        response = client.post('/convert_text/bulk', data=json.dumps(payload), content_type='application/json')
+        assert response.status_code == 400
+        assert response.get_json()['status'] == 'error'
+
+    def test_bulk_rejects_other_content_types(self, client):
+        """Test that non-JSON bodies are rejected."""
+        response = client.post('/convert_text/bulk', data='HELLO')
+        assert response.status_code == 400
+
+
+class TestConvertSpeechEndpoint:
+    """Tests for the /convert_speech_to_sign endpoint."""
+
+    @pytest.fixture
+    def fixed_backend(self, client, mocker):
+        """Recognize uploads with the local stand-in backend."""
+        import app as app_module
+        from functions.speech_to_text import FixedTranscriptBackend, SpeechRecognizerService
+
+        service = SpeechRecognizerService(FixedTranscriptBackend('hi'))
+        mocker.patch.object(app_module, 'speech_recognizer', service)
+        yield service
+        service.shutdown()
+
+    @staticmethod
+    def wav(amplitude):
+        import io
+        import wave
+        import numpy as np
+
+        rate = 16000
+        samples = np.zeros(rate * 2)
+        samples[rate // 2:rate + rate // 2] = amplitude * np.sin(np.arange(rate) * 0.1)
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(rate)
+            f.writeframes(samples.astype('<i2').tobytes())
+        return buffer.getvalue()
+
+    def test_upload_is_recognized(self, client, fixed_backend):
+        import io
+
+        response = client.post('/convert_speech_to_sign', data={
+            'audio': (io.BytesIO(self.wav(8000)), 'speech.wav')
+        })
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['status'] == 'success'
+        assert data['text'] == 'hi'
+        assert len(data['images']) == 2
+
+    def test_silent_upload_is_not_understood(self, client, fixed_backend):
+        import io
+
+        response = client.post('/convert_speech_to_sign', data={
+            'audio': (io.BytesIO(self.wav(0)), 'speech.wav')
+        })
+
+        assert response.get_json()['status'] == 'error'
+        assert fixed_backend.backend.calls == 0
+
+    def test_missing_upload(self, client, fixed_backend):
+        response = client.post('/convert_speech_to_sign')
+
+        assert response.status_code == 400
+
+    def test_unsupported_format(self, client, fixed_backend):
+        import io
+
+        response = client.post('/convert_speech_to_sign', data={
+            'audio': (io.BytesIO(b'not audio'), 'speech.webm')
+        })
+
+        assert response.status_code == 400
+
+    def test_async_upload_returns_job(self, client, fixed_backend):
+        import io
+        import app as app_module
+
+        response = client.post('/convert_speech_to_sign?async=1', data={
+            'audio': (io.BytesIO(self.wav(8000)), 'speech.wav')
+        })
+
+        assert response.status_code == 202
+        accepted = response.get_json()
+        app_module.job_queue.get(accepted['job_id']).wait(5)
+
+        status = client.get(accepted['status_url']).get_json()
+        assert status['state'] == 'succeeded'
+        assert status['result']['text'] == 'hi'
+        assert status['timing']['run_ms'] is not None
+
+        events = client.get(accepted['events_url']).get_data(as_text=True)
+        assert 'event: done' in events
+
+
+class TestJobsEndpoint:
+    """Tests for the /jobs endpoints."""
+
+    def test_unknown_job(self, client):
+        assert client.get('/jobs/missing').status_code == 404
+        assert client.delete('/jobs/missing').status_code == 404
+
+    def test_async_stop_recording(self, client, mocker):
+        import app as app_module
+
+        mocker.patch.object(app_module.detector, 'correct_recording', return_value=('HI', 'Hi.'))
+        client.post('/start_recording')
+
+        response = client.post('/stop_recording?async=1')
+
+        assert response.status_code == 202
+        # Recording stops with the request, not when the job runs
+        assert not app_module.detector.is_recording
+        job = app_module.job_queue.get(response.get_json()['job_id'])
+        assert job.wait(5) == 'succeeded'
+        assert job.result['meaningful_sentence'] == 'Hi.'
@@ -0,0 +1,126 @@
+"""
+Tests for Audio Cache Module
+
+This module tests the content-addressed TTS audio cache and its use
+by the voice module.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from audio_cache import AudioCache
+
+
+class TestAudioCache:
+    """Tests for storing, looking up and evicting clips."""
+
+    def test_key_covers_text_and_voice_settings(self):
+        """Test that every synthesis parameter is part of the key."""
+        key = AudioCache.make_key('Hello  world', 'voice', 0.7, 0.8)
+
+        assert key == AudioCache.make_key('Hello world', 'voice', 0.7, 0.8)
+        assert key != AudioCache.make_key('Hello world', 'other', 0.7, 0.8)
+        assert key != AudioCache.make_key('Hello world', 'voice', 0.5, 0.8)
+        assert key != AudioCache.make_key('Hello world', 'voice', 0.7, 0.9)
+
+    def test_put_then_get(self, tmp_path):
+        """Test that a stored clip is found and counted as a hit."""
+        cache = AudioCache(str(tmp_path))
+
+        assert cache.get('a') is None
+        path = cache.put('a', b'mp3')
+
+        assert cache.get('a') == path
+        with open(path, 'rb') as f:
+            assert f.read() == b'mp3'
+        assert cache.stats()['hits'] == 1
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that the total size stays bounded, dropping old clips first."""
+        cache = AudioCache(str(tmp_path), max_bytes=10)
+        cache.put('a', b'1234')
+        cache.put('b', b'1234')
+        cache.get('a')
+        cache.put('c', b'1234')
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.stats()['bytes'] <= 10
+        assert not os.path.exists(cache.path_for('b'))
+
+    def test_held_clips_are_not_evicted(self, tmp_path):
+        """Test that a clip being served survives eviction until released."""
+        cache = AudioCache(str(tmp_path), max_bytes=10)
+        cache.put('a', b'1234')
+        path = cache.get('a', hold=True)
+        cache.put('b', b'1234')
+        cache.get('b')
+        cache.put('c', b'1234')  # 'a' is least recently used, but held
+
+        assert os.path.exists(path)
+        assert cache.get('b') is None
+        assert cache.stats()['held'] == 1
+        assert cache.stats()['bytes'] <= 10
+
+        cache.release(path)
+        assert cache.stats()['held'] == 0
+
+    def test_directory_is_created_on_first_use(self, tmp_path):
+        """Test that constructing the cache touches nothing on disk."""
+        directory = tmp_path / 'audio'
+        cache = AudioCache(str(directory))
+        assert not directory.exists()
+
+        assert cache.get('a') is None
+        assert directory.exists()
+
+    def test_existing_clips_are_indexed(self, tmp_path):
+        """Test that clips written by an earlier process are reused."""
+        AudioCache(str(tmp_path)).put('a', b'mp3')
+
+        assert AudioCache(str(tmp_path)).get('a') is not None
+
+
+class TestVoiceCaching:
+    """Tests for cached synthesis in the voice module."""
+
+    def test_repeated_text_skips_api(self, tmp_path, mocker):
+        """Test that the second request for a phrase is served from disk."""
+        os.environ.setdefault('ELEVENLABS_API_KEY', 'test-key')
+        os.environ.setdefault('ELEVENLABS_VOICE_ID', 'test-voice-id')
+        import voice
+
+        mocker.patch.object(voice, 'audio_cache', AudioCache(str(tmp_path)))
+        response = mocker.MagicMock(status_code=200, content=b'mp3')
+        post = mocker.patch.object(voice.elevenlabs_session.get(), 'post', return_value=response)
+
+        first, temporary = voice.synthesize_to_file('Hello world.')
+        second, _ = voice.synthesize_to_file('Hello  world.')
+
+        assert first == second
+        assert temporary is False
+        assert post.call_count == 1
+
+    def test_clip_is_held_while_playing(self, tmp_path, mocker):
+        """Test that playback keeps the clip from being evicted."""
+        os.environ.setdefault('ELEVENLABS_API_KEY', 'test-key')
+        os.environ.setdefault('ELEVENLABS_VOICE_ID', 'test-voice-id')
+        import voice
+
+        cache = AudioCache(str(tmp_path))
+        mocker.patch.object(voice, 'audio_cache', cache)
+        response = mocker.MagicMock(status_code=200, content=b'mp3')
+        mocker.patch.object(voice.elevenlabs_session.get(), 'post', return_value=response)
+        held = []
+        mocker.patch.object(voice, 'playsound', side_effect=lambda path: held.append(dict(cache._held)))
+
+        assert voice.text_to_speech_and_play('Hello world.')  # Synthesized
+        assert voice.text_to_speech_and_play('Hello world.')  # Cache hit
+
+        assert len(held) == 2
+        assert all(len(h) == 1 for h in held)
+        assert cache._held == {}
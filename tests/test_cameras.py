@@ -0,0 +1,207 @@
+"""
+Tests for Cameras Module
+
+This module tests CAMERA_SOURCES parsing, the fair inference scheduler
+and the per-camera pipeline shared by its viewers.
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from cameras import CameraPipeline, FairScheduler, FramePartWriter, parse_camera_sources
+from frame_source import SyntheticSource
+
+
+class TestParseCameraSources:
+    """Tests for CAMERA_SOURCES."""
+
+    def test_default_camera(self):
+        cameras = parse_camera_sources('', 'synthetic', environ={})
+        assert [(camera.name, camera.source) for camera in cameras] == [('default', 'synthetic')]
+
+    def test_named_and_bare_sources(self):
+        cameras = parse_camera_sources('front=0, side=v4l2:/dev/video2,synthetic@5', environ={})
+        assert [(camera.name, camera.source) for camera in cameras] == [
+            ('front', '0'), ('side', 'v4l2:/dev/video2'), ('cam2', 'synthetic@5')
+        ]
+
+    def test_per_camera_overrides(self):
+        environ = {'CAMERA_SIDE_STABILITY_THRESHOLD': '8', 'CAMERA_SIDE_STABILIZATION_DELAY': '0.5'}
+        front, side = parse_camera_sources('front=0,side=1', stability_threshold=5, environ=environ)
+        assert front.stability_threshold == 5
+        assert side.stability_threshold == 8
+        assert side.stabilization_delay == 0.5
+        assert side.to_dict()['name'] == 'side'
+
+    def test_bad_name(self):
+        with pytest.raises(ValueError):
+            parse_camera_sources('front door=0', environ={})
+
+    def test_duplicate_name(self):
+        with pytest.raises(ValueError):
+            parse_camera_sources('a=0,a=1', environ={})
+
+    def test_bad_override(self):
+        with pytest.raises(ValueError):
+            parse_camera_sources('a=0', environ={'CAMERA_A_STABILITY_THRESHOLD': 'many'})
+
+
+class TestFairScheduler:
+    """Tests for sharing inference between cameras."""
+
+    def test_least_recently_served_goes_first(self):
+        scheduler = FairScheduler(slots=1)
+        order = []
+
+        def take(camera):
+            with scheduler.turn(camera):
+                order.append(camera)
+
+        with scheduler.turn('a'):
+            # 'a' queues again before 'b', but 'b' has never been served
+            threads = [threading.Thread(target=take, args=(camera,)) for camera in ('a', 'b')]
+            for thread in threads:
+                thread.start()
+                while scheduler.stats()['waiting'] < threads.index(thread) + 1:
+                    time.sleep(0.001)
+        for thread in threads:
+            thread.join(5)
+
+        assert order == ['b', 'a']
+        assert scheduler.stats()['turns'] == {'a': 2, 'b': 1}
+
+    def test_slots_limit_concurrency(self):
+        scheduler = FairScheduler(slots=2)
+        busy = []
+        lock = threading.Lock()
+        active = [0]
+
+        def take(camera):
+            with scheduler.turn(camera):
+                with lock:
+                    active[0] += 1
+                    busy.append(active[0])
+                time.sleep(0.01)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=take, args=(f'cam{i}',)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        assert max(busy) <= 2
+        assert scheduler.stats()['busy'] == 0
+
+
+class TestFramePartWriter:
+    """Tests for building multipart parts in a reused buffer."""
+
+    def test_part_framing(self):
+        part = FramePartWriter().part(b'JPEG')
+        assert part == b'--frame\r\nContent-Type: image/jpeg\r\n\r\nJPEG\r\n'
+
+    def test_array_input(self):
+        jpeg = np.frombuffer(b'\xff\xd8data', dtype=np.uint8).reshape(-1, 1)
+        assert FramePartWriter().part(jpeg).endswith(b'\xff\xd8data\r\n')
+
+    def test_parts_outlive_buffer_reuse(self):
+        writer = FramePartWriter(capacity=64)
+        first = writer.part(b'a' * 10)
+        second = writer.part(b'b' * 200)  # Grows the buffer
+        third = writer.part(b'c' * 5)
+        assert first.endswith(b'a' * 10 + b'\r\n')
+        assert second.count(b'b') == 200
+        assert third.endswith(b'\r\n\r\nccccc\r\n')
+
+
+def make_pipeline(process=None, idle_timeout=0.0):
+    config = parse_camera_sources('test=synthetic:64x48@200', environ={})[0]
+    return CameraPipeline(
+        config,
+        open_source=lambda: SyntheticSource(64, 48, fps=200),
+        process=process or (lambda frame: frame),
+        encode=lambda frame: bytes([int(frame[0, 0, 0])]),
+        error_frame=lambda message: message.encode(),
+        idle_timeout=idle_timeout,
+    )
+
+
+class TestCameraPipeline:
+    """Tests for the per-camera pipeline."""
+
+    def test_viewers_share_one_stream(self):
+        processed = []
+        pipeline = make_pipeline(lambda frame: processed.append(1) or frame, idle_timeout=5)
+        try:
+            viewers = [pipeline.frames_for_viewer() for _ in range(3)]
+            for viewer in viewers:
+                assert isinstance(next(viewer), bytes)
+            assert pipeline.viewers == 3
+            for viewer in viewers:
+                for _ in range(5):
+                    next(viewer)
+            # Three viewers did not triple the processing
+            assert len(processed) <= pipeline.frames + 1
+            for viewer in viewers:
+                viewer.close()
+            assert pipeline.viewers == 0
+        finally:
+            pipeline.stop()
+
+    def test_stops_when_idle(self):
+        pipeline = make_pipeline(idle_timeout=0.05)
+        viewer = pipeline.frames_for_viewer()
+        next(viewer)
+        viewer.close()
+        deadline = time.monotonic() + 5
+        while pipeline.stats()['running'] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not pipeline.stats()['running']
+
+        # A new viewer starts it again
+        viewer = pipeline.frames_for_viewer()
+        assert next(viewer)
+        viewer.close()
+        pipeline.stop()
+
+    def test_stats(self):
+        pipeline = make_pipeline(idle_timeout=5)
+        try:
+            viewer = pipeline.frames_for_viewer()
+            for _ in range(10):
+                next(viewer)
+            stats = pipeline.stats()
+            assert stats['frames'] >= 10
+            assert stats['fps'] > 0
+            assert stats['latency_p50_ms'] is not None
+            assert stats['viewers'] == 1
+            viewer.close()
+        finally:
+            pipeline.stop()
+
+    def test_processing_error_keeps_running(self):
+        calls = [0]
+
+        def flaky(frame):
+            calls[0] += 1
+            if calls[0] == 1:
+                raise RuntimeError('boom')
+            return frame
+
+        pipeline = make_pipeline(flaky, idle_timeout=5)
+        try:
+            viewer = pipeline.frames_for_viewer()
+            assert next(viewer)
+            assert calls[0] >= 2
+            viewer.close()
+        finally:
+            pipeline.stop()
@@ -0,0 +1,89 @@
+"""
+Tests for Correction Cache Module
+
+This module tests the two-tier correction cache.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from correction_cache import CorrectionCache, normalize_input
+
+
+class TestCacheKeys:
+    """Tests for key construction."""
+
+    def test_normalize_input(self):
+        """Test that case and spacing differences are ignored."""
+        assert normalize_input(' h e  l l o ') == 'H E L L O'
+
+    def test_key_depends_on_model_and_prompt(self):
+        """Test that the model and prompt are part of the key."""
+        key = CorrectionCache.make_key('H I', 'gpt-4o', 'prompt')
+
+        assert key == CorrectionCache.make_key('h  i', 'gpt-4o', 'prompt')
+        assert key != CorrectionCache.make_key('H I', 'other-model', 'prompt')
+        assert key != CorrectionCache.make_key('H I', 'gpt-4o', 'new prompt')
+
+
+class TestCorrectionCache:
+    """Tests for cache lookups, eviction and persistence."""
+
+    def test_miss_then_hit(self):
+        """Test that a stored value is returned and counted."""
+        cache = CorrectionCache()
+
+        assert cache.get('k') is None
+        cache.set('k', 'Hello.')
+        assert cache.get('k') == 'Hello.'
+
+        stats = cache.stats()
+        assert stats['misses'] == 1
+        assert stats['memory_hits'] == 1
+
+    def test_memory_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = CorrectionCache(max_memory_entries=2)
+        cache.set('a', '1')
+        cache.set('b', '2')
+        cache.get('a')
+        cache.set('c', '3')
+
+        assert cache.get('b') is None
+        assert cache.get('a') == '1'
+
+    def test_ttl_expiry(self, mocker):
+        """Test that entries older than the TTL are dropped."""
+        cache = CorrectionCache(ttl=10)
+        clock = mocker.patch('correction_cache.time.time', return_value=1000.0)
+        cache.set('k', 'v')
+
+        clock.return_value = 1011.0
+        assert cache.get('k') is None
+        assert cache.stats()['expirations'] == 1
+
+    def test_disk_tier_persists(self, tmp_path):
+        """Test that entries survive a new cache instance."""
+        path = str(tmp_path / 'cache.sqlite3')
+        cache = CorrectionCache(path=path)
+        cache.set('k', 'Thank You.')
+        cache.close()
+
+        reopened = CorrectionCache(path=path)
+        assert reopened.get('k') == 'Thank You.'
+        assert reopened.stats()['disk_hits'] == 1
+
+    def test_disk_size_bound(self, tmp_path):
+        """Test that the disk tier is trimmed to its maximum size."""
+        cache = CorrectionCache(path=str(tmp_path / 'cache.sqlite3'),
+                                max_memory_entries=1, max_disk_entries=3)
+        for i in range(5):
+            cache.set(f'k{i}', str(i))
+
+        assert cache.stats()['disk_entries'] == 3
+        assert cache.get('k0') is None
+        assert cache.get('k4') == '4'
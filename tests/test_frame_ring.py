@@ -0,0 +1,160 @@
+"""
+Tests for Frame Ring Module
+
+This module tests publishing frames through the shared-memory ring, in
+one process and from a capture process.
+"""
+
+import pytest
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from frame_ring import CaptureProcess, FrameRing, FrameRingSource
+from frame_source import create_frame_source
+
+
+@pytest.fixture
+def ring():
+    ring = FrameRing(shape=(48, 64, 3), slots=3, create=True)
+    yield ring
+    ring.close()
+
+
+def frame_of(value):
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+class TestFrameRing:
+    """Tests for writing and reading slots."""
+
+    def test_empty_ring(self, ring):
+        assert ring.latest == 0
+        assert ring.view(1) is None
+
+    def test_publish_and_view(self, ring):
+        sequence = ring.publish(frame_of(7), timestamp=123.0)
+        assert sequence == 1
+        frame, captured_at = ring.view(sequence)
+        assert frame.shape == (48, 64, 3)
+        assert frame[0, 0, 0] == 7
+        assert captured_at == 123.0
+
+    def test_resizes_to_ring_shape(self, ring):
+        sequence = ring.publish(np.full((96, 128, 3), 9, dtype=np.uint8))
+        frame, _ = ring.view(sequence)
+        assert frame.shape == (48, 64, 3)
+        assert frame[10, 10, 0] == 9
+
+    def test_overwritten_slot_is_invalid(self, ring):
+        first = ring.publish(frame_of(1))
+        for value in range(2, 5):
+            ring.publish(frame_of(value))
+        assert not ring.valid(first)
+        assert ring.view(first) is None
+        assert ring.view(ring.latest)[0][0, 0, 0] == 4
+
+    def test_slot_being_written_is_skipped(self, ring):
+        ring.publish(frame_of(1))
+        ring.begin_write()
+        assert ring.view(ring.latest + 1) is None
+        sequence = ring.end_write()
+        assert ring.valid(sequence)
+
+    def test_attach_by_name(self, ring):
+        ring.publish(frame_of(5))
+        other = FrameRing(ring.name)
+        try:
+            assert other.shape == ring.shape
+            assert other.view(other.latest)[0][0, 0, 0] == 5
+        finally:
+            other.close()
+
+    def test_attach_missing(self):
+        with pytest.raises(FileNotFoundError):
+            FrameRing('no-such-frame-ring')
+
+
+class TestFrameRingSource:
+    """Tests for reading a ring as a frame source."""
+
+    def test_reads_newest_frame(self, ring):
+        source = FrameRingSource(ring.name)
+        for value in (1, 2, 3):
+            ring.publish(frame_of(value))
+        ok, frame = source.read()
+        assert ok
+        assert frame[0, 0, 0] == 3
+        source.release()
+
+    def test_copy_is_private(self, ring):
+        source = FrameRingSource(ring.name)
+        ring.publish(frame_of(1))
+        _, frame = source.read()
+        frame[:] = 0
+        assert ring.view(ring.latest)[0][0, 0, 0] == 1
+        source.release()
+
+    def test_counts_skipped_frames(self, ring):
+        source = FrameRingSource(ring.name, copy=False)
+        ring.publish(frame_of(1))
+        source.read()
+        ring.publish(frame_of(2))
+        ring.publish(frame_of(3))
+        ok, frame = source.read()
+        assert frame[0, 0, 0] == 3
+        assert source.valid()
+        assert source.skipped == 1
+        del frame
+        source.release()
+
+    def test_times_out_without_new_frame(self, ring):
+        source = FrameRingSource(ring.name, timeout=0.05)
+        assert source.read() == (False, None)
+        source.release()
+
+    def test_closed_writer(self, ring):
+        source = FrameRingSource(ring.name, timeout=5)
+        ring.close_writer()
+        assert not source.isOpened()
+        start = time.monotonic()
+        assert source.read() == (False, None)
+        assert time.monotonic() - start < 1
+        source.release()
+
+    def test_shm_spec(self, ring):
+        source = create_frame_source(f'shm:{ring.name}')
+        assert type(source).__name__ == 'FrameRingSource'
+        assert source.name == f'shm:{ring.name}'
+        assert source.isOpened()
+        source.release()
+
+    def test_missing_ring(self):
+        source = FrameRingSource('no-such-frame-ring')
+        assert not source.isOpened()
+        assert source.read() == (False, None)
+
+
+class TestCaptureProcess:
+    """Tests for capturing in a child process."""
+
+    def test_frames_arrive_from_child(self):
+        capture = CaptureProcess('synthetic:64x48@100', width=32, height=24, slots=4)
+        try:
+            source = capture.open_reader()
+            source.timeout = 30  # Child interpreter start-up
+            ok, frame = source.read()
+            assert ok
+            assert frame.shape == (24, 32, 3)
+            source.timeout = 2
+            assert source.read()[0]
+            assert source.sequence >= 2
+            source.release()
+        finally:
+            capture.stop()
+        assert not capture.alive()
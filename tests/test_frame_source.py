@@ -0,0 +1,164 @@
+"""
+Tests for Frame Source Module
+
+This module tests the synthetic and video file frame sources and the
+parsing of CAMERA_SOURCE specifications.
+"""
+
+import pytest
+import sys
+import os
+import time
+
+import cv2
+import numpy as np
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from frame_source import (
+    DeviceSource, FrameSource, ImageDirectorySource, SyntheticSource, VideoFileSource,
+    create_frame_source, parse_device_spec, parse_synthetic_spec
+)
+
+
+class TestSyntheticSource:
+    """Tests for generated frames."""
+
+    def test_frame_shape(self):
+        source = SyntheticSource(320, 240, fps=0)
+        ok, frame = source.read()
+        assert ok
+        assert frame.shape == (240, 320, 3)
+        assert frame.dtype == np.uint8
+
+    def test_frames_change(self):
+        source = SyntheticSource(160, 120, fps=0)
+        _, first = source.read()
+        _, second = source.read()
+        assert not np.array_equal(first, second)
+
+    def test_paced_at_frame_rate(self):
+        source = SyntheticSource(64, 48, fps=50)
+        start = time.monotonic()
+        for _ in range(6):
+            source.read()
+        # Five intervals after the first frame
+        assert time.monotonic() - start >= 0.09
+
+
+class TestFrameSource:
+    """Tests for the source interface."""
+
+    def test_incomplete_source_fails_on_construction(self):
+        class NoRead(FrameSource):
+            def isOpened(self):
+                return True
+
+        with pytest.raises(TypeError):
+            NoRead()
+
+
+class TestCreateFrameSource:
+    """Tests for CAMERA_SOURCE parsing."""
+
+    def test_synthetic_defaults(self):
+        assert parse_synthetic_spec('') == (640, 480, 30.0)
+
+    def test_synthetic_spec(self):
+        source = create_frame_source('synthetic:320x240@15')
+        assert isinstance(source, SyntheticSource)
+        assert (source.width, source.height) == (320, 240)
+        assert source.name == 'synthetic:320x240@15'
+
+    def test_synthetic_rate_only(self):
+        assert parse_synthetic_spec('@10') == (640, 480, 10.0)
+
+    def test_bad_synthetic_spec(self):
+        with pytest.raises(ValueError):
+            create_frame_source('synthetic:big')
+
+    def test_unknown_spec(self):
+        with pytest.raises(ValueError):
+            create_frame_source('webcam')
+
+    def test_device_index(self, monkeypatch):
+        opened = []
+        monkeypatch.setattr(cv2, 'VideoCapture', lambda *args: opened.append(args))
+        source = create_frame_source('2')
+        assert isinstance(source, DeviceSource)
+        assert opened == [(2,)]
+
+    def test_device_spec(self):
+        assert parse_device_spec('/dev/video0') == ('/dev/video0', None, None, None)
+        assert parse_device_spec('1:1280x720') == (1, 1280, 720, None)
+        assert parse_device_spec('/dev/video2:640x480@15') == ('/dev/video2', 640, 480, 15.0)
+
+    def test_v4l2_spec(self, monkeypatch):
+        class FakeCapture:
+            def __init__(self, *args):
+                self.args = args
+                self.props = {}
+
+            def set(self, prop, value):
+                self.props[prop] = value
+
+        monkeypatch.setattr(cv2, 'VideoCapture', FakeCapture)
+        source = create_frame_source('v4l2:/dev/video0:1280x720@30')
+        assert source.name == 'v4l2:/dev/video0'
+        assert source.capture.args == ('/dev/video0', cv2.CAP_V4L2)
+        assert source.capture.props == {
+            cv2.CAP_PROP_FRAME_WIDTH: 1280, cv2.CAP_PROP_FRAME_HEIGHT: 720, cv2.CAP_PROP_FPS: 30.0
+        }
+
+
+class TestVideoFileSource:
+    """Tests for looping video files."""
+
+    def test_loops_at_end(self, tmp_path):
+        path = str(tmp_path / 'clip.avi')
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (64, 48))
+        if not writer.isOpened():
+            pytest.skip('OpenCV cannot write video here')
+        for value in (0, 120, 240):
+            writer.write(np.full((48, 64, 3), value, dtype=np.uint8))
+        writer.release()
+
+        source = create_frame_source(f'file:{path}')
+        assert isinstance(source, VideoFileSource)
+        assert source.isOpened()
+        source.interval = 0.0
+        frames = [source.read()[1] for _ in range(4)]
+        source.release()
+
+        assert all(frame is not None for frame in frames)
+        # The fourth read is the first frame again
+        assert abs(int(frames[3].mean()) - int(frames[0].mean())) < 10
+
+    def test_missing_file(self, tmp_path):
+        source = create_frame_source(f"file:{tmp_path / 'missing.mp4'}")
+        assert not source.isOpened()
+
+
+class TestImageDirectorySource:
+    """Tests for image directories."""
+
+    def test_loops_over_images_in_order(self, tmp_path):
+        for name, value in (('b.png', 200), ('a.png', 100)):
+            cv2.imwrite(str(tmp_path / name), np.full((8, 8, 3), value, dtype=np.uint8))
+        (tmp_path / 'notes.txt').write_text('not an image')
+
+        source = create_frame_source(f'dir:{tmp_path}@0')
+        assert isinstance(source, ImageDirectorySource)
+        assert source.isOpened()
+        values = [int(source.read()[1][0, 0, 0]) for _ in range(3)]
+        assert values == [100, 200, 100]
+
+    def test_empty_directory(self, tmp_path):
+        source = ImageDirectorySource(str(tmp_path))
+        assert not source.isOpened()
+        assert source.read() == (False, None)
+
+    def test_bad_rate(self, tmp_path):
+        with pytest.raises(ValueError):
+            create_frame_source(f'dir:{tmp_path}@fast')
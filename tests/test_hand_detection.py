@@ -0,0 +1,244 @@
+"""
+Tests for Hand Detection Module
+
+This module tests the hand detector: the worker protocol encoding, the
+conversion of MediaPipe results and the pool of worker processes.
+"""
+
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from hand_detection import (
+    DetectedHand, DetectionPool, DetectionError, HandTracker, InferenceRegion, LocalDetector,
+    hands_from_results, pack_hands, pool_size, unpack_hands
+)
+
+
+def make_hand(offset=0.0, handedness='Left', score=0.9):
+    landmarks = (np.arange(63, dtype=np.float32).reshape(21, 3) / 100) + offset
+    return DetectedHand(landmarks, handedness, score)
+
+
+def fake_results(hands):
+    """An object shaped like a MediaPipe Hands result."""
+    if not hands:
+        return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+    return SimpleNamespace(
+        multi_hand_landmarks=[
+            SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in hand.landmarks.tolist()])
+            for hand in hands
+        ],
+        multi_handedness=[
+            SimpleNamespace(classification=[SimpleNamespace(label=hand.handedness, score=hand.score)])
+            for hand in hands
+        ],
+    )
+
+
+class TestProtocol:
+    """Tests for the compact landmark encoding."""
+
+    def test_round_trip(self):
+        hands = [make_hand(0.0, 'Left', 0.9), make_hand(0.5, 'Right', 0.7)]
+        data = pack_hands(hands)
+        count = int.from_bytes(data[:4], 'little')
+        decoded = unpack_hands(count, data[4:])
+
+        assert count == 2
+        for original, hand in zip(hands, decoded):
+            np.testing.assert_allclose(hand.landmarks, original.landmarks)
+            assert hand.handedness == original.handedness
+            assert hand.score == pytest.approx(original.score)
+
+    def test_no_hands(self):
+        assert pack_hands([]) == b'\x00\x00\x00\x00'
+
+    def test_compact(self):
+        # 21 x (x, y, z) + score + label, as float32
+        assert len(pack_hands([make_hand()])) == 4 + 65 * 4
+
+
+class TestResults:
+    """Tests for converting MediaPipe results."""
+
+    def test_no_hands(self):
+        assert hands_from_results(fake_results([])) == []
+
+    def test_landmarks_and_handedness(self):
+        hand = make_hand(0.1, 'Right', 0.8)
+        converted = hands_from_results(fake_results([hand]))
+        assert len(converted) == 1
+        assert converted[0].landmarks.shape == (21, 3)
+        assert converted[0].landmarks.dtype == np.float32
+        np.testing.assert_allclose(converted[0].landmarks, hand.landmarks)
+        assert converted[0].handedness == 'Right'
+
+    def test_landmark_list_for_drawing(self):
+        landmark_list = make_hand().to_landmark_list()
+        assert len(landmark_list.landmark) == 21
+        assert landmark_list.landmark[1].x == pytest.approx(0.03)
+
+
+class TestHandTracker:
+    """Tests for keeping hand identities across frames."""
+
+    def test_ids_follow_hands_in_any_order(self):
+        tracker = HandTracker()
+        left, right = make_hand(0.0, 'Left'), make_hand(0.4, 'Right')
+        assert tracker.update([left, right], now=0.0) == ['left1', 'right1']
+        assert tracker.update([right, left], now=0.1) == ['right1', 'left1']
+
+    def test_two_signers(self):
+        tracker = HandTracker(max_distance=0.2)
+        near, far = make_hand(0.0, 'Right'), make_hand(0.5, 'Right')
+        assert tracker.update([near, far], now=0.0) == ['right1', 'right2']
+        # Moved a little: still matched to the nearest track
+        assert tracker.update([make_hand(0.52, 'Right'), make_hand(0.03, 'Right')], now=0.1) == ['right2', 'right1']
+
+    def test_far_move_is_a_new_hand(self):
+        tracker = HandTracker(max_distance=0.1)
+        tracker.update([make_hand(0.0, 'Left')], now=0.0)
+        assert tracker.update([make_hand(0.5, 'Left')], now=0.1) == ['left2']
+
+    def test_unseen_tracks_expire(self):
+        tracker = HandTracker(max_age=1.0)
+        tracker.update([make_hand(0.0, 'Left')], now=0.0)
+        tracker.update([], now=2.0)
+        assert tracker.update([make_hand(0.5, 'Left')], now=2.1) == ['left1']
+
+
+class SquareDetector:
+    """Finds a bright square as a "hand" whose landmarks span it."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def detect(self, image):
+        self.shapes.append(image.shape[:2])
+        ys, xs = np.nonzero(image[..., 0] > 128)
+        if not len(xs):
+            return []
+        height, width = image.shape[:2]
+        corners = np.linspace((xs.min() / width, ys.min() / height, 0.0),
+                              ((xs.max() + 1) / width, (ys.max() + 1) / height, 0.0), NUM_POINTS)
+        return [DetectedHand(corners.astype(np.float32), 'Right', 0.9)]
+
+
+NUM_POINTS = 21
+
+
+def frame_with_square(x, y, size=40, shape=(300, 400)):
+    frame = np.zeros(shape + (3,), dtype=np.uint8)
+    frame[y:y + size, x:x + size] = 255
+    return frame
+
+
+class TestInferenceRegion:
+    """Tests for downscaling and cropping before detection."""
+
+    def test_downscales_to_width(self):
+        detector = SquareDetector()
+        hands = InferenceRegion(width=200, roi=False).detect(detector, frame_with_square(100, 100))
+        assert detector.shapes == [(150, 200)]
+        # Normalized coordinates are unaffected by the scale
+        assert hands[0].landmarks[0, 0] == pytest.approx(0.25, abs=0.01)
+
+    def test_full_resolution_passes_frame_through(self):
+        detector = SquareDetector()
+        InferenceRegion(width=0, roi=False).detect(detector, frame_with_square(100, 100))
+        assert detector.shapes == [(300, 400)]
+
+    def test_roi_crops_and_remaps(self):
+        detector = SquareDetector()
+        region = InferenceRegion(width=0, roi=True, margin=0.5)
+        full = region.detect(detector, frame_with_square(100, 100))
+        cropped = region.detect(detector, frame_with_square(100, 100))
+
+        assert detector.shapes[0] == (300, 400)
+        assert detector.shapes[1] == (80, 80)  # 40 px square, 20 px margin
+        np.testing.assert_allclose(cropped[0].landmarks, full[0].landmarks, atol=1e-5)
+        assert region.stats()['roi_frames'] == 1
+
+    def test_lost_hand_falls_back_to_full_frame(self):
+        detector = SquareDetector()
+        region = InferenceRegion(width=0, roi=True)
+        region.detect(detector, frame_with_square(20, 20))
+        hands = region.detect(detector, frame_with_square(300, 200))
+
+        assert len(hands) == 1
+        assert hands[0].landmarks[0, 0] == pytest.approx(0.75)
+        assert detector.shapes[-1] == (300, 400)
+        assert region.stats()['roi_misses'] == 1
+
+    def test_refresh_searches_full_frame(self):
+        detector = SquareDetector()
+        region = InferenceRegion(width=0, roi=True, refresh=2)
+        for _ in range(4):
+            region.detect(detector, frame_with_square(100, 100))
+        assert [shape == (300, 400) for shape in detector.shapes] == [True, False, False, True]
+
+
+class TestPoolSize:
+    """Tests for DETECTION_WORKERS."""
+
+    def test_auto_uses_cores(self):
+        assert pool_size('auto') >= 1
+
+    def test_number(self):
+        assert pool_size('3') == 3
+        assert pool_size('0') == 0
+
+
+class TestLocalDetector:
+    """Tests for detection in this process."""
+
+    def test_detect(self):
+        hand = make_hand()
+        hands = SimpleNamespace(process=lambda frame: fake_results([hand]), close=lambda: None)
+        detector = LocalDetector(hands)
+        found = detector.detect(np.zeros((48, 64, 3), dtype=np.uint8))
+        assert len(found) == 1
+        assert detector.stats()['frames'] == 1
+        assert detector.stats()['mode'] == 'local'
+
+
+@pytest.fixture(scope='module')
+def pool():
+    pool = DetectionPool(workers=1, timeout=10)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+class TestDetectionPool:
+    """Tests for the worker processes (each loads MediaPipe)."""
+
+    def test_blank_frame_has_no_hands(self, pool):
+        assert pool.detect(np.zeros((120, 160, 3), dtype=np.uint8)) == []
+        assert pool.stats()['frames'] >= 1
+
+    def test_frame_too_large(self, pool):
+        frame = np.zeros((2000, 2000, 3), dtype=np.uint8)
+        with pytest.raises(DetectionError):
+            pool.detect(frame)
+
+    def test_restarts_dead_worker(self, pool):
+        worker = pool._workers[0]
+        if worker.alive():
+            worker.process.kill()
+            worker.process.wait()
+        restarts = pool.stats()['restarts']
+        assert pool.detect(np.zeros((120, 160, 3), dtype=np.uint8)) == []
+        assert pool.stats()['restarts'] == restarts + 1
+        assert pool.stats()['alive'] == 1
+
+    def test_needs_a_worker(self):
+        with pytest.raises(ValueError):
+            DetectionPool(workers=0)
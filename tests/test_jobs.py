@@ -0,0 +1,107 @@
+"""
+Tests for Jobs Module
+
+This module tests the background job queue: priorities, limits,
+cancellation and timing.
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from jobs import JobQueue, JobQueueFull, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL
+
+
+@pytest.fixture
+def jobs():
+    queue = JobQueue(max_workers=1, max_queued=3)
+    yield queue
+    queue.shutdown()
+
+
+def block_worker(jobs):
+    """Occupy the single worker until the returned event is set."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(5)
+
+    jobs.submit('block', blocker)
+    assert started.wait(5)
+    return release
+
+
+class TestJobQueue:
+    """Tests for JobQueue."""
+
+    def test_result_and_timing(self, jobs):
+        job = jobs.submit('add', lambda a, b: a + b, 2, 3)
+
+        assert job.wait(5) == 'succeeded'
+        status = job.to_dict()
+        assert status['result'] == 5
+        assert status['timing']['total_ms'] is not None
+        assert jobs.get(job.id) is job
+        assert jobs.stats()['kinds']['add']['count'] == 1
+
+    def test_failure_is_reported(self, jobs):
+        def broken():
+            raise ValueError('bad input')
+
+        job = jobs.submit('broken', broken)
+
+        assert job.wait(5) == 'failed'
+        assert job.error == 'bad input'
+        assert jobs.stats()['failed'] == 1
+
+    def test_higher_priority_runs_first(self, jobs):
+        order = []
+        release = block_worker(jobs)
+
+        low = jobs.submit('low', order.append, 'low', priority=PRIORITY_LOW)
+        normal = jobs.submit('normal', order.append, 'normal', priority=PRIORITY_NORMAL)
+        high = jobs.submit('high', order.append, 'high', priority=PRIORITY_HIGH)
+        release.set()
+
+        for job in (low, normal, high):
+            job.wait(5)
+        assert order == ['high', 'normal', 'low']
+
+    def test_full_queue_rejects(self, jobs):
+        release = block_worker(jobs)
+        for _ in range(3):
+            jobs.submit('wait', lambda: None)
+
+        with pytest.raises(JobQueueFull):
+            jobs.submit('wait', lambda: None)
+
+        release.set()
+        assert jobs.stats()['rejected'] == 1
+
+    def test_cancel_queued_job(self, jobs):
+        calls = []
+        release = block_worker(jobs)
+        job = jobs.submit('cancel-me', calls.append, 1)
+
+        assert jobs.cancel(job.id)
+        release.set()
+        follow_up = jobs.submit('after', lambda: None)
+        follow_up.wait(5)
+
+        assert job.state == 'cancelled'
+        assert calls == []
+        assert not jobs.cancel(follow_up.id)
+
+    def test_wait_since_returns_on_state_change(self, jobs):
+        release = block_worker(jobs)
+        job = jobs.submit('later', lambda: 'ok')
+
+        assert job.wait(0.05, since='queued') == 'queued'
+        release.set()
+        assert job.wait(5, since='queued') in ('running', 'succeeded')
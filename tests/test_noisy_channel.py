@@ -0,0 +1,74 @@
+"""
+Tests for Noisy Channel Module
+
+This module tests the confusion model and the lattice decoder.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from noisy_channel import ConfusionModel, NoisyChannelDecoder, decode_lattice
+from word_segmenter import LanguageModel
+
+
+@pytest.fixture
+def decoder():
+    """Decoder over a tiny vocabulary with an M/N confusion."""
+    lm = LanguageModel({'friend': 50, 'hello': 80, 'world': 60, 'and': 100})
+    confusion = ConfusionModel({'N': {'N': 80, 'M': 20}, 'M': {'M': 95, 'N': 5}})
+    return NoisyChannelDecoder(lm, confusion)
+
+
+class TestConfusionModel:
+    """Tests for the confusion model."""
+
+    def test_measured_likelihoods(self):
+        """Test that confusion counts become likelihoods."""
+        confusion = ConfusionModel({'N': {'N': 80, 'M': 20}})
+
+        assert confusion.p_observed('M', 'N') > confusion.p_observed('A', 'N')
+        assert confusion.confusable('M', 1) == ['N']
+
+    def test_uniform_model_suggests_no_confusions(self):
+        """Test that without a matrix no extra letters are proposed."""
+        confusion = ConfusionModel()
+
+        assert confusion.confusable('M', 3) == []
+        assert confusion.p_observed('A', 'A') > confusion.p_observed('B', 'A')
+
+
+class TestNoisyChannelDecoder:
+    """Tests for lattice decoding."""
+
+    def test_second_candidate_recovers_word(self, decoder):
+        """Test that an 'M' that was almost an 'N' is decoded as 'friend'."""
+        lattice = [[(c, 0.9)] for c in 'FRIE'] + [[('M', 0.6), ('N', 0.35)], [('D', 0.9)]]
+
+        assert decoder.decode(lattice) == ['friend']
+
+    def test_confusion_matrix_adds_candidates(self, decoder):
+        """Test that letters absent from the top-k come from the confusion matrix."""
+        lattice = [[(c, 0.9)] for c in 'FRIE'] + [[('M', 0.9)], [('D', 0.9)]]
+
+        assert decoder.decode(lattice) == ['friend']
+
+    def test_doubled_letters_and_word_boundaries(self, decoder):
+        """Test that squeezed doubles and multiple words are decoded."""
+        lattice = [[(c, 0.95)] for c in 'HELOWORLD']
+
+        assert decoder.decode(lattice) == ['hello', 'world']
+
+    def test_no_dictionary_path_returns_none(self, decoder):
+        """Test that unknown letter runs are left to the segmenter."""
+        assert decoder.decode([[('X', 0.9)], [('Q', 0.9)]]) is None
+
+    def test_decode_lattice_formats_sentence(self):
+        """Test the shared decoder with the shipped tables."""
+        lattice = [[(c, 0.95)] for c in 'THANKYOU']
+
+        assert decode_lattice(lattice) == 'Thank You.'
+        assert decode_lattice([]) == ''
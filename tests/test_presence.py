@@ -0,0 +1,74 @@
+"""
+Tests for Presence Module
+
+This module tests the gate that skips hand detection on empty or static
+frames.
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from presence import PresenceGate
+
+
+def scene(square_at=None, colour=(255, 255, 255)):
+    """A grey 320x240 frame, optionally with a 60 px square in it."""
+    rng = np.random.default_rng(0)
+    frame = np.full((240, 320, 3), 90, dtype=np.uint8)
+    frame += rng.integers(0, 4, frame.shape, dtype=np.uint8)  # Sensor noise
+    if square_at is not None:
+        x, y = square_at
+        frame[y:y + 60, x:x + 60] = colour
+    return frame
+
+
+class TestPresenceGate:
+    """Tests for deciding when detection runs."""
+
+    def test_static_scene_is_skipped(self):
+        gate = PresenceGate(heartbeat=10, hold=0.5)
+        assert gate.should_detect(scene(), now=0.0)  # First frame
+        gate.update(False, now=0.0)
+        assert [gate.should_detect(scene(), now=1.0 + i * 0.03) for i in range(10)] == [False] * 10
+        assert gate.stats()['skipped'] == 10
+        assert gate.stats()['skip_rate'] == pytest.approx(10 / 11, abs=0.001)
+
+    def test_motion_is_detected_at_once(self):
+        gate = PresenceGate(heartbeat=10, hold=0.5)
+        gate.should_detect(scene(), now=0.0)
+        assert not gate.should_detect(scene(), now=1.0)
+        assert gate.should_detect(scene(square_at=(100, 80)), now=1.03)
+        assert gate.stats()['detections']['motion'] == 2
+
+    def test_hand_held_still_keeps_detecting(self):
+        gate = PresenceGate(heartbeat=10, hold=0.5)
+        gate.should_detect(scene(), now=0.0)
+        gate.should_detect(scene(square_at=(100, 80)), now=1.0)
+        for i in range(1, 20):
+            now = 1.0 + i * 0.1
+            assert gate.should_detect(scene(square_at=(100, 80)), now=now)
+            gate.update(True, now=now)
+
+    def test_heartbeat(self):
+        gate = PresenceGate(heartbeat=1.0, hold=0.0)
+        gate.should_detect(scene(), now=0.0)
+        assert not gate.should_detect(scene(), now=0.5)
+        assert gate.should_detect(scene(), now=1.0)
+        assert gate.stats()['detections']['heartbeat'] == 1
+
+    def test_skin_only_ignores_other_colours(self):
+        gate = PresenceGate(skin=True, heartbeat=10, hold=0.0)
+        gate.should_detect(scene(), now=0.0)
+        assert not gate.should_detect(scene(square_at=(100, 80), colour=(255, 0, 0)), now=0.1)
+        assert gate.should_detect(scene(square_at=(180, 80), colour=(120, 150, 220)), now=0.2)
+
+    def test_disabled_lets_everything_through(self):
+        gate = PresenceGate(enabled=False)
+        assert all(gate.should_detect(scene()) for _ in range(5))
+        assert gate.stats()['skipped'] == 0
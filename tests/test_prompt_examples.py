@@ -0,0 +1,64 @@
+"""
+Tests for Prompt Examples Module
+
+This module tests few-shot example retrieval and prompt construction.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from prompt_examples import ExampleStore, load_examples, build_prompt, char_ngrams
+
+
+EXAMPLES = [
+    {'category': 'Examples', 'input': 'H E L L O', 'output': 'Hello.'},
+    {'category': 'Examples', 'input': 'T H A N K Y O U', 'output': 'Thank you.'},
+    {'category': 'Acronym Examples', 'input': 'B M W', 'output': 'BMW.'},
+]
+
+
+class TestExampleStore:
+    """Tests for nearest-neighbor lookup."""
+
+    def test_ngrams_ignore_spacing(self):
+        """Test that spaced and unspaced letters produce the same n-grams."""
+        assert char_ngrams('H E L L O') == char_ngrams('hello')
+
+    def test_nearest_ranks_similar_input_first(self):
+        """Test that the most similar example is returned first."""
+        store = ExampleStore(EXAMPLES)
+
+        assert store.nearest('H E L L O O', 1)[0]['output'] == 'Hello.'
+        assert store.nearest('THANKS', 1)[0]['output'] == 'Thank you.'
+
+    def test_nearest_respects_k_and_exclude(self):
+        """Test that k bounds the result and excluded examples are skipped."""
+        store = ExampleStore(EXAMPLES)
+
+        assert len(store.nearest('H E L L O', 1)) == 1
+        assert all(e['output'] != 'Hello.' for e in store.nearest('H E L L O', 3, exclude={0}))
+
+    def test_shipped_examples_load(self):
+        """Test that the example file is present and well formed."""
+        examples = load_examples()
+
+        assert len(examples) > 50
+        assert all({'category', 'input', 'output'} <= set(e) for e in examples)
+
+
+class TestBuildPrompt:
+    """Tests for prompt rendering."""
+
+    def test_retrieval_prompt_is_smaller(self):
+        """Test that a k-example prompt is shorter than the grouped full prompt."""
+        store = ExampleStore(EXAMPLES)
+        full = build_prompt('RULES', EXAMPLES, grouped=True)
+        small = build_prompt('RULES', store.nearest('HELLO', 1))
+
+        assert 'Acronym Examples:' in full
+        assert 'Input: H E L L O\nOutput: Hello.' in small
+        assert len(small) < len(full)
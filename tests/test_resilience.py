@@ -0,0 +1,157 @@
+"""
+Tests for Resilience Module
+
+This module tests latency budgets and circuit breakers.
+"""
+
+import pytest
+import sys
+import os
+import time
+import threading
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from resilience import (
+    CircuitBreaker, call_with_deadline, DeadlineExceeded, CircuitOpenError,
+    CLOSED, OPEN, HALF_OPEN
+)
+
+
+class TestCallWithDeadline:
+    """Tests for budget enforcement."""
+
+    def test_returns_result_within_budget(self):
+        """Test that a fast call returns its value and counts a success."""
+        breaker = CircuitBreaker('test')
+
+        assert call_with_deadline(breaker, 1.0, lambda x: x * 2, 21) == 42
+        assert breaker.stats()['successes'] == 1
+
+    def test_slow_call_raises_deadline_exceeded(self):
+        """Test that the caller stops waiting once the budget is spent."""
+        breaker = CircuitBreaker('test')
+
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            call_with_deadline(breaker, 0.05, time.sleep, 0.5)
+
+        assert time.monotonic() - start < 0.4
+        assert breaker.stats()['budget_misses'] == 1
+
+    def test_late_result_is_discarded(self):
+        """Test that a result arriving after the budget is released."""
+        breaker = CircuitBreaker('test')
+        discarded = threading.Event()
+
+        def slow():
+            time.sleep(0.1)
+            return 'response'
+
+        with pytest.raises(DeadlineExceeded):
+            call_with_deadline(breaker, 0.02, slow, discard=lambda result: discarded.set())
+
+        assert discarded.wait(2)
+
+    def test_exceptions_propagate_and_count(self):
+        """Test that provider errors are re-raised and recorded."""
+        breaker = CircuitBreaker('test')
+
+        def fail():
+            raise ValueError('boom')
+
+        with pytest.raises(ValueError):
+            call_with_deadline(breaker, 1.0, fail)
+        assert breaker.stats()['failures'] == 1
+
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions."""
+
+    def test_opens_after_threshold_and_short_circuits(self):
+        """Test that repeated failures open the breaker and skip calls."""
+        breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        calls = []
+        with pytest.raises(CircuitOpenError):
+            call_with_deadline(breaker, 1.0, calls.append, 1)
+        assert calls == []
+        assert breaker.stats()['short_circuits'] == 1
+
+    def test_half_open_trial_closes_or_reopens(self):
+        """Test that one trial call decides whether the breaker closes."""
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # Only one trial at a time
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        time.sleep(0.02)
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+
+class TestOpenAIStreamDeadline:
+    """Tests for the budget of a streamed OpenAI correction."""
+
+    def test_slow_stream_falls_back_to_offline_correction(self, mocker):
+        """Test that a stream still running past the budget is closed."""
+        import text_fix
+
+        class SlowStream:
+            closed = False
+
+            def __iter__(self):
+                for word in ['Hel', 'lo', ' there', ' friend']:
+                    time.sleep(0.03)
+                    yield mocker.Mock(choices=[mocker.Mock(delta=mocker.Mock(content=word))])
+
+            def close(self):
+                self.closed = True
+
+        stream = SlowStream()
+        client = mocker.Mock()
+        client.chat.completions.create.return_value = stream
+        breaker = CircuitBreaker('openai')
+        mocker.patch.object(text_fix, 'get_client', return_value=client)
+        mocker.patch.object(text_fix, 'openai_breaker', breaker)
+        mocker.patch.object(text_fix, 'OPENAI_DEADLINE', 0.05)
+        mocker.patch.object(text_fix.correction_cache, 'get', return_value=None)
+        mocker.patch.object(text_fix, 'local_correction', return_value='Hello.')
+
+        events = list(text_fix.generate_sentences_stream('H E L L O'))
+
+        assert events[-1] == {'final': 'Hello.'}
+        assert len(events) < 5
+        assert stream.closed
+        assert breaker.stats()['budget_misses'] == 1
+
+    def test_disconnect_closes_stream(self, mocker):
+        """Test that abandoning the generator mid-stream closes the stream."""
+        import text_fix
+
+        stream = mocker.MagicMock()
+        stream.__iter__.return_value = iter(
+            [mocker.Mock(choices=[mocker.Mock(delta=mocker.Mock(content=word))]) for word in ['Hel', 'lo']]
+        )
+        client = mocker.Mock()
+        client.chat.completions.create.return_value = stream
+        mocker.patch.object(text_fix, 'get_client', return_value=client)
+        mocker.patch.object(text_fix, 'openai_breaker', CircuitBreaker('openai'))
+        mocker.patch.object(text_fix.correction_cache, 'get', return_value=None)
+
+        events = text_fix.generate_sentences_stream('H E L L O')
+        assert next(events) == {'delta': 'Hel'}
+        events.close()  # As on an SSE client disconnect
+
+        stream.close.assert_called_once()
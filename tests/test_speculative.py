@@ -0,0 +1,161 @@
+"""
+Tests for Speculative Correction Module
+
+This module tests background chunk correction and result joining.
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from speculative import SpeculativeCorrector, join_corrections
+
+
+class FakeCorrector:
+    """Records calls and returns the letters joined and capitalized."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, text, lattice=None):
+        with self.lock:
+            self.calls.append(text)
+        word = text.replace(' ', '').lower()
+        return word.capitalize() + '.'
+
+
+def wait_for_chunks(speculator, count):
+    """Wait until count chunks have been dispatched and corrected."""
+    for _ in range(200):
+        with speculator._lock:
+            chunks = list(speculator._chunks)
+        if len(chunks) >= count and all(c.future.done() for c in chunks[:count]):
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError('chunks were not dispatched')
+
+
+class TestJoinCorrections:
+    """Tests for joining chunk corrections."""
+
+    def test_joins_sentence_case_chunks(self):
+        """Test that inner punctuation is dropped and case continues."""
+        assert join_corrections(['Help me with.', 'This code.']) == 'Help me with this code.'
+
+    def test_keeps_title_case_and_acronyms(self):
+        """Test that title-cased text and acronyms keep their capitals."""
+        assert join_corrections(['Hello.', 'World.']) == 'Hello World.'
+        assert join_corrections(['I drive a.', 'BMW.']) == 'I drive a BMW.'
+
+    def test_question_from_first_chunk(self):
+        """Test that a question opening keeps the question mark."""
+        assert join_corrections(['Where are?', 'You going.']) == 'Where are you going?'
+
+
+class TestSpeculativeCorrector:
+    """Tests for dispatching and reusing chunks."""
+
+    def test_disabled_corrects_everything_on_finish(self):
+        """Test that a disabled speculator makes one call for all letters."""
+        correct = FakeCorrector()
+        speculator = SpeculativeCorrector(correct, enabled=False)
+
+        speculator.update(list('HELLO'))
+        assert speculator.finish(list('HELLO')) == 'Hello.'
+        assert correct.calls == ['H E L L O']
+
+    def test_word_boundary_dispatches_chunk_and_finish_corrects_tail(self):
+        """Test that settled words are corrected early and only the tail on stop."""
+        correct = FakeCorrector()
+        letters = list('HELLOTHEREWORLD')
+        speculator = SpeculativeCorrector(
+            correct, boundaries=lambda s: [e for e in (5, 10, 15) if e <= len(s)],
+            holdback_words=1, min_letters=5
+        )
+
+        speculator.update(letters[:10])
+        wait_for_chunks(speculator, 1)
+        assert correct.calls == ['H E L L O']
+
+        result = speculator.finish(letters)
+        assert correct.calls == ['H E L L O', 'T H E R E W O R L D']
+        assert result == 'Hello Thereworld.'
+        assert speculator.stats()['chunks_reused'] == 1
+
+    def test_pause_dispatches_pending_letters(self):
+        """Test that a pause sends every pending letter."""
+        correct = FakeCorrector()
+        speculator = SpeculativeCorrector(correct, boundaries=lambda s: [])
+
+        speculator.update(list('HI'))
+        speculator.on_pause()
+        wait_for_chunks(speculator, 1)
+
+        assert speculator.finish(list('HI')) == 'Hi.'
+        assert correct.calls == ['H I']
+
+    def test_planning_does_not_wait_behind_corrections(self):
+        """Test that boundaries are planned while every correction worker is busy."""
+        release = threading.Event()
+        correct = FakeCorrector()
+
+        def slow(text, lattice=None):
+            release.wait(5)
+            return correct(text, lattice)
+
+        speculator = SpeculativeCorrector(
+            slow, boundaries=lambda s: [e for e in (5, 10, 15) if e <= len(s)],
+            holdback_words=1, min_letters=5, max_workers=1
+        )
+        try:
+            speculator.update(list('HI'))
+            while speculator._planning:
+                threading.Event().wait(0.01)
+            speculator.on_pause()  # Occupies the only correction worker
+            speculator.update(list('HI') + list('HELLOTHERE'))
+            for _ in range(200):
+                if speculator.stats()['chunks_dispatched'] == 2:
+                    break
+                threading.Event().wait(0.01)
+            assert speculator.stats()['chunks_dispatched'] == 2
+        finally:
+            release.set()
+            speculator.shutdown()
+
+    def test_reset_discards_chunks(self):
+        """Test that chunks from a previous recording are not reused."""
+        correct = FakeCorrector()
+        speculator = SpeculativeCorrector(correct, boundaries=lambda s: [])
+
+        speculator.update(list('HI'))
+        speculator.on_pause()
+        wait_for_chunks(speculator, 1)
+        speculator.reset()
+
+        assert speculator.finish(list('OK')) == 'Ok.'
+        assert correct.calls[-1] == 'O K'
+
+    def test_finish_stream_sends_chunks_then_tail(self):
+        """Test that reused chunks are sent first and the tail is streamed."""
+        correct = FakeCorrector()
+
+        def stream(text, lattice=None):
+            yield {'delta': 'Wor'}
+            yield {'delta': 'ld.'}
+            yield {'final': 'World.'}
+
+        speculator = SpeculativeCorrector(correct, stream=stream, boundaries=lambda s: [])
+        speculator.update(list('HELLO'))
+        speculator.on_pause()
+        wait_for_chunks(speculator, 1)
+
+        events = list(speculator.finish_stream(list('HELLOWORLD')))
+
+        assert events == [
+            {'delta': 'Hello '}, {'delta': 'Wor'}, {'delta': 'ld.'}, {'final': 'Hello World.'}
+        ]
@@ -0,0 +1,69 @@
+"""
+Tests for Speech Prefetch Module
+
+This module tests background TTS prefetching and cancellation.
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from speech_prefetch import SpeechPrefetcher
+
+
+class BlockingSynthesizer:
+    """Synthesizer that blocks until released, recording its inputs."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, text):
+        self.calls.append(text)
+        self.release.wait(5)
+        return f'/cache/{text}.mp3', False
+
+
+class TestSpeechPrefetcher:
+    """Tests for prefetch scheduling."""
+
+    def test_prefetch_synthesizes_and_wait_for_returns(self):
+        """Test that a prefetched sentence is synthesized once."""
+        synth = BlockingSynthesizer()
+        prefetcher = SpeechPrefetcher(synth, enabled=True, max_workers=1)
+
+        prefetcher.prefetch('Hello.')
+        prefetcher.prefetch('Hello.')
+        synth.release.set()
+
+        assert prefetcher.wait_for('Hello.', timeout=5) is True
+        assert synth.calls == ['Hello.']
+        assert prefetcher.stats()['completed'] == 1
+
+    def test_new_sentence_cancels_queued_one(self):
+        """Test that queued work for an older sentence is dropped."""
+        synth = BlockingSynthesizer()
+        prefetcher = SpeechPrefetcher(synth, enabled=True, max_workers=1)
+
+        prefetcher.prefetch('First.')     # Occupies the only worker
+        prefetcher.prefetch('Second.')    # Queued
+        prefetcher.prefetch('Third.')     # Replaces the queued one
+        synth.release.set()
+        prefetcher.wait_for('Third.', timeout=5)
+
+        assert 'Second.' not in synth.calls
+        assert prefetcher.stats()['cancelled'] == 1
+
+    def test_disabled_does_nothing(self):
+        """Test that a disabled prefetcher never synthesizes."""
+        synth = BlockingSynthesizer()
+        prefetcher = SpeechPrefetcher(synth, enabled=False)
+
+        prefetcher.prefetch('Hello.')
+
+        assert prefetcher.wait_for('Hello.') is False
+        assert synth.calls == []
@@ -0,0 +1,179 @@
+"""
+Tests for Speech to Text Module
+
+This module tests endpointing of uploaded recordings and the
+recognition service with the local stand-in backend.
+"""
+
+import pytest
+import sys
+import os
+import io
+import wave
+import threading
+
+import numpy as np
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from voice_activity import NoiseCalibration, find_speech
+from speech_to_text import (
+    SPEECH_RECOGNITION_DEADLINE, AudioDecodeError, FixedTranscriptBackend, RecognizerBackend,
+    SpeechBusyError, SpeechRecognizerService, _recognize_google, create_backend, decode_audio,
+    register_backend
+)
+
+RATE = 16000
+
+
+def make_clip(silence_before=1.0, speech=1.0, silence_after=1.0, rate=RATE, seed=0):
+    """Low background noise around a loud tone standing in for speech."""
+    rng = np.random.default_rng(seed)
+    total = int((silence_before + speech + silence_after) * rate)
+    samples = rng.normal(0, 30, total)
+    start = int(silence_before * rate)
+    end = start + int(speech * rate)
+    samples[start:end] += 6000 * np.sin(np.arange(end - start) * 2 * np.pi * 220 / rate)
+    return samples.astype('<i2'), start, end
+
+
+def to_wav(samples, rate=RATE, channels=1):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(samples.astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+class TestFindSpeech:
+    """Tests for energy-based endpointing."""
+
+    def test_trims_silence_around_speech(self):
+        samples, start, end = make_clip()
+
+        bounds = find_speech(samples, RATE, padding_ms=100)
+
+        assert bounds is not None
+        found_start, found_end = bounds
+        assert start - 0.15 * RATE <= found_start <= start
+        assert end <= found_end <= end + 0.15 * RATE
+
+    def test_silence_has_no_speech(self):
+        samples, _, _ = make_clip(speech=0.0)
+
+        assert find_speech(samples, RATE) is None
+
+    def test_short_click_is_not_speech(self):
+        samples, _, _ = make_clip(speech=0.03)
+
+        assert find_speech(samples, RATE) is None
+
+    def test_calibration_covers_clip_without_pause(self):
+        calibration = NoiseCalibration()
+        quiet, _, _ = make_clip()
+        find_speech(quiet, RATE, calibration)
+        assert calibration.level < 100
+
+        # Speech from the first sample: the clip alone has no noise floor
+        speech_only, _, _ = make_clip(silence_before=0.0, speech=2.0, silence_after=0.0)
+        assert find_speech(speech_only, RATE) is None
+        assert find_speech(speech_only, RATE, calibration) == (0, len(speech_only))
+
+
+class TestDecodeAudio:
+    """Tests for decoding uploads."""
+
+    def test_resamples_and_downmixes(self):
+        stereo = np.repeat(make_clip(rate=44100)[0], 2)
+
+        samples, rate = decode_audio(to_wav(stereo, rate=44100, channels=2))
+
+        assert rate == RATE
+        assert abs(len(samples) - 3 * RATE) < 10
+
+    def test_rejects_other_formats(self):
+        with pytest.raises(AudioDecodeError):
+            decode_audio(b'OggS not a wav file')
+
+
+class TestBackends:
+    """Tests for the backend registry."""
+
+    def test_unknown_backend_falls_back_to_google(self):
+        assert create_backend('no-such-backend').name == 'google'
+
+    def test_registered_backend(self):
+        class Upper(RecognizerBackend):
+            name = 'upper'
+
+            def recognize(self, audio):
+                return 'UPPER'
+
+        register_backend('upper', Upper)
+        assert create_backend('upper').recognize(None) == 'UPPER'
+
+    def test_incomplete_backend_fails_on_construction(self):
+        class Incomplete(RecognizerBackend):
+            name = 'incomplete'
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_google_request_bounded_by_budget(self):
+        class Recognizer:
+            operation_timeout = None
+
+            def recognize_google(self, audio):
+                return self.operation_timeout
+
+        assert _recognize_google(Recognizer(), None) == SPEECH_RECOGNITION_DEADLINE
+
+
+class TestSpeechRecognizerService:
+    """Tests for recognizing uploads on the worker pool."""
+
+    def test_recognizes_trimmed_speech(self):
+        backend = FixedTranscriptBackend('hello world')
+        service = SpeechRecognizerService(backend)
+
+        assert service.recognize_upload(to_wav(make_clip()[0]), timeout=5) == 'hello world'
+
+        stats = service.stats()
+        assert stats['recognized'] == 1
+        assert stats['audio_seconds'] == 3.0
+        assert stats['speech_seconds'] < 2.0
+        service.shutdown()
+
+    def test_silence_skips_backend(self):
+        backend = FixedTranscriptBackend()
+        service = SpeechRecognizerService(backend)
+
+        assert service.recognize_upload(to_wav(make_clip(speech=0.0)[0]), timeout=5) is None
+        assert backend.calls == 0
+        assert service.stats()['no_speech'] == 1
+        service.shutdown()
+
+    def test_rejects_when_queue_is_full(self):
+        release = threading.Event()
+
+        class Blocking(RecognizerBackend):
+            name = 'blocking'
+
+            def recognize(self, audio):
+                release.wait(5)
+                return 'done'
+
+        service = SpeechRecognizerService(Blocking(), max_workers=1, max_pending=1)
+        wav = to_wav(make_clip()[0])
+        future = service.submit(wav)
+
+        with pytest.raises(SpeechBusyError):
+            service.submit(wav)
+
+        release.set()
+        assert future.result(timeout=5) == 'done'
+        assert service.stats()['rejected'] == 1
+        service.shutdown()
@@ -0,0 +1,209 @@
+"""
+Tests for Startup Module
+
+This module tests lazy resource initialization and startup timing.
+"""
+
+import pytest
+import sys
+import os
+import time
+import threading
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from startup import LazyResource, Warmup, record_remainder, record_timing, timing_report
+
+
+class TestLazyResource:
+    """Tests for LazyResource."""
+
+    def test_factory_runs_once_on_first_get(self):
+        calls = []
+        resource = LazyResource('test-once', lambda: calls.append(1) or 'value')
+
+        assert not resource.loaded
+        assert resource.peek() is None
+        assert calls == []
+
+        assert resource.get() == 'value'
+        assert resource.get() == 'value'
+        assert calls == [1]
+        assert resource.loaded
+        assert resource.peek() == 'value'
+        assert 'init:test-once' in timing_report()['phases_ms']
+
+    def test_failure_is_remembered_until_reset(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError('boom')
+            return 'recovered'
+
+        resource = LazyResource('test-failure', factory)
+
+        with pytest.raises(RuntimeError):
+            resource.get()
+        with pytest.raises(RuntimeError):
+            resource.get()
+        assert len(calls) == 1
+        assert isinstance(resource.error, RuntimeError)
+
+        resource.reset()
+        assert resource.get() == 'recovered'
+        assert resource.error is None
+
+    def test_failure_is_retried_after_backoff(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            if len(calls) < 3:
+                raise RuntimeError('boom')
+            return 'recovered'
+
+        resource = LazyResource('test-retry', factory, retry_interval=0.05, max_retry_interval=0.1)
+
+        with pytest.raises(RuntimeError):
+            resource.get()
+        with pytest.raises(RuntimeError):
+            resource.get()  # Within the backoff
+        assert len(calls) == 1
+
+        time.sleep(0.06)
+        with pytest.raises(RuntimeError):
+            resource.get()  # Retried, failed again; the next wait is doubled
+        assert len(calls) == 2
+        time.sleep(0.06)
+        with pytest.raises(RuntimeError):
+            resource.get()
+        assert len(calls) == 2
+
+        time.sleep(0.06)
+        assert resource.get() == 'recovered'
+        assert resource.loaded
+        assert resource.error is None
+
+
+class TestTimingReport:
+    """Tests for the startup timing report."""
+
+    def test_remainder_excludes_attributed_phases(self):
+        start = time.perf_counter() - 1.0
+        record_timing('phase-test:part', 0.4)
+        record_remainder('phase-test:rest', start)
+
+        phases = timing_report()['phases_ms']
+        assert phases['phase-test:part'] == 400.0
+        assert 550.0 <= phases['phase-test:rest'] <= 700.0
+
+
+class TestWarmup:
+    """Tests for the warm-up and readiness state."""
+
+    def test_run_marks_ready_and_records_durations(self):
+        calls = []
+        warmup = Warmup([('first', lambda: calls.append('first')), ('second', lambda: calls.append('second'))])
+
+        assert not warmup.ready
+        assert warmup.run()
+        assert warmup.run()
+
+        assert calls == ['first', 'second']
+        status = warmup.status()
+        assert status['state'] == 'ready'
+        assert set(status['steps_ms']) == {'first', 'second'}
+        assert status['duration_ms'] is not None
+        assert 'warmup:first' in timing_report()['phases_ms']
+
+    def test_failed_step_is_not_ready(self):
+        def broken():
+            raise RuntimeError('no model')
+
+        warmup = Warmup([('model', broken), ('never', lambda: None)])
+
+        assert not warmup.run()
+        status = warmup.status()
+        assert status['state'] == 'failed'
+        assert 'no model' in status['error']
+        assert 'never' not in status['steps_ms']
+
+    def test_failed_warmup_is_retried_after_backoff(self):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 2:
+                raise RuntimeError('no model')
+
+        warmup = Warmup([('model', flaky)], retry_interval=0.05)
+
+        assert not warmup.run()
+        assert not warmup.run()  # Within the backoff
+        assert len(calls) == 1
+
+        time.sleep(0.06)
+        warmup.start()
+        assert warmup.wait(5)
+        assert len(calls) == 2
+        assert warmup.status()['error'] is None
+
+    def test_disabled_is_ready_immediately(self):
+        warmup = Warmup([('step', lambda: None)], enabled=False)
+
+        assert warmup.ready
+        assert warmup.wait(0)
+        assert warmup.status()['state'] == 'disabled'
+
+    def test_start_runs_in_background(self):
+        release = threading.Event()
+        warmup = Warmup([('slow', lambda: release.wait(5))])
+
+        warmup.start()
+        assert not warmup.wait(0.05)
+        assert warmup.status()['state'] == 'running'
+
+        release.set()
+        assert warmup.wait(5)
+
+
+class TestAppStartup:
+    """Tests for lazy initialization in the Flask app."""
+
+    def test_health_does_not_load_model(self, client):
+        import app as app_module
+        app_module.classifier.reset()
+
+        response = client.get('/health')
+
+        assert response.status_code == 200
+        assert response.get_json()['model_loaded'] is False
+        assert not app_module.classifier.loaded
+
+    def test_metrics_include_startup_timing(self, client):
+        startup = client.get('/metrics').get_json()['startup']
+
+        assert 'import:flask' in startup['phases_ms']
+        assert 'init:create_app' in startup['phases_ms']
+
+    def test_ready_reflects_warmup(self, client, mocker):
+        import app as app_module
+
+        release = threading.Event()
+        pending = Warmup([('step', lambda: release.wait(5))])
+        mocker.patch.object(app_module, 'warmup', pending)
+        assert pending.state == 'pending'
+
+        # Without a server entry point, the first request starts it
+        response = client.get('/ready')
+        assert response.status_code == 503
+        assert response.get_json()['state'] == 'running'
+
+        release.set()
+        assert pending.wait(5)
+        response = client.get('/ready')
+        assert response.status_code == 200
+        assert response.get_json()['ready'] is True
@@ -138,3 +138,104 @@ class TestGetImageBase64:
 
         result = get_image_base64('/nonexistent/path/image.png')
         assert result is None
+
+
+class TestLetterVariants:
+    """Tests for the letter image variant builder and selection."""
+
+    @pytest.fixture
+    def variants_dir(self, tmp_path):
+        """Build variants of two letters into a temporary directory."""
+        from letter_variants import build_variants, LETTER_IMAGES_DIR
+        import shutil
+
+        source = tmp_path / 'source'
+        source.mkdir()
+        for letter in ('A', 'B'):
+            shutil.copy(os.path.join(LETTER_IMAGES_DIR, f'{letter}.png'), source)
+
+        output = tmp_path / 'variants'
+        build_variants(str(source), str(output), widths=(64, 128))
+        return str(source), str(output)
+
+    def test_variants_are_smaller(self, variants_dir):
+        """Test that every generated variant is smaller than the original."""
+        source, output = variants_dir
+        original = os.path.getsize(os.path.join(source, 'A.png'))
+
+        for width in ('64', '128'):
+            for ext in ('webp', 'png'):
+                assert os.path.getsize(os.path.join(output, width, f'A.{ext}')) < original
+
+    def test_select_prefers_webp_when_accepted(self, variants_dir):
+        """Test that WebP is chosen only when the client accepts it."""
+        from letter_variants import select_variant
+
+        source, output = variants_dir
+        _, mime = select_variant('a', 100, 'image/webp,*/*', output, source)
+        assert mime == 'image/webp'
+
+        _, mime = select_variant('a', 100, '*/*', output, source)
+        assert mime == 'image/png'
+
+    def test_select_smallest_fitting_width(self, variants_dir):
+        """Test that the smallest variant covering the requested size is used."""
+        from letter_variants import select_variant
+
+        source, output = variants_dir
+        path, _ = select_variant('B', 50, None, output, source)
+        assert os.path.join(output, '64') in path
+
+        path, _ = select_variant('B', 100, None, output, source)
+        assert os.path.join(output, '128') in path
+
+        # Larger than every variant falls back to the largest one
+        path, _ = select_variant('B', 1000, None, output, source)
+        assert os.path.join(output, '128') in path
+
+    def test_select_falls_back_to_original(self, tmp_path):
+        """Test that the original PNG is used when no variants exist."""
+        from letter_variants import select_variant, LETTER_IMAGES_DIR
+
+        path, mime = select_variant('C', 64, 'image/webp', str(tmp_path / 'missing'), LETTER_IMAGES_DIR)
+        assert path.endswith('C.png')
+        assert mime == 'image/png'
+
+    def test_variants_built_later_are_used(self, tmp_path):
+        """Test that variants built after the first lookup are served without clearing caches."""
+        from letter_variants import build_variants, select_variant, LETTER_IMAGES_DIR
+
+        output = str(tmp_path / 'variants')
+        path, _ = select_variant('A', 64, None, output, LETTER_IMAGES_DIR)
+        assert path.endswith(os.path.join('letter_images', 'A.png'))
+
+        build_variants(LETTER_IMAGES_DIR, output, widths=(64,), formats=('png',))
+        path, _ = select_variant('A', 64, None, output, LETTER_IMAGES_DIR)
+        assert path == os.path.join(output, '64', 'A.png')
+
+    def test_result_includes_mime_type(self):
+        """Test that converted letters report their image MIME type."""
+        from text_to_sign import text_to_sign_language
+
+        result = text_to_sign_language('A B')
+
+        assert result[0]['mime'] in ('image/png', 'image/webp')
+        assert result[1]['mime'] is None
+
+
+class TestSplitTextSegments:
+    """Tests for the split_text_segments function."""
+
+    def test_segments_respect_max_length(self):
+        """Test that segments never exceed the maximum length."""
+        from text_to_sign import split_text_segments
+
+        segments = list(split_text_segments('ONE TWO THREE FOUR FIVE', 9))
+
+        assert segments == ['ONE TWO', 'THREE', 'FOUR FIVE']
+
+    def test_long_word_is_split(self):
+        """Test that a word longer than the limit is cut."""
+        from text_to_sign import split_text_segments
+
+        assert list(split_text_segments('ABCDEFGHIJ', 4)) == ['ABCD', 'EFGH', 'IJ']
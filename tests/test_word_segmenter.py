@@ -0,0 +1,89 @@
+"""
+Tests for Word Segmenter Module
+
+This module tests the offline segmentation and spelling engine.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the UI/functions directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UI', 'functions'))
+
+from word_segmenter import (
+    LanguageModel, SpellingIndex, WordSegmenter, correct_text,
+    damerau_levenshtein, format_sentence, squeeze
+)
+
+
+@pytest.fixture
+def segmenter():
+    """Segmenter over a tiny hand-written vocabulary."""
+    lm = LanguageModel(
+        {'i': 500, 'love': 100, 'programming': 20, 'hello': 80, 'world': 60,
+         'a': 600, 'pro': 5, 'gram': 5},
+        {('i', 'love'): 50, ('hello', 'world'): 40}
+    )
+    return WordSegmenter(lm)
+
+
+class TestHelpers:
+    """Tests for the string helpers."""
+
+    def test_squeeze(self):
+        """Test that repeated letters are collapsed."""
+        assert squeeze('programming') == 'programing'
+        assert squeeze('hello') == 'helo'
+
+    def test_damerau_levenshtein(self):
+        """Test edit distances including transpositions."""
+        assert damerau_levenshtein('hand', 'hnad', 2) == 1
+        assert damerau_levenshtein('sign', 'sigmn', 2) == 1
+        assert damerau_levenshtein('abc', 'xyz', 1) == 2
+
+    def test_format_sentence(self):
+        """Test title casing, acronyms and question marks."""
+        assert format_sentence(['i', 'love', 'ibm']) == 'I Love IBM.'
+        assert format_sentence(['how', 'are', 'you']) == 'How Are You?'
+        assert format_sentence(['do', 'you', 'like', 'it']) == 'Do You Like It?'
+        assert format_sentence([]) == ''
+
+
+class TestSpellingIndex:
+    """Tests for the symmetric-delete index."""
+
+    def test_lookup_finds_dropped_and_inserted_letters(self):
+        """Test that single deletions and insertions are recovered."""
+        index = SpellingIndex(['friend', 'teacher'])
+
+        assert 'friend' in dict(index.lookup('frend'))
+        assert 'teacher' in dict(index.lookup('teachmer'))
+
+    def test_squeezed_match_is_cheaper_than_edit(self):
+        """Test that doubled letters cost less than a real edit."""
+        index = SpellingIndex(['hello', 'helot'])
+        penalties = dict(index.lookup('helo'))
+
+        assert penalties['hello'] > penalties['helot']
+
+
+class TestWordSegmenter:
+    """Tests for segmentation."""
+
+    def test_segments_spaced_letters(self, segmenter):
+        """Test segmentation of fingerspelled input."""
+        assert segmenter.segment('I L O V E P R O G R A M M I N G') == ['i', 'love', 'programming']
+
+    def test_recovers_squeezed_double_letters(self, segmenter):
+        """Test that 'HELO WORLD' becomes 'hello world'."""
+        assert segmenter.segment('HELOWORLD') == ['hello', 'world']
+
+    def test_empty_input(self, segmenter):
+        """Test that empty input gives no words."""
+        assert segmenter.segment(' ') == []
+
+    def test_shipped_tables(self):
+        """Test the full engine with the shipped frequency tables."""
+        assert correct_text('T H A N K Y O U V E R Y M U C H') == 'Thank You Very Much.'
+        assert correct_text('G O O D M B Y E') == 'Goodbye.'